@@ -22,7 +22,7 @@ if config.config_file_name is not None:
 # add your model's MetaData object here
 # for 'autogenerate' support
 from src.database.base import Base
-from src.models import Biography, Chapter, Source, GenerationJob
+from src.models import Biography, Chapter, Source, GenerationJob, JobEvent
 
 target_metadata = Base.metadata
 
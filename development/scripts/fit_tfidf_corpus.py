@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Fit the TF-IDF corpus model used for source relevance scoring
+
+The model is fitted on the markdown files of the bios/ folder and saved
+with joblib. Point TFIDF_CORPUS_MODEL_PATH at the saved file so that
+SourceValidationService scores sources with it.
+
+Usage:
+    python development/scripts/fit_tfidf_corpus.py --output models/tfidf_corpus.joblib
+    python development/scripts/fit_tfidf_corpus.py --directory bios --pattern "**/*.md"
+"""
+import argparse
+import os
+import sys
+
+# Add the repository root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.tfidf_analyzer import TfidfAnalyzer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the TF-IDF corpus model on a folder of biographies")
+    parser.add_argument("--directory", default="bios", help="Root directory of the corpus (default: %(default)s)")
+    parser.add_argument("--pattern", default="**/*.md", help="Glob pattern of corpus files (default: %(default)s)")
+    parser.add_argument(
+        "--output",
+        default=os.getenv("TFIDF_CORPUS_MODEL_PATH", "models/tfidf_corpus.joblib"),
+        help="Destination of the model (default: TFIDF_CORPUS_MODEL_PATH or %(default)s)"
+    )
+    args = parser.parse_args()
+
+    analyzer = TfidfAnalyzer()
+    vectorizer = analyzer.fit_corpus_from_directory(args.directory, args.pattern)
+    analyzer.save_corpus_model(args.output)
+
+    print(f"Saved corpus model with {len(vectorizer.vocabulary_)} terms to {args.output}")
+    print(f"Set TFIDF_CORPUS_MODEL_PATH={args.output} to use it")
+
+
+if __name__ == "__main__":
+    main()
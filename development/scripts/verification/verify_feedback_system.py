@@ -84,7 +84,7 @@ def verify_acceptance_criteria():
                 patterns=[],
                 timestamp=datetime.now() - timedelta(days=40)
             )
-            feedback_system.quality_tracker.success_cases.append(old_case)
+            feedback_system.quality_tracker.add_case(old_case)
         
         # Then add recent, higher-quality generations (showing improvement)
         for i in range(5):
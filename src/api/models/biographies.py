@@ -52,6 +52,12 @@ class BiographyGenerateRequest(BaseModel):
         le=2.0,
         description="Temperature for text generation"
     )
+    max_concurrent_chapters: Optional[int] = Field(
+        default=4,
+        ge=1,
+        le=10,
+        description="Maximum chapters generated concurrently (1 = sequential)"
+    )
     
     # Source generation mode (new feature)
     mode: GenerationMode = Field(
@@ -72,6 +72,7 @@ class CollectionStatsResponse(BaseModel):
     total_characters: int = Field(..., description="Total number of characters in collection")
     completed: int = Field(..., description="Number of completed characters")
     remaining: int = Field(..., description="Number of remaining characters")
+    in_progress: int = Field(0, description="Number of characters claimed by running collection workers")
     completion_percentage: float = Field(..., description="Completion percentage")
 
 
@@ -4,10 +4,11 @@ Biography generation endpoints
 import uuid
 import logging
 import os
-from datetime import datetime, timezone
-from typing import Dict, List
+from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException, status, BackgroundTasks
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import FileResponse
+from sqlalchemy.exc import SQLAlchemyError
 
 from ..models.biographies import (
     BiographyGenerateRequest,
@@ -22,6 +23,10 @@ from ...services.openrouter_client import OpenRouterClient
 from ...services.source_generator import AutomaticSourceGenerator
 from ...services.hybrid_generator import HybridSourceGenerator
 from ...services.zip_export_service import ZipExportService
+from ...services.chapter_generator import ChapterGenerator, ChapterStore
+from ...services.job_store import get_job_store
+from ...websocket.manager import get_websocket_client
+from ...websocket.token_stream import TokenStreamForwarder
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +35,6 @@ router = APIRouter(
     tags=["biographies"]
 )
 
-# In-memory job storage (in production, use a database)
-jobs: Dict[str, Dict] = {}
-
-
 def generate_sources_for_biography(
     character: str,
     mode: GenerationMode,
@@ -127,18 +128,29 @@ def generate_sources_for_biography(
         raise ValueError(f"Unknown generation mode: {mode}")
 
 
-def run_biography_generation(job_id: str, request: BiographyGenerateRequest):
+def run_biography_generation(
+    job_id: str,
+    request: BiographyGenerateRequest,
+    bios_dir: str = "bios"
+):
     """
     Background task to generate biography
     
+    Independent chapters are generated concurrently and each one is
+    persisted as soon as it finishes; when the job is restarted (e.g. after
+    a crash), chapters it already stored are not generated again. Job state
+    is written through the job store, so any worker can report it.
+    
     Args:
         job_id: Unique job identifier
         request: Generation request parameters
+        bios_dir: Base directory for chapter files
     """
+    job_store = get_job_store()
+    
     try:
         # Update job status
-        jobs[job_id]["status"] = JobStatus.IN_PROGRESS
-        jobs[job_id]["started_at"] = datetime.now(timezone.utc)
+        job_store.mark_started(job_id)
         
         logger.info(f"Starting biography generation for job {job_id}")
         
@@ -148,55 +160,87 @@ def run_biography_generation(job_id: str, request: BiographyGenerateRequest):
         # Calculate words per chapter
         words_per_chapter = request.total_words // request.chapters
         
-        # Generate a simple test biography (in production, this would be more complex)
-        chapters_generated = []
-        for i in range(1, request.chapters + 1):
-            chapter_prompt = (
-                f"Write chapter {i} of {request.chapters} about {request.character}. "
-                f"The chapter should be approximately {words_per_chapter} words long. "
-                f"Focus on their life story, achievements, and impact."
-            )
-            
-            try:
-                chapter_content = client.generate_text(
-                    prompt=chapter_prompt,
-                    system_prompt="You are an expert biographer writing a comprehensive biography.",
-                    temperature=request.temperature,
-                    max_tokens=min(words_per_chapter * 2, 8192)  # Rough token estimate
-                )
-                
-                chapters_generated.append({
-                    "chapter": i,
-                    "content": chapter_content,
-                    "word_count": len(chapter_content.split())
-                })
-                
-                # Update progress
-                jobs[job_id]["progress"] = {
-                    "chapters_completed": i,
-                    "total_chapters": request.chapters,
-                    "percentage": round((i / request.chapters) * 100, 2)
-                }
-                
-                logger.info(f"Job {job_id}: Completed chapter {i}/{request.chapters}")
-                
-            except Exception as e:
-                logger.error(f"Error generating chapter {i} for job {job_id}: {e}")
-                raise
+        ws_manager = get_websocket_client()
+        
+        def stream_factory(number: int) -> Optional[TokenStreamForwarder]:
+            # Stream tokens only while someone is watching the job
+            if not ws_manager.is_connected(job_id=job_id):
+                return None
+            return TokenStreamForwarder(ws_manager, job_id, chapter=number)
+        
+        generator = ChapterGenerator(
+            client=client,
+            store=ChapterStore(
+                request.character,
+                job_id,
+                base_dir=bios_dir,
+                session_factory=job_store.session_factory
+            ),
+            max_concurrency=request.max_concurrent_chapters or 1,
+            stream_factory=stream_factory
+        )
         
-        # Mark job as completed
-        jobs[job_id]["status"] = JobStatus.COMPLETED
-        jobs[job_id]["completed_at"] = datetime.now(timezone.utc)
-        jobs[job_id]["chapters"] = chapters_generated
-        jobs[job_id]["download_url"] = f"/api/v1/biographies/{job_id}/download"
+        def on_chapter(chapter: Dict, completed: int):
+            # Update progress
+            job_store.update_progress(job_id, completed, request.chapters)
+            logger.info(f"Job {job_id}: Completed chapter {chapter['chapter']} ({completed}/{request.chapters})")
+        
+        chapters_generated = generator.generate(
+            character=request.character,
+            total_chapters=request.chapters,
+            words_per_chapter=words_per_chapter,
+            temperature=request.temperature,
+            on_chapter=on_chapter
+        )
+        
+        # Mark job as completed (chapters are already stored)
+        job_store.mark_completed(job_id, len(chapters_generated), request.chapters)
         
         logger.info(f"Successfully completed biography generation for job {job_id}")
         
     except Exception as e:
         logger.error(f"Failed to generate biography for job {job_id}: {e}", exc_info=True)
-        jobs[job_id]["status"] = JobStatus.FAILED
-        jobs[job_id]["error"] = str(e)
-        jobs[job_id]["completed_at"] = datetime.now(timezone.utc)
+        job_store.mark_failed(job_id, str(e))
+
+
+def create_biography_job(
+    job_id: str,
+    request: BiographyGenerateRequest,
+    source_result: Dict
+) -> Dict:
+    """
+    Store a pending generation job with its sources
+    
+    Args:
+        job_id: Unique job identifier
+        request: Generation request parameters
+        source_result: Result of generate_sources_for_biography
+        
+    Returns:
+        Created job
+        
+    Raises:
+        SQLAlchemyError: If the job cannot be stored
+    """
+    return get_job_store().create_job(
+        job_id,
+        character=request.character,
+        total_chapters=request.chapters,
+        metadata=jsonable_encoder({
+            "total_words": request.total_words,
+            "model": request.model or os.getenv("OPENROUTER_MODEL", "qwen/qwen2.5-vl-72b-instruct:free"),
+            "temperature": request.temperature,
+            "mode": request.mode.value,
+            "sources": source_result["sources"],
+            "source_count": source_result["source_count"],
+            "sources_generated_automatically": source_result.get("sources_generated_automatically", False),
+            "source_metadata": {
+                "user_source_count": source_result.get("user_source_count"),
+                "auto_generated_count": source_result.get("auto_generated_count"),
+                "validation_summary": source_result.get("validation_summary")
+            }
+        })
+    )
 
 
 @router.post(
@@ -239,31 +283,14 @@ async def generate_biography(
         )
     
     # Create job record
-    jobs[job_id] = {
-        "job_id": job_id,
-        "status": JobStatus.PENDING,
-        "character": request.character,
-        "chapters": request.chapters,
-        "total_words": request.total_words,
-        "model": request.model or os.getenv("OPENROUTER_MODEL", "qwen/qwen2.5-vl-72b-instruct:free"),
-        "temperature": request.temperature,
-        "mode": request.mode.value,
-        "sources": source_result["sources"],
-        "source_count": source_result["source_count"],
-        "sources_generated_automatically": source_result.get("sources_generated_automatically", False),
-        "source_metadata": {
-            "user_source_count": source_result.get("user_source_count"),
-            "auto_generated_count": source_result.get("auto_generated_count"),
-            "validation_summary": source_result.get("validation_summary")
-        },
-        "created_at": datetime.now(timezone.utc),
-        "started_at": None,
-        "completed_at": None,
-        "progress": None,
-        "error": None,
-        "chapters": [],
-        "download_url": None
-    }
+    try:
+        job = create_biography_job(job_id, request, source_result)
+    except SQLAlchemyError as e:
+        logger.error(f"Could not store job for '{request.character}': {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job storage is unavailable"
+        )
     
     # Add background task for generation
     background_tasks.add_task(run_biography_generation, job_id, request)
@@ -279,7 +306,7 @@ async def generate_biography(
         message="Biography generation job created successfully",
         character=request.character,
         chapters=request.chapters,
-        created_at=jobs[job_id]["created_at"],
+        created_at=job["created_at"],
         estimated_completion_time=f"{request.chapters * 30} seconds",  # Rough estimate
         mode=request.mode,
         sources_generated_automatically=source_result.get("sources_generated_automatically"),
@@ -296,15 +323,15 @@ async def get_biography_status(job_id: str):
     Get the status of a biography generation job
     
     Returns current status, progress information, and error details if applicable.
+    Served from the job store's status cache; chapter texts are not loaded.
     """
-    if job_id not in jobs:
+    job = get_job_store().get_status(job_id)
+    if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job {job_id} not found"
         )
     
-    job = jobs[job_id]
-    
     return BiographyStatusResponse(
         job_id=job["job_id"],
         status=job["status"],
@@ -326,20 +353,22 @@ async def download_biography(job_id: str):
     Returns the completed biography as a downloadable file.
     Only available for completed jobs.
     """
-    if job_id not in jobs:
+    job_store = get_job_store()
+    job = job_store.get_status(job_id)
+    if job is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Job {job_id} not found"
         )
     
-    job = jobs[job_id]
-    
     if job["status"] != JobStatus.COMPLETED:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Job is not completed yet. Current status: {job['status']}"
+            detail=f"Job is not completed yet. Current status: {job['status'].value}"
         )
     
+    chapters = job_store.get_chapters(job_id) or []
+    
     # In a real implementation, this would return the actual generated file
     # For now, we'll create a temporary text file with the biography content
     import tempfile
@@ -354,13 +383,13 @@ async def download_biography(job_id: str):
         tmp_file.write(f"Biography of {job['character']}\n")
         tmp_file.write("=" * 50 + "\n\n")
         
-        for chapter_data in job["chapters"]:
+        for chapter_data in chapters:
             tmp_file.write(f"Chapter {chapter_data['chapter']}\n")
             tmp_file.write("-" * 30 + "\n")
             tmp_file.write(chapter_data["content"] + "\n\n")
         
         tmp_file.write(f"\nGenerated on: {job['completed_at'].isoformat()}\n")
-        tmp_file.write(f"Total chapters: {len(job['chapters'])}\n")
+        tmp_file.write(f"Total chapters: {len(chapters)}\n")
         
         tmp_path = tmp_file.name
     
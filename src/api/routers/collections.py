@@ -14,7 +14,7 @@ from ..models.collections import (
 )
 from ..models.biographies import BiographyGenerateRequest
 from ...services.collection_service import CollectionService
-from .biographies import generate_biography, jobs
+from .biographies import generate_biography
 
 logger = logging.getLogger(__name__)
 
@@ -62,7 +62,7 @@ async def get_metrics():
     
     # Update job stats if available
     try:
-        from .biographies import jobs
+        from ...services.job_store import get_job_store
         
         # Count jobs by status
         job_stats = {
@@ -72,9 +72,8 @@ async def get_metrics():
             "failed": 0
         }
         
-        for job in jobs.values():
-            status = job.get("status", "unknown").value if hasattr(job.get("status"), "value") else str(job.get("status", "unknown"))
-            job_stats[status] = job_stats.get(status, 0) + 1
+        for status, count in get_job_store().count_by_status().items():
+            job_stats[status] = job_stats.get(status, 0) + count
         
         # Set gauge for each job status
         for status_key, count in job_stats.items():
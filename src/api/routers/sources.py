@@ -212,7 +212,7 @@ async def validate_sources_advanced(request: AdvancedSourceValidationRequest):
     )
     
     # Perform validation
-    result = validator.validate_sources(
+    result = await validator.validate_sources_async(
         biography_topic=request.biography_topic,
         sources_list=request.sources,
         check_accessibility=request.check_accessibility
@@ -36,6 +36,11 @@ async def websocket_notifications(
         "timestamp": "2024-01-01T12:00:00Z"
     }
     ```
+    
+    While a chapter is being generated, job watchers also receive
+    "token_stream" frames with the generated text in coalesced chunks
+    (see TokenStreamForwarder). Slow connections may skip intermediate
+    frames; the final frame of each chapter carries the full text.
     """
     manager = get_websocket_client()
     
@@ -7,10 +7,40 @@ from .redis_cache import (
     cache_key,
     cached,
 )
+from .page_cache import (
+    PageCache,
+    CachedPage,
+    DiskPageStore,
+    get_page_cache,
+    normalize_url,
+)
+from .llm_cache import (
+    LLMResponseCache,
+    CachedResponse,
+    get_llm_cache,
+    response_key,
+)
+from .single_flight import (
+    CallCancelled,
+    SingleFlight,
+    get_single_flight,
+)
 
 __all__ = [
     'RedisCache',
     'get_cache',
     'cache_key',
     'cached',
+    'PageCache',
+    'CachedPage',
+    'DiskPageStore',
+    'get_page_cache',
+    'normalize_url',
+    'LLMResponseCache',
+    'CachedResponse',
+    'get_llm_cache',
+    'response_key',
+    'CallCancelled',
+    'SingleFlight',
+    'get_single_flight',
 ]
@@ -0,0 +1,280 @@
+"""
+Response cache for repeatable LLM calls.
+
+Completions are keyed by a hash of the model, messages and sampling
+parameters and stored compressed, so an analysis step re-run with the same
+prompt (a retried job, a regenerated character) is answered from the cache
+instead of the API.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from .redis_cache import get_cache
+from ..monitoring.prometheus_metrics import increment_counter
+
+logger = logging.getLogger(__name__)
+
+
+# Request fields that determine a completion
+KEY_FIELDS = ('model', 'messages', 'temperature', 'max_tokens', 'top_p')
+
+
+def response_key(payload: Dict[str, Any]) -> str:
+    """
+    Build the cache key of a chat completion request
+
+    Args:
+        payload: Request body (model, messages and sampling parameters)
+
+    Returns:
+        Cache key
+    """
+    canonical = json.dumps(
+        {name: payload.get(name) for name in KEY_FIELDS},
+        sort_keys=True,
+        separators=(',', ':'),
+        ensure_ascii=False
+    )
+    return f"llm_response:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()}"
+
+
+@dataclass
+class CachedResponse:
+    """A completion with its text stored compressed"""
+    compressed: bytes
+    usage: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    expires_at: float = float('inf')
+
+    @classmethod
+    def from_content(
+        cls,
+        content: str,
+        usage: Optional[Dict[str, Any]] = None,
+        ttl: float = 3600
+    ) -> 'CachedResponse':
+        """Build an entry from the completion text"""
+        now = time.time()
+        return cls(
+            compressed=zlib.compress(content.encode('utf-8')),
+            usage=dict(usage or {}),
+            created_at=now,
+            expires_at=now + ttl,
+        )
+
+    @property
+    def content(self) -> str:
+        """Completion text"""
+        return zlib.decompress(self.compressed).decode('utf-8')
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes"""
+        return len(self.compressed) + 128
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary"""
+        return {
+            'compressed': base64.b64encode(self.compressed).decode('ascii'),
+            'usage': self.usage,
+            'created_at': self.created_at,
+            'expires_at': self.expires_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CachedResponse':
+        """Deserialize from to_dict output"""
+        return cls(
+            compressed=base64.b64decode(data['compressed']),
+            usage=data.get('usage', {}),
+            created_at=data.get('created_at', 0.0),
+            expires_at=data.get('expires_at', float('inf')),
+        )
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for LLM completions.
+
+    Features:
+    - Size-bounded in-memory LRU tier
+    - Optional Redis (RedisCache) tier shared by all workers
+    - Per-entry TTL chosen by the caller
+    - Hit/miss counters exported through MetricsCollector
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 16 * 1024 * 1024,
+        backend: Optional[Any] = None
+    ):
+        """
+        Initialize response cache
+
+        Args:
+            max_memory_bytes: Byte budget of the in-memory tier
+            backend: Optional second tier with get(key)/set(key, value, ttl),
+                e.g. RedisCache
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.backend = backend
+        self._entries: "OrderedDict[str, Tuple[CachedResponse, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, payload: Dict[str, Any]) -> Optional[CachedResponse]:
+        """
+        Get the cached completion of a request
+
+        Args:
+            payload: Request body
+
+        Returns:
+            CachedResponse, or None if not cached or expired
+        """
+        key = response_key(payload)
+        response = self._memory_get(key)
+        if response is None and self.backend is not None:
+            data = self.backend.get(key)
+            if data is not None:
+                try:
+                    response = CachedResponse.from_dict(data)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning(f"Discarding unreadable LLM cache entry {key}: {e}")
+                else:
+                    self._memory_set(key, response)
+        self._record(hit=response is not None)
+        return response
+
+    def set(
+        self,
+        payload: Dict[str, Any],
+        content: str,
+        usage: Optional[Dict[str, Any]] = None,
+        ttl: int = 3600
+    ) -> CachedResponse:
+        """
+        Store the completion of a request
+
+        Args:
+            payload: Request body
+            content: Completion text
+            usage: Token usage reported for the completion
+            ttl: Time-to-live in seconds
+
+        Returns:
+            The cached response
+        """
+        key = response_key(payload)
+        response = CachedResponse.from_content(content, usage, ttl)
+        self._memory_set(key, response)
+        if self.backend is not None:
+            self.backend.set(key, response.to_dict(), ttl=ttl)
+        return response
+
+    def clear(self):
+        """Clear the in-memory tier and statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        total_requests = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'total_requests': total_requests,
+            'hit_ratio': self._hits / total_requests if total_requests > 0 else 0.0,
+            'entries': len(self._entries),
+            'memory_bytes': self._memory_bytes,
+        }
+
+    def _memory_get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, size = entry
+            if time.time() >= response.expires_at:
+                del self._entries[key]
+                self._memory_bytes -= size
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def _memory_set(self, key: str, response: CachedResponse):
+        size = response.size
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            self._entries[key] = (response, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        increment_counter(
+            "bookgen_llm_cache_requests_total",
+            labels={"result": "hit" if hit else "miss"}
+        )
+
+
+# Global response cache instance
+_llm_cache_instance: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Get global LLM response cache instance (singleton pattern).
+
+    LLM_CACHE_BACKEND set to 'redis' adds the shared RedisCache as second
+    tier, so a retried job hits the cache on any worker. Without it only
+    the in-memory tier is used.
+
+    Returns:
+        LLMResponseCache instance
+    """
+    global _llm_cache_instance
+    if _llm_cache_instance is None:
+        backend = None
+        if os.getenv("LLM_CACHE_BACKEND", "").lower() == "redis":
+            backend = get_cache()
+        _llm_cache_instance = LLMResponseCache(
+            max_memory_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(16 * 1024 * 1024))),
+            backend=backend
+        )
+    return _llm_cache_instance
+
+
+def reset_llm_cache():
+    """Drop the global LLM response cache instance (useful for testing)"""
+    global _llm_cache_instance
+    _llm_cache_instance = None
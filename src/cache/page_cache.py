@@ -0,0 +1,504 @@
+"""
+Fetched-page cache shared by source validation and content analysis.
+
+Pages are keyed by normalized URL and stored compressed; the extracted
+clean text is stored separately, keyed by a hash of the raw content, so
+each page is downloaded and parsed at most once per job.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from .redis_cache import get_cache
+from ..utils.url_utils import normalize_url
+from ..monitoring.prometheus_metrics import increment_counter
+
+logger = logging.getLogger(__name__)
+
+
+# Response headers kept with a cached page
+CACHED_HEADERS = ('content-type', 'etag', 'last-modified')
+
+def decode_body(content: bytes, headers: Mapping[str, str]) -> str:
+    """
+    Decode a response body with the charset declared in its headers
+
+    Args:
+        content: Raw response body
+        headers: Response headers with lower-case names
+
+    Returns:
+        Decoded body (undecodable bytes replaced)
+    """
+    encoding = 'utf-8'
+    content_type = headers.get('content-type', '')
+    if 'charset=' in content_type:
+        encoding = content_type.split('charset=')[-1].split(';')[0].strip() or encoding
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+
+def extract_clean_text(html_content: str) -> str:
+    """
+    Extract clean text from HTML content
+
+    Args:
+        html_content: HTML content
+
+    Returns:
+        Extracted text with scripts, styles and page chrome removed
+    """
+    try:
+        soup = BeautifulSoup(html_content, 'lxml')
+
+        # Remove script, style and navigation elements
+        for element in soup(["script", "style", "nav", "footer", "header"]):
+            element.decompose()
+
+        text = soup.get_text(separator=' ', strip=True)
+
+        # Clean up whitespace
+        return ' '.join(text.split())
+
+    except Exception as e:
+        logger.warning(f"Error extracting text from HTML: {e}")
+        return ""
+
+
+@dataclass
+class CachedPage:
+    """A fetched page with its body stored compressed"""
+    url: str
+    status_code: int
+    compressed: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def content(self) -> bytes:
+        """Raw response body"""
+        return zlib.decompress(self.compressed)
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the raw response body"""
+        return hashlib.sha256(self.content).hexdigest()
+
+    @property
+    def text(self) -> str:
+        """Response body decoded with the declared charset"""
+        return decode_body(self.content, self.headers)
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint in bytes"""
+        return len(self.compressed) + len(self.url) + 128
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary"""
+        return {
+            'url': self.url,
+            'status_code': self.status_code,
+            'compressed': base64.b64encode(self.compressed).decode('ascii'),
+            'headers': self.headers,
+            'fetched_at': self.fetched_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CachedPage':
+        """Deserialize from to_dict output"""
+        return cls(
+            url=data['url'],
+            status_code=data['status_code'],
+            compressed=base64.b64decode(data['compressed']),
+            headers=data.get('headers', {}),
+            fetched_at=data.get('fetched_at', 0.0),
+        )
+
+
+class DiskPageStore:
+    """Second cache tier storing serialized entries as files in a directory"""
+
+    def __init__(self, directory: str):
+        """
+        Initialize disk store
+
+        Args:
+            directory: Directory holding cache files (created if missing)
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Page cache disk read error for {key}: {e}")
+            return None
+
+    def set(self, key: str, value: Dict[str, Any], ttl: int) -> bool:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.warning(f"Page cache disk write error for {key}: {e}")
+            return False
+
+
+class PageCache:
+    """
+    Two-tier cache for fetched pages and their extracted text.
+
+    Features:
+    - Size-bounded in-memory LRU tier
+    - Optional Redis (RedisCache) or disk tier behind it
+    - Compressed raw bodies, clean text stored per content hash
+    - ETag/Last-Modified revalidation of stale entries
+    - Hit/miss counters exported through MetricsCollector
+    """
+
+    def __init__(
+        self,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        max_age: int = 3600,
+        backend: Optional[Any] = None,
+        backend_ttl: int = 7 * 24 * 3600
+    ):
+        """
+        Initialize page cache
+
+        Args:
+            max_memory_bytes: Byte budget of the in-memory tier
+            max_age: Seconds a page is served without revalidation
+            backend: Optional second tier with get(key)/set(key, value, ttl),
+                e.g. RedisCache or DiskPageStore
+            backend_ttl: Time-to-live of backend entries in seconds
+        """
+        self.max_memory_bytes = max_memory_bytes
+        self.max_age = max_age
+        self.backend = backend
+        self.backend_ttl = backend_ttl
+        self._entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """
+        Get a fresh cached page
+
+        Args:
+            url: Page URL
+
+        Returns:
+            CachedPage if cached and younger than max_age, otherwise None
+        """
+        page = self.lookup(url)
+        if page is not None and time.time() - page.fetched_at <= self.max_age:
+            self._record('page', hit=True)
+            return page
+        self._record('page', hit=False)
+        return None
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """
+        Get a cached page regardless of age
+
+        Args:
+            url: Page URL
+
+        Returns:
+            CachedPage or None
+        """
+        key = self._page_key(url)
+        page = self._memory_get(key)
+        if page is None and self.backend is not None:
+            data = self.backend.get(key)
+            if data is not None:
+                page = CachedPage.from_dict(data)
+                self._memory_set(key, page, page.size)
+        return page
+
+    def store(
+        self,
+        url: str,
+        status_code: int,
+        headers: Optional[Mapping[str, Any]],
+        content: bytes
+    ) -> Optional[CachedPage]:
+        """
+        Store a fetched response
+
+        A 304 response refreshes the existing entry instead of replacing it.
+        If the entry was evicted after the conditional request was sent,
+        nothing is stored and the page must be fetched again without
+        conditional headers.
+
+        Args:
+            url: Page URL
+            status_code: HTTP status code
+            headers: Response headers
+            content: Raw response body
+
+        Returns:
+            The cached page, or None for a 304 whose page is no longer cached
+        """
+        if status_code == 304:
+            page = self.revalidate(url)
+            if page is None:
+                logger.debug(f"{url} was evicted before its 304 arrived")
+            return page
+
+        page = CachedPage(
+            url=url,
+            status_code=status_code,
+            compressed=zlib.compress(content or b''),
+            headers=self._select_headers(headers),
+        )
+        if status_code < 400:
+            self._put(self._page_key(url), page)
+        return page
+
+    def revalidate(self, url: str) -> Optional[CachedPage]:
+        """
+        Mark a cached page as fresh after a 304 Not Modified response
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Refreshed page, or None if the page is not cached
+        """
+        page = self.lookup(url)
+        if page is None:
+            return None
+        page.fetched_at = time.time()
+        self._put(self._page_key(url), page)
+        return page
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build If-None-Match/If-Modified-Since headers for a cached page
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Request headers (empty if the page is not cached)
+        """
+        page = self.lookup(url)
+        if page is None:
+            return {}
+        headers = {}
+        if page.headers.get('etag'):
+            headers['If-None-Match'] = page.headers['etag']
+        if page.headers.get('last-modified'):
+            headers['If-Modified-Since'] = page.headers['last-modified']
+        return headers
+
+    # ------------------------------------------------------------------
+    # Extracted text
+    # ------------------------------------------------------------------
+
+    def extract_text(self, content: bytes, html_content: Optional[str] = None) -> str:
+        """
+        Get the clean text for a page body, parsing it only on first use
+
+        Args:
+            content: Raw response body
+            html_content: Decoded body (decoded as UTF-8 if omitted)
+
+        Returns:
+            Extracted clean text
+        """
+        key = f"page_text:{hashlib.sha256(content).hexdigest()}"
+
+        text = self._memory_get(key)
+        if text is None and self.backend is not None:
+            data = self.backend.get(key)
+            if data is not None:
+                text = zlib.decompress(base64.b64decode(data['compressed'])).decode('utf-8')
+                self._memory_set(key, text, len(text))
+        if text is not None:
+            self._record('text', hit=True)
+            return text
+
+        self._record('text', hit=False)
+        if html_content is None:
+            html_content = content.decode('utf-8', errors='replace')
+        text = extract_clean_text(html_content)
+
+        self._memory_set(key, text, len(text))
+        if self.backend is not None:
+            self.backend.set(
+                key,
+                {'compressed': base64.b64encode(zlib.compress(text.encode('utf-8'))).decode('ascii')},
+                ttl=self.backend_ttl
+            )
+        return text
+
+    def get_text(self, url: str) -> Optional[str]:
+        """
+        Get the clean text of a cached page without fetching
+
+        Args:
+            url: Page URL
+
+        Returns:
+            Clean text, or None if the page is not cached
+        """
+        page = self.lookup(url)
+        if page is None:
+            return None
+        return self.extract_text(page.content, page.text)
+
+    # ------------------------------------------------------------------
+    # Maintenance and statistics
+    # ------------------------------------------------------------------
+
+    def clear(self):
+        """Clear the in-memory tier and statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+            self._hits = 0
+            self._misses = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        total_requests = self._hits + self._misses
+        return {
+            'hits': self._hits,
+            'misses': self._misses,
+            'total_requests': total_requests,
+            'hit_ratio': self._hits / total_requests if total_requests > 0 else 0.0,
+            'entries': len(self._entries),
+            'memory_bytes': self._memory_bytes,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _page_key(url: str) -> str:
+        return f"page:{normalize_url(url)}"
+
+    @staticmethod
+    def _select_headers(headers: Optional[Mapping[str, Any]]) -> Dict[str, str]:
+        """Keep the headers needed for revalidation and decoding"""
+        try:
+            lowered = {str(k).lower(): v for k, v in headers.items()} if headers else {}
+        except (AttributeError, TypeError):
+            return {}
+        return {
+            name: lowered[name]
+            for name in CACHED_HEADERS
+            if isinstance(lowered.get(name), str)
+        }
+
+    def _put(self, key: str, page: CachedPage):
+        self._memory_set(key, page, page.size)
+        if self.backend is not None:
+            self.backend.set(key, page.to_dict(), ttl=self.backend_ttl)
+
+    def _memory_get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _memory_set(self, key: str, value: Any, size: int):
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes and self._entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted_size
+
+    def _record(self, kind: str, hit: bool):
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        increment_counter(
+            "bookgen_page_cache_requests_total",
+            labels={"kind": kind, "result": "hit" if hit else "miss"}
+        )
+
+
+# Global page cache instance
+_page_cache_instance: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    """
+    Get global page cache instance (singleton pattern).
+
+    The second tier is configured from the environment: PAGE_CACHE_BACKEND
+    set to 'redis' uses the shared RedisCache, 'disk' stores files under
+    PAGE_CACHE_DIR. Without it only the in-memory tier is used.
+
+    Returns:
+        PageCache instance
+    """
+    global _page_cache_instance
+    if _page_cache_instance is None:
+        backend_name = os.getenv("PAGE_CACHE_BACKEND", "").lower()
+        backend = None
+        if backend_name == "redis":
+            backend = get_cache()
+        elif backend_name == "disk":
+            backend = DiskPageStore(os.getenv("PAGE_CACHE_DIR", "data/page_cache"))
+        _page_cache_instance = PageCache(
+            max_memory_bytes=int(os.getenv("PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            max_age=int(os.getenv("PAGE_CACHE_MAX_AGE", "3600")),
+            backend=backend
+        )
+    return _page_cache_instance
+
+
+def reset_page_cache():
+    """Drop the global page cache instance (useful for testing)"""
+    global _page_cache_instance
+    _page_cache_instance = None
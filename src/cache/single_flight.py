@@ -0,0 +1,290 @@
+"""
+Request coalescing (single-flight) for expensive identical calls.
+
+While a call for a key is running, identical calls wait for it and share
+its result instead of repeating the work. Within a process the waiters
+share the running call; across processes a Redis lock elects one leader
+and the followers read its result from a short-lived result key.
+"""
+import copy
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+import redis
+
+from .redis_cache import get_cache
+from ..monitoring.prometheus_metrics import increment_counter
+
+logger = logging.getLogger(__name__)
+
+
+# Seconds a leader may hold the cross-process lock (longer calls just lose
+# the coalescing, a second process then runs the call too)
+DEFAULT_LOCK_TTL = 120.0
+# Seconds a finished result stays readable for followers in other processes
+DEFAULT_RESULT_TTL = 10
+# Seconds between a follower's checks for the leader's result
+DEFAULT_POLL_INTERVAL = 0.05
+# Seconds Redis is bypassed after an error
+REDIS_RETRY_INTERVAL = 30.0
+
+# Deletes the lock only if it still belongs to the caller
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class CallCancelled(BaseException):
+    """
+    Raised by a call whose leading caller gave up on it
+
+    The cancellation belongs to that caller alone: it is not shared with
+    the followers, which run the call again under a new leader.
+    """
+
+
+class _Call:
+    """A call in flight in this process"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.cancelled = False
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one execution.
+
+    Features:
+    - In-process: concurrent callers of a key share one running call
+      (followers get a copy of the result, or the same exception; a
+      leader's CallCancelled is not shared, a follower runs the call instead)
+    - Cross-process: with a Redis client, calls that provide encode/decode
+      hooks are coordinated through a lock and a result key
+    - Falls back to in-process coalescing while Redis is unreachable
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        lock_ttl: float = DEFAULT_LOCK_TTL,
+        result_ttl: int = DEFAULT_RESULT_TTL,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        prefix: str = "bookgen:singleflight"
+    ):
+        """
+        Initialize single-flight group
+
+        Args:
+            redis_client: Optional redis.Redis client shared by all processes
+            lock_ttl: Seconds a leader may hold the cross-process lock; also
+                the longest a follower waits before running the call itself
+            result_ttl: Seconds a result stays readable for other processes
+            poll_interval: Seconds between a follower's result checks
+            prefix: Prefix of the Redis keys
+        """
+        self.redis_client = redis_client
+        self.lock_ttl = lock_ttl
+        self.result_ttl = result_ttl
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._release_script = None
+        self._redis_retry_at = 0.0
+        self._stats = {'executed': 0, 'shared': 0, 'remote': 0}
+
+    def do(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        encode: Optional[Callable[[Any], Any]] = None,
+        decode: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        """
+        Run fn, or wait for an identical call already running
+
+        Args:
+            key: Identity of the call
+            fn: Function doing the work
+            encode: Converts the result to a JSON-compatible value; together
+                with decode, enables coalescing across processes
+            decode: Rebuilds the result from encode's output
+
+        Returns:
+            Result of fn (from this call or a coalesced one)
+
+        Raises:
+            Exception: Whatever fn raised in the call that was joined
+            CallCancelled: Only if fn raised it in this caller's own run
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                else:
+                    call.followers += 1
+
+            if leader:
+                break
+            call.done.wait()
+            if call.cancelled:
+                # The leader gave up; run the call under a new leader
+                continue
+            self._record('shared')
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = self._run(key, fn, encode, decode)
+        except CallCancelled:
+            call.cancelled = True
+            raise
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                has_followers = call.followers > 0
+            if has_followers and call.error is None and not call.cancelled:
+                # Snapshot before the caller can modify the result
+                call.result = copy.deepcopy(result)
+            call.done.set()
+        return result
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get coalescing statistics
+
+        Returns:
+            Dictionary with counts of executed calls, calls that shared an
+            in-process call and calls answered by another process
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _run(
+        self,
+        key: str,
+        fn: Callable[[], Any],
+        encode: Optional[Callable[[Any], Any]],
+        decode: Optional[Callable[[Any], Any]]
+    ) -> Any:
+        client = self._redis() if encode is not None and decode is not None else None
+        if client is None:
+            return self._execute(fn)
+
+        lock_key = f"{self.prefix}:{key}:lock"
+        result_key = f"{self.prefix}:{key}:result"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl
+        waiting = False
+
+        try:
+            while True:
+                # Once another process holds the lock, its result wins over
+                # taking the lock after it is released
+                if waiting:
+                    raw = client.get(result_key)
+                    if raw is not None:
+                        self._record('remote')
+                        return decode(json.loads(raw))
+                if client.set(lock_key, token, nx=True, px=int(self.lock_ttl * 1000)):
+                    break
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Gave up waiting for the leader of {key}; running it here")
+                    return self._execute(fn)
+                waiting = True
+                time.sleep(self.poll_interval)
+        except redis.RedisError as e:
+            self._redis_failed(e)
+            return self._execute(fn)
+
+        try:
+            result = self._execute(fn)
+            try:
+                client.set(result_key, json.dumps(encode(result)), ex=self.result_ttl)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Cannot share the result of {key}: {e}")
+            except redis.RedisError as e:
+                self._redis_failed(e)
+            return result
+        finally:
+            self._release(client, lock_key, token)
+
+    def _execute(self, fn: Callable[[], Any]) -> Any:
+        self._record('executed')
+        return fn()
+
+    def _release(self, client: Any, lock_key: str, token: str):
+        try:
+            if self._release_script is None:
+                self._release_script = client.register_script(RELEASE_SCRIPT)
+            self._release_script(keys=[lock_key], args=[token])
+        except redis.RedisError as e:
+            # The lock expires on its own after lock_ttl
+            self._redis_failed(e)
+
+    def _redis(self) -> Optional[Any]:
+        if self.redis_client is None or time.time() < self._redis_retry_at:
+            return None
+        return self.redis_client
+
+    def _redis_failed(self, error: Exception):
+        logger.warning(
+            f"Single-flight cannot reach Redis ({error}); coalescing in-process only "
+            f"for {REDIS_RETRY_INTERVAL:.0f}s"
+        )
+        self._redis_retry_at = time.time() + REDIS_RETRY_INTERVAL
+
+    def _record(self, kind: str):
+        with self._lock:
+            self._stats[kind] += 1
+        increment_counter("bookgen_single_flight_calls_total", labels={"result": kind})
+
+
+# Global single-flight instance
+_single_flight_instance: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Get global single-flight instance (singleton pattern).
+
+    Calls are coordinated across processes through the shared RedisCache
+    connection unless SINGLE_FLIGHT_BACKEND is set to 'memory'.
+
+    Returns:
+        SingleFlight instance
+    """
+    global _single_flight_instance
+    with _single_flight_lock:
+        if _single_flight_instance is None:
+            redis_client = None
+            if os.getenv("SINGLE_FLIGHT_BACKEND", "redis").lower() == "redis":
+                redis_client = get_cache().client
+            _single_flight_instance = SingleFlight(redis_client=redis_client)
+        return _single_flight_instance
+
+
+def reset_single_flight():
+    """Drop the global single-flight instance (useful for testing)"""
+    global _single_flight_instance
+    with _single_flight_lock:
+        _single_flight_instance = None
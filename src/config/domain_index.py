@@ -0,0 +1,247 @@
+"""
+Domain classification index over the trusted and premium domain lists
+
+The sets in trusted_domains and the registries in PremiumDomainRegistry are
+compiled at import time into one suffix trie keyed by reversed domain
+labels ("www.history.army.mil" walks mil -> army -> history -> www). A
+lookup visits each label of the domain once and returns credibility score,
+category, authority and premium status together. Matches are label-aligned,
+so "edu" matches "mit.edu" but not "reduce.com".
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .trusted_domains import (
+    ACADEMIC_DOMAINS,
+    GOVERNMENT_DOMAINS,
+    TRUSTED_ACADEMIC_SITES,
+    MEDIUM_CREDIBILITY_SITES,
+    LOW_CREDIBILITY_INDICATORS,
+)
+from .premium_domains import PremiumDomainRegistry
+
+
+# Credibility tiers in precedence order (lower wins)
+_ACADEMIC_TIER = 0
+_GOVERNMENT_TIER = 1
+_TRUSTED_SITE_TIER = 2
+_MEDIUM_TIER = 3
+_LOW_TIER = 4
+
+DEFAULT_CREDIBILITY_SCORE = 50.0
+DEFAULT_AUTHORITY_SCORE = 50.0
+
+# Premium registries in precedence order with their category
+PREMIUM_REGISTRIES: List[Tuple[str, Dict[str, Dict]]] = [
+    ('academic', PremiumDomainRegistry.TIER_1_ACADEMIC),
+    ('government', PremiumDomainRegistry.GOVERNMENT_ARCHIVES),
+    ('encyclopedic', PremiumDomainRegistry.TIER_1_ENCYCLOPEDIC),
+    ('biographical', PremiumDomainRegistry.TIER_1_BIOGRAPHICAL),
+    ('scientific', PremiumDomainRegistry.TIER_1_SCIENTIFIC),
+    ('cultural', PremiumDomainRegistry.TIER_1_CULTURAL),
+    ('literary', PremiumDomainRegistry.TIER_1_LITERARY),
+    ('military', PremiumDomainRegistry.TIER_1_MILITARY),
+    ('news', PremiumDomainRegistry.TIER_1_NEWS_ARCHIVES),
+]
+
+
+@dataclass(frozen=True)
+class DomainClassification:
+    """Everything the domain lists say about one domain"""
+    domain: str
+    credibility_score: float
+    category: str
+    authority: float
+    premium_category: Optional[str] = None
+    premium_info: Optional[Dict] = None
+
+    @property
+    def is_trusted(self) -> bool:
+        """Whether the domain counts as a trusted source"""
+        return self.credibility_score >= 80.0
+
+    @property
+    def is_premium(self) -> bool:
+        """Whether the domain is in the premium registry"""
+        return self.premium_info is not None
+
+
+class _Node:
+    __slots__ = ('children', 'credibility', 'premium')
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        # (tier, score, category) of a trusted_domains entry ending here
+        self.credibility: Optional[Tuple[int, float, str]] = None
+        # (registry rank, category, info) of a premium entry ending here
+        self.premium: Optional[Tuple[int, str, Dict]] = None
+
+
+class DomainSuffixTrie:
+    """
+    Trie of domain suffixes keyed by reversed labels
+
+    Each node may carry a credibility entry and a premium entry. Lower tiers
+    and registry ranks win when several suffixes of a domain match, which
+    keeps the precedence of the original list-by-list checks.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+        # Indicators without a dot match any single label ("blogspot")
+        self.label_indicators: Dict[str, Tuple[int, float, str]] = {}
+
+    def _node(self, suffix: str) -> _Node:
+        node = self.root
+        for label in reversed(suffix.lower().split('.')):
+            node = node.children.setdefault(label, _Node())
+        return node
+
+    def add_credibility(self, suffix: str, tier: int, score: float, category: str):
+        """
+        Register a trusted_domains entry
+
+        Args:
+            suffix: Domain suffix ("edu", "gov.uk", "jstor.org")
+            tier: Precedence (lower wins)
+            score: Credibility score
+            category: Domain category
+        """
+        node = self._node(suffix)
+        if node.credibility is None or tier < node.credibility[0]:
+            node.credibility = (tier, score, category)
+
+    def add_premium(self, suffix: str, rank: int, category: str, info: Dict):
+        """
+        Register a premium registry entry
+
+        Args:
+            suffix: Registered domain
+            rank: Registry precedence (lower wins)
+            category: Registry category
+            info: Registry entry
+        """
+        node = self._node(suffix)
+        if node.premium is None or rank < node.premium[0]:
+            node.premium = (rank, category, info)
+
+    def lookup(self, domain: str) -> DomainClassification:
+        """
+        Classify a normalized (lowercase, no port) domain
+
+        Args:
+            domain: Domain name
+
+        Returns:
+            DomainClassification
+        """
+        labels = domain.split('.')
+        credibility = None
+        premium = None
+
+        node = self.root
+        for label in reversed(labels):
+            node = node.children.get(label)
+            if node is None:
+                break
+            if node.credibility is not None and (credibility is None or node.credibility[0] < credibility[0]):
+                credibility = node.credibility
+            # Deeper (more specific) matches win within the same registry
+            if node.premium is not None and (premium is None or node.premium[0] <= premium[0]):
+                premium = node.premium
+
+        if credibility is None and self.label_indicators:
+            for label in labels:
+                indicator = self.label_indicators.get(label)
+                if indicator is not None:
+                    credibility = indicator
+                    break
+
+        score, category = (credibility[1], credibility[2]) if credibility else (DEFAULT_CREDIBILITY_SCORE, "other")
+        if premium is None:
+            return DomainClassification(domain, score, category, DEFAULT_AUTHORITY_SCORE)
+        info = premium[2]
+        return DomainClassification(
+            domain,
+            score,
+            category,
+            float(info.get('authority', DEFAULT_AUTHORITY_SCORE)),
+            premium_category=premium[1],
+            premium_info=info
+        )
+
+
+def _trusted_site_category(site: str) -> str:
+    """Category of a TRUSTED_ACADEMIC_SITES entry"""
+    if any(news in site for news in ['nytimes', 'washington', 'guardian', 'bbc', 'reuters', 'apnews', 'npr']):
+        return "news"
+    if any(archive in site for archive in ['archive', 'loc.gov', 'gutenberg', 'hathitrust', 'europeana']):
+        return "archive"
+    if any(museum in site for museum in ['si.edu', 'museum', 'louvre']):
+        return "museum"
+    return "academic"
+
+
+def build_domain_index() -> DomainSuffixTrie:
+    """
+    Compile the trusted and premium domain lists into a trie
+
+    Returns:
+        DomainSuffixTrie
+    """
+    trie = DomainSuffixTrie()
+
+    for suffix in ACADEMIC_DOMAINS:
+        trie.add_credibility(suffix, _ACADEMIC_TIER, 95.0, "academic")
+    for suffix in GOVERNMENT_DOMAINS:
+        trie.add_credibility(suffix, _GOVERNMENT_TIER, 95.0, "government")
+    for site in TRUSTED_ACADEMIC_SITES:
+        trie.add_credibility(site, _TRUSTED_SITE_TIER, 90.0, _trusted_site_category(site))
+    for site in MEDIUM_CREDIBILITY_SITES:
+        trie.add_credibility(site, _MEDIUM_TIER, 60.0, "blog")
+    for indicator in LOW_CREDIBILITY_INDICATORS:
+        if '/' in indicator:
+            # Path indicators ("wordpress.com/free") cannot match a bare domain
+            continue
+        if '.' in indicator:
+            trie.add_credibility(indicator, _LOW_TIER, 30.0, "other")
+        else:
+            trie.label_indicators[indicator] = (_LOW_TIER, 30.0, "other")
+
+    for rank, (category, registry) in enumerate(PREMIUM_REGISTRIES):
+        for registered_domain, info in registry.items():
+            trie.add_premium(registered_domain, rank, category, info)
+
+    return trie
+
+
+DOMAIN_INDEX = build_domain_index()
+
+
+def normalize_domain(domain: str) -> str:
+    """Lowercase a domain and drop port and trailing dot"""
+    domain = domain.strip().lower()
+    if ':' in domain:
+        domain = domain.split(':', 1)[0]
+    return domain.rstrip('.')
+
+
+@lru_cache(maxsize=8192)
+def _classify(domain: str) -> DomainClassification:
+    return DOMAIN_INDEX.lookup(domain)
+
+
+def classify_domain(domain: str) -> DomainClassification:
+    """
+    Classify a domain against the trusted and premium lists
+
+    Results for hot domains are served from an LRU cache.
+
+    Args:
+        domain: Domain name (case, port and trailing dot are ignored)
+
+    Returns:
+        DomainClassification
+    """
+    return _classify(normalize_domain(domain))
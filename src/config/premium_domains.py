@@ -318,30 +318,7 @@ class PremiumDomainRegistry:
         Returns:
             Domain info dict or None if not found
         """
-        domain_lower = domain.lower()
-        
-        # Search in all registries
-        for registry in [
-            cls.TIER_1_ACADEMIC,
-            cls.GOVERNMENT_ARCHIVES,
-            cls.TIER_1_ENCYCLOPEDIC,
-            cls.TIER_1_BIOGRAPHICAL,
-            cls.TIER_1_SCIENTIFIC,
-            cls.TIER_1_CULTURAL,
-            cls.TIER_1_LITERARY,
-            cls.TIER_1_MILITARY,
-            cls.TIER_1_NEWS_ARCHIVES
-        ]:
-            # Check exact match
-            if domain_lower in registry:
-                return registry[domain_lower]
-            
-            # Check if domain ends with any registered domain
-            for registered_domain, info in registry.items():
-                if domain_lower.endswith(registered_domain):
-                    return info
-        
-        return None
+        return domain_index.classify_domain(domain).premium_info
     
     @classmethod
     def get_authority_score(cls, domain: str) -> float:
@@ -354,10 +331,7 @@ class PremiumDomainRegistry:
         Returns:
             Authority score (0-100)
         """
-        info = cls.get_domain_info(domain)
-        if info:
-            return info.get('authority', 50.0)
-        return 50.0
+        return domain_index.classify_domain(domain).authority
     
     @classmethod
     def get_category(cls, domain: str) -> str:
@@ -370,45 +344,7 @@ class PremiumDomainRegistry:
         Returns:
             Category name
         """
-        domain_lower = domain.lower()
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_ACADEMIC.keys()):
-            return "academic"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.GOVERNMENT_ARCHIVES.keys()):
-            return "government"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_ENCYCLOPEDIC.keys()):
-            return "encyclopedic"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_BIOGRAPHICAL.keys()):
-            return "biographical"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_SCIENTIFIC.keys()):
-            return "scientific"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_CULTURAL.keys()):
-            return "cultural"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_LITERARY.keys()):
-            return "literary"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_MILITARY.keys()):
-            return "military"
-        
-        if any(domain_lower.endswith(d) or d in domain_lower 
-               for d in cls.TIER_1_NEWS_ARCHIVES.keys()):
-            return "news"
-        
-        return "other"
+        return domain_index.classify_domain(domain).premium_category or "other"
     
     @classmethod
     def is_premium_domain(cls, domain: str) -> bool:
@@ -421,7 +357,7 @@ class PremiumDomainRegistry:
         Returns:
             True if premium domain
         """
-        return cls.get_domain_info(domain) is not None
+        return domain_index.classify_domain(domain).is_premium
     
     @classmethod
     def get_all_domains_by_category(cls, category: str) -> List[str]:
@@ -448,3 +384,7 @@ class PremiumDomainRegistry:
         
         registry = category_map.get(category, {})
         return list(registry.keys())
+
+
+# The index is compiled from the registries above, so it is imported last
+from . import domain_index  # noqa: E402
@@ -100,34 +100,7 @@ def get_domain_credibility_score(domain: str) -> float:
     Returns:
         Credibility score from 0-100
     """
-    domain_lower = domain.lower()
-    
-    # Highest credibility: Academic and government domains
-    for academic_domain in ACADEMIC_DOMAINS:
-        if domain_lower.endswith(f'.{academic_domain}') or domain_lower == academic_domain:
-            return 95.0
-    
-    for gov_domain in GOVERNMENT_DOMAINS:
-        if domain_lower.endswith(f'.{gov_domain}') or domain_lower == gov_domain:
-            return 95.0
-    
-    # High credibility: Trusted academic and research sites
-    for trusted_site in TRUSTED_ACADEMIC_SITES:
-        if trusted_site in domain_lower:
-            return 90.0
-    
-    # Medium credibility
-    for medium_site in MEDIUM_CREDIBILITY_SITES:
-        if medium_site in domain_lower:
-            return 60.0
-    
-    # Low credibility indicators
-    for low_indicator in LOW_CREDIBILITY_INDICATORS:
-        if low_indicator in domain_lower:
-            return 30.0
-    
-    # Default: Unknown source - neutral score
-    return 50.0
+    return domain_index.classify_domain(domain).credibility_score
 
 
 def is_trusted_domain(domain: str) -> bool:
@@ -140,7 +113,7 @@ def is_trusted_domain(domain: str) -> bool:
     Returns:
         True if domain is trusted
     """
-    return get_domain_credibility_score(domain) >= 80.0
+    return domain_index.classify_domain(domain).is_trusted
 
 
 def get_domain_category(domain: str) -> str:
@@ -153,34 +126,8 @@ def get_domain_category(domain: str) -> str:
     Returns:
         Category name
     """
-    domain_lower = domain.lower()
-    
-    # Check academic domains
-    for academic_domain in ACADEMIC_DOMAINS:
-        if domain_lower.endswith(f'.{academic_domain}') or domain_lower == academic_domain:
-            return "academic"
-    
-    # Check government domains
-    for gov_domain in GOVERNMENT_DOMAINS:
-        if domain_lower.endswith(f'.{gov_domain}') or domain_lower == gov_domain:
-            return "government"
-    
-    # Check trusted sites
-    for trusted_site in TRUSTED_ACADEMIC_SITES:
-        if trusted_site in domain_lower:
-            if any(news in trusted_site for news in ['nytimes', 'washington', 'guardian', 'bbc', 'reuters', 'apnews', 'npr']):
-                return "news"
-            elif any(archive in trusted_site for archive in ['archive', 'loc.gov', 'gutenberg', 'hathitrust', 'europeana']):
-                return "archive"
-            elif any(museum in trusted_site for museum in ['si.edu', 'museum', 'louvre']):
-                return "museum"
-            else:
-                return "academic"
-    
-    # Check medium credibility
-    for medium_site in MEDIUM_CREDIBILITY_SITES:
-        if medium_site in domain_lower:
-            return "blog"
-    
-    # Default
-    return "other"
+    return domain_index.classify_domain(domain).category
+
+
+# The index is compiled from the sets above, so it is imported last
+from . import domain_index  # noqa: E402
@@ -63,7 +63,7 @@ def init_db():
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
     
     # Import all models to ensure they are registered with Base
-    from src.models import Biography, Chapter, Source, GenerationJob
+    from src.models import Biography, Chapter, Source, GenerationJob, JobEvent
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
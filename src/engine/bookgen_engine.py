@@ -5,15 +5,18 @@ Coordinates all services for biography generation with state management and erro
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, defer
 from sqlalchemy.orm.attributes import flag_modified
 
 from .state_machine import GenerationState, StateMachine
 from .error_handler import ErrorHandler
 from .workflow_manager import WorkflowManager
+from .event_log import JobEventBuffer
 from ..database.config import SessionLocal, get_db
 from ..models.generation_job import GenerationJob
 from ..models.biography import Biography
+from ..repositories.job_event_repository import JobEventRepository
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +33,8 @@ class JobStatus:
         created_at: datetime,
         updated_at: datetime,
         error_message: Optional[str] = None,
-        logs: Optional[list] = None
+        logs: Optional[list] = None,
+        next_log_cursor: Optional[int] = None
     ):
         self.job_id = job_id
         self.state = state
@@ -40,6 +44,7 @@ class JobStatus:
         self.updated_at = updated_at
         self.error_message = error_message
         self.logs = logs or []
+        self.next_log_cursor = next_log_cursor
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -51,7 +56,8 @@ class JobStatus:
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'error_message': self.error_message,
-            'logs': self.logs
+            'logs': self.logs,
+            'next_log_cursor': self.next_log_cursor
         }
 
 
@@ -71,6 +77,7 @@ class BookGenEngine:
         """
         self.db = db_session or SessionLocal()
         self._should_close_db = db_session is None
+        self._events = JobEventBuffer(self.db)
         
         # Initialize components
         self.state_machines: Dict[int, StateMachine] = {}
@@ -85,6 +92,10 @@ class BookGenEngine:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
+        try:
+            self._events.flush()
+        except Exception as e:
+            logger.warning(f"Could not write pending job events: {e}")
         if self._should_close_db:
             self.db.close()
     
@@ -187,18 +198,19 @@ class BookGenEngine:
         logger.info(f"Initializing job {context['job_id']}")
         
         job_id = context['job_id']
-        job = self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
-        
-        if not job:
-            raise ValueError(f"Job {job_id} not found")
         
         # Update job status
-        job.status = "running"
-        job.started_at = datetime.now(timezone.utc)
-        job.current_phase = "initialized"
-        self.db.commit()
-        
-        self._add_log(job_id, "INFO", "Job initialized successfully")
+        updated = self._update_job(
+            job_id,
+            {
+                'status': "running",
+                'started_at': datetime.now(timezone.utc),
+                'current_phase': "initialized"
+            },
+            "Job initialized successfully"
+        )
+        if not updated:
+            raise ValueError(f"Job {job_id} not found")
         
         return {'status': 'initialized', 'job_id': job_id}
     
@@ -207,8 +219,7 @@ class BookGenEngine:
         logger.info(f"Validating sources for job {context['job_id']}")
         
         job_id = context['job_id']
-        self._update_job_phase(job_id, "sources_validating")
-        self._add_log(job_id, "INFO", "Validating biographical sources")
+        self._update_job_phase(job_id, "sources_validating", "Validating biographical sources")
         
         # TODO: Integrate with source validation service
         # For now, placeholder implementation
@@ -220,8 +231,7 @@ class BookGenEngine:
         logger.info(f"Generating content for job {context['job_id']}")
         
         job_id = context['job_id']
-        self._update_job_phase(job_id, "content_generating")
-        self._add_log(job_id, "INFO", "Generating biography content")
+        self._update_job_phase(job_id, "content_generating", "Generating biography content")
         
         # TODO: Integrate with content generation tasks
         # For now, placeholder implementation
@@ -233,8 +243,7 @@ class BookGenEngine:
         logger.info(f"Validating chapters for job {context['job_id']}")
         
         job_id = context['job_id']
-        self._update_job_phase(job_id, "chapters_validating")
-        self._add_log(job_id, "INFO", "Validating generated chapters")
+        self._update_job_phase(job_id, "chapters_validating", "Validating generated chapters")
         
         # TODO: Integrate with chapter validation
         # For now, placeholder implementation
@@ -246,8 +255,7 @@ class BookGenEngine:
         logger.info(f"Concatenating biography for job {context['job_id']}")
         
         job_id = context['job_id']
-        self._update_job_phase(job_id, "concatenating")
-        self._add_log(job_id, "INFO", "Concatenating biography sections")
+        self._update_job_phase(job_id, "concatenating", "Concatenating biography sections")
         
         # TODO: Integrate with concatenation service
         # For now, placeholder implementation
@@ -259,36 +267,52 @@ class BookGenEngine:
         logger.info(f"Exporting biography for job {context['job_id']}")
         
         job_id = context['job_id']
-        self._update_job_phase(job_id, "exporting")
-        self._add_log(job_id, "INFO", "Exporting to final format")
+        self._update_job_phase(job_id, "exporting", "Exporting to final format")
         
         # TODO: Integrate with export service
         # For now, placeholder implementation
         
         return {'status': 'exported', 'export_path': None}
     
-    def _update_job_phase(self, job_id: int, phase: str):
-        """Update job current phase"""
-        job = self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
-        if job:
-            job.current_phase = phase
-            job.updated_at = datetime.now(timezone.utc)
-            self.db.commit()
+    def _update_job(self, job_id: int, values: Dict[str, Any], message: Optional[str] = None) -> bool:
+        """
+        Update job columns and write buffered events in one transaction
+        
+        Args:
+            job_id: Job ID
+            values: Column values to set
+            message: Optional INFO log entry recorded with the update
+            
+        Returns:
+            True if the job exists
+        """
+        result = self.db.execute(
+            update(GenerationJob)
+            .where(GenerationJob.id == job_id)
+            .values(**values)
+        )
+        if result.rowcount == 0:
+            self.db.rollback()
+            self._events.discard(job_id)
+            return False
+        
+        if message:
+            self._events.add(job_id, "INFO", message)
+        self._events.flush(commit=False)
+        self.db.commit()
+        return True
+    
+    def _update_job_phase(self, job_id: int, phase: str, message: Optional[str] = None):
+        """Update job current phase, logging the optional message with it"""
+        self._update_job(
+            job_id,
+            {'current_phase': phase, 'updated_at': datetime.now(timezone.utc)},
+            message
+        )
     
     def _add_log(self, job_id: int, level: str, message: str, metadata: Optional[Dict] = None):
-        """Add log entry to job"""
-        job = self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
-        if job:
-            logs = job.logs or []
-            logs.append({
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'level': level,
-                'message': message,
-                'metadata': metadata or {}
-            })
-            job.logs = logs
-            flag_modified(job, "logs")  # Tell SQLAlchemy that the JSON column changed
-            self.db.commit()
+        """Buffer a log entry for the job's append-only event log"""
+        self._events.add(job_id, level, message, metadata)
     
     def _save_state(self, job_id: int):
         """Save state machine state to database"""
@@ -296,7 +320,7 @@ class BookGenEngine:
         if not state_machine:
             return
         
-        job = self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        job = self.db.get(GenerationJob, job_id)
         if job:
             metadata = job.job_metadata or {}
             metadata['state_machine'] = state_machine.to_dict()
@@ -304,6 +328,7 @@ class BookGenEngine:
             flag_modified(job, "job_metadata")  # Tell SQLAlchemy that the JSON column changed
             job.progress = state_machine.get_progress_percentage()
             job.updated_at = datetime.now(timezone.utc)
+            self._events.flush(commit=False)
             self.db.commit()
     
     def generate_biography(self, character: str) -> int:
@@ -324,24 +349,21 @@ class BookGenEngine:
             status="pending"
         )
         self.db.add(biography)
-        self.db.commit()
-        self.db.refresh(biography)
+        self.db.flush()
         
         # Create generation job
         job = GenerationJob(
             biography_id=biography.id,
             status="pending",
             progress=0.0,
-            current_phase="initialized",
-            logs=[{
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'level': 'INFO',
-                'message': f'Biography generation job created for {character}'
-            }]
+            current_phase="initialized"
         )
         self.db.add(job)
+        self.db.flush()
+        
+        self._events.add(job.id, 'INFO', f'Biography generation job created for {character}')
+        self._events.flush(commit=False)
         self.db.commit()
-        self.db.refresh(job)
         
         # Initialize components
         state_machine, error_handler, workflow_manager = self._get_or_create_components(job.id)
@@ -355,17 +377,33 @@ class BookGenEngine:
         
         return job.id
     
-    def get_status(self, job_id: int) -> JobStatus:
+    def get_status(
+        self,
+        job_id: int,
+        log_limit: int = 50,
+        log_before: Optional[int] = None
+    ) -> JobStatus:
         """
         Get status of a generation job
         
         Args:
             job_id: Job ID
+            log_limit: Maximum number of log entries to return
+            log_before: Return log entries older than this event ID
+                (next_log_cursor of a previous status)
             
         Returns:
-            JobStatus object with current status
+            JobStatus object with current status and the tail of its log
         """
-        job = self.db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        # Make buffered entries visible to the reader
+        self._events.flush()
+        
+        job = (
+            self.db.query(GenerationJob)
+            .options(defer(GenerationJob.logs))
+            .filter(GenerationJob.id == job_id)
+            .first()
+        )
         
         if not job:
             raise ValueError(f"Job {job_id} not found")
@@ -387,6 +425,16 @@ class BookGenEngine:
                 state = job.status
                 progress = job.progress
         
+        events = JobEventRepository(self.db).get_tail(job_id, limit=log_limit + 1, before_id=log_before)
+        next_log_cursor = None
+        if len(events) > log_limit:
+            events = events[1:]
+            next_log_cursor = events[0].id
+        logs = [event.to_dict() for event in events]
+        if not logs and log_before is None and job.logs:
+            # Jobs created before the event log keep their entries inline
+            logs = job.logs[-log_limit:]
+        
         return JobStatus(
             job_id=job.id,
             state=state,
@@ -395,7 +443,8 @@ class BookGenEngine:
             created_at=job.created_at,
             updated_at=job.updated_at,
             error_message=job.error_message,
-            logs=job.logs
+            logs=logs,
+            next_log_cursor=next_log_cursor
         )
     
     def execute_job(self, job_id: int) -> Dict[str, Any]:
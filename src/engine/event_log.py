@@ -0,0 +1,102 @@
+"""
+Buffered writer for the append-only job event log
+"""
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..repositories.job_event_repository import JobEventRepository
+
+logger = logging.getLogger(__name__)
+
+
+class JobEventBuffer:
+    """
+    Collects job log entries and inserts them in batches
+
+    Entries are appended to the job_events table, so writing one costs the
+    same however long the job's log already is. Pending entries are written
+    when the buffer is full, when flush_interval has passed, or together with
+    the next job update (flush(commit=False) inside the caller's transaction).
+    """
+
+    def __init__(self, db: Session, max_pending: int = 50, flush_interval: float = 5.0):
+        """
+        Initialize event buffer
+
+        Args:
+            db: Database session used for inserts
+            max_pending: Buffered entries that trigger a flush
+            flush_interval: Maximum seconds an entry stays buffered while
+                new entries arrive
+        """
+        self.db = db
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+
+        self._pending: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of entries not yet written"""
+        return len(self._pending)
+
+    def add(self, job_id: int, level: str, message: str, metadata: Optional[Dict] = None):
+        """
+        Buffer a log entry
+
+        Args:
+            job_id: Job ID
+            level: Log level
+            message: Log message
+            metadata: Additional structured data
+        """
+        self._pending.append({
+            'job_id': job_id,
+            'timestamp': datetime.now(timezone.utc),
+            'level': level,
+            'message': message,
+            'event_metadata': metadata or {}
+        })
+
+        if (
+            len(self._pending) >= self.max_pending
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def discard(self, job_id: int):
+        """
+        Drop buffered entries of a job
+
+        Args:
+            job_id: Job ID
+        """
+        self._pending = [event for event in self._pending if event['job_id'] != job_id]
+
+    def flush(self, commit: bool = True) -> int:
+        """
+        Write buffered entries in one INSERT
+
+        Args:
+            commit: Commit the session; pass False to write the entries as
+                part of the caller's transaction
+
+        Returns:
+            Number of entries written
+        """
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return 0
+
+        events, self._pending = self._pending, []
+        JobEventRepository(self.db).append(events)
+        if commit:
+            self.db.commit()
+
+        logger.debug(f"Wrote {len(events)} job events")
+        return len(events)
@@ -5,6 +5,7 @@ from .biography import Biography
 from .chapter import Chapter
 from .source import Source
 from .generation_job import GenerationJob
+from .job_event import JobEvent
 from .notification import Notification
 
-__all__ = ["Biography", "Chapter", "Source", "GenerationJob", "Notification"]
+__all__ = ["Biography", "Chapter", "Source", "GenerationJob", "JobEvent", "Notification"]
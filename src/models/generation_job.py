@@ -17,6 +17,9 @@ class GenerationJob(Base):
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
     
+    # Public identifier exposed by the API (UUID string)
+    public_id = Column(String(36), nullable=True, unique=True, index=True)
+    
     # Foreign key
     biography_id = Column(Integer, ForeignKey("biographies.id", ondelete="CASCADE"), nullable=False, index=True)
     
@@ -32,7 +35,7 @@ class GenerationJob(Base):
     progress = Column(Float, nullable=False, default=0.0)  # 0.0 to 100.0
     current_phase = Column(String(100), nullable=True)
     
-    # Logs and error tracking
+    # Logs and error tracking (new entries go to job_events; logs holds legacy entries)
     logs = Column(JSON, nullable=True)
     error_message = Column(Text, nullable=True)
     
@@ -47,6 +50,7 @@ class GenerationJob(Base):
     
     # Relationships
     biography = relationship("Biography", back_populates="generation_jobs")
+    events = relationship("JobEvent", back_populates="job", cascade="all, delete-orphan", passive_deletes=True)
     
     # Indexes for common queries
     __table_args__ = (
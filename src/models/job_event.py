@@ -0,0 +1,47 @@
+"""
+JobEvent SQLAlchemy model
+"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+
+from src.database.base import Base
+
+
+class JobEvent(Base):
+    """
+    JobEvent model - one append-only log entry of a generation job
+    """
+    __tablename__ = "job_events"
+    
+    # Primary key (also the ordering and pagination cursor)
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Foreign key
+    job_id = Column(Integer, ForeignKey("generation_jobs.id", ondelete="CASCADE"), nullable=False)
+    
+    # Core fields
+    timestamp = Column(DateTime(timezone=True), nullable=False)
+    level = Column(String(20), nullable=False, default="INFO")
+    message = Column(Text, nullable=False)
+    event_metadata = Column(JSON, nullable=True)
+    
+    # Relationships
+    job = relationship("GenerationJob", back_populates="events")
+    
+    # Indexes for common queries
+    __table_args__ = (
+        Index('idx_job_event_job_id', 'job_id', 'id'),
+    )
+    
+    def to_dict(self):
+        """Log entry as returned in job status"""
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'level': self.level,
+            'message': self.message,
+            'metadata': self.event_metadata or {}
+        }
+    
+    def __repr__(self):
+        return f"<JobEvent(id={self.id}, job_id={self.job_id}, level='{self.level}')>"
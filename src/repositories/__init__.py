@@ -6,6 +6,7 @@ from .biography_repository import BiographyRepository
 from .chapter_repository import ChapterRepository
 from .source_repository import SourceRepository
 from .generation_job_repository import GenerationJobRepository
+from .job_event_repository import JobEventRepository
 
 __all__ = [
     "BaseRepository",
@@ -13,4 +14,5 @@ __all__ = [
     "ChapterRepository",
     "SourceRepository",
     "GenerationJobRepository",
+    "JobEventRepository",
 ]
@@ -1,9 +1,9 @@
 """
 GenerationJob repository
 """
-from typing import List, Optional
-from sqlalchemy import select
-from sqlalchemy.orm import Session, joinedload
+from typing import Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, defer, joinedload
 
 from src.models.generation_job import GenerationJob
 from .base import BaseRepository
@@ -17,6 +17,41 @@ class GenerationJobRepository(BaseRepository[GenerationJob]):
     def __init__(self, db: Session):
         super().__init__(GenerationJob, db)
     
+    def get_by_public_id(self, public_id: str) -> Optional[GenerationJob]:
+        """
+        Get job by its public (API) identifier
+        
+        The logs column is deferred, so status lookups stay a single
+        narrow row read.
+        
+        Args:
+            public_id: Public job identifier
+            
+        Returns:
+            Job or None if not found
+        """
+        stmt = (
+            select(GenerationJob)
+            .where(GenerationJob.public_id == public_id)
+            .options(defer(GenerationJob.logs))
+        )
+        result = self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Count jobs grouped by status
+        
+        Returns:
+            Dictionary mapping status to number of jobs
+        """
+        stmt = (
+            select(GenerationJob.status, func.count(GenerationJob.id))
+            .group_by(GenerationJob.status)
+        )
+        result = self.db.execute(stmt)
+        return {status: count for status, count in result.all()}
+    
     def get_by_biography(self, biography_id: int) -> List[GenerationJob]:
         """
         Get all jobs for a biography
@@ -0,0 +1,57 @@
+"""
+JobEvent repository
+"""
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from src.models.job_event import JobEvent
+from .base import BaseRepository
+
+
+class JobEventRepository(BaseRepository[JobEvent]):
+    """
+    Repository for JobEvent model with specific queries
+    """
+    
+    def __init__(self, db: Session):
+        super().__init__(JobEvent, db)
+    
+    def append(self, events: List[Dict[str, Any]]) -> None:
+        """
+        Insert log entries in one statement without committing
+        
+        The caller commits, so a batch of events can share a transaction
+        with the job update it belongs to.
+        
+        Args:
+            events: Rows with job_id, timestamp, level, message and
+                event_metadata
+        """
+        if events:
+            self.db.execute(insert(JobEvent), events)
+    
+    def get_tail(
+        self,
+        job_id: int,
+        limit: int = 50,
+        before_id: Optional[int] = None
+    ) -> List[JobEvent]:
+        """
+        Get the most recent events of a job
+        
+        Args:
+            job_id: Job ID
+            limit: Maximum number of events to return
+            before_id: Only return events older than this event ID
+                (pagination cursor)
+            
+        Returns:
+            List of events in chronological order
+        """
+        stmt = select(JobEvent).where(JobEvent.job_id == job_id)
+        if before_id is not None:
+            stmt = stmt.where(JobEvent.id < before_id)
+        stmt = stmt.order_by(JobEvent.id.desc()).limit(limit)
+        result = self.db.execute(stmt)
+        return list(reversed(result.scalars().all()))
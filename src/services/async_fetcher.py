@@ -0,0 +1,232 @@
+"""
+Asynchronous, connection-pooled HTTP fetch engine for source validation
+"""
+import asyncio
+import base64
+import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+import aiohttp
+
+from ..cache.page_cache import CachedPage, decode_body
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'BookGen Academic Research Bot 1.0',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+}
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a single URL"""
+    url: str
+    status_code: Optional[int] = None
+    text: str = ""
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True when the URL answered with a non-error status code"""
+        return self.error is None and self.status_code is not None and self.status_code < 400
+
+    @classmethod
+    def from_page(cls, page: CachedPage) -> 'FetchResult':
+        """Build a result from a cached page"""
+        return cls(
+            url=page.url,
+            status_code=page.status_code,
+            text=page.text,
+            content=page.content,
+            headers=dict(page.headers)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to a JSON-compatible dictionary (body stored compressed, text rebuilt from it)"""
+        return {
+            'url': self.url,
+            'status_code': self.status_code,
+            'compressed': base64.b64encode(zlib.compress(self.content)).decode('ascii'),
+            'headers': self.headers,
+            'error': self.error,
+            'timed_out': self.timed_out,
+            'elapsed': self.elapsed,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'FetchResult':
+        """Deserialize from to_dict output"""
+        content = zlib.decompress(base64.b64decode(data['compressed']))
+        headers = data.get('headers', {})
+        return cls(
+            url=data['url'],
+            status_code=data.get('status_code'),
+            text=decode_body(content, headers),
+            content=content,
+            headers=headers,
+            error=data.get('error'),
+            timed_out=data.get('timed_out', False),
+            elapsed=data.get('elapsed', 0.0),
+        )
+
+
+class AsyncFetchEngine:
+    """
+    Fetches many URLs concurrently over a shared keep-alive connection pool.
+
+    Features:
+    - One aiohttp session (and TCP connector) per batch, so connections
+      to the same host are reused across sources
+    - Bounded concurrency per host and in total, so a batch never floods
+      a single site
+    - Batch wall-clock time is bounded by the slowest host rather than
+      the number of URLs
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        max_per_host: int = 4,
+        max_connections: int = 64,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize fetch engine
+
+        Args:
+            timeout: Per-request timeout in seconds
+            max_per_host: Maximum concurrent connections to a single host
+            max_connections: Maximum concurrent connections overall
+            headers: Default request headers
+        """
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.max_connections = max_connections
+        self.headers = dict(headers) if headers else dict(DEFAULT_HEADERS)
+
+    async def fetch_all(
+        self,
+        urls: Iterable[str],
+        headers_by_url: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> Dict[str, FetchResult]:
+        """
+        Fetch all URLs concurrently
+
+        Duplicate URLs are fetched only once.
+
+        Args:
+            urls: URLs to fetch
+            headers_by_url: Extra request headers per URL (e.g. conditional
+                request headers)
+
+        Returns:
+            Dictionary mapping each URL to its FetchResult
+        """
+        unique_urls: List[str] = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+        headers_by_url = headers_by_url or {}
+
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=30
+        )
+        client_timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=client_timeout,
+            headers=self.headers
+        ) as session:
+            results = await asyncio.gather(
+                *(
+                    self._fetch_one(session, url, headers_by_url.get(url))
+                    for url in unique_urls
+                )
+            )
+
+        return {result.url: result for result in results}
+
+    def fetch_all_sync(
+        self,
+        urls: Iterable[str],
+        headers_by_url: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> Dict[str, FetchResult]:
+        """
+        Blocking wrapper around fetch_all for synchronous callers
+
+        When called from a thread that already runs an event loop (e.g. a
+        FastAPI handler), the batch is run on a helper thread.
+
+        Args:
+            urls: URLs to fetch
+            headers_by_url: Extra request headers per URL
+
+        Returns:
+            Dictionary mapping each URL to its FetchResult
+        """
+        urls = list(urls)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.fetch_all(urls, headers_by_url))
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.fetch_all(urls, headers_by_url)).result()
+
+    async def _fetch_one(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> FetchResult:
+        """
+        Fetch a single URL, converting failures into a FetchResult
+
+        Args:
+            session: Shared client session
+            url: URL to fetch
+            headers: Extra request headers
+
+        Returns:
+            FetchResult for the URL
+        """
+        start_time = time.perf_counter()
+        try:
+            async with session.get(url, headers=headers, allow_redirects=True) as response:
+                content = await response.read()
+                text = await response.text(errors='replace')
+                return FetchResult(
+                    url=url,
+                    status_code=response.status,
+                    text=text,
+                    content=content,
+                    headers={k.lower(): v for k, v in response.headers.items()},
+                    elapsed=time.perf_counter() - start_time
+                )
+        except asyncio.TimeoutError:
+            return FetchResult(
+                url=url,
+                error="timeout",
+                timed_out=True,
+                elapsed=time.perf_counter() - start_time
+            )
+        except (aiohttp.ClientError, ValueError) as e:
+            logger.debug(f"Error fetching {url}: {e}")
+            return FetchResult(
+                url=url,
+                error=str(e) or e.__class__.__name__,
+                elapsed=time.perf_counter() - start_time
+            )
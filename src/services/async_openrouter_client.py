@@ -0,0 +1,365 @@
+"""
+Asynchronous OpenRouter API Client
+Non-blocking client for OpenRouter API with a pooled keep-alive connection pool
+"""
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Optional, Dict, Any, AsyncIterator
+
+import httpx
+
+from ..cache.llm_cache import LLMResponseCache
+from ..config.openrouter_config import OpenRouterConfig
+from .rate_limiter import DistributedRateLimiter
+from .openrouter_client import (
+    BaseOpenRouterClient,
+    Completion,
+    OpenRouterException,
+    RateLimitException,
+    APIException
+)
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+# Seconds an idle pooled connection is kept open
+KEEPALIVE_EXPIRY = 30.0
+
+
+class AsyncOpenRouterClient(BaseOpenRouterClient):
+    """
+    Asynchronous client for OpenRouter API
+
+    Same interface as OpenRouterClient, with awaitable calls. Requests go
+    through one httpx.AsyncClient, so TCP/TLS connections are reused across
+    calls (multiplexed over HTTP/2 when h2 is installed) and many
+    completions can be in flight at once without blocking the event loop.
+
+    The connection pool belongs to the event loop it was first used in:
+    share one client per loop and close it with aclose() (or use the client
+    as an async context manager). Every call that may reach Redis (budget
+    reservations, rate-limit header and usage updates, and the response
+    cache) runs in a worker thread and the waiting is an asyncio sleep, so
+    none of them blocks the loop.
+    """
+
+    def __init__(
+        self,
+        config: Optional[OpenRouterConfig] = None,
+        rate_limiter: Optional[DistributedRateLimiter] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        min_request_interval: float = 0.0,
+        http2: Optional[bool] = None
+    ):
+        """
+        Initialize asynchronous OpenRouter client
+
+        Args:
+            config: OpenRouter configuration (defaults to environment-based config)
+            rate_limiter: Budget shared with every other client of the API key
+                (defaults to the process-wide, Redis-backed limiter)
+            response_cache: Cache for calls made with a cache_ttl
+                (defaults to the process-wide LLM response cache)
+            max_connections: Maximum open connections (requests beyond it wait for one)
+            max_keepalive_connections: Idle connections kept for reuse
+            min_request_interval: Minimum seconds between the starts of two of
+                this client's requests, on top of the shared budget; requests
+                still run concurrently
+            http2: Whether to use HTTP/2 (defaults to whether h2 is installed)
+        """
+        super().__init__(config, rate_limiter, response_cache)
+
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Rate limiting: start time reserved by the latest request
+        self._min_request_interval = min_request_interval
+        self._next_request_time = 0.0
+
+        logger.info(
+            f"Async OpenRouter client initialized with model: {self.config.model} "
+            f"(HTTP/{'2' if self.http2 else '1.1'})"
+        )
+
+    async def __aenter__(self) -> "AsyncOpenRouterClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client (created on first use)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.config.base_url,
+                headers=self.config.get_headers(),
+                timeout=self.config.timeout,
+                limits=self._limits,
+                http2=self.http2
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _wait_for_rate_limit(self, payload: Dict[str, Any]) -> int:
+        """
+        Wait for this request's start slot and its share of the budget
+
+        Args:
+            payload: Request body
+
+        Returns:
+            Tokens reserved for the request
+        """
+        # Reserve the slot before sleeping so concurrent callers queue up behind it
+        now = time.monotonic()
+        start = max(now, self._next_request_time)
+        self._next_request_time = start + self._min_request_interval
+
+        # The shared budget is reserved in arrival order too; the reservation
+        # is a blocking Redis call, so it runs off the event loop
+        tokens, wait = await asyncio.to_thread(self._reserve, payload)
+        delay = max(start - now, wait)
+        if delay > 0:
+            logger.debug(f"Rate limiting: waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+        return tokens
+
+    def _raise_for_status(self, response: httpx.Response):
+        """Map error responses to client exceptions"""
+        if response.status_code == 429:
+            error_msg = "Rate limit exceeded"
+            logger.error(error_msg)
+            self._update_stats(success=False, error=error_msg)
+            raise RateLimitException(error_msg)
+
+        if response.is_error:
+            error_msg = f"HTTP error: {response.status_code} - {response.text}"
+            logger.error(error_msg)
+            self._update_stats(success=False, error=error_msg)
+            raise APIException(error_msg)
+
+    def _request_failed(self, e: httpx.HTTPError) -> APIException:
+        """Record a transport error and build the exception to raise"""
+        if isinstance(e, httpx.TimeoutException):
+            error_msg = f"Request timeout after {self.config.timeout}s"
+        else:
+            error_msg = f"Request failed: {str(e)}"
+        logger.error(error_msg)
+        self._update_stats(success=False, error=error_msg)
+        return APIException(error_msg)
+
+    async def _make_request(
+        self,
+        messages: list[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Make a chat completion request to OpenRouter API
+
+        Args:
+            messages: List of message dictionaries
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            top_p: Top-p for diversity
+
+        Returns:
+            API response
+
+        Raises:
+            RateLimitException: If rate limit is exceeded
+            APIException: If the request fails or API returns an error
+        """
+        payload = self._build_payload(messages, temperature, max_tokens, top_p)
+        reserved_tokens = await self._wait_for_rate_limit(payload)
+        logger.info(f"Making async request with model {self.config.model}")
+
+        try:
+            response = await self.client.post("/chat/completions", json=payload)
+        except httpx.HTTPError as e:
+            raise self._request_failed(e) from e
+
+        await asyncio.to_thread(self._observe_response, response.status_code, response.headers)
+        self._raise_for_status(response)
+        result = response.json()
+        await asyncio.to_thread(self._observe_usage, reserved_tokens, result.get("usage"))
+        logger.info(f"Request successful. Status: {response.status_code}")
+        return result
+
+    async def generate_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        cache_ttl: Optional[int] = None
+    ) -> str:
+        """
+        Generate text from a prompt
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            top_p: Top-p for diversity
+            cache_ttl: Seconds to keep the response in the response cache
+                (None disables caching for the call)
+
+        Returns:
+            Generated text
+
+        Raises:
+            OpenRouterException: If generation fails
+        """
+        completion = await self.generate_completion(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            cache_ttl=cache_ttl
+        )
+        return completion.content
+
+    async def generate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        cache_ttl: Optional[int] = None
+    ) -> Completion:
+        """
+        Generate text from a prompt, with the usage and finish reason
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            top_p: Top-p for diversity
+            cache_ttl: Seconds to keep the response in the response cache
+                (None disables caching for the call)
+
+        Returns:
+            Completion with the generated text
+
+        Raises:
+            OpenRouterException: If generation fails
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        payload = self._build_payload(messages, temperature, max_tokens, top_p)
+
+        cached = await asyncio.to_thread(self._cached_content, payload, cache_ttl) if cache_ttl else None
+        if cached is not None:
+            return Completion(content=cached)
+
+        try:
+            result = await self.retry_handler.execute_async(
+                self._make_request,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                top_p=top_p,
+                retry_on=(APIException, RateLimitException)
+            )
+
+            completion = Completion.from_result(result)
+
+            # Update stats with usage info
+            self._update_stats(success=True, usage=completion.usage)
+            if cache_ttl:
+                await asyncio.to_thread(
+                    self._cache_content, payload, cache_ttl, completion.content, completion.usage
+                )
+
+            logger.info(f"Generated {completion.usage.get('completion_tokens', 0)} tokens")
+
+            return completion
+
+        except Exception as e:
+            logger.error(f"Text generation failed: {str(e)}")
+            raise OpenRouterException(f"Text generation failed: {str(e)}") from e
+
+    async def generate_text_streaming(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate text with streaming response
+
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            top_p: Top-p for diversity
+
+        Yields:
+            Chunks of generated text
+
+        Raises:
+            OpenRouterException: If generation fails
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        payload = self._build_payload(messages, temperature, max_tokens, top_p, stream=True)
+
+        try:
+            await self._wait_for_rate_limit(payload)
+
+            try:
+                async with self.client.stream("POST", "/chat/completions", json=payload) as response:
+                    await asyncio.to_thread(self._observe_response, response.status_code, response.headers)
+                    if response.is_error:
+                        await response.aread()
+                    self._raise_for_status(response)
+
+                    logger.info("Starting streaming response")
+
+                    async for line in response.aiter_lines():
+                        if line:
+                            done, content = self._parse_stream_line(line)
+                            if done:
+                                break
+                            if content is not None:
+                                yield content
+            except httpx.HTTPError as e:
+                raise self._request_failed(e) from e
+
+            self._update_stats(success=True)
+            logger.info("Streaming completed successfully")
+
+        except OpenRouterException as e:
+            logger.error(f"Streaming generation failed: {str(e)}")
+            raise OpenRouterException(f"Streaming generation failed: {str(e)}") from e
+        except Exception as e:
+            logger.error(f"Streaming generation failed: {str(e)}")
+            self._update_stats(success=False, error=str(e))
+            raise OpenRouterException(f"Streaming generation failed: {str(e)}") from e
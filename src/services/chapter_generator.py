@@ -0,0 +1,440 @@
+"""
+Concurrent chapter generation with incremental persistence
+"""
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..database.config import SessionLocal
+from ..models.chapter import Chapter
+from ..repositories.chapter_repository import ChapterRepository
+from ..repositories.generation_job_repository import GenerationJobRepository
+from .collection_service import CollectionService
+from .openrouter_client import Completion, OpenRouterClient
+from .token_budget import TokenBudget, TokenBudgeter, get_token_budgeter
+from ..monitoring.prometheus_metrics import increment_counter
+from ..websocket.token_stream import TokenStreamForwarder
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_PROMPT = "You are an expert biographer writing a comprehensive biography."
+
+# Continuation requests allowed for a chapter cut off at max_tokens
+MAX_CONTINUATIONS = 2
+# Words of the chapter so far quoted in a continuation prompt
+CONTINUATION_CONTEXT_WORDS = 300
+# Smallest length asked of a continuation (a cut-off chapter still needs an ending)
+MIN_CONTINUATION_WORDS = 150
+
+
+def chapter_filename(number: int) -> str:
+    """File name of a chapter inside a job's chapters directory"""
+    return f"capitulo-{number:02d}.md"
+
+
+class ChapterStore:
+    """
+    Persists each finished chapter of a job as soon as it is generated
+
+    Chapters are written to the Chapter table (under the job's Biography)
+    and to bios/<character>/jobs/<job_id>/chapters/, so a crashed or
+    restarted job keeps every chapter that was already finished. Other
+    jobs for the same character never see them.
+    """
+
+    def __init__(
+        self,
+        character: str,
+        job_id: str,
+        base_dir: str = "bios",
+        session_factory: Optional[Callable] = None
+    ):
+        """
+        Initialize chapter store
+
+        Args:
+            character: Character name
+            job_id: Public identifier of the job the chapters belong to
+            base_dir: Base directory containing biography files
+            session_factory: Factory for database sessions (defaults to
+                SessionLocal)
+        """
+        self.character = character
+        self.job_id = job_id
+        self.chapters_dir = os.path.join(
+            base_dir, CollectionService.normalize_character_name(character), "jobs", job_id, "chapters"
+        )
+        self.session_factory = session_factory or SessionLocal
+
+    def existing_chapters(self) -> Dict[int, Dict]:
+        """
+        Load chapters this job already persisted
+
+        Returns:
+            Dictionary mapping chapter number to chapter data
+        """
+        chapters: Dict[int, Dict] = {}
+
+        if os.path.isdir(self.chapters_dir):
+            for filename in os.listdir(self.chapters_dir):
+                match = re.fullmatch(r'capitulo-(\d+)\.md', filename)
+                if not match:
+                    continue
+                with open(os.path.join(self.chapters_dir, filename), 'r', encoding='utf-8') as f:
+                    content = f.read()
+                if content.strip():
+                    chapters[int(match.group(1))] = self._chapter_data(int(match.group(1)), content)
+
+        try:
+            db = self.session_factory()
+            try:
+                biography_id = self._biography_id(db)
+                if biography_id is not None:
+                    for chapter in ChapterRepository(db).get_by_biography(biography_id):
+                        if chapter.content and chapter.number not in chapters:
+                            chapters[chapter.number] = self._chapter_data(chapter.number, chapter.content)
+            finally:
+                db.close()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not load stored chapters of job {self.job_id}: {e}")
+
+        return chapters
+
+    def save(self, number: int, content: str) -> Dict:
+        """
+        Persist one chapter to disk and to the database
+
+        The file is written atomically; a database failure is logged and
+        does not lose the chapter, which remains on disk.
+
+        Args:
+            number: Chapter number
+            content: Chapter text
+
+        Returns:
+            Chapter data
+        """
+        os.makedirs(self.chapters_dir, exist_ok=True)
+        path = os.path.join(self.chapters_dir, chapter_filename(number))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        data = self._chapter_data(number, content)
+
+        try:
+            db = self.session_factory()
+            try:
+                self._save_to_db(db, number, content, data["word_count"])
+            finally:
+                db.close()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not store chapter {number} of job {self.job_id} in database: {e}")
+
+        return data
+
+    def _biography_id(self, db) -> Optional[int]:
+        """Biography row of the job, or None if the job is not stored"""
+        job = GenerationJobRepository(db).get_by_public_id(self.job_id)
+        return job.biography_id if job is not None else None
+
+    def _save_to_db(self, db, number: int, content: str, word_count: int):
+        """Insert or update a chapter row"""
+        biography_id = self._biography_id(db)
+        if biography_id is None:
+            logger.warning(f"Job {self.job_id} is not stored; chapter {number} is kept on disk only")
+            return
+
+        chapter_repo = ChapterRepository(db)
+        chapter = chapter_repo.get_by_biography_and_number(biography_id, number)
+        if chapter is None:
+            chapter_repo.create(Chapter(
+                biography_id=biography_id,
+                number=number,
+                content=content,
+                word_count=word_count
+            ))
+        else:
+            chapter.content = content
+            chapter.word_count = word_count
+            chapter_repo.update(chapter)
+
+    @staticmethod
+    def _chapter_data(number: int, content: str) -> Dict:
+        return {
+            "chapter": number,
+            "content": content,
+            "word_count": len(content.split())
+        }
+
+
+class ChapterGenerator:
+    """
+    Generates the chapters of a biography concurrently
+
+    Features:
+    - Independent chapters are requested in parallel; request pacing is
+      left to the OpenRouter client's rate limiter
+    - Each chapter is persisted through ChapterStore as soon as it is done
+    - Chapters the job already stored are skipped, so a restarted job only
+      generates the missing ones
+    - Optionally streams tokens of each chapter to WebSocket watchers
+    - max_tokens is planned from the words-per-token ratio learned for the
+      model, and a chapter cut off at max_tokens is continued rather than
+      regenerated
+    """
+
+    def __init__(
+        self,
+        client: OpenRouterClient,
+        store: ChapterStore,
+        max_concurrency: int = 4,
+        stream_factory: Optional[Callable[[int], Optional[TokenStreamForwarder]]] = None,
+        budgeter: Optional[TokenBudgeter] = None,
+        max_continuations: int = MAX_CONTINUATIONS
+    ):
+        """
+        Initialize chapter generator
+
+        Args:
+            client: OpenRouter client (shared by all workers)
+            store: Store receiving finished chapters
+            max_concurrency: Maximum chapters generated at the same time
+            stream_factory: Called with the chapter number before it is
+                generated; when it returns a forwarder, the chapter is
+                generated with streaming and its tokens are forwarded
+            budgeter: Token budgeter planning max_tokens (uses the shared
+                budgeter if None)
+            max_continuations: Continuation requests allowed for a chapter
+                cut off at max_tokens
+        """
+        self.client = client
+        self.store = store
+        self.max_concurrency = max(1, max_concurrency)
+        self.stream_factory = stream_factory
+        self.budgeter = budgeter or get_token_budgeter()
+        self.max_continuations = max(0, max_continuations)
+
+    def generate(
+        self,
+        character: str,
+        total_chapters: int,
+        words_per_chapter: int,
+        temperature: Optional[float] = None,
+        on_chapter: Optional[Callable[[Dict, int], None]] = None
+    ) -> List[Dict]:
+        """
+        Generate all missing chapters
+
+        Args:
+            character: Character name
+            total_chapters: Number of chapters in the book
+            words_per_chapter: Target words per chapter
+            temperature: Temperature for generation
+            on_chapter: Called with (chapter data, chapters completed so far)
+                after each chapter is persisted
+
+        Returns:
+            All chapters ordered by number
+
+        Raises:
+            Exception: The first chapter generation error; chapters not yet
+                started are cancelled, every chapter that finishes (including
+                those still running when the error occurred) is persisted
+        """
+        chapters = {
+            number: data
+            for number, data in self.store.existing_chapters().items()
+            if 1 <= number <= total_chapters
+        }
+        if chapters:
+            logger.info(
+                f"Resuming job {self.store.job_id} for '{character}': "
+                f"{len(chapters)}/{total_chapters} chapters already stored"
+            )
+
+        pending = [number for number in range(1, total_chapters + 1) if number not in chapters]
+        start_time = time.perf_counter()
+        first_chapter_logged = False
+
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            futures = {
+                executor.submit(
+                    self._generate_chapter,
+                    character, number, total_chapters, words_per_chapter, temperature
+                ): number
+                for number in pending
+            }
+            not_done = set(futures)
+            errors = []
+
+            while not_done:
+                done, not_done = wait(not_done, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=futures.get):
+                    number = futures[future]
+                    if future.cancelled():
+                        continue
+                    if future.exception() is not None:
+                        if not errors:
+                            # Chapters not started yet are dropped; running ones
+                            # still finish and are persisted below
+                            for other in not_done:
+                                other.cancel()
+                        errors.append(future.exception())
+                        continue
+
+                    chapters[number] = self.store.save(number, future.result())
+
+                    if not first_chapter_logged:
+                        first_chapter_logged = True
+                        logger.info(
+                            f"First chapter of '{character}' ready after "
+                            f"{time.perf_counter() - start_time:.2f}s"
+                        )
+                    if on_chapter:
+                        on_chapter(chapters[number], len(chapters))
+
+            if errors:
+                raise errors[0]
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return [chapters[number] for number in sorted(chapters)]
+
+    def _generate_chapter(
+        self,
+        character: str,
+        number: int,
+        total_chapters: int,
+        words_per_chapter: int,
+        temperature: Optional[float]
+    ) -> str:
+        """Request a single chapter from the model"""
+        chapter_prompt = (
+            f"Write chapter {number} of {total_chapters} about {character}. "
+            f"The chapter should be approximately {words_per_chapter} words long. "
+            f"Focus on their life story, achievements, and impact."
+        )
+
+        stream = self.stream_factory(number) if self.stream_factory else None
+        content = self._generate_with_continuations(
+            character, number, total_chapters, words_per_chapter, temperature, chapter_prompt, stream
+        )
+        if stream is not None:
+            stream.close(content)
+        return content
+
+    def _generate_with_continuations(
+        self,
+        character: str,
+        number: int,
+        total_chapters: int,
+        words_per_chapter: int,
+        temperature: Optional[float],
+        chapter_prompt: str,
+        stream: Optional[TokenStreamForwarder] = None
+    ) -> str:
+        """
+        Request a chapter, continuing it if it is cut off at max_tokens
+
+        A truncated chapter is extended with a continuation request for the
+        missing words instead of being generated again from the start. With
+        a stream, every request is streamed and its tokens are fed to it.
+        """
+        model = self.client.config.model
+        prompt = chapter_prompt
+        target_words = words_per_chapter
+        content = ""
+
+        for attempt in range(self.max_continuations + 1):
+            budget = self._plan(prompt, target_words)
+            if stream is None:
+                completion = self.client.generate_completion(
+                    prompt=prompt,
+                    system_prompt=SYSTEM_PROMPT,
+                    temperature=temperature,
+                    max_tokens=budget.max_tokens
+                )
+            else:
+                completion = self._stream_completion(prompt, temperature, budget, stream)
+            self.budgeter.observe(model, budget, completion.content, completion.usage)
+            # Continuations pick up exactly where the text stopped, even mid-word
+            content += completion.content
+
+            if not completion.truncated:
+                break
+            if attempt == self.max_continuations:
+                logger.warning(
+                    f"Chapter {number} of '{character}' still truncated after "
+                    f"{self.max_continuations} continuations"
+                )
+                break
+
+            increment_counter("bookgen_chapter_continuations_total", labels={"model": model})
+            target_words = max(words_per_chapter - len(content.split()), MIN_CONTINUATION_WORDS)
+            logger.info(f"Chapter {number} of '{character}' was truncated, continuing with ~{target_words} words")
+            prompt = self._continuation_prompt(character, number, total_chapters, content, target_words)
+
+        return content
+
+    def _stream_completion(
+        self,
+        prompt: str,
+        temperature: Optional[float],
+        budget: TokenBudget,
+        stream: TokenStreamForwarder
+    ) -> Completion:
+        """Stream one chapter request into stream, returning its text, usage and finish reason"""
+        parts = []
+        completions = []
+        for token in self.client.generate_text_streaming(
+            prompt=prompt,
+            system_prompt=SYSTEM_PROMPT,
+            temperature=temperature,
+            max_tokens=budget.max_tokens,
+            on_complete=completions.append
+        ):
+            parts.append(token)
+            stream.feed(token)
+
+        if completions:
+            return completions[0]
+        return Completion(content="".join(parts))
+
+    def _plan(self, prompt: str, target_words: int) -> TokenBudget:
+        """Choose max_tokens for a chapter request"""
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+        return self.budgeter.plan(
+            self.client.config.model,
+            messages,
+            target_words,
+            max_tokens_limit=self.client.config.max_tokens
+        )
+
+    @staticmethod
+    def _continuation_prompt(
+        character: str,
+        number: int,
+        total_chapters: int,
+        content: str,
+        target_words: int
+    ) -> str:
+        """Prompt continuing a chapter from the end of its text so far"""
+        tail = " ".join(content.split()[-CONTINUATION_CONTEXT_WORDS:])
+        return (
+            f"Continue chapter {number} of {total_chapters} about {character}. "
+            f"The chapter so far ends with:\n\n{tail}\n\n"
+            f"Continue exactly where it stops, without repeating any of it. "
+            f"Write approximately {target_words} more words and bring the chapter to a close."
+        )
@@ -0,0 +1,412 @@
+"""
+Concurrent scheduling of collection files
+
+A collection file (colecciones/*.md) lists one character per line and marks
+finished ones with ✅. CollectionScheduler parses it once into an indexed
+state (entries, name lookup, counters and a cursor to the first open
+entry) so lookups and statistics do not rescan the file, and lets several
+workers, threads or processes, claim characters concurrently:
+
+- Claims and not yet written completion marks live in a small state file
+  next to the collection (<collection>.state.json). Every change happens
+  under an exclusive file lock (<collection>.lock), so two workers never
+  claim the same character.
+- Claims expire after claim_ttl seconds, so characters claimed by a worker
+  that died are handed out again.
+- Completion marks are written back to the collection file in batches
+  (atomically, under the same lock) instead of rewriting it per character.
+
+The parsed state is only rebuilt when the collection file changes on disk
+(e.g. edited by hand).
+"""
+import fcntl
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+COMPLETION_MARK = '✅'
+
+# Optional numbering ("1.1. ", "4. ") followed by a name and an optional mark
+ENTRY_RE = re.compile(r'^(?P<num>\d+\.?\d*\.\s+)?(?P<nombre>[^✅]+?)(\s*✅)?$')
+
+# Completion marks buffered before the collection file is rewritten
+DEFAULT_BATCH_SIZE = 10
+# Seconds a claim is honored; longer than the Celery hard time limit
+DEFAULT_CLAIM_TTL = 2 * 3600
+
+
+@dataclass
+class CollectionEntry:
+    """One character line of a collection file"""
+    line_index: int
+    number: str  # Numbering prefix as written (e.g. "4. "), or ''
+    name: str
+    completed: bool
+
+
+class CollectionScheduler:
+    """
+    Indexed, lock-protected state of one collection file
+
+    Use get_collection_scheduler() to share one instance per file within a
+    process.
+    """
+
+    def __init__(
+        self,
+        collection_path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        claim_ttl: float = DEFAULT_CLAIM_TTL
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            collection_path: Path to the collection file
+            batch_size: Completion marks buffered before they are written
+                to the collection file
+            claim_ttl: Seconds after which an unfinished claim expires
+        """
+        self.collection_path = collection_path
+        self.batch_size = batch_size
+        self.claim_ttl = claim_ttl
+        self.state_path = f"{collection_path}.state.json"
+        self.lock_path = f"{collection_path}.lock"
+
+        self._lock = threading.RLock()
+        self._file_key: Optional[Tuple[int, int, int]] = None
+        self._state_key: Optional[Tuple[int, int, int]] = None
+        self._lines: List[str] = []
+        self._entries: List[CollectionEntry] = []
+        self._positions: Dict[str, int] = {}
+        self._completed = 0
+        self._cursor = 0
+        # Lowercased name -> {'worker': ..., 'expires': ...}
+        self._claims: Dict[str, Dict[str, Any]] = {}
+        # Lowercased names completed but not yet marked in the file
+        self._pending: List[str] = []
+        # Number of times schedulers rewrote the file, and as of our parse
+        self._version = 0
+        self._parsed_version = 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def first_uncompleted(self, include_claimed: bool = True) -> Optional[CollectionEntry]:
+        """
+        Get the first character without a completion mark
+
+        Args:
+            include_claimed: Whether characters currently claimed by a
+                worker may be returned
+
+        Returns:
+            CollectionEntry, or None if every character is completed
+        """
+        with self._lock:
+            self._refresh()
+            return self._next_open(include_claimed)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get counters of the collection (no file scan unless it changed)
+
+        Returns:
+            Dictionary with total_characters, completed, remaining and
+            in_progress (characters claimed by a worker)
+        """
+        with self._lock:
+            self._refresh()
+            total = len(self._entries)
+            return {
+                'total_characters': total,
+                'completed': self._completed,
+                'remaining': total - self._completed,
+                'in_progress': len(self._active_claims())
+            }
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def claim_next(self, worker_id: str) -> Optional[CollectionEntry]:
+        """
+        Atomically claim the first uncompleted character nobody else holds
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            Claimed CollectionEntry, or None if nothing is left to claim
+        """
+        with self._locked():
+            entry = self._next_open(include_claimed=False)
+            if entry is None:
+                return None
+
+            self._claims[entry.name.lower()] = {
+                'worker': worker_id,
+                'expires': time.time() + self.claim_ttl
+            }
+            self._save_state()
+            logger.info(f"Worker {worker_id} claimed '{entry.name}' (line {entry.line_index})")
+            return entry
+
+    def release(self, character_name: str) -> bool:
+        """
+        Give up a claim so the character can be claimed again
+
+        Args:
+            character_name: Name of the claimed character
+
+        Returns:
+            True if the character was claimed
+        """
+        with self._locked():
+            if self._claims.pop(character_name.lower(), None) is None:
+                return False
+            self._save_state()
+            return True
+
+    def complete(self, character_name: str) -> bool:
+        """
+        Mark a character as completed
+
+        The mark is buffered and written to the collection file with the
+        next batch (see flush).
+
+        Args:
+            character_name: Name of the character
+
+        Returns:
+            True if the character was found and not completed yet
+        """
+        with self._locked():
+            key = character_name.lower()
+            released = self._claims.pop(key, None) is not None
+            if not self._mark(key):
+                if released:
+                    self._save_state()
+                return False
+
+            self._pending.append(key)
+            if len(self._pending) >= self.batch_size:
+                self._write_marks()
+            self._save_state()
+            return True
+
+    def flush(self) -> int:
+        """
+        Write all buffered completion marks to the collection file
+
+        Returns:
+            Number of marks written
+        """
+        with self._locked():
+            written = self._write_marks()
+            if written:
+                self._save_state()
+            return written
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and the exclusive file lock, with fresh state"""
+        with self._lock:
+            if not os.path.exists(self.collection_path):
+                raise FileNotFoundError(f"Collection file not found: {self.collection_path}")
+            with open(self.lock_path, 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    self._refresh(locked=True)
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self, locked: bool = False):
+        """
+        Re-parse the collection and reload the state file if either changed
+
+        Args:
+            locked: Whether the file lock is held; the state file is then
+                always re-read (it is small), so no change by another
+                worker can be missed
+        """
+        try:
+            stat = os.stat(self.collection_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Collection file not found: {self.collection_path}")
+        file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+        try:
+            stat = os.stat(self.state_path)
+            state_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            state_key = None
+
+        reloaded = locked or state_key != self._state_key
+        if reloaded:
+            self._load_state()
+            self._state_key = state_key
+
+        # Marks written by any scheduler bump the version in the state file
+        reparsed = file_key != self._file_key or self._parsed_version != self._version
+        if reparsed:
+            self._parse()
+            self._file_key = file_key
+            self._parsed_version = self._version
+
+        if reloaded or reparsed:
+            for key in self._pending:
+                self._mark(key)
+
+    def _parse(self):
+        """Index the lines of the collection file"""
+        with open(self.collection_path, 'r', encoding='utf-8') as f:
+            self._lines = f.readlines()
+
+        self._entries = []
+        self._positions = {}
+        self._completed = 0
+        for i, line in enumerate(self._lines):
+            match = ENTRY_RE.match(line.strip())
+            if not match:
+                continue
+            nombre = match.group('nombre').strip()
+            if not nombre:
+                continue
+
+            completed = COMPLETION_MARK in line
+            self._positions.setdefault(nombre.lower(), len(self._entries))
+            self._entries.append(CollectionEntry(
+                line_index=i,
+                number=match.group('num') or '',
+                name=nombre,
+                completed=completed
+            ))
+            self._completed += completed
+        self._cursor = 0
+        logger.info(f"Indexed {len(self._entries)} characters in {self.collection_path}")
+
+    def _load_state(self):
+        """Load claims and buffered completions written by any worker"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            state = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read collection state {self.state_path}: {e}")
+            state = {}
+        self._claims = state.get('claims', {})
+        self._pending = state.get('pending', [])
+        self._version = state.get('version', 0)
+
+    def _save_state(self):
+        """Write claims and buffered completions (under the file lock)"""
+        state = {'claims': self._active_claims(), 'pending': self._pending, 'version': self._version}
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+        stat = os.stat(self.state_path)
+        self._state_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _active_claims(self) -> Dict[str, Dict[str, Any]]:
+        """Drop expired claims and return the others"""
+        now = time.time()
+        self._claims = {
+            key: claim for key, claim in self._claims.items() if claim['expires'] > now
+        }
+        return self._claims
+
+    def _next_open(self, include_claimed: bool) -> Optional[CollectionEntry]:
+        """First uncompleted entry at or after the cursor"""
+        # Completed entries at the front never reopen unless the file is re-parsed
+        while self._cursor < len(self._entries) and self._entries[self._cursor].completed:
+            self._cursor += 1
+
+        claims = {} if include_claimed else self._active_claims()
+        for entry in self._entries[self._cursor:]:
+            if not entry.completed and entry.name.lower() not in claims:
+                return entry
+        return None
+
+    def _mark(self, key: str) -> bool:
+        """Mark the first entry with a name as completed in the index"""
+        position = self._positions.get(key)
+        if position is None or self._entries[position].completed:
+            return False
+        self._entries[position].completed = True
+        self._completed += 1
+        return True
+
+    def _write_marks(self) -> int:
+        """Add the buffered completion marks to the collection file (under the file lock)"""
+        if not self._pending:
+            return 0
+
+        for key in self._pending:
+            position = self._positions.get(key)
+            if position is None:
+                # Removed from the file since it was completed
+                continue
+            i = self._entries[position].line_index
+            line = self._lines[i]
+            if COMPLETION_MARK not in line:
+                self._lines[i] = line.rstrip() + f' {COMPLETION_MARK}\n'
+
+        tmp_path = f"{self.collection_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.writelines(self._lines)
+        os.replace(tmp_path, self.collection_path)
+
+        stat = os.stat(self.collection_path)
+        self._file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        self._version += 1
+        self._parsed_version = self._version
+        written = len(self._pending)
+        self._pending = []
+        logger.info(f"Wrote {written} completion marks to {self.collection_path}")
+        return written
+
+
+_schedulers: Dict[str, CollectionScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_collection_scheduler(collection_path: str) -> CollectionScheduler:
+    """
+    Get the shared scheduler of a collection file (one per path and process)
+
+    Args:
+        collection_path: Path to the collection file
+
+    Returns:
+        CollectionScheduler instance
+    """
+    key = os.path.abspath(collection_path)
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = CollectionScheduler(key)
+        return scheduler
+
+
+def reset_collection_schedulers():
+    """Drop all shared schedulers (useful for testing)"""
+    with _schedulers_lock:
+        _schedulers.clear()
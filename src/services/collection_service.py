@@ -9,6 +9,8 @@ import unicodedata
 from typing import Optional, Tuple, List
 from pathlib import Path
 
+from .collection_scheduler import CollectionScheduler, get_collection_scheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,49 +31,31 @@ class CollectionService:
         """
         Find first character without completion mark (✅) in collection file
         
+        Characters claimed by a running collection worker are skipped.
+        
         Args:
             collection_file: Path to collection file (relative to collections_base_path)
             
         Returns:
             Tuple of (line_index, line_number, character_name) or (None, None, None) if all completed
         """
-        collection_path = self._get_collection_path(collection_file)
+        scheduler = self.get_scheduler(collection_file)
+        entry = scheduler.first_uncompleted(include_claimed=False)
         
-        if not os.path.exists(collection_path):
-            logger.error(f"Collection file not found: {collection_path}")
-            raise FileNotFoundError(f"Collection file not found: {collection_file}")
+        if entry is None:
+            logger.info("No uncompleted characters found in collection")
+            return None, None, None
         
-        logger.info(f"Reading collection file: {collection_path}")
-        
-        with open(collection_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        for i, line in enumerate(lines):
-            # Skip lines that already have completion mark
-            if '✅' in line:
-                continue
-            
-            line_stripped = line.strip()
-            
-            # Try to match pattern: optional number + name
-            # Examples: "1.1. Joseph Stalin" or "Dwight D. Eisenhower"
-            match = re.match(r'^(?P<num>\d+\.?\d*\.\s+)?(?P<nombre>[^✅]+?)(\s*✅)?$', line_stripped)
-            
-            if match:
-                numero = match.group('num') or ''
-                nombre = match.group('nombre').strip()
-                
-                if nombre:
-                    logger.info(f"Found uncompleted character at line {i}: {nombre}")
-                    return i, numero, nombre
-        
-        logger.info("No uncompleted characters found in collection")
-        return None, None, None
+        logger.info(f"Found uncompleted character at line {entry.line_index}: {entry.name}")
+        return entry.line_index, entry.number, entry.name
     
     def mark_as_completed(self, collection_file: str, character_name: str) -> bool:
         """
         Mark a character as completed (add ✅) in the collection file
         
+        The file is written right away, together with any completion marks
+        buffered by collection workers.
+        
         Args:
             collection_file: Path to collection file (relative to collections_base_path)
             character_name: Name of the character to mark
@@ -79,43 +63,40 @@ class CollectionService:
         Returns:
             True if character was found and marked, False otherwise
         """
-        collection_path = self._get_collection_path(collection_file)
-        
-        if not os.path.exists(collection_path):
-            logger.error(f"Collection file not found: {collection_path}")
-            raise FileNotFoundError(f"Collection file not found: {collection_file}")
+        scheduler = self.get_scheduler(collection_file)
         
-        logger.info(f"Marking character '{character_name}' as completed in {collection_path}")
-        
-        with open(collection_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        encontrado = False
-        for i, line in enumerate(lines):
-            # Match pattern with or without completion mark
-            match = re.match(r'^(?P<num>\d+\.?\d*\.\s+)?(?P<nombre>[^✅]+?)(\s*✅)?$', line.strip())
-            
-            if match:
-                nombre = match.group('nombre').strip()
-                
-                # Check if this is the character we're looking for
-                if nombre.lower() == character_name.lower():
-                    # Add completion mark if not already present
-                    if '✅' not in line:
-                        lines[i] = line.rstrip() + ' ✅\n'
-                        encontrado = True
-                        logger.info(f"Marked character '{character_name}' as completed")
-                    break
+        logger.info(f"Marking character '{character_name}' as completed in {scheduler.collection_path}")
         
+        encontrado = scheduler.complete(character_name)
         if encontrado:
-            # Write back to file
-            with open(collection_path, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
+            scheduler.flush()
+            logger.info(f"Marked character '{character_name}' as completed")
         else:
             logger.warning(f"Character '{character_name}' not found in collection")
         
         return encontrado
     
+    def get_scheduler(self, collection_file: str) -> CollectionScheduler:
+        """
+        Get the shared scheduler of a collection file
+        
+        Args:
+            collection_file: Path to collection file (relative to collections_base_path)
+            
+        Returns:
+            CollectionScheduler for the file
+            
+        Raises:
+            FileNotFoundError: If the collection file does not exist
+        """
+        collection_path = self._get_collection_path(collection_file)
+        
+        if not os.path.exists(collection_path):
+            logger.error(f"Collection file not found: {collection_path}")
+            raise FileNotFoundError(f"Collection file not found: {collection_file}")
+        
+        return get_collection_scheduler(collection_path)
+    
     def list_collections(self) -> List[str]:
         """
         List all available collection files
@@ -139,39 +120,25 @@ class CollectionService:
         """
         Get statistics about a collection file
         
+        Counters come from the scheduler's index, so the file is only
+        re-read when it changed.
+        
         Args:
             collection_file: Path to collection file
             
         Returns:
             Dictionary with statistics
         """
-        collection_path = self._get_collection_path(collection_file)
-        
-        if not os.path.exists(collection_path):
-            raise FileNotFoundError(f"Collection file not found: {collection_file}")
-        
-        with open(collection_path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        total = 0
-        completed = 0
-        
-        for line in lines:
-            line_stripped = line.strip()
-            match = re.match(r'^(?P<num>\d+\.?\d*\.\s+)?(?P<nombre>[^✅]+?)(\s*✅)?$', line_stripped)
-            
-            if match:
-                nombre = match.group('nombre').strip()
-                if nombre:
-                    total += 1
-                    if '✅' in line:
-                        completed += 1
+        stats = self.get_scheduler(collection_file).stats()
+        total = stats['total_characters']
+        completed = stats['completed']
         
         return {
             'collection_file': collection_file,
             'total_characters': total,
             'completed': completed,
-            'remaining': total - completed,
+            'remaining': stats['remaining'],
+            'in_progress': stats['in_progress'],
             'completion_percentage': round((completed / total * 100) if total > 0 else 0, 2)
         }
     
@@ -6,7 +6,7 @@ import os
 import re
 import unicodedata
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import Iterator, List, Optional, Dict, Set, Tuple
 import logging
 
 from src.api.models.concatenation import (
@@ -17,9 +17,18 @@ from src.api.models.concatenation import (
     TransitionError,
     CoherenceIssue
 )
-from src.utils.narrative_analyzer import NarrativeAnalyzer
+from src.services.concatenation_manifest import (
+    ConcatenationManifest,
+    SectionEntry,
+    content_hash,
+    manifest_path_for
+)
+from src.services.concatenation_writer import BookWriter, HEADER_RE
+from src.utils.narrative_analyzer import NarrativeAnalyzer, REDUNDANCY_THRESHOLD, REDUNDANCY_SHINGLE_SIZE
+from src.utils.near_duplicates import ShingleIndex
 from src.utils.transition_generator import TransitionGenerator
 from src.utils.text_analyzer import TextAnalyzer
+from src.utils.tokenized_document import TokenizedDocument, tokenize
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +53,8 @@ class ConcatenationService:
     def concatenate_biography(
         self,
         character: str,
-        validate_quality: bool = True
+        validate_quality: bool = True,
+        incremental: bool = False
     ) -> ConcatenationResult:
         """
         Concatenate all files for a biography with intelligent analysis
@@ -52,6 +62,9 @@ class ConcatenationService:
         Args:
             character: Character/person name (normalized)
             validate_quality: Whether to perform quality validation
+            incremental: Only re-read and re-analyze files changed since the
+                last incremental run (tracked in a manifest next to the
+                output) and splice them into the previous output
             
         Returns:
             ConcatenationResult with comprehensive metrics
@@ -65,8 +78,13 @@ class ConcatenationService:
         # Check for missing files
         missing_files = self._check_missing_files(files_to_concat)
         
-        # Load chapter contents
-        chapters = self._load_chapters(files_to_concat)
+        if incremental:
+            return self._concatenate_incremental(
+                character, base_dir, files_to_concat, missing_files, validate_quality
+            )
+        
+        # Generate output path
+        output_file = self._generate_output_path(character, base_dir)
         
         # Perform quality analysis if enabled
         coherence_score = 0.0
@@ -74,89 +92,82 @@ class ConcatenationService:
         coherence_issues = []
         chronology_valid = True
         redundancies_removed = 0
+        profiles = []
+        transition_results = []
+        redundancy_index = ShingleIndex(threshold=REDUNDANCY_THRESHOLD, shingle_size=REDUNDANCY_SHINGLE_SIZE)
+        files_processed = 0
+        total_chapters = 0
+        
+        # Stream sections to the output as they are loaded, keeping only the
+        # previous one for the transition between them
+        with BookWriter(output_file, normalize=self.transition_generator.normalize_section_headers) as writer:
+            previous = None
+            for chapter, document in self._iter_chapters(files_to_concat):
+                if validate_quality:
+                    # Narrative coherence is combined from per-chapter profiles
+                    profiles.append(self.narrative_analyzer.profile_chapter(document, character))
+                    
+                    # Same count as detect_redundancies over all chapters
+                    if self.config.enable_redundancy_detection:
+                        for para_idx, shingles in self.narrative_analyzer.paragraph_shingles(document):
+                            if redundancy_index.add_shingles((files_processed, para_idx), shingles):
+                                redundancies_removed += 1
+                
+                if previous is not None:
+                    if validate_quality and self.config.enable_transition_generation:
+                        transition = self.transition_generator.validate_transition(
+                            previous.content, chapter.content
+                        )
+                        transition_results.append({
+                            **transition, 'from_section': files_processed - 1, 'to_section': files_processed
+                        })
+                    writer.write(self.transition_generator.generate_transition(
+                        previous.content, chapter.content
+                    ))
+                writer.write(chapter.content)
+                
+                files_processed += 1
+                if chapter.section_type == 'chapter':
+                    total_chapters += 1
+                previous = chapter
+            
+            success = writer.close()
         
-        if validate_quality and chapters:
+        if validate_quality and profiles:
             # Analyze narrative coherence
-            coherence_analysis = self.narrative_analyzer.analyze_coherence(
-                [ch.content for ch in chapters],
-                character
-            )
+            coherence_analysis = self.narrative_analyzer.combine_coherence(profiles, character)
             coherence_score = coherence_analysis['score']
             
             # Convert issues to CoherenceIssue objects
-            for issue in coherence_analysis.get('issues', []):
-                coherence_issues.append(CoherenceIssue(
-                    location=issue.get('location', 'Unknown'),
-                    issue_type=issue.get('type', 'unknown'),
-                    severity=issue.get('severity', 'info'),
-                    description=issue.get('message', ''),
-                    context=issue.get('context')
-                ))
+            coherence_issues = self._coherence_issues(coherence_analysis)
             
             # Check chronology
             chronology_valid = coherence_analysis['metrics'].get(
                 'temporal_consistency', 1.0
             ) >= 0.7
             
-            # Analyze transitions
-            if self.config.enable_transition_generation:
-                transition_results = self.transition_generator.analyze_all_transitions(
-                    [ch.content for ch in chapters]
-                )
-                
-                for trans in transition_results:
-                    if trans.get('has_errors'):
-                        for issue in trans.get('issues', []):
-                            transition_errors.append(TransitionError(
-                                chapter_from=trans['from_section'],
-                                chapter_to=trans['to_section'],
-                                severity=issue.get('severity', 'info'),
-                                message=issue.get('message', ''),
-                                suggestion=issue.get('suggestion')
-                            ))
-            
-            # Detect redundancies
-            if self.config.enable_redundancy_detection:
-                redundancies = self.narrative_analyzer.detect_redundancies(
-                    [ch.content for ch in chapters]
-                )
-                redundancies_removed = len(redundancies)
-        
-        # Concatenate content
-        final_content = self._concatenate_content(chapters)
-        
-        # Normalize headers for table of contents
-        final_content = self.transition_generator.normalize_section_headers(
-            final_content
-        )
-        
-        # Generate output path
-        output_file = self._generate_output_path(character, base_dir)
-        
-        # Write final file
-        success = self._write_final_file(output_file, final_content)
+            transition_errors = self._transition_errors(transition_results)
         
         # Calculate metrics
-        total_words = self.text_analyzer.count_words(final_content)
+        total_words = writer.word_count
         
         # Calculate vocabulary richness
-        words = re.findall(r'\b\w+\b', final_content.lower())
-        unique_words = len(set(words))
-        vocabulary_richness = unique_words / len(words) if words else 0.0
+        term_count = writer.term_count
+        vocabulary_richness = len(writer.vocabulary) / term_count if term_count else 0.0
         
         metrics = ConcatenationMetrics(
             total_words=total_words,
-            total_chapters=len([ch for ch in chapters if ch.section_type == 'chapter']),
-            files_processed=len(chapters),
+            total_chapters=total_chapters,
+            files_processed=files_processed,
             missing_files=missing_files,
             coherence_score=coherence_score,
             transition_quality=self._calculate_transition_quality(transition_errors),
-            redundancy_ratio=redundancies_removed / len(chapters) if chapters else 0.0,
+            redundancy_ratio=redundancies_removed / files_processed if files_processed else 0.0,
             vocabulary_richness=vocabulary_richness
         )
         
-        # Generate index (table of contents)
-        index_generated = self._generate_index(final_content, output_file)
+        # Generate index (table of contents) from the headers seen while writing
+        index_generated = self._generate_index(writer.headers, output_file)
         
         result = ConcatenationResult(
             character=character,
@@ -216,16 +227,7 @@ class ConcatenationService:
             [ch.content for ch in chapters]
         )
         
-        transition_errors = []
-        for trans in transition_results:
-            if trans.get('has_errors'):
-                for issue in trans.get('issues', []):
-                    transition_errors.append(TransitionError(
-                        chapter_from=trans['from_section'],
-                        chapter_to=trans['to_section'],
-                        severity=issue.get('severity', 'info'),
-                        message=issue.get('message', '')
-                    ))
+        transition_errors = self._transition_errors(transition_results)
         
         # Concatenate
         final_content = self._concatenate_content(chapters)
@@ -255,6 +257,354 @@ class ConcatenationService:
             transition_errors=transition_errors
         )
     
+    def _concatenate_incremental(
+        self,
+        character: str,
+        base_dir: str,
+        files_to_concat: List[str],
+        missing_files: List[str],
+        validate_quality: bool
+    ) -> ConcatenationResult:
+        """
+        Concatenate a biography, reusing the previous run for unchanged files
+        
+        Files whose mtime and size (or content hash) match the manifest are
+        not re-read: their normalized text is copied from the previous
+        output and their cached profiles, paragraph shingles and transition
+        results are reused. Only changed files are analyzed, their
+        paragraphs compared against the cached ones of the other files, and
+        the transitions next to them re-validated before the output is
+        re-spliced. Results match a full concatenation.
+        
+        Args:
+            character: Character/person name (normalized)
+            base_dir: Biography directory
+            files_to_concat: Ordered section file paths
+            missing_files: Names of missing section files
+            validate_quality: Whether to perform quality validation
+            
+        Returns:
+            ConcatenationResult with comprehensive metrics
+        """
+        output_file = self._generate_output_path(character, base_dir)
+        manifest_path = manifest_path_for(output_file)
+        settings = {
+            'character': character,
+            'validate_quality': validate_quality,
+            'enable_transition_generation': self.config.enable_transition_generation,
+            'enable_redundancy_detection': self.config.enable_redundancy_detection,
+        }
+        manifest = ConcatenationManifest.load(manifest_path, settings)
+        previous_output = self._read_previous_output(output_file, manifest) if manifest else None
+        if previous_output is None:
+            manifest = ConcatenationManifest(settings=settings)
+        
+        # Reuse the entries of unchanged files, analyze the others
+        entries: List[SectionEntry] = []
+        changed_texts: Dict[str, str] = {}
+        for file_path in files_to_concat:
+            refreshed = self._refresh_entry(file_path, manifest.sections.get(file_path), character)
+            if refreshed is None:
+                continue
+            entry, normalized = refreshed
+            entries.append(entry)
+            if normalized is not None:
+                changed_texts[file_path] = normalized
+        changed = set(changed_texts)
+        logger.info(f"Incremental concatenation: {len(changed)} of {len(entries)} files changed")
+        
+        # Perform quality analysis if enabled
+        coherence_score = 0.0
+        transition_errors = []
+        coherence_issues = []
+        chronology_valid = True
+        redundancies_removed = 0
+        transitions = {}
+        redundant_pairs = []
+        
+        if validate_quality and entries:
+            # Analyze narrative coherence from the cached profiles
+            coherence_analysis = self.narrative_analyzer.combine_coherence(
+                [entry.profile for entry in entries],
+                character
+            )
+            coherence_score = coherence_analysis['score']
+            coherence_issues = self._coherence_issues(coherence_analysis)
+            
+            # Check chronology
+            chronology_valid = coherence_analysis['metrics'].get(
+                'temporal_consistency', 1.0
+            ) >= 0.7
+            
+            # Analyze transitions, re-validating only new neighbor pairs
+            if self.config.enable_transition_generation:
+                transition_results = []
+                for i in range(len(entries) - 1):
+                    previous, following = entries[i], entries[i + 1]
+                    key = f"{previous.content_hash}:{following.content_hash}"
+                    transition = manifest.transitions.get(key)
+                    if transition is None:
+                        transition = self.transition_generator.validate_transition(
+                            previous.last_paragraph or '',
+                            following.first_paragraph or ''
+                        )
+                    transitions[key] = transition
+                    transition_results.append({**transition, 'from_section': i, 'to_section': i + 1})
+                transition_errors = self._transition_errors(transition_results)
+            
+            # Detect redundancies involving changed files
+            if self.config.enable_redundancy_detection:
+                redundant_pairs = self._update_redundant_pairs(entries, changed, manifest.redundant_pairs)
+                redundancies_removed = self._count_redundancies(entries, redundant_pairs)
+        
+        # Splice normalized sections with transitions, recording where each one lands
+        texts = [
+            changed_texts[entry.path] if entry.path in changed_texts
+            else previous_output[entry.output_start:entry.output_end]
+            for entry in entries
+        ]
+        parts = []
+        position = 0
+        transition_words = 0
+        for i, (entry, text) in enumerate(zip(entries, texts)):
+            entry.output_start, entry.output_end = position, position + len(text)
+            parts.append(text)
+            position += len(text)
+            
+            # Add transition (except after last section)
+            if i < len(entries) - 1:
+                transition = self.transition_generator.generate_transition(text, texts[i + 1])
+                transition_words += self.text_analyzer.count_words(transition)
+                parts.append(transition)
+                position += len(transition)
+        final_content = ''.join(parts)
+        
+        # Write final file
+        success = self._write_final_file(output_file, final_content)
+        
+        # Sections are separated by whitespace, so word and term counts add up
+        total_words = sum(entry.word_count for entry in entries) + transition_words
+        term_count = sum(entry.profile.term_count for entry in entries)
+        vocabulary = set().union(*(entry.profile.vocabulary for entry in entries))
+        vocabulary_richness = len(vocabulary) / term_count if term_count else 0.0
+        
+        metrics = ConcatenationMetrics(
+            total_words=total_words,
+            total_chapters=len([entry for entry in entries if entry.section_type == 'chapter']),
+            files_processed=len(entries),
+            missing_files=missing_files,
+            coherence_score=coherence_score,
+            transition_quality=self._calculate_transition_quality(transition_errors),
+            redundancy_ratio=redundancies_removed / len(entries) if entries else 0.0,
+            vocabulary_richness=vocabulary_richness
+        )
+        
+        if success:
+            manifest.sections = {entry.path: entry for entry in entries}
+            manifest.transitions = transitions
+            manifest.redundant_pairs = redundant_pairs
+            manifest.output_hash = content_hash(final_content)
+            manifest.save(manifest_path)
+        
+        result = ConcatenationResult(
+            character=character,
+            output_file=output_file,
+            success=success,
+            metrics=metrics,
+            coherence_score=coherence_score,
+            chronology_valid=chronology_valid,
+            transition_errors=transition_errors,
+            coherence_issues=coherence_issues,
+            redundancies_removed=redundancies_removed,
+            index_generated=any(entry.has_headers for entry in entries)
+        )
+        
+        logger.info(
+            f"Incremental concatenation complete. Quality: {coherence_score:.2f}, "
+            f"Words: {total_words}, Success: {success}"
+        )
+        
+        return result
+    
+    def _read_previous_output(self, output_file: str, manifest: ConcatenationManifest) -> Optional[str]:
+        """
+        Read the output a manifest describes
+        
+        Args:
+            output_file: Output file path
+            manifest: Manifest of the previous incremental run
+            
+        Returns:
+            Previous output, or None if missing or modified since
+        """
+        try:
+            with open(output_file, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+        except OSError:
+            return None
+        
+        if content_hash(content) != manifest.output_hash:
+            logger.info(f"{output_file} changed since the last incremental run, rebuilding")
+            return None
+        return content
+    
+    def _refresh_entry(
+        self,
+        file_path: str,
+        cached: Optional[SectionEntry],
+        character: str
+    ) -> Optional[Tuple[SectionEntry, Optional[str]]]:
+        """
+        Get the manifest entry of a section file, analyzing it if it changed
+        
+        Args:
+            file_path: Section file path
+            cached: Entry from the previous run, if any
+            character: Character/person name
+            
+        Returns:
+            Tuple of (entry, normalized text if the file changed else None),
+            or None if the file cannot be read
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            logger.warning(f"File not found: {file_path}")
+            return None
+        
+        if cached and cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            return cached, None
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            logger.error(f"Error loading {file_path}: {e}")
+            return None
+        
+        digest = content_hash(content)
+        if cached and cached.content_hash == digest:
+            # Touched but not modified
+            cached.mtime_ns, cached.size = stat.st_mtime_ns, stat.st_size
+            return cached, None
+        
+        filename = os.path.basename(file_path)
+        paragraphs = tokenize(content).paragraphs
+        entry = SectionEntry(
+            path=file_path,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            content_hash=digest,
+            title=self._extract_title(content, filename),
+            number=self._extract_chapter_number(filename),
+            section_type=self._get_section_type(filename),
+            word_count=self.text_analyzer.count_words(content),
+            profile=self.narrative_analyzer.profile_chapter(content, character),
+            first_paragraph=paragraphs[0] if paragraphs else None,
+            last_paragraph=paragraphs[-1] if paragraphs else None,
+            has_headers=any(HEADER_RE.match(line) for line in content.split('\n')),
+            paragraph_shingles=(
+                self.narrative_analyzer.paragraph_shingles(content)
+                if self.config.enable_redundancy_detection else []
+            )
+        )
+        return entry, self.transition_generator.normalize_section_headers(content)
+    
+    def _update_redundant_pairs(
+        self,
+        entries: List[SectionEntry],
+        changed: Set[str],
+        cached_pairs: List[Tuple[str, int, str, int]]
+    ) -> List[Tuple[str, int, str, int]]:
+        """
+        Find all redundant paragraph pairs, comparing only changed files anew
+        
+        Pairs between unchanged files are kept. The paragraphs of changed
+        files are indexed, matched among themselves, and every cached
+        paragraph of the unchanged files is looked up in that index.
+        
+        Args:
+            entries: Entries of the sections being concatenated
+            changed: Paths of changed sections
+            cached_pairs: Pairs from the previous run
+            
+        Returns:
+            Redundant pairs as (path, paragraph, path, paragraph)
+        """
+        present = {entry.path for entry in entries}
+        pairs = [
+            pair for pair in cached_pairs
+            if pair[0] in present and pair[2] in present
+            and pair[0] not in changed and pair[2] not in changed
+        ]
+        
+        index = ShingleIndex(threshold=REDUNDANCY_THRESHOLD, shingle_size=REDUNDANCY_SHINGLE_SIZE)
+        for entry in entries:
+            if entry.path in changed:
+                for para_idx, shingles in entry.paragraph_shingles:
+                    for (other_path, other_para), _, _ in index.add_shingles((entry.path, para_idx), shingles):
+                        pairs.append((other_path, other_para, entry.path, para_idx))
+        
+        if len(index):
+            for entry in entries:
+                if entry.path not in changed:
+                    for para_idx, shingles in entry.paragraph_shingles:
+                        for (other_path, other_para), _, _ in index.query_shingles(shingles):
+                            pairs.append((entry.path, para_idx, other_path, other_para))
+        
+        return pairs
+    
+    def _count_redundancies(
+        self,
+        entries: List[SectionEntry],
+        pairs: List[Tuple[str, int, str, int]]
+    ) -> int:
+        """
+        Count paragraphs redundant with an earlier paragraph
+        
+        Same count as detect_redundancies over the sections in order.
+        
+        Args:
+            entries: Entries of the sections, in output order
+            pairs: Redundant paragraph pairs
+            
+        Returns:
+            Number of redundant paragraphs
+        """
+        order = {entry.path: idx for idx, entry in enumerate(entries)}
+        duplicates = set()
+        for path_a, para_a, path_b, para_b in pairs:
+            duplicates.add(max((order[path_a], para_a), (order[path_b], para_b)))
+        return len(duplicates)
+    
+    def _coherence_issues(self, coherence_analysis: Dict[str, any]) -> List[CoherenceIssue]:
+        """Convert coherence analysis issues to CoherenceIssue objects"""
+        return [
+            CoherenceIssue(
+                location=issue.get('location', 'Unknown'),
+                issue_type=issue.get('type', 'unknown'),
+                severity=issue.get('severity', 'info'),
+                description=issue.get('message', ''),
+                context=issue.get('context')
+            )
+            for issue in coherence_analysis.get('issues', [])
+        ]
+    
+    def _transition_errors(self, transition_results: List[Dict[str, any]]) -> List[TransitionError]:
+        """Convert issues of failed transitions to TransitionError objects"""
+        transition_errors = []
+        for trans in transition_results:
+            if trans.get('has_errors'):
+                for issue in trans.get('issues', []):
+                    transition_errors.append(TransitionError(
+                        chapter_from=trans['from_section'],
+                        chapter_to=trans['to_section'],
+                        severity=issue.get('severity', 'info'),
+                        message=issue.get('message', ''),
+                        suggestion=issue.get('suggestion')
+                    ))
+        return transition_errors
+    
     def _get_ordered_files(self, base_dir: str) -> List[str]:
         """
         Get list of files in correct order from new directory structure
@@ -306,8 +656,21 @@ class ConcatenationService:
         Returns:
             List of ChapterContent objects
         """
-        chapters = []
+        return [chapter for chapter, _ in self._iter_chapters(file_paths)]
+    
+    def _iter_chapters(self, file_paths: List[str]) -> Iterator[Tuple[ChapterContent, TokenizedDocument]]:
+        """
+        Load chapter contents from files one at a time
         
+        Documents are tokenized without going through the shared tokenize()
+        cache, so a streamed book is released chapter by chapter.
+        
+        Args:
+            file_paths: List of file paths
+            
+        Yields:
+            Tuple of (ChapterContent, TokenizedDocument of its content)
+        """
         for file_path in file_paths:
             if not os.path.exists(file_path):
                 logger.warning(f"File not found: {file_path}")
@@ -326,21 +689,23 @@ class ConcatenationService:
                 # Extract title from content or filename
                 title = self._extract_title(content, filename)
                 
-                word_count = self.text_analyzer.count_words(content)
+                document = TokenizedDocument(content)
+                word_count = self.text_analyzer.count_words(document)
                 
-                chapters.append(ChapterContent(
+                chapter = ChapterContent(
                     number=chapter_number,
                     title=title,
                     content=content,
                     file_path=file_path,
                     word_count=word_count,
                     section_type=section_type
-                ))
+                )
                 
             except Exception as e:
                 logger.error(f"Error loading {file_path}: {e}")
-        
-        return chapters
+                continue
+            
+            yield chapter, document
     
     def _get_section_type(self, filename: str) -> str:
         """Determine section type from filename"""
@@ -491,25 +856,16 @@ class ConcatenationService:
         
         return max(0.0, 1.0 - penalty)
     
-    def _generate_index(self, content: str, output_file: str) -> bool:
+    def _generate_index(self, headers: List[Tuple[int, str]], output_file: str) -> bool:
         """
         Generate table of contents index
         
         Args:
-            content: Full content
+            headers: (level, title) of the headers in the output
             output_file: Output file path
             
         Returns:
             True if index was generated
         """
-        # Extract all headers
-        headers = []
-        for line in content.split('\n'):
-            match = re.match(r'^(#+)\s+(.+)$', line)
-            if match:
-                level = len(match.group(1))
-                title = match.group(2).strip()
-                headers.append((level, title))
-        
         # Index is considered generated if we found headers
         return len(headers) > 0
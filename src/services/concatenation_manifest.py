@@ -0,0 +1,163 @@
+"""
+Manifest of an incrementally concatenated biography
+
+Stored as JSON next to the output file. For every section file it records
+what the file looked like when it was last concatenated (mtime, size,
+content hash), the analysis results derived from it and where its text
+sits in the output, so the next run only re-reads and re-analyzes the
+files that changed and copies everything else from the previous output.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.narrative_analyzer import ChapterProfile
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+def content_hash(text: str) -> str:
+    """Hash identifying a section's or output's content"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def manifest_path_for(output_file: str) -> str:
+    """Path of the manifest kept next to an output file"""
+    return f"{output_file}.manifest.json"
+
+
+def _encode_shingles(shingles: List[int]) -> str:
+    return base64.b64encode(np.asarray(shingles, dtype=np.uint32).tobytes()).decode('ascii')
+
+
+def _decode_shingles(encoded: str) -> List[int]:
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.uint32).tolist()
+
+
+@dataclass
+class SectionEntry:
+    """One section file as of the last concatenation"""
+    path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    title: str
+    number: Optional[int]
+    section_type: str
+    word_count: int
+    profile: ChapterProfile
+    first_paragraph: Optional[str]
+    last_paragraph: Optional[str]
+    has_headers: bool
+    # (paragraph index, shingle hashes) of the paragraphs compared for redundancy
+    paragraph_shingles: List[Tuple[int, List[int]]] = field(default_factory=list)
+    # Character range of the section's normalized text in the output
+    output_start: int = 0
+    output_end: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Shallow copies: asdict() would deep-copy every vocabulary list
+        data = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        data['profile'] = vars(self.profile)
+        data['paragraph_shingles'] = [
+            [para_idx, _encode_shingles(shingles)] for para_idx, shingles in self.paragraph_shingles
+        ]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SectionEntry":
+        data = dict(data)
+        data['profile'] = ChapterProfile(**data['profile'])
+        data['paragraph_shingles'] = [
+            (para_idx, _decode_shingles(encoded)) for para_idx, encoded in data['paragraph_shingles']
+        ]
+        return cls(**data)
+
+
+@dataclass
+class ConcatenationManifest:
+    """Per-file state of an output file, used for incremental re-concatenation"""
+    settings: Dict[str, Any]
+    sections: Dict[str, SectionEntry] = field(default_factory=dict)
+    # validate_transition results keyed by "<previous hash>:<next hash>"
+    transitions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Redundant paragraph pairs as (path, paragraph, path, paragraph)
+    redundant_pairs: List[Tuple[str, int, str, int]] = field(default_factory=list)
+    output_hash: str = ''
+
+    @classmethod
+    def load(cls, path: str, settings: Dict[str, Any]) -> Optional["ConcatenationManifest"]:
+        """
+        Load a manifest written with the same settings
+
+        Args:
+            path: Manifest path
+            settings: Settings the cached results must have been computed with
+
+        Returns:
+            ConcatenationManifest, or None if missing, unreadable or stale
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read concatenation manifest {path}: {e}")
+            return None
+
+        if data.get('version') != MANIFEST_VERSION or data.get('settings') != settings:
+            logger.info(f"Concatenation manifest {path} is stale, rebuilding")
+            return None
+
+        try:
+            return cls(
+                settings=data['settings'],
+                sections={
+                    entry['path']: SectionEntry.from_dict(entry) for entry in data['sections']
+                },
+                transitions=data['transitions'],
+                redundant_pairs=[tuple(pair) for pair in data['redundant_pairs']],
+                output_hash=data['output_hash']
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Invalid concatenation manifest {path}: {e}")
+            return None
+
+    def save(self, path: str) -> bool:
+        """
+        Write the manifest atomically
+
+        Args:
+            path: Manifest path
+
+        Returns:
+            True if successful
+        """
+        data = {
+            'version': MANIFEST_VERSION,
+            'settings': self.settings,
+            'sections': [entry.to_dict() for entry in self.sections.values()],
+            'transitions': self.transitions,
+            'redundant_pairs': [list(pair) for pair in self.redundant_pairs],
+            'output_hash': self.output_hash,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            # dumps() encodes in one shot with the C encoder, dump() does not
+            serialized = json.dumps(data, ensure_ascii=False)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(serialized)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.error(f"Error writing concatenation manifest {path}: {e}")
+            return False
@@ -0,0 +1,155 @@
+"""
+Streaming writer for concatenated biographies
+
+Sections and transitions are written to the output as they are produced
+instead of being joined into one string first. Header normalization, word
+and term counts and the table of contents are computed on the way, one
+batch of complete lines at a time, so the whole book is never held in
+memory. Every statistic works line by line (words, terms and headers never
+span a newline), so the results equal those computed over the full text.
+"""
+import hashlib
+import logging
+import os
+import re
+from typing import Callable, List, Optional, Set, Tuple
+
+from src.utils.tokenized_document import TERM_RE
+
+logger = logging.getLogger(__name__)
+
+# Markdown header lines, as listed in the table of contents
+HEADER_RE = re.compile(r'^(#+)\s+(.+)$')
+
+
+class BookWriter:
+    """
+    Writes a book to disk piece by piece
+
+    The output is written to a temporary file next to the destination and
+    moved into place by close(), so a failed run never leaves a truncated
+    book behind. If the file cannot be written, statistics are still
+    collected and close() reports the failure.
+    """
+
+    def __init__(self, output_path: str, normalize: Optional[Callable[[str], str]] = None):
+        """
+        Open the output
+
+        Args:
+            output_path: Destination path
+            normalize: Line-wise transformation applied to the text before
+                it is written (e.g. header normalization)
+        """
+        self.output_path = output_path
+        self.normalize = normalize
+        self.word_count = 0
+        self.term_count = 0
+        self.vocabulary: Set[str] = set()
+        # (level, title) of every header, in order
+        self.headers: List[Tuple[int, str]] = []
+        self._digest = hashlib.blake2b(digest_size=16)
+        self._pending = ''
+        self._tmp_path = f"{output_path}.{os.getpid()}.tmp"
+        self._file = None
+        self._failed = False
+
+        try:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            self._file = open(self._tmp_path, 'w', encoding='utf-8', newline='')
+        except OSError as e:
+            logger.error(f"Error writing file {output_path}: {e}")
+            self._failed = True
+
+    def __enter__(self) -> "BookWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+
+    @property
+    def content_hash(self) -> str:
+        """Hash of everything written so far (same as content_hash() of the output)"""
+        return self._digest.hexdigest()
+
+    def write(self, text: str):
+        """
+        Append text to the book
+
+        Only complete lines are processed; a trailing partial line is kept
+        until the next write or close().
+
+        Args:
+            text: Section or transition text
+        """
+        end = text.rfind('\n') + 1
+        if not end:
+            self._pending += text
+            return
+
+        lines = self._pending + text[:end]
+        self._pending = text[end:]
+        self._emit(lines)
+
+    def close(self) -> bool:
+        """
+        Flush the last partial line and move the output into place
+
+        Returns:
+            True if the book was written successfully
+        """
+        if self._pending:
+            self._emit(self._pending)
+            self._pending = ''
+
+        if self._file is None:
+            return False
+
+        try:
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self.output_path)
+        except OSError as e:
+            logger.error(f"Error writing file {self.output_path}: {e}")
+            self.abort()
+            return False
+
+        logger.info(f"Successfully wrote: {self.output_path}")
+        return not self._failed
+
+    def abort(self):
+        """Discard the partially written output"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+        self._failed = True
+
+    def _emit(self, lines: str):
+        """Normalize, measure and write a batch of whole lines"""
+        if self.normalize:
+            lines = self.normalize(lines)
+
+        self.word_count += len(lines.split())
+        terms = TERM_RE.findall(lines)
+        self.term_count += len(terms)
+        # Lowercase the distinct terms, not the text
+        self.vocabulary.update(term.lower() for term in set(terms))
+
+        if '#' in lines:
+            for line in lines.split('\n'):
+                match = HEADER_RE.match(line)
+                if match:
+                    self.headers.append((len(match.group(1)), match.group(2).strip()))
+
+        self._digest.update(lines.encode('utf-8'))
+        if self._file is not None:
+            try:
+                self._file.write(lines)
+            except OSError as e:
+                logger.error(f"Error writing file {self.output_path}: {e}")
+                self.abort()
@@ -9,8 +9,8 @@ from typing import Optional, Dict, Any
 from datetime import datetime, timezone
 
 import requests
-from bs4 import BeautifulSoup
 
+from ..cache.page_cache import PageCache, get_page_cache
 from ..services.openrouter_client import OpenRouterClient, OpenRouterException
 from ..api.models.content_analysis import (
     BiographicalDepthAnalysis,
@@ -21,18 +21,27 @@ from ..api.models.content_analysis import (
 
 logger = logging.getLogger(__name__)
 
+# Source analyses are reused by retried jobs for this long
+ANALYSIS_CACHE_TTL = 7 * 24 * 3600
+
 
 class ContentAnalyzer:
     """Advanced content analyzer using AI for quality evaluation"""
     
-    def __init__(self, openrouter_client: Optional[OpenRouterClient] = None):
+    def __init__(
+        self,
+        openrouter_client: Optional[OpenRouterClient] = None,
+        page_cache: Optional[PageCache] = None
+    ):
         """
         Initialize content analyzer
         
         Args:
             openrouter_client: Optional OpenRouter client instance
+            page_cache: Fetched-page cache (uses the shared cache if None)
         """
         self.openrouter_client = openrouter_client or OpenRouterClient()
+        self.page_cache = page_cache or get_page_cache()
         
         # Quality models for different analysis types
         self.quality_models = {
@@ -133,27 +142,35 @@ class ContentAnalyzer:
             Cleaned content text
         """
         try:
-            logger.debug(f"Fetching content from {url}")
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (compatible; BookGenBot/1.0; +https://bookgen.ai)'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
+            page = self.page_cache.get(url)
             
-            # Remove script and style elements
-            for script in soup(['script', 'style', 'nav', 'footer', 'header']):
-                script.decompose()
-            
-            # Get text
-            text = soup.get_text(separator=' ', strip=True)
+            if page is None:
+                logger.debug(f"Fetching content from {url}")
+                
+                headers = {
+                    'User-Agent': 'Mozilla/5.0 (compatible; BookGenBot/1.0; +https://bookgen.ai)'
+                }
+                
+                # A 304 for a page evicted meanwhile leaves nothing to reuse:
+                # fetch it again without conditional headers
+                for conditional in (self.page_cache.conditional_headers(url), {}):
+                    response = requests.get(url, headers={**headers, **conditional}, timeout=10)
+                    if response.status_code != 304:
+                        response.raise_for_status()
+                    
+                    page = self.page_cache.store(
+                        url,
+                        response.status_code,
+                        response.headers,
+                        response.content
+                    )
+                    if page is not None:
+                        break
+                else:
+                    raise ValueError("304 Not Modified without a cached page")
             
-            # Clean whitespace
-            text = re.sub(r'\s+', ' ', text)
+            # Clean text is extracted once per page body and shared
+            text = self.page_cache.extract_text(page.content, page.text)
             
             # Truncate to max length
             if len(text) > max_length:
@@ -216,7 +233,8 @@ Calculate depth_score as the average of all scores divided by 100 (0-1 range).
             response = self.openrouter_client.generate_text(
                 prompt=prompt,
                 temperature=0.1,
-                max_tokens=1000
+                max_tokens=1000,
+                cache_ttl=ANALYSIS_CACHE_TTL
             )
             
             # Parse JSON response
@@ -313,7 +331,8 @@ considering date accuracy and consistency.
             response = self.openrouter_client.generate_text(
                 prompt=prompt,
                 temperature=0.1,
-                max_tokens=800
+                max_tokens=800,
+                cache_ttl=ANALYSIS_CACHE_TTL
             )
             
             try:
@@ -402,7 +421,8 @@ Calculate neutrality_score (0-1) based on low bias and high objectivity.
             response = self.openrouter_client.generate_text(
                 prompt=prompt,
                 temperature=0.1,
-                max_tokens=800
+                max_tokens=800,
+                cache_ttl=ANALYSIS_CACHE_TTL
             )
             
             try:
@@ -3,7 +3,9 @@ Cross-Validation System
 System for cross-validating sources and ensuring factual consistency
 """
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
 
 from ..strategies.base_strategy import SourceCandidate
 from ..utils.fact_checker import FactualConsistencyChecker
@@ -16,6 +18,7 @@ from ..api.models.cross_validation import (
     KeyFact
 )
 from ..services.openrouter_client import OpenRouterClient
+from ..cache.page_cache import PageCache, get_page_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,16 +26,25 @@ logger = logging.getLogger(__name__)
 class CrossValidationSystem:
     """System for cross-validation of sources to ensure factual consistency"""
     
-    def __init__(self, openrouter_client: Optional[OpenRouterClient] = None):
+    def __init__(
+        self,
+        openrouter_client: Optional[OpenRouterClient] = None,
+        page_cache: Optional[PageCache] = None,
+        fact_batch_size: int = 5
+    ):
         """
         Initialize cross-validation system
         
         Args:
             openrouter_client: Optional OpenRouter client instance
+            page_cache: Fetched-page cache (uses the shared cache if None)
+            fact_batch_size: Number of sources per fact extraction call
         """
         self.fact_checker = FactualConsistencyChecker(openrouter_client)
-        self.source_triangulator = SourceTriangulator()
+        self.fact_batch_size = fact_batch_size
         self.openrouter_client = openrouter_client or OpenRouterClient()
+        self.page_cache = page_cache or get_page_cache()
+        self.source_triangulator = SourceTriangulator(page_cache=self.page_cache)
         logger.info("CrossValidationSystem initialized")
     
     def validate_source_set_quality(
@@ -57,7 +69,7 @@ class CrossValidationSystem:
             return self._create_default_result()
         
         # 1. Check factual consistency
-        consistency_score = self._check_factual_consistency(sources, character)
+        consistency_score, outlier_sources = self._analyze_factual_consistency(sources, character)
         
         # 2. Analyze temporal coverage
         temporal_coverage = self._analyze_temporal_coverage(sources, character)
@@ -100,6 +112,7 @@ class CrossValidationSystem:
             recommendations=recommendations,
             metadata={
                 'source_count': len(sources),
+                'outlier_sources': outlier_sources,
                 'temporal_analysis': {
                     'early_life': temporal_coverage >= 0.7,
                     'career': temporal_coverage >= 0.7,
@@ -127,31 +140,63 @@ class CrossValidationSystem:
         Returns:
             Consistency score (0-1)
         """
+        score, _ = self._analyze_factual_consistency(sources, character)
+        return score
+    
+    def _analyze_factual_consistency(
+        self,
+        sources: List[SourceCandidate],
+        character: str
+    ) -> Tuple[float, List[int]]:
+        """
+        Score factual consistency and find sources that disagree with the rest
+        
+        Args:
+            sources: List of sources
+            character: Character name
+            
+        Returns:
+            Tuple of (consistency score (0-1), indices of outlier sources)
+        """
         logger.debug("Checking factual consistency")
         
-        # Extract facts from each source (limit to first 10 for efficiency)
-        fact_sets = []
-        for idx, source in enumerate(sources[:10]):
+        indexed_contents = []
+        for idx, source in enumerate(sources):
             # Get content from metadata or use title/author info
             content = self._get_source_content(source)
             if content:
-                facts = self.fact_checker.extract_key_facts(content, character)
-                # Set source index for each fact
-                for fact in facts:
-                    fact.source_index = idx
-                fact_sets.append(facts)
+                indexed_contents.append((idx, content))
+        
+        # Extract facts from all sources, several sources per AI call
+        fact_sets = self.fact_checker.extract_key_facts_batch(
+            [content for _, content in indexed_contents],
+            character,
+            batch_size=self.fact_batch_size
+        )
+        for (idx, _), facts in zip(indexed_contents, fact_sets):
+            # Set source index for each fact
+            for fact in facts:
+                fact.source_index = idx
         
         if len(fact_sets) < 2:
             logger.warning("Not enough sources with content for consistency check")
-            return 0.7  # Default decent score
+            return 0.7, []  # Default decent score
         
         # Build consistency matrix
         consistency_matrix = self._build_consistency_matrix(fact_sets)
         
-        # Calculate weighted consistency score
-        score = self._calculate_weighted_consistency_score(consistency_matrix)
+        # Calculate consistency score weighted by source credibility
+        weights = [sources[idx].credibility_score for idx, _ in indexed_contents]
+        score = self._calculate_weighted_consistency_score(consistency_matrix, weights)
         
-        return score
+        outliers = [
+            indexed_contents[row][0]
+            for row in self._detect_outlier_sources(consistency_matrix)
+        ]
+        if outliers:
+            logger.info(f"Sources disagreeing with the rest: {outliers}")
+        
+        return score, outliers
     
     def _get_source_content(self, source: SourceCandidate) -> str:
         """
@@ -167,6 +212,13 @@ class CrossValidationSystem:
         if source.metadata and 'content' in source.metadata:
             return source.metadata['content']
         
+        # Reuse the page text if the source was already fetched in this job
+        url = getattr(source.source_item, 'url', None)
+        if isinstance(url, str) and url:
+            cached_text = self.page_cache.get_text(url)
+            if cached_text:
+                return cached_text
+        
         # Fall back to combining title and author
         content_parts = []
         if hasattr(source.source_item, 'title'):
@@ -179,61 +231,87 @@ class CrossValidationSystem:
     def _build_consistency_matrix(
         self,
         fact_sets: List[List[KeyFact]]
-    ) -> List[List[float]]:
+    ) -> np.ndarray:
         """
         Build matrix of consistency scores between fact sets
         
+        Facts are normalized locally and all pairs are scored at once from
+        a source-by-fact incidence matrix, so no AI call is made per pair.
+        
         Args:
             fact_sets: List of fact sets from different sources
             
         Returns:
-            Matrix of consistency scores
+            Symmetric matrix of consistency scores
         """
-        n = len(fact_sets)
-        matrix = [[0.0 for _ in range(n)] for _ in range(n)]
-        
-        for i in range(n):
-            for j in range(i + 1, n):
-                score = self.fact_checker.compare_facts(fact_sets[i], fact_sets[j])
-                matrix[i][j] = score
-                matrix[j][i] = score
-            matrix[i][i] = 1.0
-        
-        return matrix
+        normalized = [self.fact_checker.normalize_facts(facts) for facts in fact_sets]
+        return self.fact_checker.consistency_matrix(normalized)
     
     def _calculate_weighted_consistency_score(
         self,
-        consistency_matrix: List[List[float]]
+        consistency_matrix: np.ndarray,
+        weights: Optional[Sequence[float]] = None
     ) -> float:
         """
         Calculate weighted consistency score from matrix
         
+        Each pair is weighted by the product of the two sources' weights,
+        so agreement between credible sources counts more.
+        
         Args:
             consistency_matrix: Matrix of pairwise consistency scores
+            weights: Per-source weights (e.g. credibility scores); uniform
+                if None or all zero
             
         Returns:
             Overall consistency score (0-1)
         """
-        if not consistency_matrix:
+        matrix = np.asarray(consistency_matrix, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[0] < 2:
             return 0.5
         
-        n = len(consistency_matrix)
-        if n == 0:
+        n = matrix.shape[0]
+        source_weights = np.ones(n) if weights is None else np.asarray(weights, dtype=float)
+        if source_weights.sum() <= 0:
+            source_weights = np.ones(n)
+        
+        # Upper triangle only: each unordered pair once, no self-pairs
+        pair_weights = np.triu(np.outer(source_weights, source_weights), k=1)
+        total_weight = pair_weights.sum()
+        if total_weight <= 0:
             return 0.5
         
-        # Calculate average of all pairwise comparisons
-        total = 0.0
-        count = 0
+        return float((pair_weights * matrix).sum() / total_weight)
+    
+    def _detect_outlier_sources(
+        self,
+        consistency_matrix: np.ndarray,
+        min_gap: float = 0.15
+    ) -> List[int]:
+        """
+        Find sources whose average agreement is far below the others'
         
-        for i in range(n):
-            for j in range(i + 1, n):
-                total += consistency_matrix[i][j]
-                count += 1
+        Uses a robust z-score (median absolute deviation) of each source's
+        mean consistency with all other sources.
         
-        if count == 0:
-            return 0.5
+        Args:
+            consistency_matrix: Matrix of pairwise consistency scores
+            min_gap: Minimum distance below the median to count as outlier
+            
+        Returns:
+            Row indices of outlier sources
+        """
+        matrix = np.asarray(consistency_matrix, dtype=float)
+        n = matrix.shape[0] if matrix.ndim == 2 else 0
+        if n < 3:
+            return []
         
-        return total / count
+        mean_agreement = (matrix.sum(axis=1) - np.diag(matrix)) / (n - 1)
+        median = np.median(mean_agreement)
+        mad = np.median(np.abs(mean_agreement - median))
+        threshold = median - max(3.5 * mad / 0.6745, min_gap)
+        
+        return np.flatnonzero(mean_agreement < threshold).tolist()
     
     def _analyze_temporal_coverage(
         self,
@@ -320,7 +398,11 @@ class CrossValidationSystem:
             unique_information_ratio=unique_content_ratio,
             overlapping_facts=overlap.get('redundant_sources', 0),
             unique_facts=overlap.get('unique_sources', len(sources)),
-            details=f"Found {overlap.get('unique_sources', 0)} unique source domains"
+            details=(
+                f"Found {overlap.get('unique_sources', 0)} unique sources on "
+                f"{overlap.get('unique_domains', 0)} domains, "
+                f"{len(overlap.get('near_duplicate_groups', []))} groups of near-duplicate pages"
+            )
         )
     
     def _verify_academic_standards(
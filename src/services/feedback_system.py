@@ -17,6 +17,7 @@ from ..models.quality_metrics import (
     QualityWeights
 )
 from ..utils.pattern_analyzer import SuccessPatternAnalyzer
+from .success_case_store import DEFAULT_COMPACT_INTERVAL, CaseSummary, SuccessCaseStore
 
 logger = logging.getLogger(__name__)
 
@@ -24,47 +25,64 @@ logger = logging.getLogger(__name__)
 class QualityTracker:
     """Tracks quality data and success cases"""
     
-    def __init__(self, storage_path: Optional[str] = None):
+    def __init__(
+        self,
+        storage_path: Optional[str] = None,
+        compact_interval: int = DEFAULT_COMPACT_INTERVAL
+    ):
         """
         Initialize quality tracker
         
+        Success cases are kept in an append-only SuccessCaseStore in a
+        directory named after storage_path (data/quality_tracking/ by
+        default). A legacy JSON file at storage_path is migrated into it.
+        
         Args:
             storage_path: Path to store success cases (defaults to data/quality_tracking.json)
+            compact_interval: Stored cases between two compactions of the store
         """
         if storage_path is None:
             storage_path = "data/quality_tracking.json"
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
-        self.success_cases: List[SuccessCase] = []
-        self._load_cases()
-        logger.info(f"Initialized QualityTracker with {len(self.success_cases)} existing cases")
+        self.store = SuccessCaseStore(
+            str(self.storage_path.with_suffix('')),
+            compact_interval=compact_interval
+        )
+        self._migrate_legacy_file()
+        logger.info(f"Initialized QualityTracker with store {self.store.directory}")
     
-    def _load_cases(self):
-        """Load success cases from storage"""
-        if self.storage_path.exists():
-            try:
-                with open(self.storage_path, 'r') as f:
-                    data = json.load(f)
-                    self.success_cases = [
-                        SuccessCase(**case) for case in data.get('cases', [])
-                    ]
-                logger.info(f"Loaded {len(self.success_cases)} cases from storage")
-            except Exception as e:
-                logger.error(f"Failed to load cases: {e}")
-                self.success_cases = []
+    @property
+    def success_cases(self) -> List[SuccessCase]:
+        """All success cases, oldest first (reads every segment)"""
+        return self.get_all_cases()
     
-    def _save_cases(self):
-        """Save success cases to storage"""
+    def _migrate_legacy_file(self):
+        """Move cases from the single-file JSON format into the store"""
+        if not self.storage_path.is_file():
+            return
         try:
-            data = {
-                'cases': [case.model_dump(mode='json') for case in self.success_cases],
-                'last_updated': datetime.now().isoformat()
-            }
-            with open(self.storage_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            logger.debug(f"Saved {len(self.success_cases)} cases to storage")
+            with open(self.storage_path, 'r') as f:
+                data = json.load(f)
+            cases = [SuccessCase(**case) for case in data.get('cases', [])]
         except Exception as e:
-            logger.error(f"Failed to save cases: {e}")
+            logger.error(f"Failed to load cases: {e}")
+            return
+        
+        for case in cases:
+            self.store.append(case)
+        self.store.compact()
+        self.storage_path.rename(self.storage_path.with_name(self.storage_path.name + '.migrated'))
+        logger.info(f"Migrated {len(cases)} cases from {self.storage_path}")
+    
+    def add_case(self, case: SuccessCase):
+        """
+        Append a success case to the store
+        
+        Args:
+            case: Success case, with the timestamp it was recorded at
+        """
+        self.store.append(case)
     
     def store_success_case(
         self,
@@ -89,8 +107,7 @@ class QualityTracker:
             patterns=patterns,
             timestamp=datetime.now()
         )
-        self.success_cases.append(case)
-        self._save_cases()
+        self.add_case(case)
         logger.info(f"Stored success case for {character} with score {quality_score}")
     
     def get_recent_cases(self, days: int = 30) -> List[SuccessCase]:
@@ -101,19 +118,25 @@ class QualityTracker:
             days: Number of days to look back
             
         Returns:
-            List of recent success cases
+            List of recent success cases, oldest first
         """
         cutoff = datetime.now() - timedelta(days=days)
-        recent = [
-            case for case in self.success_cases
-            if case.timestamp >= cutoff
-        ]
+        recent = self.store.range(start=cutoff)
         logger.debug(f"Found {len(recent)} cases in last {days} days")
         return recent
     
     def get_all_cases(self) -> List[SuccessCase]:
-        """Get all success cases"""
-        return self.success_cases
+        """Get all success cases, oldest first"""
+        return self.store.range()
+    
+    def get_summary(self) -> CaseSummary:
+        """
+        Get aggregates over all success cases
+        
+        Returns:
+            CaseSummary (read from segment summaries, not from the cases)
+        """
+        return self.store.summary()
 
 
 class QualityFeedbackSystem:
@@ -253,10 +276,9 @@ class QualityFeedbackSystem:
         """
         logger.debug(f"Calculating improvement metrics for last {lookback_days} days")
         
-        recent_cases = self.quality_tracker.get_recent_cases(lookback_days)
-        all_cases = self.quality_tracker.get_all_cases()
+        summary = self.quality_tracker.get_summary()
         
-        if not all_cases:
+        if not summary.count:
             logger.warning("No cases available for metrics calculation")
             return ImprovementMetrics(
                 total_generations=0,
@@ -267,22 +289,24 @@ class QualityFeedbackSystem:
             )
         
         # Calculate basic metrics
-        total_generations = len(all_cases)
-        avg_quality = sum(c.quality_score for c in all_cases) / len(all_cases)
-        success_rate = sum(1 for c in all_cases if c.quality_score >= 85) / len(all_cases)
+        total_generations = summary.count
+        avg_quality = summary.score_sum / summary.count
+        success_rate = summary.success_count / summary.count
         
         # Calculate quality trend (compare recent vs older)
-        if len(all_cases) >= 10:
-            recent_avg = sum(c.quality_score for c in recent_cases) / max(1, len(recent_cases))
-            older_cases = [c for c in all_cases if c not in recent_cases]
-            older_avg = sum(c.quality_score for c in older_cases) / max(1, len(older_cases))
+        if summary.count >= 10:
+            recent_cases = self.quality_tracker.get_recent_cases(lookback_days)
+            recent_sum = sum(c.quality_score for c in recent_cases)
+            recent_avg = recent_sum / max(1, len(recent_cases))
+            # Older cases are all cases minus the recent ones
+            older_count = summary.count - len(recent_cases)
+            older_avg = (summary.score_sum - recent_sum) / max(1, older_count) if older_count else 0.0
             quality_trend = recent_avg - older_avg
         else:
             quality_trend = 0.0
         
-        # Aggregate patterns from all cases
-        all_patterns = [case.patterns for case in all_cases]
-        aggregated_patterns = self.success_patterns.aggregate_patterns(all_patterns)
+        # Aggregate patterns from all cases (same as aggregate_patterns over every case)
+        aggregated_patterns = summary.aggregated_patterns()
         
         # Get most effective patterns (top 5)
         most_effective = sorted(
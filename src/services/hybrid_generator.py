@@ -2,12 +2,15 @@
 Hybrid source generator service - combines automatic generation with manual sources
 """
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from collections import defaultdict
 
 from ..services.source_generator import AutomaticSourceGenerator
 from ..services.source_validator import SourceValidationService
 from ..api.models.sources import SourceItem, SourceType
+from ..cache.page_cache import PageCache, get_page_cache
+from ..utils.near_duplicates import NearDuplicateDetector
+from ..utils.url_utils import extract_domain, is_subdomain_of, normalize_url, parse_url
 from ..api.models.source_generation import AutomaticSourceGenerationRequest
 from ..api.models.hybrid_generation import (
     HybridSourceGenerationRequest,
@@ -32,7 +35,9 @@ class HybridSourceGenerator:
     def __init__(
         self,
         automatic_generator: AutomaticSourceGenerator = None,
-        source_validator: SourceValidationService = None
+        source_validator: SourceValidationService = None,
+        page_cache: Optional[PageCache] = None,
+        duplicate_detector: Optional[NearDuplicateDetector] = None
     ):
         """
         Initialize the hybrid source generator
@@ -40,9 +45,15 @@ class HybridSourceGenerator:
         Args:
             automatic_generator: Automatic source generator (creates default if None)
             source_validator: Source validation service (creates default if None)
+            page_cache: Fetched-page cache holding the text of validated
+                pages (uses the shared cache if None)
+            duplicate_detector: Near-duplicate detector for fetched pages
+                (creates default if None)
         """
         self.automatic_generator = automatic_generator or AutomaticSourceGenerator()
         self.source_validator = source_validator or SourceValidationService()
+        self.page_cache = page_cache or get_page_cache()
+        self.duplicate_detector = duplicate_detector or NearDuplicateDetector()
         
         logger.info("HybridSourceGenerator initialized")
     
@@ -210,27 +221,15 @@ class HybridSourceGenerator:
         Returns:
             Basic title string
         """
-        # Remove protocol
-        title = url.replace('https://', '').replace('http://', '')
+        parsed = parse_url(url)
         
-        # Remove www.
-        title = title.replace('www.', '')
-        
-        # Take domain + path
-        if '/' in title:
-            parts = title.split('/')
-            domain = parts[0]
-            path = parts[-1] if len(parts) > 1 and parts[-1] else domain
-            
-            # Clean up path
-            path = path.replace('-', ' ').replace('_', ' ')
-            path = path.split('?')[0]  # Remove query params
-            path = path.split('#')[0]  # Remove anchors
-            
-            if path != domain:
-                title = f"{domain}: {path}"
-            else:
-                title = domain
+        # Take domain + last path segment (query and anchor are not part of the path)
+        segments = [segment for segment in parsed.path.split('/') if segment]
+        if segments:
+            path = segments[-1].replace('-', ' ').replace('_', ' ')
+            title = f"{parsed.domain}: {path}"
+        else:
+            title = parsed.domain
         
         return title[:200]  # Limit length
     
@@ -242,6 +241,11 @@ class HybridSourceGenerator:
         """
         Remove auto-generated sources that duplicate user sources
         
+        An auto-generated source is a duplicate if its URL is the same as a
+        user source's after normalization, or if its fetched page is a
+        near-duplicate (mirror, print view, syndicated copy) of a user
+        source's page. User sources are always kept.
+        
         Args:
             auto_sources: Auto-generated sources
             user_sources: User-provided sources
@@ -249,14 +253,24 @@ class HybridSourceGenerator:
         Returns:
             Filtered auto sources without duplicates
         """
-        user_urls = {source.url.lower() for source in user_sources if source.url}
+        user_urls = {normalize_url(source.url) for source in user_sources if source.url}
         
         filtered = []
         for source in auto_sources:
-            if source.url and source.url.lower() not in user_urls:
+            if source.url and normalize_url(source.url) not in user_urls:
                 filtered.append(source)
         
-        return filtered
+        if not user_sources or not filtered:
+            return filtered
+        
+        # User sources win every near-duplicate cluster they belong to
+        user_ids = {id(source) for source in user_sources}
+        kept, _ = self.duplicate_detector.deduplicate(
+            user_sources + filtered,
+            text_of=lambda source: self.page_cache.get_text(source.url) if source.url else None,
+            score_of=lambda source: 1.0 if id(source) in user_ids else 0.0
+        )
+        return [source for source in kept if id(source) not in user_ids]
     
     def _validate_combined_sources(
         self,
@@ -325,9 +339,10 @@ class HybridSourceGenerator:
             source_types[source.source_type.value] += 1
         
         # Suggestion 1: If missing academic sources
+        academic_domains = ['scholar.google.com', 'jstor.org', 'edu']
         has_academic = any(
-            'scholar' in s.url.lower() or 'jstor' in s.url.lower() or 'edu' in s.url.lower()
-            for s in combined_sources if s.url
+            any(is_subdomain_of(domain, academic) for academic in academic_domains)
+            for domain in domains
         )
         
         if not has_academic:
@@ -346,8 +361,8 @@ class HybridSourceGenerator:
         # Suggestion 2: If missing government archives
         gov_domains = ['loc.gov', 'nationalarchives.gov.uk', 'nara.gov']
         has_gov = any(
-            any(gov_domain in source.url.lower() for gov_domain in gov_domains)
-            for source in combined_sources if source.url
+            any(is_subdomain_of(domain, gov_domain) for gov_domain in gov_domains)
+            for domain in domains
         )
         
         if not has_gov:
@@ -411,7 +426,4 @@ class HybridSourceGenerator:
         Returns:
             Domain string
         """
-        domain = url.replace('https://', '').replace('http://', '')
-        domain = domain.split('/')[0]
-        domain = domain.replace('www.', '')
-        return domain
+        return extract_domain(url)
@@ -0,0 +1,416 @@
+"""
+Persistent store for biography generation jobs
+
+Jobs live in the generation_jobs table (with their chapters in the
+chapters table), so they survive restarts and are visible to every API
+worker process. A small in-process cache keeps the status of hot jobs so
+status polling does not hit the database on every request.
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..api.models.biographies import JobStatus
+from ..database.base import Base
+from ..database.config import SessionLocal
+from ..models.biography import Biography
+from ..models.generation_job import GenerationJob
+from ..monitoring.prometheus_metrics import increment_counter
+from ..repositories.biography_repository import BiographyRepository
+from ..repositories.chapter_repository import ChapterRepository
+from ..repositories.generation_job_repository import GenerationJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+# API job status <-> generation_jobs.status (shared with BookGenEngine)
+DB_STATUS = {
+    JobStatus.PENDING: "pending",
+    JobStatus.IN_PROGRESS: "running",
+    JobStatus.COMPLETED: "completed",
+    JobStatus.FAILED: "failed",
+}
+API_STATUS = {value: key for key, value in DB_STATUS.items()}
+API_STATUS["paused"] = JobStatus.IN_PROGRESS
+
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED)
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """SQLite drops tzinfo; stored timestamps are always UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class JobStore:
+    """
+    Biography generation jobs backed by GenerationJob and Chapter rows
+
+    Features:
+    - Write-through: every state change is committed before the cache is
+      updated, so any worker process can serve any job
+    - Bounded LRU cache of job status snapshots; status reads never load
+      chapter bodies or job logs
+    - Jobs updated by this process are served from the cache; active jobs
+      run by other workers are re-read at most every refresh_interval
+      seconds, finished jobs are cached until evicted
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable] = None,
+        cache_size: int = 256,
+        refresh_interval: float = 2.0,
+        create_tables: bool = True
+    ):
+        """
+        Initialize job store
+
+        Args:
+            session_factory: Factory for database sessions (defaults to
+                SessionLocal)
+            cache_size: Maximum status snapshots kept in memory
+            refresh_interval: Seconds an active job owned by another worker
+                is served from the cache before it is read again
+            create_tables: Create missing tables on first use (deployments
+                managed by Alembic can disable it)
+        """
+        self.session_factory = session_factory or SessionLocal
+        self.cache_size = cache_size
+        self.refresh_interval = refresh_interval
+        self.create_tables = create_tables
+
+        # job_id -> (status snapshot, expiry time or None if authoritative)
+        self._cache: "OrderedDict[str, Tuple[Dict[str, Any], Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_ready = not create_tables
+
+    def create_job(
+        self,
+        job_id: str,
+        character: str,
+        total_chapters: int,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a pending job for a character
+
+        Each job gets its own Biography row, so the chapters it writes are
+        never mixed with those of earlier jobs for the same character.
+
+        Args:
+            job_id: Public job identifier
+            character: Character name
+            total_chapters: Number of chapters to generate
+            metadata: Request parameters and source information to keep
+                with the job
+
+        Returns:
+            Status snapshot of the new job
+
+        Raises:
+            SQLAlchemyError: If the job could not be stored
+        """
+        db = self._session()
+        try:
+            biography = BiographyRepository(db).create(
+                Biography(character_name=character, status="pending")
+            )
+
+            job = GenerationJobRepository(db).create(GenerationJob(
+                public_id=job_id,
+                biography_id=biography.id,
+                status=DB_STATUS[JobStatus.PENDING],
+                progress=0.0,
+                current_phase="queued",
+                job_metadata={
+                    **(metadata or {}),
+                    "character": character,
+                    "total_chapters": total_chapters,
+                    "progress": None
+                },
+                created_at=datetime.now(timezone.utc)
+            ))
+            snapshot = self._snapshot(job)
+        finally:
+            db.close()
+
+        self._cache_put(job_id, snapshot, owned=True)
+        return snapshot
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the status snapshot of a job
+
+        Args:
+            job_id: Public job identifier
+
+        Returns:
+            Status snapshot or None if the job does not exist
+        """
+        with self._lock:
+            entry = self._cache.get(job_id)
+            if entry is not None:
+                snapshot, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._cache.move_to_end(job_id)
+                    increment_counter("bookgen_job_status_cache_total", labels={"result": "hit"})
+                    return dict(snapshot)
+        increment_counter("bookgen_job_status_cache_total", labels={"result": "miss"})
+
+        db = self._session()
+        try:
+            job = GenerationJobRepository(db).get_by_public_id(job_id)
+            if job is None:
+                return None
+            snapshot = self._snapshot(job)
+        finally:
+            db.close()
+
+        self._cache_put(job_id, snapshot, owned=snapshot["status"] in TERMINAL_STATUSES)
+        return dict(snapshot)
+
+    def mark_started(self, job_id: str):
+        """
+        Mark a job as running
+
+        Args:
+            job_id: Public job identifier
+        """
+        self._update(
+            job_id,
+            status=JobStatus.IN_PROGRESS,
+            started_at=datetime.now(timezone.utc),
+            current_phase="generating_chapters"
+        )
+
+    def update_progress(self, job_id: str, chapters_completed: int, total_chapters: int):
+        """
+        Record the number of finished chapters
+
+        Args:
+            job_id: Public job identifier
+            chapters_completed: Chapters finished so far
+            total_chapters: Chapters in the book
+        """
+        self._update(job_id, progress={
+            "chapters_completed": chapters_completed,
+            "total_chapters": total_chapters,
+            "percentage": round((chapters_completed / total_chapters) * 100, 2)
+        })
+
+    def mark_completed(self, job_id: str, chapters_completed: int, total_chapters: int):
+        """
+        Mark a job as completed
+
+        Args:
+            job_id: Public job identifier
+            chapters_completed: Chapters generated
+            total_chapters: Chapters in the book
+        """
+        self._update(
+            job_id,
+            status=JobStatus.COMPLETED,
+            completed_at=datetime.now(timezone.utc),
+            current_phase="completed",
+            progress={
+                "chapters_completed": chapters_completed,
+                "total_chapters": total_chapters,
+                "percentage": 100.0
+            }
+        )
+
+    def mark_failed(self, job_id: str, error: str):
+        """
+        Mark a job as failed
+
+        Args:
+            job_id: Public job identifier
+            error: Error message
+        """
+        self._update(
+            job_id,
+            status=JobStatus.FAILED,
+            completed_at=datetime.now(timezone.utc),
+            current_phase="failed",
+            error=error
+        )
+
+    def get_chapters(self, job_id: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load the chapters written by a job, including their text
+
+        Args:
+            job_id: Public job identifier
+
+        Returns:
+            Chapters ordered by number, or None if the job does not exist
+        """
+        db = self._session()
+        try:
+            job = GenerationJobRepository(db).get_by_public_id(job_id)
+            if job is None:
+                return None
+            return [
+                {
+                    "chapter": chapter.number,
+                    "content": chapter.content or "",
+                    "word_count": chapter.word_count
+                }
+                for chapter in ChapterRepository(db).get_by_biography(job.biography_id)
+            ]
+        finally:
+            db.close()
+
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Count jobs by API status
+
+        Returns:
+            Dictionary mapping JobStatus values to job counts
+        """
+        db = self._session()
+        try:
+            counts: Dict[str, int] = {}
+            for db_status, count in GenerationJobRepository(db).count_by_status().items():
+                key = API_STATUS.get(db_status, JobStatus.PENDING).value
+                counts[key] = counts.get(key, 0) + count
+            return counts
+        finally:
+            db.close()
+
+    def invalidate(self, job_id: Optional[str] = None):
+        """
+        Drop cached status snapshots
+
+        Args:
+            job_id: Job to drop (drops every job if None)
+        """
+        with self._lock:
+            if job_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(job_id, None)
+
+    def _update(self, job_id: str, progress: Optional[Dict[str, Any]] = None, **fields):
+        """
+        Write job fields to the database, then to the cache
+
+        A database failure is logged and the change is still applied to the
+        cached snapshot, so this worker keeps reporting the job's progress.
+        """
+        snapshot = None
+        try:
+            db = self._session()
+            try:
+                repo = GenerationJobRepository(db)
+                job = repo.get_by_public_id(job_id)
+                if job is not None:
+                    if "status" in fields:
+                        job.status = DB_STATUS[fields["status"]]
+                    if "error" in fields:
+                        job.error_message = fields["error"]
+                    for name in ("started_at", "completed_at", "current_phase"):
+                        if name in fields:
+                            setattr(job, name, fields[name])
+                    if progress is not None:
+                        job.progress = progress["percentage"]
+                        job.job_metadata = {**(job.job_metadata or {}), "progress": progress}
+                    snapshot = self._snapshot(repo.update(job))
+            finally:
+                db.close()
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not store update of job {job_id}: {e}")
+
+        if snapshot is None:
+            with self._lock:
+                entry = self._cache.get(job_id)
+                if entry is None:
+                    return
+                snapshot = dict(entry[0])
+            for name in ("status", "started_at", "completed_at", "error"):
+                if name in fields:
+                    snapshot[name] = fields[name]
+            if progress is not None:
+                snapshot["progress"] = progress
+            snapshot["download_url"] = self._download_url(job_id, snapshot["status"])
+
+        self._cache_put(job_id, snapshot, owned=True)
+
+    def _cache_put(self, job_id: str, snapshot: Dict[str, Any], owned: bool):
+        expires_at = None if owned else time.monotonic() + self.refresh_interval
+        with self._lock:
+            self._cache[job_id] = (snapshot, expires_at)
+            self._cache.move_to_end(job_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _session(self):
+        """Open a session, creating the tables on first use if enabled"""
+        if not self._schema_ready:
+            with self._lock:
+                if not self._schema_ready:
+                    db = self.session_factory()
+                    try:
+                        bind = db.get_bind()
+                        database = bind.url.database
+                        if bind.url.get_backend_name() == "sqlite" and database and database != ":memory:":
+                            os.makedirs(os.path.dirname(os.path.abspath(database)), exist_ok=True)
+                        Base.metadata.create_all(bind=bind)
+                    finally:
+                        db.close()
+                    self._schema_ready = True
+        return self.session_factory()
+
+    @classmethod
+    def _snapshot(cls, job: GenerationJob) -> Dict[str, Any]:
+        """Status fields of a job row (no chapter bodies, no logs)"""
+        metadata = job.job_metadata or {}
+        status = API_STATUS.get(job.status, JobStatus.PENDING)
+        return {
+            "job_id": job.public_id,
+            "status": status,
+            "character": metadata.get("character", ""),
+            "total_chapters": metadata.get("total_chapters"),
+            "progress": metadata.get("progress"),
+            "created_at": _as_utc(job.created_at),
+            "started_at": _as_utc(job.started_at),
+            "completed_at": _as_utc(job.completed_at),
+            "error": job.error_message,
+            "download_url": cls._download_url(job.public_id, status)
+        }
+
+    @staticmethod
+    def _download_url(job_id: str, status: JobStatus) -> Optional[str]:
+        if status != JobStatus.COMPLETED:
+            return None
+        return f"/api/v1/biographies/{job_id}/download"
+
+
+_job_store_instance: Optional[JobStore] = None
+
+
+def get_job_store() -> JobStore:
+    """
+    Get global job store instance (singleton pattern).
+
+    Returns:
+        JobStore instance
+    """
+    global _job_store_instance
+    if _job_store_instance is None:
+        _job_store_instance = JobStore()
+    return _job_store_instance
+
+
+def reset_job_store():
+    """Drop the global job store instance (useful for testing)"""
+    global _job_store_instance
+    _job_store_instance = None
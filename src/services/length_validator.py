@@ -10,6 +10,7 @@ from pathlib import Path
 
 from src.config.validation_config import ValidationConfig
 from src.utils.text_analyzer import TextAnalyzer
+from src.utils.tokenized_document import tokenize
 
 
 @dataclass
@@ -90,27 +91,30 @@ class LengthValidationService:
         # Get acceptable range
         target_min, target_max = self.config.get_target_range(section_type)
         
+        # Tokenize once; every metric below reuses the document
+        document = tokenize(chapter_text)
+        
         # Count words
-        word_count = self.text_analyzer.count_words(chapter_text)
+        word_count = self.text_analyzer.count_words(document)
         
         # Calculate length score
         length_score = self.config.calculate_length_score(word_count, target_length)
         
         # Analyze information density
-        density_score = self.text_analyzer.calculate_information_density(chapter_text)
+        density_score = self.text_analyzer.calculate_information_density(document)
         
         # Detect repetition
-        repetition_metrics = self.text_analyzer.detect_repetitive_content(chapter_text)
+        repetition_metrics = self.text_analyzer.detect_repetitive_content(document)
         repetition_score = repetition_metrics['repetition_score']
         
         # Extract keywords
-        keywords = self.text_analyzer.extract_keywords(chapter_text, top_n=10)
+        keywords = self.text_analyzer.extract_keywords(document, top_n=10)
         
         # Get readability metrics
-        readability = self.text_analyzer.calculate_readability_metrics(chapter_text)
+        readability = self.text_analyzer.calculate_readability_metrics(document)
         
         # Get content balance
-        balance = self.text_analyzer.analyze_content_balance(chapter_text)
+        balance = self.text_analyzer.analyze_content_balance(document)
         
         # Calculate overall quality score (0-100)
         quality_score = self._calculate_quality_score(
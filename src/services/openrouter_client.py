@@ -5,20 +5,31 @@ Robust client for OpenRouter API with rate limiting, error handling, and retry l
 import time
 import logging
 import json
-from typing import Optional, Dict, Any, Iterator
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, Iterator, Callable
 from datetime import datetime, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, HTTPError
 
 from ..config.openrouter_config import OpenRouterConfig
 from ..utils.retry_handler import RetryHandler, with_retry
+from ..cache.llm_cache import LLMResponseCache, get_llm_cache, response_key
+from ..cache.single_flight import SingleFlight, get_single_flight
+from .rate_limiter import DistributedRateLimiter, estimate_request_tokens, get_rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Keep-alive connections per host kept by the shared HTTP session; enough
+# for the chapters and analysis calls a worker runs at once
+DEFAULT_POOL_MAXSIZE = 20
+
+
 class OpenRouterException(Exception):
     """Base exception for OpenRouter client errors"""
     pass
@@ -34,26 +45,90 @@ class APIException(OpenRouterException):
     pass
 
 
-class OpenRouterClient:
+@dataclass
+class Completion:
+    """Generated text of a chat completion with its usage"""
+    content: str
+    usage: Dict[str, Any] = field(default_factory=dict)
+    finish_reason: Optional[str] = None
+    
+    @property
+    def truncated(self) -> bool:
+        """True when generation stopped at max_tokens"""
+        return self.finish_reason == "length"
+    
+    @classmethod
+    def from_result(cls, result: Dict[str, Any]) -> "Completion":
+        """Build from a chat completion response body"""
+        choice = result["choices"][0]
+        return cls(
+            content=choice["message"]["content"],
+            usage=result.get("usage") or {},
+            finish_reason=choice.get("finish_reason")
+        )
+
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
     """
-    Client for OpenRouter API with advanced features:
-    - Rate limiting
-    - Error handling
-    - Retry logic with exponential backoff
-    - Usage tracking
-    - Streaming support
-    - Detailed logging
+    Get the process-wide HTTP session used by OpenRouterClient.
+    
+    Clients are created per job and per service, so the connection pool is
+    shared by all of them: TCP/TLS connections to OpenRouter are opened once
+    and reused across calls.
+    
+    Returns:
+        requests.Session instance
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=DEFAULT_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def reset_http_session():
+    """Close and drop the shared HTTP session (useful for testing)"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = None
+
+
+class BaseOpenRouterClient:
+    """
+    Configuration, request building and usage tracking shared by the
+    synchronous and the asynchronous OpenRouter client
     """
     
-    def __init__(self, config: Optional[OpenRouterConfig] = None):
+    def __init__(
+        self,
+        config: Optional[OpenRouterConfig] = None,
+        rate_limiter: Optional[DistributedRateLimiter] = None,
+        response_cache: Optional[LLMResponseCache] = None
+    ):
         """
         Initialize OpenRouter client
         
         Args:
             config: OpenRouter configuration (defaults to environment-based config)
+            rate_limiter: Budget shared with every other client of the API key
+                (defaults to the process-wide, Redis-backed limiter)
+            response_cache: Cache for calls made with a cache_ttl
+                (defaults to the process-wide LLM response cache)
         """
         self.config = config or OpenRouterConfig()
         self.config.validate()
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.response_cache = response_cache or get_llm_cache()
         
         self.retry_handler = RetryHandler(
             max_retries=3,
@@ -71,24 +146,157 @@ class OpenRouterClient:
             "total_prompt_tokens": 0,
             "total_completion_tokens": 0,
             "total_cost": 0.0,
+            "cached_responses": 0,
+            "coalesced_responses": 0,
             "errors": [],
             "start_time": datetime.now(timezone.utc)
         }
+    
+    @staticmethod
+    def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> list[Dict[str, str]]:
+        """Build the chat messages for a prompt"""
+        messages = []
         
-        # Rate limiting
-        self._last_request_time = 0
-        self._min_request_interval = 1.0  # Minimum 1 second between requests for free tier
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
         
-        logger.info(f"OpenRouter client initialized with model: {self.config.model}")
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _build_payload(
+        self,
+        messages: list[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """Build the request body of a chat completion"""
+        payload = {
+            "model": self.config.model,
+            "messages": messages,
+            "temperature": temperature or self.config.temperature,
+            "max_tokens": max_tokens or self.config.max_tokens,
+            "top_p": top_p or self.config.top_p,
+        }
+        
+        if stream:
+            payload["stream"] = True
+        
+        return payload
+    
+    @staticmethod
+    def _parse_stream_line(
+        line: str,
+        completion: Optional[Completion] = None
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Parse one server-sent event line of a streaming response
+        
+        Args:
+            line: Decoded, non-empty line
+            completion: Receives the finish reason and usage reported by
+                the final chunks
+        
+        Returns:
+            Tuple of (stream finished, content chunk or None)
+        """
+        if not line.startswith('data: '):
+            return False, None
+        
+        data = line[6:]  # Remove 'data: ' prefix
+        if data == '[DONE]':
+            return True, None
+        
+        try:
+            chunk = json.loads(data)
+            if completion is not None:
+                if chunk.get('usage'):
+                    completion.usage = chunk['usage']
+                if chunk.get('choices') and chunk['choices'][0].get('finish_reason'):
+                    completion.finish_reason = chunk['choices'][0]['finish_reason']
+            if 'choices' in chunk and len(chunk['choices']) > 0:
+                delta = chunk['choices'][0].get('delta', {})
+                if 'content' in delta:
+                    return False, delta['content']
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to parse streaming chunk: {data}")
+        return False, None
+    
+    def _reserve(self, payload: Dict[str, Any]) -> tuple[int, float]:
+        """
+        Reserve a request and its estimated tokens from the shared budget
+        
+        Args:
+            payload: Request body
+            
+        Returns:
+            Tuple of (tokens reserved, seconds to wait before sending)
+            
+        Raises:
+            RateLimitException: If the budget would not allow the request in time
+        """
+        tokens = estimate_request_tokens(payload["messages"], payload["max_tokens"])
+        reservation = self.rate_limiter.acquire(self.config.api_key, self.config.model, tokens)
+        if not reservation.granted:
+            error_msg = f"Rate limit budget exhausted for the next {reservation.wait:.0f}s"
+            logger.error(error_msg)
+            self._update_stats(success=False, error=error_msg)
+            raise RateLimitException(error_msg)
+        
+        if reservation.wait > 0:
+            logger.debug(f"Rate limiting: waiting {reservation.wait:.2f}s")
+        return tokens, reservation.wait
+    
+    def _observe_response(self, status_code: int, headers: Any):
+        """Adapt the shared budget to the response's rate-limit headers"""
+        self.rate_limiter.update_from_headers(self.config.api_key, self.config.model, status_code, headers)
+    
+    def _observe_usage(self, reserved_tokens: int, usage: Optional[Dict]):
+        """Return unused reserved tokens to the shared budget (or charge the excess)"""
+        if usage:
+            self.rate_limiter.record_usage(
+                self.config.api_key,
+                self.config.model,
+                reserved_tokens,
+                usage.get("total_tokens", reserved_tokens)
+            )
     
-    def _wait_for_rate_limit(self):
-        """Wait if needed to respect rate limits"""
-        if self._last_request_time > 0:
-            elapsed = time.time() - self._last_request_time
-            if elapsed < self._min_request_interval:
-                wait_time = self._min_request_interval - elapsed
-                logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-                time.sleep(wait_time)
+    def _cached_content(self, payload: Dict[str, Any], cache_ttl: Optional[int]) -> Optional[str]:
+        """
+        Look up a cached completion for a request
+        
+        Cache hits are counted separately and never add to the request,
+        token or cost statistics.
+        
+        Args:
+            payload: Request body
+            cache_ttl: The caller's cache TTL (None means the call is not cached)
+            
+        Returns:
+            Cached completion text, or None
+        """
+        if not cache_ttl:
+            return None
+        
+        cached = self.response_cache.get(payload)
+        if cached is None:
+            return None
+        
+        self._stats["cached_responses"] += 1
+        logger.info(f"Serving cached response for model {self.config.model}")
+        return cached.content
+    
+    def _cache_content(
+        self,
+        payload: Dict[str, Any],
+        cache_ttl: Optional[int],
+        content: str,
+        usage: Optional[Dict] = None
+    ):
+        """Store a completion for calls made with a cache_ttl"""
+        if cache_ttl and content:
+            self.response_cache.set(payload, content, usage, ttl=cache_ttl)
     
     def _update_stats(self, success: bool, usage: Optional[Dict] = None, error: Optional[str] = None):
         """Update usage statistics"""
@@ -108,6 +316,117 @@ class OpenRouterClient:
                     "error": error
                 })
     
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """
+        Get usage statistics
+        
+        Returns:
+            Dictionary with usage statistics
+        """
+        stats = self._stats.copy()
+        stats["uptime_seconds"] = (datetime.now(timezone.utc) - stats["start_time"]).total_seconds()
+        stats["start_time"] = stats["start_time"].isoformat()
+        
+        # Calculate success rate
+        if stats["requests"] > 0:
+            stats["success_rate"] = stats["successful_requests"] / stats["requests"]
+        else:
+            stats["success_rate"] = 0.0
+        
+        return stats
+    
+    def reset_stats(self):
+        """Reset usage statistics"""
+        self._stats = {
+            "requests": 0,
+            "successful_requests": 0,
+            "failed_requests": 0,
+            "total_tokens": 0,
+            "total_prompt_tokens": 0,
+            "total_completion_tokens": 0,
+            "total_cost": 0.0,
+            "cached_responses": 0,
+            "coalesced_responses": 0,
+            "errors": [],
+            "start_time": datetime.now(timezone.utc)
+        }
+        logger.info("Usage statistics reset")
+
+
+class OpenRouterClient(BaseOpenRouterClient):
+    """
+    Client for OpenRouter API with advanced features:
+    - Rate limiting
+    - Error handling
+    - Retry logic with exponential backoff
+    - Usage tracking
+    - Opt-in response caching
+    - Coalescing of concurrent identical requests
+    - Pooled keep-alive connections
+    - Streaming support
+    - Detailed logging
+    """
+    
+    def __init__(
+        self,
+        config: Optional[OpenRouterConfig] = None,
+        rate_limiter: Optional[DistributedRateLimiter] = None,
+        response_cache: Optional[LLMResponseCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        session: Optional[requests.Session] = None
+    ):
+        """
+        Initialize OpenRouter client
+        
+        Args:
+            config: OpenRouter configuration (defaults to environment-based config)
+            rate_limiter: Budget shared with every other client of the API key
+                (defaults to the process-wide, Redis-backed limiter)
+            response_cache: Cache for calls made with a cache_ttl
+                (defaults to the process-wide LLM response cache)
+            single_flight: Coalesces concurrent identical requests
+                (defaults to the process-wide instance)
+            session: HTTP session whose connections are reused across
+                requests (defaults to the process-wide session)
+        """
+        super().__init__(config, rate_limiter, response_cache)
+        self.single_flight = single_flight or get_single_flight()
+        self.session = session or get_http_session()
+        
+        # Rate limiting: the shared budget is enforced by the rate limiter;
+        # this optional gap only spaces out this instance's own requests
+        self._last_request_time = 0
+        self._min_request_interval = 0.0
+        self._rate_limit_lock = threading.Lock()
+        
+        logger.info(f"OpenRouter client initialized with model: {self.config.model}")
+    
+    def _wait_for_rate_limit(self, payload: Dict[str, Any]) -> int:
+        """
+        Wait if needed to respect rate limits
+        
+        Args:
+            payload: Request body
+            
+        Returns:
+            Tokens reserved for the request
+        """
+        # Serialize callers so concurrent requests are spaced out too
+        with self._rate_limit_lock:
+            if self._last_request_time > 0:
+                elapsed = time.time() - self._last_request_time
+                if elapsed < self._min_request_interval:
+                    wait_time = self._min_request_interval - elapsed
+                    logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
+                    time.sleep(wait_time)
+            self._last_request_time = time.time()
+        
+        # Queue for the budget shared across workers (reserved in arrival order)
+        tokens, wait = self._reserve(payload)
+        if wait > 0:
+            time.sleep(wait)
+        return tokens
+    
     def _make_request(
         self,
         messages: list[Dict[str, str]],
@@ -134,18 +453,8 @@ class OpenRouterClient:
             APIException: If API returns an error
             RequestException: If request fails
         """
-        self._wait_for_rate_limit()
-        
-        payload = {
-            "model": self.config.model,
-            "messages": messages,
-            "temperature": temperature or self.config.temperature,
-            "max_tokens": max_tokens or self.config.max_tokens,
-            "top_p": top_p or self.config.top_p,
-        }
-        
-        if stream:
-            payload["stream"] = True
+        payload = self._build_payload(messages, temperature, max_tokens, top_p, stream)
+        reserved_tokens = self._wait_for_rate_limit(payload)
         
         url = f"{self.config.base_url}/chat/completions"
         headers = self.config.get_headers()
@@ -154,7 +463,7 @@ class OpenRouterClient:
         logger.debug(f"Payload: {json.dumps(payload, indent=2)}")
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 url=url,
                 headers=headers,
                 json=payload,
@@ -163,6 +472,7 @@ class OpenRouterClient:
             )
             
             self._last_request_time = time.time()
+            self._observe_response(response.status_code, response.headers)
             
             # Check for rate limiting
             if response.status_code == 429:
@@ -178,6 +488,7 @@ class OpenRouterClient:
                 return response
             else:
                 result = response.json()
+                self._observe_usage(reserved_tokens, result.get("usage"))
                 logger.info(f"Request successful. Status: {response.status_code}")
                 logger.debug(f"Response: {json.dumps(result, indent=2)}")
                 return result
@@ -204,17 +515,25 @@ class OpenRouterClient:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        top_p: Optional[float] = None
+        top_p: Optional[float] = None,
+        cache_ttl: Optional[int] = None
     ) -> str:
         """
         Generate text from a prompt
         
+        Identical calls made while one is in flight (in this or another
+        worker) wait for it and return its text instead of sending a request.
+        
         Args:
             prompt: User prompt
             system_prompt: Optional system prompt
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
             top_p: Top-p for diversity
+            cache_ttl: Seconds to keep the response in the response cache;
+                an identical call (same model, messages and sampling
+                parameters) within that time is answered without a request.
+                None disables caching for the call
             
         Returns:
             Generated text
@@ -222,12 +541,51 @@ class OpenRouterClient:
         Raises:
             OpenRouterException: If generation fails
         """
-        messages = []
+        return self.generate_completion(
+            prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=top_p,
+            cache_ttl=cache_ttl
+        ).content
+    
+    def generate_completion(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        top_p: Optional[float] = None,
+        cache_ttl: Optional[int] = None
+    ) -> Completion:
+        """
+        Generate text from a prompt, with the usage and finish reason
         
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
+        Same as generate_text, for callers that budget tokens or continue
+        truncated output. Cached responses have no finish reason.
         
-        messages.append({"role": "user", "content": prompt})
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Temperature for generation
+            max_tokens: Maximum tokens to generate
+            top_p: Top-p for diversity
+            cache_ttl: Seconds to keep the response in the response cache
+                (None disables caching for the call)
+            
+        Returns:
+            Completion with the generated text
+            
+        Raises:
+            OpenRouterException: If generation fails
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        payload = self._build_payload(messages, temperature, max_tokens, top_p)
+        
+        cached = self._cached_content(payload, cache_ttl)
+        if cached is not None:
+            return Completion(content=cached)
         
         def _generate():
             return self._make_request(
@@ -238,23 +596,41 @@ class OpenRouterClient:
                 stream=False
             )
         
-        try:
+        executed = False
+        
+        def _generate_completion() -> Completion:
+            nonlocal executed
+            executed = True
+            
             # Use retry handler for the request
             result = self.retry_handler.execute(
                 _generate,
                 retry_on=(RequestException, APIException, RateLimitException)
             )
             
-            # Extract text from response
-            content = result["choices"][0]["message"]["content"]
+            completion = Completion.from_result(result)
             
             # Update stats with usage info
-            usage = result.get("usage", {})
-            self._update_stats(success=True, usage=usage)
+            self._update_stats(success=True, usage=completion.usage)
+            self._cache_content(payload, cache_ttl, completion.content, completion.usage)
+            
+            logger.info(f"Generated {completion.usage.get('completion_tokens', 0)} tokens")
             
-            logger.info(f"Generated {usage.get('completion_tokens', 0)} tokens")
+            return completion
+        
+        try:
+            completion = self.single_flight.do(
+                f"openrouter:{response_key(payload)}",
+                _generate_completion,
+                encode=asdict,
+                decode=lambda data: Completion(**data)
+            )
+            
+            # Requests made by another caller are not counted as ours
+            if not executed:
+                self._stats["coalesced_responses"] += 1
             
-            return content
+            return completion
             
         except Exception as e:
             logger.error(f"Text generation failed: {str(e)}")
@@ -266,7 +642,8 @@ class OpenRouterClient:
         system_prompt: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
-        top_p: Optional[float] = None
+        top_p: Optional[float] = None,
+        on_complete: Optional[Callable[[Completion], None]] = None
     ) -> Iterator[str]:
         """
         Generate text with streaming response
@@ -277,6 +654,8 @@ class OpenRouterClient:
             temperature: Temperature for generation
             max_tokens: Maximum tokens to generate
             top_p: Top-p for diversity
+            on_complete: Called once the stream is fully read, with the
+                joined text and the finish reason and usage of the final chunks
             
         Yields:
             Chunks of generated text
@@ -284,12 +663,7 @@ class OpenRouterClient:
         Raises:
             OpenRouterException: If generation fails
         """
-        messages = []
-        
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        
-        messages.append({"role": "user", "content": prompt})
+        messages = self._build_messages(prompt, system_prompt)
         
         try:
             response = self._make_request(
@@ -302,60 +676,28 @@ class OpenRouterClient:
             
             logger.info("Starting streaming response")
             
-            for line in response.iter_lines():
-                if line:
-                    line = line.decode('utf-8')
-                    if line.startswith('data: '):
-                        data = line[6:]  # Remove 'data: ' prefix
-                        if data == '[DONE]':
+            completion = Completion(content="")
+            parts = []
+            try:
+                for line in response.iter_lines():
+                    if line:
+                        done, content = self._parse_stream_line(line.decode('utf-8'), completion)
+                        if done:
                             break
-                        try:
-                            chunk = json.loads(data)
-                            if 'choices' in chunk and len(chunk['choices']) > 0:
-                                delta = chunk['choices'][0].get('delta', {})
-                                if 'content' in delta:
-                                    yield delta['content']
-                        except json.JSONDecodeError:
-                            logger.warning(f"Failed to parse streaming chunk: {data}")
+                        if content is not None:
+                            parts.append(content)
+                            yield content
+            finally:
+                # Hand the connection back to the pool, also when the caller stops early
+                response.close()
             
-            self._update_stats(success=True)
+            completion.content = "".join(parts)
+            self._update_stats(success=True, usage=completion.usage)
             logger.info("Streaming completed successfully")
+            if on_complete:
+                on_complete(completion)
             
         except Exception as e:
             logger.error(f"Streaming generation failed: {str(e)}")
             self._update_stats(success=False, error=str(e))
             raise OpenRouterException(f"Streaming generation failed: {str(e)}") from e
-    
-    def get_usage_stats(self) -> Dict[str, Any]:
-        """
-        Get usage statistics
-        
-        Returns:
-            Dictionary with usage statistics
-        """
-        stats = self._stats.copy()
-        stats["uptime_seconds"] = (datetime.now(timezone.utc) - stats["start_time"]).total_seconds()
-        stats["start_time"] = stats["start_time"].isoformat()
-        
-        # Calculate success rate
-        if stats["requests"] > 0:
-            stats["success_rate"] = stats["successful_requests"] / stats["requests"]
-        else:
-            stats["success_rate"] = 0.0
-        
-        return stats
-    
-    def reset_stats(self):
-        """Reset usage statistics"""
-        self._stats = {
-            "requests": 0,
-            "successful_requests": 0,
-            "failed_requests": 0,
-            "total_tokens": 0,
-            "total_prompt_tokens": 0,
-            "total_completion_tokens": 0,
-            "total_cost": 0.0,
-            "errors": [],
-            "start_time": datetime.now(timezone.utc)
-        }
-        logger.info("Usage statistics reset")
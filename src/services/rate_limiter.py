@@ -0,0 +1,529 @@
+"""
+Cluster-wide token-bucket rate limiter for OpenRouter
+
+Every request takes one token from a requests-per-minute bucket and its
+estimated token count from a tokens-per-minute bucket, for two scopes: the
+API key (shared by every model) and the model. The buckets live in Redis
+and are updated by Lua scripts, so all Celery workers and API processes
+draw from the same budget.
+
+Waiters are queued fairly: a request reserves its tokens immediately, even
+if that drives a bucket below zero, and is told how long to wait until the
+deficit is refilled. Later requests queue behind it, so requests are served
+in arrival order without polling.
+
+Budgets adapt to the provider's responses: Retry-After and X-RateLimit-*
+headers pause a model's requests until the provider accepts them again, or
+cap its bucket at the remaining requests the provider reports.
+
+If Redis is unreachable the same buckets are kept in process memory.
+"""
+import email.utils
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Seconds of budget a bucket can accumulate while idle
+DEFAULT_BURST_SECONDS = 10.0
+# Longer waits are refused instead of reserved
+DEFAULT_MAX_WAIT = 120.0
+# Seconds before Redis is tried again after an error
+REDIS_RETRY_INTERVAL = 30.0
+# OpenRouter limits free model variants to 20 requests per minute
+FREE_MODEL_REQUESTS_PER_MINUTE = 20.0
+
+# KEYS[1] holds the time a pause ends; refill every other bucket in KEYS, then take
+# the costs if the longest wait is acceptable.
+# ARGV: max_wait, then capacity, rate (per second) and cost for each bucket.
+# Returns {granted, wait} (the wait as a string: Lua numbers are truncated to integers).
+ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local max_wait = tonumber(ARGV[1])
+local wait = math.max(0, tonumber(redis.call('GET', KEYS[1]) or '0') - now)
+local balances = {}
+for i = 2, #KEYS do
+    local key = KEYS[i]
+    local base = 1 + (i - 2) * 3
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local balance = tokens - cost
+    if balance < 0 then
+        wait = math.max(wait, -balance / rate)
+    end
+    balances[i] = {tokens, balance, capacity, rate}
+end
+local granted = wait <= max_wait
+for i = 2, #KEYS do
+    local tokens = balances[i][1]
+    if granted then
+        tokens = balances[i][2]
+    end
+    local ttl = math.ceil(((balances[i][3] - tokens) / balances[i][4] + 60) * 1000)
+    redis.call('HSET', KEYS[i], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('PEXPIRE', KEYS[i], ttl)
+end
+return {granted and 1 or 0, tostring(wait)}
+"""
+
+# Refill a bucket, add delta and cap it at ceiling (which may be negative).
+# ARGV: capacity, rate (per second), delta, ceiling.
+UPDATE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+tokens = math.min(capacity, tokens + tonumber(ARGV[3]), tonumber(ARGV[4]))
+local ttl = math.ceil(((capacity - tokens) / rate + 60) * 1000)
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ttl)
+return tostring(tokens)
+"""
+
+# Pause KEYS[1] for ARGV[1] seconds, unless it is already paused for longer
+PAUSE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local seconds = tonumber(ARGV[1])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+if now + seconds > current then
+    redis.call('SET', KEYS[1], tostring(now + seconds), 'PX', math.ceil(seconds * 1000) + 1000)
+end
+return tostring(math.max(now + seconds, current))
+"""
+
+
+@dataclass
+class RateLimitBudget:
+    """Requests and tokens allowed per minute (None for no limit)"""
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+
+@dataclass
+class Reservation:
+    """Result of an acquire() call"""
+    granted: bool
+    # Seconds to wait before sending (if granted) or until the budget allows it
+    wait: float
+
+
+@dataclass
+class _Bucket:
+    key: str
+    capacity: float
+    rate: float  # Tokens per second
+
+
+class _LocalBuckets:
+    """In-process buckets with the same arithmetic as the Lua scripts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._pauses: Dict[str, float] = {}
+
+    def _refill(self, bucket: _Bucket, now: float) -> float:
+        tokens, ts = self._state.get(bucket.key, (bucket.capacity, now))
+        return min(bucket.capacity, tokens + max(0.0, now - ts) * bucket.rate)
+
+    def acquire(self, pause_key: str, buckets: List[Tuple[_Bucket, float]], max_wait: float) -> Reservation:
+        with self._lock:
+            now = time.time()
+            wait = max(0.0, self._pauses.get(pause_key, 0.0) - now)
+            balances = []
+            for bucket, cost in buckets:
+                tokens = self._refill(bucket, now)
+                balance = tokens - cost
+                if balance < 0:
+                    wait = max(wait, -balance / bucket.rate)
+                balances.append((tokens, balance))
+
+            granted = wait <= max_wait
+            for (bucket, _), (tokens, balance) in zip(buckets, balances):
+                self._state[bucket.key] = (balance if granted else tokens, now)
+            return Reservation(granted=granted, wait=wait)
+
+    def update(self, bucket: _Bucket, delta: float, ceiling: float) -> float:
+        with self._lock:
+            now = time.time()
+            tokens = self._refill(bucket, now)
+            tokens = min(bucket.capacity, tokens + delta, ceiling)
+            self._state[bucket.key] = (tokens, now)
+            return tokens
+
+    def pause(self, pause_key: str, seconds: float):
+        with self._lock:
+            self._pauses[pause_key] = max(self._pauses.get(pause_key, 0.0), time.time() + seconds)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header
+
+    Args:
+        value: Header value, in seconds or as an HTTP date
+        now: Current time (defaults to time.time())
+
+    Returns:
+        Seconds to wait, or None if missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, AttributeError):
+        return None
+    return max(0.0, retry_at - (now if now is not None else time.time()))
+
+
+def estimate_request_tokens(messages: List[Dict[str, str]], max_tokens: int) -> int:
+    """
+    Tokens a completion may consume, reserved before it is sent
+
+    Args:
+        messages: Chat messages (about four characters per token)
+        max_tokens: Completion limit of the request
+
+    Returns:
+        Estimated prompt tokens plus max_tokens
+    """
+    return sum(len(message.get("content", "")) for message in messages) // 4 + max_tokens
+
+
+class DistributedRateLimiter:
+    """
+    Token buckets per API key and model, shared through Redis
+
+    Use get_rate_limiter() to share one instance per process.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[Any] = None,
+        key_budget: Optional[RateLimitBudget] = None,
+        model_budgets: Optional[Dict[str, RateLimitBudget]] = None,
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        prefix: str = "bookgen:ratelimit"
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            redis_client: Redis client (None keeps the buckets in process memory)
+            key_budget: Budget of an API key across all models
+            model_budgets: Budgets per model; models without an entry are
+                only limited by the key budget (":free" models by
+                FREE_MODEL_REQUESTS_PER_MINUTE) and by provider feedback
+            burst_seconds: Seconds of budget a bucket can save up while idle
+            max_wait: Longest wait a reservation is granted for
+            prefix: Redis key prefix
+        """
+        self.redis_client = redis_client
+        self.key_budget = key_budget or RateLimitBudget()
+        self.model_budgets = model_budgets or {}
+        self.burst_seconds = burst_seconds
+        self.max_wait = max_wait
+        self.prefix = prefix
+
+        self._local = _LocalBuckets()
+        self._scripts: Dict[str, Any] = {}
+        self._redis_retry_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def budget_for(self, model: str) -> RateLimitBudget:
+        """
+        Get the budget of a model
+
+        Args:
+            model: Model identifier
+
+        Returns:
+            RateLimitBudget
+        """
+        budget = self.model_budgets.get(model)
+        if budget is not None:
+            return budget
+        if model.endswith(":free"):
+            return RateLimitBudget(requests_per_minute=FREE_MODEL_REQUESTS_PER_MINUTE)
+        return RateLimitBudget()
+
+    def acquire(self, api_key: str, model: str, tokens: int = 0) -> Reservation:
+        """
+        Reserve one request and its tokens from every applicable bucket
+
+        A granted reservation is final: sleep for its wait, then send.
+
+        Args:
+            api_key: API key the request is sent with
+            model: Model identifier
+            tokens: Estimated tokens of the request (prompt plus max_tokens)
+
+        Returns:
+            Reservation
+        """
+        costs = []
+        for scope, budget in self._scopes(api_key, model):
+            request_bucket = self._bucket(scope, "rpm", budget.requests_per_minute)
+            if request_bucket is not None:
+                costs.append((request_bucket, 1.0))
+            token_bucket = self._bucket(scope, "tpm", budget.tokens_per_minute)
+            if token_bucket is not None and tokens > 0:
+                costs.append((token_bucket, float(tokens)))
+        pause_key = self._pause_key(api_key, model)
+
+        client = self._redis()
+        if client is not None:
+            try:
+                args: List[Any] = [self.max_wait]
+                for bucket, cost in costs:
+                    args.extend([bucket.capacity, bucket.rate, cost])
+                granted, wait = self._script(client, "acquire", ACQUIRE_SCRIPT)(
+                    keys=[pause_key] + [bucket.key for bucket, _ in costs],
+                    args=args
+                )
+                return Reservation(granted=bool(int(granted)), wait=float(wait))
+            except redis.RedisError as e:
+                self._redis_failed(e)
+
+        return self._local.acquire(pause_key, costs, self.max_wait)
+
+    def record_usage(self, api_key: str, model: str, reserved_tokens: int, used_tokens: int):
+        """
+        Correct the token buckets once the actual usage of a request is known
+
+        Args:
+            api_key: API key the request was sent with
+            model: Model identifier
+            reserved_tokens: Tokens reserved by acquire()
+            used_tokens: Tokens reported by the response
+        """
+        delta = reserved_tokens - used_tokens
+        if not delta:
+            return
+        for scope, budget in self._scopes(api_key, model):
+            bucket = self._bucket(scope, "tpm", budget.tokens_per_minute)
+            if bucket is not None:
+                self._update(bucket, delta=delta, ceiling=bucket.capacity)
+
+    def update_from_headers(
+        self,
+        api_key: str,
+        model: str,
+        status_code: int,
+        headers: Mapping[str, str]
+    ) -> Optional[float]:
+        """
+        Adapt to the provider's rate-limit feedback
+
+        - 429/503 responses pause the model's requests for Retry-After
+          seconds, or until X-RateLimit-Reset. Without either header the
+          model's request bucket is emptied instead.
+        - X-RateLimit-Remaining caps the model's request bucket, and a
+          remaining count of 0 pauses it until X-RateLimit-Reset.
+
+        Args:
+            api_key: API key the request was sent with
+            model: Model identifier
+            status_code: HTTP status of the response
+            headers: Response headers (case-insensitive mapping)
+
+        Returns:
+            Seconds requests are paused for, or None
+        """
+        now = time.time()
+        retry_after = parse_retry_after(headers.get("Retry-After"), now)
+        reset_in = self._reset_in(headers.get("X-RateLimit-Reset"), now)
+        remaining = self._number(headers.get("X-RateLimit-Remaining"))
+
+        pause = None
+        if status_code in (429, 503):
+            pause = retry_after if retry_after is not None else reset_in
+            if pause is None and status_code == 429:
+                remaining = 0.0
+        elif remaining is not None and remaining <= 0:
+            pause = reset_in if reset_in is not None else retry_after
+
+        if pause:
+            self._pause(self._pause_key(api_key, model), pause)
+            logger.warning(f"OpenRouter rate limit for {model}: pausing requests for {pause:.1f}s")
+            return pause
+
+        if remaining is not None:
+            scope, budget = self._scopes(api_key, model)[1]
+            bucket = self._bucket(scope, "rpm", budget.requests_per_minute)
+            if bucket is not None:
+                self._update(bucket, delta=0.0, ceiling=remaining)
+        return None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _scopes(self, api_key: str, model: str) -> List[Tuple[str, RateLimitBudget]]:
+        key_id = hashlib.sha1(api_key.encode("utf-8")).hexdigest()[:12]
+        return [
+            (f"key:{key_id}", self.key_budget),
+            (f"model:{key_id}:{model}", self.budget_for(model)),
+        ]
+
+    def _bucket(self, scope: str, kind: str, per_minute: Optional[float]) -> Optional[_Bucket]:
+        if not per_minute:
+            return None
+        rate = per_minute / 60.0
+        return _Bucket(
+            key=f"{self.prefix}:{scope}:{kind}",
+            capacity=max(1.0, rate * self.burst_seconds),
+            rate=rate
+        )
+
+    def _pause_key(self, api_key: str, model: str) -> str:
+        scope = self._scopes(api_key, model)[1][0]
+        return f"{self.prefix}:{scope}:pause"
+
+    def _update(self, bucket: _Bucket, delta: float, ceiling: float):
+        client = self._redis()
+        if client is not None:
+            try:
+                self._script(client, "update", UPDATE_SCRIPT)(
+                    keys=[bucket.key],
+                    args=[bucket.capacity, bucket.rate, delta, ceiling]
+                )
+                return
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        self._local.update(bucket, delta, ceiling)
+
+    def _pause(self, pause_key: str, seconds: float):
+        client = self._redis()
+        if client is not None:
+            try:
+                self._script(client, "pause", PAUSE_SCRIPT)(keys=[pause_key], args=[seconds])
+                return
+            except redis.RedisError as e:
+                self._redis_failed(e)
+        self._local.pause(pause_key, seconds)
+
+    def _redis(self) -> Optional[Any]:
+        if self.redis_client is None or time.time() < self._redis_retry_at:
+            return None
+        return self.redis_client
+
+    def _redis_failed(self, error: Exception):
+        logger.warning(
+            f"Rate limiter cannot reach Redis ({error}); using process-local buckets "
+            f"for {REDIS_RETRY_INTERVAL:.0f}s"
+        )
+        self._redis_retry_at = time.time() + REDIS_RETRY_INTERVAL
+
+    def _script(self, client: Any, name: str, source: str) -> Any:
+        script = self._scripts.get(name)
+        if script is None:
+            script = self._scripts[name] = client.register_script(source)
+        return script
+
+    @staticmethod
+    def _number(value: Optional[str]) -> Optional[float]:
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def _reset_in(self, value: Optional[str], now: float) -> Optional[float]:
+        """Seconds until an X-RateLimit-Reset timestamp (milliseconds or seconds)"""
+        reset = self._number(value)
+        if reset is None:
+            return None
+        if reset > 1e11:
+            reset /= 1000.0
+        return max(0.0, reset - now)
+
+
+def _budget_from_env(rpm_var: str, tpm_var: str) -> RateLimitBudget:
+    rpm = os.getenv(rpm_var)
+    tpm = os.getenv(tpm_var)
+    return RateLimitBudget(
+        requests_per_minute=float(rpm) if rpm else None,
+        tokens_per_minute=float(tpm) if tpm else None
+    )
+
+
+_limiter: Optional[DistributedRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> DistributedRateLimiter:
+    """
+    Get the process-wide rate limiter (singleton pattern)
+
+    Configured from the environment:
+    - OPENROUTER_RATE_LIMIT_RPM / OPENROUTER_RATE_LIMIT_TPM: API key budget
+      (default 60 requests per minute, no token limit)
+    - OPENROUTER_MODEL_RATE_LIMITS: JSON object of per-model budgets, e.g.
+      {"openai/gpt-4o": {"rpm": 30, "tpm": 150000}}
+    - RATE_LIMIT_BACKEND=memory keeps the buckets in process memory
+
+    Returns:
+        DistributedRateLimiter instance
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            key_budget = _budget_from_env("OPENROUTER_RATE_LIMIT_RPM", "OPENROUTER_RATE_LIMIT_TPM")
+            if key_budget.requests_per_minute is None:
+                key_budget.requests_per_minute = 60.0
+
+            model_budgets = {}
+            try:
+                for model, limits in json.loads(os.getenv("OPENROUTER_MODEL_RATE_LIMITS", "{}")).items():
+                    model_budgets[model] = RateLimitBudget(
+                        requests_per_minute=limits.get("rpm"),
+                        tokens_per_minute=limits.get("tpm")
+                    )
+            except (ValueError, AttributeError) as e:
+                logger.error(f"Invalid OPENROUTER_MODEL_RATE_LIMITS: {e}")
+
+            redis_client = None
+            if os.getenv("RATE_LIMIT_BACKEND", "redis").lower() == "redis":
+                from ..cache.redis_cache import get_cache
+                redis_client = get_cache().client
+
+            _limiter = DistributedRateLimiter(
+                redis_client=redis_client,
+                key_budget=key_budget,
+                model_budgets=model_budgets
+            )
+        return _limiter
+
+
+def reset_rate_limiter():
+    """Drop the process-wide rate limiter (useful for testing)"""
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
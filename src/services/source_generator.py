@@ -1,23 +1,35 @@
 """
 Automatic source generator service using AI and multiple strategies
 """
+import hashlib
 import logging
 import json
-from typing import List, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Any, Optional, Tuple
 from collections import defaultdict
 
 from ..services.openrouter_client import OpenRouterClient, OpenRouterException
 from ..services.source_validator import SourceValidationService
+from ..cache.page_cache import PageCache, get_page_cache
+from ..cache.single_flight import SingleFlight, get_single_flight
 from ..api.models.sources import SourceItem
 from ..api.models.source_generation import (
     CharacterAnalysis,
     AutomaticSourceGenerationRequest
 )
-from ..strategies.source_strategy import SourceStrategy
+from ..strategies.source_strategy import SourceStrategy, StrategyCancelled, cancellation_scope
 from ..strategies.wikipedia_strategy import WikipediaStrategy
+from ..config.trusted_domains import get_domain_credibility_score
+from ..utils.near_duplicates import NearDuplicateDetector
+from ..utils.url_utils import extract_domain, normalize_url
 
 logger = logging.getLogger(__name__)
 
+# Character analyses are reused by retried and regenerated jobs for this long
+CHARACTER_ANALYSIS_CACHE_TTL = 30 * 24 * 3600
+
 
 class AutomaticSourceGenerator:
     """
@@ -33,7 +45,11 @@ class AutomaticSourceGenerator:
     def __init__(
         self,
         openrouter_client: OpenRouterClient = None,
-        source_validator: SourceValidationService = None
+        source_validator: SourceValidationService = None,
+        strategy_timeout: float = 30.0,
+        page_cache: Optional[PageCache] = None,
+        duplicate_detector: Optional[NearDuplicateDetector] = None,
+        single_flight: Optional[SingleFlight] = None
     ):
         """
         Initialize the automatic source generator
@@ -41,9 +57,20 @@ class AutomaticSourceGenerator:
         Args:
             openrouter_client: OpenRouter client for AI analysis (creates default if None)
             source_validator: Source validation service (creates default if None)
+            strategy_timeout: Deadline in seconds for each search strategy
+            page_cache: Fetched-page cache holding the text of validated
+                pages (uses the shared cache if None)
+            duplicate_detector: Near-duplicate detector for fetched pages
+                (creates default if None)
+            single_flight: Coalesces identical strategy searches running
+                concurrently for another request (uses the shared instance if None)
         """
         self.openrouter_client = openrouter_client or OpenRouterClient()
         self.source_validator = source_validator or SourceValidationService()
+        self.strategy_timeout = strategy_timeout
+        self.page_cache = page_cache or get_page_cache()
+        self.duplicate_detector = duplicate_detector or NearDuplicateDetector()
+        self.single_flight = single_flight or get_single_flight()
         
         # Initialize search strategies
         self.search_strategies: List[SourceStrategy] = [
@@ -80,9 +107,11 @@ class AutomaticSourceGenerator:
             logger.info(f"Character analysis complete for {character_name}")
             
             # Step 2: Generate sources using all strategies
-            candidate_sources = self._generate_sources_from_strategies(
+            candidate_sources, strategy_report = self._generate_sources_from_strategies(
                 character_name,
-                character_analysis
+                character_analysis,
+                min_sources=request.min_sources,
+                min_credibility=request.min_credibility
             )
             logger.info(f"Generated {len(candidate_sources)} candidate sources")
             
@@ -114,7 +143,9 @@ class AutomaticSourceGenerator:
                     'total_candidates': len(candidate_sources),
                     'valid_sources': validated_result['valid_count'],
                     'final_count': len(final_sources),
-                    'meets_minimum': len(final_sources) >= request.min_sources
+                    'meets_minimum': len(final_sources) >= request.min_sources,
+                    'strategies': strategy_report['strategies'],
+                    'early_terminated': strategy_report['early_terminated']
                 }
             }
         
@@ -163,7 +194,8 @@ Example format:
                 prompt=prompt,
                 system_prompt=system_prompt,
                 temperature=0.3,  # Low temperature for factual information
-                max_tokens=1000
+                max_tokens=1000,
+                cache_ttl=CHARACTER_ANALYSIS_CACHE_TTL
             )
             
             # Parse JSON response
@@ -221,42 +253,185 @@ Example format:
     def _generate_sources_from_strategies(
         self,
         character_name: str,
-        character_analysis: CharacterAnalysis
-    ) -> List[SourceItem]:
+        character_analysis: CharacterAnalysis,
+        min_sources: Optional[int] = None,
+        min_credibility: float = 80.0
+    ) -> Tuple[List[SourceItem], Dict[str, Any]]:
         """
-        Generate sources using all available strategies
+        Generate sources using all available strategies concurrently
+        
+        Strategies run in parallel, each with a deadline of strategy_timeout
+        seconds. Results are de-duplicated by normalized URL as each strategy finishes,
+        and remaining strategies are cancelled once min_sources high-quality
+        candidates have been collected. Cancelled and timed-out strategies are
+        signalled to stop before their next request. The report is keyed by a
+        unique id per strategy (its name, suffixed with "#<n>" for repeats).
         
         Args:
             character_name: Name of the character
             character_analysis: AI analysis of the character
+            min_sources: Stop early after this many high-quality candidates
+            min_credibility: Domain credibility that makes a candidate high-quality
             
         Returns:
-            Combined list of sources from all strategies
+            Tuple of (unique sources, report with per-strategy latency/status)
         """
-        all_sources = []
+        unique_sources = []
+        seen_urls = set()
+        high_quality_count = 0
+        strategies_report: Dict[str, Dict[str, Any]] = {}
+        early_terminated = False
         
-        for strategy in self.search_strategies:
-            try:
-                logger.info(f"Running {strategy.get_strategy_name()}...")
-                sources = strategy.search(character_name, character_analysis)
-                all_sources.extend(sources)
-                logger.info(f"{strategy.get_strategy_name()} found {len(sources)} sources")
-            except Exception as e:
-                logger.error(f"Error in {strategy.get_strategy_name()}: {e}")
-                continue
+        if not self.search_strategies:
+            return unique_sources, {'strategies': strategies_report, 'early_terminated': False}
         
-        # Remove duplicates based on URL
-        seen_urls = set()
-        unique_sources = []
-        for source in all_sources:
-            if source.url and source.url in seen_urls:
-                continue
-            if source.url:
-                seen_urls.add(source.url)
-            unique_sources.append(source)
+        start_time = time.perf_counter()
+        executor = ThreadPoolExecutor(
+            max_workers=len(self.search_strategies),
+            thread_name_prefix="source-strategy"
+        )
+        report_keys = self._strategy_report_keys(self.search_strategies)
+        cancel_events = [threading.Event() for _ in self.search_strategies]
+        future_to_index = {
+            executor.submit(
+                self._run_strategy, strategy, character_name, character_analysis, cancel_events[index]
+            ): index
+            for index, strategy in enumerate(self.search_strategies)
+        }
+        pending = set(future_to_index)
+        
+        try:
+            while pending:
+                remaining = self.strategy_timeout - (time.perf_counter() - start_time)
+                if remaining <= 0:
+                    break
+                
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    sources, latency, error = future.result()
+                    strategies_report[report_keys[future_to_index[future]]] = {
+                        'status': 'failed' if error else 'completed',
+                        'latency_seconds': round(latency, 3),
+                        'sources': len(sources)
+                    }
+                    
+                    # Stream results into URL de-duplication
+                    for source in sources:
+                        url_key = normalize_url(source.url) if source.url else None
+                        if url_key and url_key in seen_urls:
+                            continue
+                        if url_key:
+                            seen_urls.add(url_key)
+                            if self._is_high_quality_candidate(source, min_credibility):
+                                high_quality_count += 1
+                        unique_sources.append(source)
+                
+                if min_sources and high_quality_count >= min_sources:
+                    early_terminated = True
+                    logger.info(
+                        f"Collected {high_quality_count} high-quality candidates, "
+                        f"cancelling {len(pending)} remaining strategies"
+                    )
+                    break
+        finally:
+            elapsed = round(time.perf_counter() - start_time, 3)
+            for future in pending:
+                index = future_to_index[future]
+                future.cancel()
+                cancel_events[index].set()
+                if not early_terminated:
+                    logger.warning(f"{report_keys[index]} exceeded {self.strategy_timeout}s deadline")
+                strategies_report[report_keys[index]] = {
+                    'status': 'cancelled' if early_terminated else 'timeout',
+                    'latency_seconds': elapsed,
+                    'sources': 0
+                }
+            executor.shutdown(wait=False, cancel_futures=True)
         
         logger.info(f"Total unique sources: {len(unique_sources)}")
-        return unique_sources
+        return unique_sources, {
+            'strategies': strategies_report,
+            'early_terminated': early_terminated
+        }
+    
+    def _run_strategy(
+        self,
+        strategy: SourceStrategy,
+        character_name: str,
+        character_analysis: CharacterAnalysis,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Tuple[List[SourceItem], float, Optional[BaseException]]:
+        """
+        Run a single strategy, capturing its latency and any error
+        
+        An identical search already running for another request (in this
+        or another worker) is joined instead of repeated.
+        
+        Args:
+            strategy: Strategy to run
+            character_name: Name of the character
+            character_analysis: AI analysis of the character
+            cancel_event: Set once the caller stops waiting for the strategy
+            
+        Returns:
+            Tuple of (sources, latency in seconds, error or None)
+        """
+        start_time = time.perf_counter()
+        try:
+            logger.info(f"Running {strategy.get_strategy_name()}...")
+            cancel_event = cancel_event or threading.Event()
+            # The scope only reaches a search this call leads; a cancelled
+            # leader's search is re-run by the callers that joined it
+            with cancellation_scope(cancel_event):
+                sources = self.single_flight.do(
+                    self._strategy_flight_key(strategy, character_analysis),
+                    lambda: strategy.search(character_name, character_analysis),
+                    encode=lambda items: [item.model_dump(mode='json') for item in items],
+                    decode=lambda data: [SourceItem.model_validate(item) for item in data]
+                )
+            if cancel_event.is_set():
+                raise StrategyCancelled(f"{strategy.get_strategy_name()} was cancelled")
+            logger.info(f"{strategy.get_strategy_name()} found {len(sources)} sources")
+            return sources, time.perf_counter() - start_time, None
+        except StrategyCancelled as e:
+            return [], time.perf_counter() - start_time, e
+        except Exception as e:
+            logger.error(f"Error in {strategy.get_strategy_name()}: {e}")
+            return [], time.perf_counter() - start_time, e
+    
+    @staticmethod
+    def _strategy_report_keys(strategies: List[SourceStrategy]) -> List[str]:
+        """Unique report key of each strategy: its name, suffixed with "#<n>" for repeats"""
+        counts: Dict[str, int] = defaultdict(int)
+        keys = []
+        for strategy in strategies:
+            name = strategy.get_strategy_name()
+            counts[name] += 1
+            keys.append(name if counts[name] == 1 else f"{name}#{counts[name]}")
+        return keys
+    
+    @staticmethod
+    def _strategy_flight_key(strategy: SourceStrategy, character_analysis: CharacterAnalysis) -> str:
+        """Identity of a strategy search (the strategy and the analysis it searches with)"""
+        analysis = character_analysis.model_dump_json(exclude={'metadata'})
+        strategy_id = f"{type(strategy).__module__}.{type(strategy).__qualname__}:{strategy.get_strategy_name()}"
+        return f"strategy:{strategy_id}:{hashlib.sha256(analysis.encode('utf-8')).hexdigest()}"
+    
+    @staticmethod
+    def _is_high_quality_candidate(source: SourceItem, min_credibility: float) -> bool:
+        """
+        Check whether a candidate comes from a sufficiently credible domain
+        
+        Args:
+            source: Candidate source
+            min_credibility: Minimum domain credibility score (0-100)
+            
+        Returns:
+            True if the candidate's domain meets the threshold
+        """
+        domain = extract_domain(source.url)
+        return bool(domain) and get_domain_credibility_score(domain) >= min_credibility
     
     def _validate_and_filter_sources(
         self,
@@ -267,6 +442,10 @@ Example format:
         """
         Validate and filter sources using SourceValidationService
         
+        Sources passing the thresholds are then grouped by the text of their
+        fetched pages; of mirrors, print views and syndicated copies of the
+        same content only the most credible one is kept.
+        
         Args:
             sources: List of candidate sources
             character_name: Name of the character
@@ -290,7 +469,7 @@ Example format:
         )
         
         # Filter sources based on thresholds
-        filtered_sources = []
+        passing_results = []
         for result in validation_result['results']:
             # Include source if:
             # 1. It's valid (basic validation passed)
@@ -306,7 +485,15 @@ Example format:
                 )
                 
                 if relevance_ok and credibility_ok:
-                    filtered_sources.append(result.source)
+                    passing_results.append(result)
+        
+        # Drop near-duplicate pages, keeping the most credible copy
+        kept_results, duplicate_results = self.duplicate_detector.deduplicate(
+            passing_results,
+            text_of=lambda result: self.page_cache.get_text(result.source.url) if result.source.url else None,
+            score_of=lambda result: result.credibility_score or 0.0
+        )
+        filtered_sources = [result.source for result in kept_results]
         
         return {
             'sources': filtered_sources,
@@ -315,6 +502,7 @@ Example format:
                 'total_validated': validation_result['total_sources'],
                 'valid_sources': validation_result['valid_sources'],
                 'filtered_count': len(filtered_sources),
+                'near_duplicates_removed': len(duplicate_results),
                 'average_relevance': validation_result.get('average_relevance', 0.0),
                 'average_credibility': validation_result.get('average_credibility', 0.0),
                 'recommendations': validation_result.get('recommendations', [])
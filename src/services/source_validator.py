@@ -1,11 +1,12 @@
 """
 Advanced source validation service with AI analysis
 """
+import dataclasses
 import logging
-from typing import List, Dict, Any, Optional
+import os
+from typing import List, Dict, Any, Optional, Tuple
 import requests
 from requests.exceptions import RequestException, Timeout
-from bs4 import BeautifulSoup
 
 from ..api.models.sources import (
     SourceItem,
@@ -13,6 +14,10 @@ from ..api.models.sources import (
 )
 from ..utils.tfidf_analyzer import TfidfAnalyzer
 from ..utils.credibility_checker import CredibilityChecker
+from ..cache.page_cache import PageCache, get_page_cache, extract_clean_text
+from ..cache.single_flight import SingleFlight, get_single_flight
+from ..utils.url_utils import normalize_url
+from .async_fetcher import AsyncFetchEngine, FetchResult, DEFAULT_HEADERS
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +29,11 @@ class SourceValidationService:
         self,
         min_relevance: float = 0.7,
         min_credibility: float = 80.0,
-        timeout: int = 10
+        timeout: int = 10,
+        max_concurrency_per_host: int = 4,
+        page_cache: Optional[PageCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        tfidf_analyzer: Optional[TfidfAnalyzer] = None
     ):
         """
         Initialize source validation service
@@ -33,22 +42,34 @@ class SourceValidationService:
             min_relevance: Minimum relevance score threshold
             min_credibility: Minimum credibility score threshold
             timeout: Request timeout in seconds
+            max_concurrency_per_host: Maximum concurrent requests per host
+                when validating a list of sources
+            page_cache: Fetched-page cache (uses the shared cache if None)
+            single_flight: Coalesces concurrent fetches of the same page
+                (uses the shared instance if None)
+            tfidf_analyzer: Relevance analyzer (if None, one is created with
+                the corpus model at TFIDF_CORPUS_MODEL_PATH, when set)
         """
         self.min_relevance = min_relevance
         self.min_credibility = min_credibility
         self.timeout = timeout
-        self.tfidf_analyzer = TfidfAnalyzer()
+        self.tfidf_analyzer = tfidf_analyzer or TfidfAnalyzer(
+            corpus_model_path=os.getenv("TFIDF_CORPUS_MODEL_PATH")
+        )
         self.credibility_checker = CredibilityChecker()
         self.session = self._create_session()
+        self.fetch_engine = AsyncFetchEngine(
+            timeout=timeout,
+            max_per_host=max_concurrency_per_host,
+            headers=DEFAULT_HEADERS
+        )
+        self.page_cache = page_cache or get_page_cache()
+        self.single_flight = single_flight or get_single_flight()
     
     def _create_session(self) -> requests.Session:
         """Create HTTP session with proper headers"""
         session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'BookGen Academic Research Bot 1.0',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-        })
+        session.headers.update(DEFAULT_HEADERS)
         return session
     
     def validate_sources(
@@ -60,10 +81,133 @@ class SourceValidationService:
         """
         Validate sources with advanced analysis
         
+        All uncached source URLs are fetched concurrently before analysis,
+        so the batch takes roughly as long as the slowest host.
+        
+        Args:
+            biography_topic: Biography topic or character name
+            sources_list: List of sources to validate
+            check_accessibility: Whether to check URL accessibility
+            
+        Returns:
+            Validation results dictionary
+        """
+        fetched = {}
+        if check_accessibility:
+            fetched, pending = self._split_cached(sources_list)
+            fetched.update(self._remember(self.fetch_engine.fetch_all_sync(
+                pending,
+                {url: self.page_cache.conditional_headers(url) for url in pending}
+            )))
+            evicted = [url for url in pending if url not in fetched]
+            if evicted:
+                fetched.update(self._remember(self.fetch_engine.fetch_all_sync(evicted)))
+        
+        return self._validate_prefetched(
+            biography_topic,
+            sources_list,
+            check_accessibility,
+            fetched
+        )
+    
+    async def validate_sources_async(
+        self,
+        biography_topic: str,
+        sources_list: List[SourceItem],
+        check_accessibility: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Validate sources with advanced analysis from async code
+        
+        Args:
+            biography_topic: Biography topic or character name
+            sources_list: List of sources to validate
+            check_accessibility: Whether to check URL accessibility
+            
+        Returns:
+            Validation results dictionary
+        """
+        fetched = {}
+        if check_accessibility:
+            fetched, pending = self._split_cached(sources_list)
+            fetched.update(self._remember(await self.fetch_engine.fetch_all(
+                pending,
+                {url: self.page_cache.conditional_headers(url) for url in pending}
+            )))
+            evicted = [url for url in pending if url not in fetched]
+            if evicted:
+                fetched.update(self._remember(await self.fetch_engine.fetch_all(evicted)))
+        
+        return self._validate_prefetched(
+            biography_topic,
+            sources_list,
+            check_accessibility,
+            fetched
+        )
+    
+    def _split_cached(
+        self,
+        sources_list: List[SourceItem]
+    ) -> Tuple[Dict[str, FetchResult], List[str]]:
+        """
+        Split source URLs into fresh cached pages and URLs still to fetch
+        
+        Args:
+            sources_list: List of sources to validate
+            
+        Returns:
+            Tuple of (cached results keyed by URL, URLs to fetch)
+        """
+        cached = {}
+        pending = []
+        for url in dict.fromkeys(source.url for source in sources_list if source.url):
+            page = self.page_cache.get(url)
+            if page is not None:
+                cached[url] = FetchResult.from_page(page)
+            else:
+                pending.append(url)
+        return cached, pending
+    
+    def _remember(self, fetched: Dict[str, FetchResult]) -> Dict[str, FetchResult]:
+        """
+        Store fetched responses in the page cache
+        
+        304 Not Modified responses are replaced by the revalidated cached page.
+        A 304 for a page evicted since the request was sent is left out, so
+        the caller fetches it again without conditional headers.
+        
+        Args:
+            fetched: Fetch results keyed by URL
+            
+        Returns:
+            Fetch results keyed by URL
+        """
+        remembered = {}
+        for url, result in fetched.items():
+            if result.error is None and result.status_code is not None:
+                page = self.page_cache.store(url, result.status_code, result.headers, result.content)
+                if result.status_code == 304:
+                    if page is None:
+                        continue
+                    result = FetchResult.from_page(page)
+            remembered[url] = result
+        return remembered
+    
+    def _validate_prefetched(
+        self,
+        biography_topic: str,
+        sources_list: List[SourceItem],
+        check_accessibility: bool,
+        fetched: Dict[str, FetchResult]
+    ) -> Dict[str, Any]:
+        """
+        Analyze sources whose URLs have already been fetched
+        
         Args:
             biography_topic: Biography topic or character name
             sources_list: List of sources to validate
             check_accessibility: Whether to check URL accessibility
+            fetched: Fetch results keyed by URL
             
         Returns:
             Validation results dictionary
@@ -74,11 +218,29 @@ class SourceValidationService:
         valid_count = 0
         rejected_count = 0
         
-        for source in sources_list:
+        # Score the relevance of every fetched page in one TF-IDF pass
+        relevance_scores = {}
+        if check_accessibility:
+            scored = [
+                (index, source.title, self._clean_text(fetched[source.url]))
+                for index, source in enumerate(sources_list)
+                if source.url in fetched and fetched[source.url].ok
+            ]
+            batch_scores = self.tfidf_analyzer.calculate_relevance_batch(
+                biography_topic,
+                [(title, content) for _, title, content in scored]
+            )
+            relevance_scores = {
+                index: score for (index, _, _), score in zip(scored, batch_scores)
+            }
+        
+        for index, source in enumerate(sources_list):
             result = self.validate_single_source(
                 source,
                 biography_topic,
-                check_accessibility
+                check_accessibility,
+                prefetched=fetched.get(source.url) if source.url else None,
+                precomputed_relevance=relevance_scores.get(index)
             )
             results.append(result)
             
@@ -124,7 +286,9 @@ class SourceValidationService:
         self,
         source: SourceItem,
         biography_topic: str,
-        check_accessibility: bool = True
+        check_accessibility: bool = True,
+        prefetched: Optional[FetchResult] = None,
+        precomputed_relevance: Optional[float] = None
     ) -> AdvancedSourceValidationResult:
         """
         Validate a single source with advanced analysis
@@ -133,6 +297,10 @@ class SourceValidationService:
             source: Source to validate
             biography_topic: Biography topic
             check_accessibility: Whether to check URL accessibility
+            prefetched: Already fetched response for the source URL; when
+                omitted the URL is fetched here
+            precomputed_relevance: Relevance score from a batch TF-IDF pass;
+                when omitted it is calculated here
             
         Returns:
             Advanced validation result
@@ -176,44 +344,41 @@ class SourceValidationService:
         
         # Check URL if present
         if source.url and check_accessibility:
-            try:
-                # Fetch content for relevance analysis
-                response = self.session.get(
-                    source.url,
-                    timeout=self.timeout,
-                    allow_redirects=True
-                )
-                
-                is_accessible = response.status_code < 400
+            fetch_result = prefetched if prefetched is not None else self._fetch(source.url)
+            
+            if fetch_result.timed_out:
+                is_accessible = False
+                issues.append("URL request timed out")
+            elif fetch_result.error is not None:
+                is_accessible = False
+                issues.append(f"URL not accessible: {fetch_result.error}")
+            else:
+                is_accessible = fetch_result.ok
                 
                 if is_accessible:
                     # Extract content
-                    content = self._extract_text_from_html(response.text)
+                    content = self._clean_text(fetch_result)
                     
                     # Calculate relevance score
-                    relevance_score = self.tfidf_analyzer.calculate_relevance_with_mentions(
-                        character_name=biography_topic,
-                        source_title=source.title,
-                        content=content
-                    )
+                    if precomputed_relevance is not None:
+                        relevance_score = precomputed_relevance
+                    else:
+                        relevance_score = self.tfidf_analyzer.calculate_relevance_with_mentions(
+                            character_name=biography_topic,
+                            source_title=source.title,
+                            content=content
+                        )
                     
                     metadata["content_length"] = len(content)
-                    metadata["content_type"] = response.headers.get("content-type", "unknown")
+                    metadata["content_type"] = fetch_result.headers.get("content-type", "unknown")
                     
                     # Check if generic page
-                    if self._is_generic_page(response.text):
+                    if self._is_generic_page(fetch_result.text):
                         warnings.append("Page appears to be generic (search, home, etc.)")
                         relevance_score = max(0.0, relevance_score - 0.3)
                     
                 else:
-                    issues.append(f"URL not accessible (status code: {response.status_code})")
-                    
-            except Timeout:
-                is_accessible = False
-                issues.append("URL request timed out")
-            except RequestException as e:
-                is_accessible = False
-                issues.append(f"URL not accessible: {str(e)}")
+                    issues.append(f"URL not accessible (status code: {fetch_result.status_code})")
         
         # Determine if source is valid
         is_valid = len(issues) == 0
@@ -238,36 +403,98 @@ class SourceValidationService:
             metadata=metadata if metadata else None
         )
     
-    def _extract_text_from_html(self, html_content: str) -> str:
+    def _fetch(self, url: str) -> FetchResult:
         """
-        Extract clean text from HTML content
+        Fetch a single URL with the blocking session, using the page cache
+        
+        Concurrent fetches of the same page (in this or another worker)
+        share one download.
         
         Args:
-            html_content: HTML content
+            url: URL to fetch
             
         Returns:
-            Extracted text
+            FetchResult for the URL
         """
-        try:
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
+        page = self.page_cache.get(url)
+        if page is not None:
+            return FetchResult.from_page(page)
+        
+        result = self.single_flight.do(
+            f"fetch:{normalize_url(url)}",
+            lambda: self._download(url),
+            encode=FetchResult.to_dict,
+            decode=FetchResult.from_dict
+        )
+        if result.url != url:
+            result = dataclasses.replace(result, url=url)
+        return result
+    
+    def _download(self, url: str) -> FetchResult:
+        """
+        Download a URL with the blocking session and store it in the page cache
+        
+        A stale cached page is revalidated with a conditional request; if it
+        is evicted before the 304 arrives, the page is fetched again in full.
+        
+        Args:
+            url: URL to fetch
             
-            # Get text
-            text = soup.get_text(separator=' ', strip=True)
+        Returns:
+            FetchResult for the URL
+        """
+        for headers in (self.page_cache.conditional_headers(url), {}):
+            try:
+                response = self.session.get(
+                    url,
+                    timeout=self.timeout,
+                    allow_redirects=True,
+                    headers=headers
+                )
+            except Timeout:
+                return FetchResult(url=url, error="timeout", timed_out=True)
+            except RequestException as e:
+                return FetchResult(url=url, error=str(e))
             
-            # Clean up whitespace
-            lines = (line.strip() for line in text.splitlines())
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            text = ' '.join(chunk for chunk in chunks if chunk)
+            result = FetchResult(
+                url=url,
+                status_code=response.status_code,
+                text=response.text,
+                content=response.content,
+                headers={k.lower(): v for k, v in response.headers.items()}
+            )
+            remembered = self._remember({url: result})
+            if url in remembered:
+                return remembered[url]
+        
+        # Not Modified even without conditional headers
+        return dataclasses.replace(result, error="304 Not Modified without a cached page")
+    
+    def _clean_text(self, fetch_result: FetchResult) -> str:
+        """
+        Get the clean text of a fetched page (parsed once per page body)
+        
+        Args:
+            fetch_result: Fetched page
             
-            return text
+        Returns:
+            Extracted text
+        """
+        if fetch_result.content:
+            return self.page_cache.extract_text(fetch_result.content, fetch_result.text)
+        return self._extract_text_from_html(fetch_result.text)
+    
+    def _extract_text_from_html(self, html_content: str) -> str:
+        """
+        Extract clean text from HTML content
+        
+        Args:
+            html_content: HTML content
             
-        except Exception as e:
-            logger.warning(f"Error extracting text from HTML: {e}")
-            return ""
+        Returns:
+            Extracted text
+        """
+        return extract_clean_text(html_content)
     
     def _is_generic_page(self, html_content: str) -> bool:
         """
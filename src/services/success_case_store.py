@@ -0,0 +1,385 @@
+"""
+Append-only, time-partitioned store of quality success cases
+
+Cases are appended as JSON lines to one segment file per month
+(cases-YYYY-MM.jsonl) inside the store directory, so recording a case
+writes one line instead of rewriting the whole history. Nothing is parsed
+at startup:
+
+- A segment is only loaded when a query needs its cases. Loaded segments
+  are kept sorted by timestamp, so a time range is found with two bisects
+  and only the segments overlapping it are read.
+- Every segment has a CaseSummary (count, score sums, pattern totals).
+  Summaries of compacted segments are kept in index.json, so totals over
+  the whole history only read that file plus the segments written since.
+- compact() rewrites closed (past month) segments sorted by timestamp and
+  records their summaries. It runs every compact_interval appends.
+
+Every cache is tagged with the segment's size on disk, so lines appended
+by other processes are picked up on the next query.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.quality_metrics import SuccessCase, SuccessPattern
+
+logger = logging.getLogger(__name__)
+
+# Quality score from which a generation counts as a success
+SUCCESS_THRESHOLD = 85.0
+# Appends between two automatic compactions
+DEFAULT_COMPACT_INTERVAL = 1000
+
+SEGMENT_PREFIX = "cases-"
+SEGMENT_SUFFIX = ".jsonl"
+INDEX_VERSION = 1
+
+
+def segment_name(timestamp: datetime) -> str:
+    """Name of the monthly segment holding cases recorded at a timestamp"""
+    return f"{SEGMENT_PREFIX}{timestamp:%Y-%m}{SEGMENT_SUFFIX}"
+
+
+@dataclass
+class CaseSummary:
+    """Aggregates over a set of success cases, mergeable across segments"""
+    count: int = 0
+    score_sum: float = 0.0
+    success_count: int = 0
+    # (pattern_type, pattern_value) -> [frequency, impact sum, confidence sum, occurrences]
+    patterns: Dict[Tuple[str, str], List[float]] = field(default_factory=dict)
+
+    def add(self, case: SuccessCase):
+        self.count += 1
+        self.score_sum += case.quality_score
+        self.success_count += case.quality_score >= SUCCESS_THRESHOLD
+        for pattern in case.patterns:
+            totals = self.patterns.get((pattern.pattern_type, pattern.pattern_value))
+            if totals is None:
+                totals = self.patterns[(pattern.pattern_type, pattern.pattern_value)] = [0, 0.0, 0.0, 0]
+            totals[0] += pattern.frequency
+            totals[1] += pattern.avg_quality_impact
+            totals[2] += pattern.confidence
+            totals[3] += 1
+
+    def merge(self, other: "CaseSummary"):
+        self.count += other.count
+        self.score_sum += other.score_sum
+        self.success_count += other.success_count
+        for key, other_totals in other.patterns.items():
+            totals = self.patterns.get(key)
+            if totals is None:
+                self.patterns[key] = list(other_totals)
+            else:
+                for i, value in enumerate(other_totals):
+                    totals[i] += value
+
+    def aggregated_patterns(self) -> List[SuccessPattern]:
+        """
+        Patterns aggregated over all cases
+
+        Same result as SuccessPatternAnalyzer.aggregate_patterns() over the
+        cases' pattern lists, without visiting the cases.
+
+        Returns:
+            Aggregated patterns ranked by quality impact and confidence
+        """
+        aggregated = [
+            SuccessPattern(
+                pattern_type=pattern_type,
+                pattern_value=pattern_value,
+                frequency=int(frequency),
+                avg_quality_impact=impact_sum / occurrences,
+                confidence=confidence_sum / occurrences,
+                metadata={"aggregated_from": int(occurrences)}
+            )
+            for (pattern_type, pattern_value), (frequency, impact_sum, confidence_sum, occurrences)
+            in self.patterns.items()
+        ]
+        aggregated.sort(key=lambda p: p.avg_quality_impact * p.confidence, reverse=True)
+        return aggregated
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'score_sum': self.score_sum,
+            'success_count': self.success_count,
+            'patterns': [list(key) + totals for key, totals in self.patterns.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CaseSummary":
+        return cls(
+            count=data['count'],
+            score_sum=data['score_sum'],
+            success_count=data['success_count'],
+            patterns={(row[0], row[1]): list(row[2:]) for row in data['patterns']}
+        )
+
+
+@dataclass
+class _Segment:
+    """Parsed cases of one segment file, sorted by timestamp"""
+    size: int
+    cases: List[SuccessCase] = field(default_factory=list)
+    timestamps: List[datetime] = field(default_factory=list)
+    summary: CaseSummary = field(default_factory=CaseSummary)
+
+    def add(self, case: SuccessCase):
+        position = bisect.bisect_right(self.timestamps, case.timestamp)
+        self.timestamps.insert(position, case.timestamp)
+        self.cases.insert(position, case)
+        self.summary.add(case)
+
+
+class SuccessCaseStore:
+    """Directory of monthly JSONL segments with a timestamp index"""
+
+    def __init__(self, directory: str, compact_interval: int = DEFAULT_COMPACT_INTERVAL):
+        """
+        Initialize store (no segment is read until queried)
+
+        Args:
+            directory: Directory holding the segments, created if missing
+            compact_interval: Appends between two automatic compactions
+                (0 disables them)
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self.compact_interval = compact_interval
+
+        self._lock = threading.RLock()
+        self._segments: Dict[str, _Segment] = {}
+        # Segment name -> (size, summary) recorded by compaction or kept up to date on append
+        self._summaries: Optional[Dict[str, Tuple[int, CaseSummary]]] = None
+        # Segment name -> size as of its last compaction
+        self._compacted: Dict[str, int] = {}
+        self._appends = 0
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def append(self, case: SuccessCase):
+        """
+        Append a case to the segment of its month
+
+        Args:
+            case: Case to store
+        """
+        name = segment_name(case.timestamp)
+        line = (case.model_dump_json() + "\n").encode('utf-8')
+
+        with self._lock:
+            # One O_APPEND write per case: concurrent writers never interleave lines
+            fd = os.open(self.directory / name, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+            # Caches that were current before this line stay current with it
+            previous_size = size - len(line)
+            segment = self._segments.get(name)
+            if segment is not None:
+                if segment.size == previous_size:
+                    segment.add(case)
+                    segment.size = size
+                else:
+                    del self._segments[name]
+
+            summaries = self._load_summaries()
+            recorded = summaries.pop(name, None)
+            if recorded is not None and recorded[0] == previous_size:
+                recorded[1].add(case)
+                summaries[name] = (size, recorded[1])
+            elif recorded is None and previous_size == 0:
+                summary = CaseSummary()
+                summary.add(case)
+                summaries[name] = (size, summary)
+
+            self._appends += 1
+            if self.compact_interval and self._appends % self.compact_interval == 0:
+                self.compact()
+
+    def compact(self) -> int:
+        """
+        Sort and summarize closed segments changed since their last compaction
+
+        Only segments of past months are rewritten; new cases go to the
+        current month's segment.
+
+        Returns:
+            Number of segments compacted
+        """
+        current = segment_name(datetime.now())
+        compacted = 0
+
+        with self._lock:
+            summaries = self._load_summaries()
+            for name, size in self._segment_sizes().items():
+                if name >= current or self._compacted.get(name) == size:
+                    continue
+
+                segment = self._segment(name, size)
+                lines = [case.model_dump_json() + "\n" for case in segment.cases]
+                path = self.directory / name
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.writelines(lines)
+                os.replace(tmp_path, path)
+
+                size = os.path.getsize(path)
+                summaries[name] = (size, segment.summary)
+                self._compacted[name] = size
+                # Closed segments are answered from their summary from now on
+                self._segments.pop(name, None)
+                compacted += 1
+
+            if compacted:
+                self._save_summaries(summaries)
+                logger.info(f"Compacted {compacted} success case segments in {self.directory}")
+
+        return compacted
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def range(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[SuccessCase]:
+        """
+        Get the cases recorded in [start, end), oldest first
+
+        Args:
+            start: Inclusive lower bound (None for no bound)
+            end: Exclusive upper bound (None for no bound)
+
+        Returns:
+            List of success cases
+        """
+        first = segment_name(start) if start is not None else None
+        last = segment_name(end) if end is not None else None
+
+        with self._lock:
+            result: List[SuccessCase] = []
+            for name, size in self._segment_sizes().items():
+                if (first is not None and name < first) or (last is not None and name > last):
+                    continue
+                segment = self._segment(name, size)
+                lo = bisect.bisect_left(segment.timestamps, start) if start is not None else 0
+                hi = bisect.bisect_left(segment.timestamps, end) if end is not None else len(segment.cases)
+                result.extend(segment.cases[lo:hi])
+            return result
+
+    def summary(self) -> CaseSummary:
+        """
+        Aggregates over every stored case
+
+        Only segments changed since they were last summarized are read.
+
+        Returns:
+            CaseSummary of the whole store
+        """
+        total = CaseSummary()
+        with self._lock:
+            summaries = self._load_summaries()
+            for name, size in self._segment_sizes().items():
+                recorded = summaries.get(name)
+                if recorded is not None and recorded[0] == size:
+                    total.merge(recorded[1])
+                else:
+                    total.merge(self._segment(name, size).summary)
+        return total
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _segment_sizes(self) -> Dict[str, int]:
+        """Current size of every segment file, in chronological order"""
+        sizes = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.startswith(SEGMENT_PREFIX) and entry.name.endswith(SEGMENT_SUFFIX):
+                    sizes[entry.name] = entry.stat().st_size
+        return dict(sorted(sizes.items()))
+
+    def _segment(self, name: str, size: int) -> _Segment:
+        """Parsed segment, (re)loaded if its file changed"""
+        segment = self._segments.get(name)
+        if segment is not None and segment.size == size:
+            return segment
+
+        cases = []
+        with open(self.directory / name, 'rb') as f:
+            data = f.read(size)
+        # A line still being written by another process ends without a newline
+        complete = data[:data.rfind(b"\n") + 1]
+        for number, line in enumerate(complete.decode('utf-8').splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                cases.append(SuccessCase.model_validate_json(line))
+            except ValueError as e:
+                logger.warning(f"Skipping invalid success case {name}:{number}: {e}")
+        cases.sort(key=lambda c: c.timestamp)
+
+        segment = _Segment(size=len(complete), cases=cases, timestamps=[c.timestamp for c in cases])
+        for case in cases:
+            segment.summary.add(case)
+        self._segments[name] = segment
+        logger.debug(f"Loaded {len(cases)} success cases from {name}")
+        return segment
+
+    def _load_summaries(self) -> Dict[str, Tuple[int, CaseSummary]]:
+        """Segment summaries recorded by the last compaction"""
+        if self._summaries is not None:
+            return self._summaries
+
+        self._summaries = {}
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self._summaries
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read success case index {self.index_path}: {e}")
+            return self._summaries
+
+        if data.get('version') != INDEX_VERSION:
+            return self._summaries
+        try:
+            for name, entry in data['segments'].items():
+                self._summaries[name] = (entry['size'], CaseSummary.from_dict(entry['summary']))
+                self._compacted[name] = entry['size']
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            logger.warning(f"Invalid success case index {self.index_path}: {e}")
+            self._summaries = {}
+            self._compacted = {}
+        return self._summaries
+
+    def _save_summaries(self, summaries: Dict[str, Tuple[int, CaseSummary]]):
+        """Write the summaries of compacted segments atomically"""
+        segments = {}
+        for name, size in self._compacted.items():
+            recorded = summaries.get(name)
+            if recorded is not None and recorded[0] == size:
+                segments[name] = {'size': size, 'summary': recorded[1].to_dict()}
+
+        data = {'version': INDEX_VERSION, 'segments': segments}
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(data, ensure_ascii=False))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.error(f"Error writing success case index {self.index_path}: {e}")
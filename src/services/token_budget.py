@@ -0,0 +1,245 @@
+"""
+Token budgeting for long-form generation
+
+Chooses max_tokens for a requested length from words-per-token and
+characters-per-token ratios learned per model from the usage OpenRouter
+reports, and tracks how accurate those estimates are.
+"""
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ..monitoring.prometheus_metrics import observe_histogram, set_gauge
+
+logger = logging.getLogger(__name__)
+
+
+# Priors used until a model has reported usage (typical for English prose)
+DEFAULT_WORDS_PER_TOKEN = 0.75
+DEFAULT_CHARS_PER_TOKEN = 4.0
+# Weight of a new observation once a model has a few samples
+LEARNING_RATE = 0.2
+# Completion tokens allowed on top of the expected length
+DEFAULT_HEADROOM = 0.15
+MIN_COMPLETION_TOKENS = 256
+# Tokens per message spent on role markers and separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@dataclass
+class TokenBudget:
+    """Token plan for one request"""
+    prompt_chars: int
+    message_count: int
+    prompt_tokens: int
+    expected_tokens: int
+    max_tokens: int
+
+
+@dataclass
+class _ModelStats:
+    words_per_token: float = DEFAULT_WORDS_PER_TOKEN
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN
+    samples: int = 0
+    prompt_error_sum: float = 0.0
+    prompt_samples: int = 0
+    completion_error_sum: float = 0.0
+    completion_samples: int = 0
+
+
+class TokenBudgeter:
+    """
+    Plans max_tokens for a target length and learns from reported usage.
+
+    Features:
+    - Prompt token estimate from a learned characters-per-token ratio
+    - max_tokens from a learned words-per-token ratio plus headroom, so
+      chapters are neither cut off nor given a budget they never use
+    - Estimate accuracy per model, exported through MetricsCollector
+    """
+
+    def __init__(
+        self,
+        headroom: float = DEFAULT_HEADROOM,
+        learning_rate: float = LEARNING_RATE,
+        context_window: Optional[int] = None
+    ):
+        """
+        Initialize token budgeter
+
+        Args:
+            headroom: Fraction of completion tokens allowed beyond the
+                expected length
+            learning_rate: Weight of a new observation in the learned ratios
+                (the first observations are averaged evenly)
+            context_window: Model context size; when set, max_tokens never
+                exceeds what is left after the prompt
+        """
+        self.headroom = headroom
+        self.learning_rate = learning_rate
+        self.context_window = context_window
+        self._models: Dict[str, _ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def estimate_prompt_tokens(self, model: str, messages: List[Dict[str, str]]) -> int:
+        """
+        Estimate the prompt tokens of a request
+
+        Args:
+            model: Model identifier
+            messages: Chat messages
+
+        Returns:
+            Estimated prompt tokens
+        """
+        chars = sum(len(message.get("content") or "") for message in messages)
+        with self._lock:
+            chars_per_token = self._stats(model).chars_per_token
+        return math.ceil(chars / chars_per_token) + MESSAGE_OVERHEAD_TOKENS * len(messages)
+
+    def plan(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        target_words: int,
+        max_tokens_limit: Optional[int] = None
+    ) -> TokenBudget:
+        """
+        Choose max_tokens for a completion of about target_words words
+
+        Args:
+            model: Model identifier
+            messages: Chat messages of the request
+            target_words: Requested completion length in words
+            max_tokens_limit: Upper bound for max_tokens (e.g. the
+                configured maximum)
+
+        Returns:
+            TokenBudget for the request
+        """
+        prompt_tokens = self.estimate_prompt_tokens(model, messages)
+        with self._lock:
+            words_per_token = self._stats(model).words_per_token
+
+        expected = math.ceil(max(target_words, 0) / words_per_token)
+        max_tokens = max(math.ceil(expected * (1 + self.headroom)), MIN_COMPLETION_TOKENS)
+        if max_tokens_limit:
+            max_tokens = min(max_tokens, max_tokens_limit)
+        if self.context_window:
+            max_tokens = max(1, min(max_tokens, self.context_window - prompt_tokens))
+
+        return TokenBudget(
+            prompt_chars=sum(len(message.get("content") or "") for message in messages),
+            message_count=len(messages),
+            prompt_tokens=prompt_tokens,
+            expected_tokens=expected,
+            max_tokens=max_tokens
+        )
+
+    def observe(self, model: str, budget: TokenBudget, content: str, usage: Optional[Dict[str, Any]]):
+        """
+        Learn from the usage reported for a planned request
+
+        Args:
+            model: Model identifier
+            budget: Plan the request was made with
+            content: Generated text
+            usage: Usage reported by the API (prompt_tokens, completion_tokens)
+        """
+        if not usage:
+            return
+
+        prompt_tokens = usage.get("prompt_tokens") or 0
+        completion_tokens = usage.get("completion_tokens") or 0
+        words = len(content.split())
+
+        with self._lock:
+            stats = self._stats(model)
+            alpha = max(self.learning_rate, 1.0 / (stats.samples + 1))
+
+            prompt_error = None
+            if prompt_tokens > 0:
+                prompt_error = abs(budget.prompt_tokens - prompt_tokens) / prompt_tokens
+                stats.prompt_error_sum += prompt_error
+                stats.prompt_samples += 1
+                # Message overhead is not part of the character ratio
+                text_tokens = prompt_tokens - MESSAGE_OVERHEAD_TOKENS * budget.message_count
+                if budget.prompt_chars > 0 and text_tokens > 0:
+                    stats.chars_per_token += alpha * (budget.prompt_chars / text_tokens - stats.chars_per_token)
+
+            completion_error = None
+            if completion_tokens > 0 and words > 0:
+                # How many tokens the current ratio predicted for the words written
+                predicted = words / stats.words_per_token
+                completion_error = abs(predicted - completion_tokens) / completion_tokens
+                stats.completion_error_sum += completion_error
+                stats.completion_samples += 1
+                stats.words_per_token += alpha * (words / completion_tokens - stats.words_per_token)
+
+            stats.samples += 1
+            words_per_token = stats.words_per_token
+
+        labels = {"model": model}
+        if prompt_error is not None:
+            observe_histogram("bookgen_token_estimate_error_ratio", prompt_error, {**labels, "kind": "prompt"})
+        if completion_error is not None:
+            observe_histogram(
+                "bookgen_token_estimate_error_ratio", completion_error, {**labels, "kind": "completion"}
+            )
+        set_gauge("bookgen_words_per_token", words_per_token, labels)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get learned ratios and estimate accuracy per model
+
+        Returns:
+            Dictionary mapping model to its ratios, sample count and mean
+            absolute relative error of the prompt and completion estimates
+        """
+        with self._lock:
+            return {
+                model: {
+                    "words_per_token": stats.words_per_token,
+                    "chars_per_token": stats.chars_per_token,
+                    "samples": stats.samples,
+                    "prompt_estimate_error": (
+                        stats.prompt_error_sum / stats.prompt_samples if stats.prompt_samples else None
+                    ),
+                    "completion_estimate_error": (
+                        stats.completion_error_sum / stats.completion_samples
+                        if stats.completion_samples else None
+                    ),
+                }
+                for model, stats in self._models.items()
+            }
+
+    def _stats(self, model: str) -> _ModelStats:
+        stats = self._models.get(model)
+        if stats is None:
+            stats = self._models[model] = _ModelStats()
+        return stats
+
+
+# Global token budgeter instance
+_token_budgeter_instance: Optional[TokenBudgeter] = None
+
+
+def get_token_budgeter() -> TokenBudgeter:
+    """
+    Get global token budgeter instance (singleton pattern).
+
+    Returns:
+        TokenBudgeter instance
+    """
+    global _token_budgeter_instance
+    if _token_budgeter_instance is None:
+        _token_budgeter_instance = TokenBudgeter()
+    return _token_budgeter_instance
+
+
+def reset_token_budgeter():
+    """Drop the global token budgeter instance (useful for testing)"""
+    global _token_budgeter_instance
+    _token_budgeter_instance = None
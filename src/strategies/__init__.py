@@ -1,7 +1,7 @@
 """
 Strategies package for source generation
 """
-from .source_strategy import SourceStrategy
+from .source_strategy import SourceStrategy, StrategyCancelled
 from .base_strategy import CharacterAnalysis, SourceCandidate
 from .academic_database_strategy import AcademicDatabaseStrategy
 from .government_archive_strategy import GovernmentArchiveStrategy
@@ -17,6 +17,7 @@ from .military_figure_strategy import MilitaryFigureStrategy
 
 __all__ = [
     'SourceStrategy',
+    'StrategyCancelled',
     'CharacterAnalysis',
     'SourceCandidate',
     'AcademicDatabaseStrategy',
@@ -2,14 +2,46 @@
 Base interface for source generation strategies
 """
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
 import logging
+import threading
 
 from ..api.models.sources import SourceItem
 from ..api.models.source_generation import CharacterAnalysis
+from ..cache.single_flight import CallCancelled
 
 logger = logging.getLogger(__name__)
 
+_cancel_event: ContextVar[Optional[threading.Event]] = ContextVar('strategy_cancel_event', default=None)
+
+
+class StrategyCancelled(CallCancelled):
+    """
+    Raised inside a strategy whose search was cancelled
+
+    Derives from BaseException (like asyncio.CancelledError) so that the
+    broad error handling around individual requests does not swallow it.
+    As a CallCancelled it stays with the caller that cancelled: callers
+    sharing the search through single-flight run it themselves instead.
+    """
+
+
+@contextmanager
+def cancellation_scope(event: threading.Event) -> Iterator[None]:
+    """
+    Make event the cancellation signal of strategy searches run in this context
+
+    Args:
+        event: Event set once the search should stop
+    """
+    token = _cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _cancel_event.reset(token)
+
 
 class SourceStrategy(ABC):
     """
@@ -42,6 +74,29 @@ class SourceStrategy(ABC):
         """
         pass
     
+    def is_cancelled(self) -> bool:
+        """
+        Check whether the running search has been cancelled
+
+        Returns:
+            True once the caller has stopped waiting for this search
+        """
+        event = _cancel_event.get()
+        return event is not None and event.is_set()
+
+    def check_cancelled(self):
+        """
+        Stop the running search if it has been cancelled
+
+        Strategies call this between outgoing requests so that a search
+        the caller gave up on does not keep issuing them.
+
+        Raises:
+            StrategyCancelled: If the search has been cancelled
+        """
+        if self.is_cancelled():
+            raise StrategyCancelled(f"{self.name} was cancelled")
+
     def get_strategy_name(self) -> str:
         """
         Get the name of this strategy
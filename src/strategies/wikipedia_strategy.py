@@ -9,6 +9,7 @@ from requests.exceptions import RequestException
 from .source_strategy import SourceStrategy
 from ..api.models.sources import SourceItem, SourceType
 from ..api.models.source_generation import CharacterAnalysis
+from ..utils.url_utils import is_subdomain_of, parse_url
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +62,7 @@ class WikipediaStrategy(SourceStrategy):
                 logger.info(f"Found main Wikipedia article for {character_name}")
             
             # 2. Get related articles based on character analysis
+            self.check_cancelled()
             related_articles = self._find_related_articles(
                 character_name,
                 character_analysis
@@ -70,6 +72,7 @@ class WikipediaStrategy(SourceStrategy):
             
             # 3. Extract external references from main article
             if main_article:
+                self.check_cancelled()
                 external_refs = self._extract_external_references(character_name)
                 sources.extend(external_refs)
                 logger.info(f"Found {len(external_refs)} external references")
@@ -110,6 +113,7 @@ class WikipediaStrategy(SourceStrategy):
             page_title = data['query']['search'][0]['title']
             
             # Get page info
+            self.check_cancelled()
             page_info = self._get_page_info(page_title)
             if not page_info:
                 return None
@@ -151,6 +155,7 @@ class WikipediaStrategy(SourceStrategy):
         search_terms = character_analysis.search_terms[:5]  # Limit to top 5
         
         for term in search_terms:
+            self.check_cancelled()
             try:
                 params = {
                     'action': 'query',
@@ -290,14 +295,14 @@ class WikipediaStrategy(SourceStrategy):
             'nobelprize.org',
             'loc.gov',
             'history.com',
-            '.edu',
-            '.gov',
+            'edu',
+            'gov',
             'jstor.org',
             'gutenberg.org'
         ]
         
-        url_lower = url.lower()
-        return any(domain in url_lower for domain in quality_domains)
+        domain = parse_url(url).domain
+        return any(is_subdomain_of(domain, quality) for quality in quality_domains)
     
     def _extract_title_from_url(self, url: str) -> str:
         """
@@ -309,20 +314,13 @@ class WikipediaStrategy(SourceStrategy):
         Returns:
             Extracted title
         """
-        # Remove protocol and www
-        title = url.replace('https://', '').replace('http://', '').replace('www.', '')
+        parsed = parse_url(url)
         
-        # Get domain and path
-        parts = title.split('/')
-        if len(parts) > 1:
-            domain = parts[0]
-            # Use last meaningful part of path as title
-            path_parts = [p for p in parts[1:] if p and p not in ['index.html', 'index.php']]
-            if path_parts:
-                title = f"{domain}: {path_parts[-1].replace('-', ' ').replace('_', ' ').title()}"
-            else:
-                title = domain
+        # Use last meaningful part of path as title
+        path_parts = [p for p in parsed.path.split('/') if p and p not in ['index.html', 'index.php']]
+        if path_parts:
+            title = f"{parsed.domain}: {path_parts[-1].replace('-', ' ').replace('_', ' ').title()}"
         else:
-            title = parts[0]
+            title = parsed.domain
         
         return title[:200]  # Limit length
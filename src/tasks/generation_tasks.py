@@ -279,3 +279,162 @@ def batch_generate_chapters(
     except Exception as e:
         logger.error(f"Error in batch generation: {e}")
         raise
+
+
+@app.task(
+    base=GenerationTask,
+    bind=True,
+    name='src.tasks.generation_tasks.generate_collection_biography',
+    queue='content_generation',
+    priority=5
+)
+def generate_collection_biography(
+    self,
+    collection_file: str,
+    options: Optional[Dict[str, Any]] = None,
+    continue_collection: bool = True
+) -> Dict[str, Any]:
+    """
+    Claim the next character of a collection and generate its biography
+    
+    Claims are atomic across workers, so any number of these tasks can
+    walk the same collection concurrently. A completed biography is marked
+    in the collection (written back in batches); a failed one keeps its
+    claim until it expires, so other workers move on to other characters.
+    An exception releases the claim before Celery retries the task (the
+    retry claims again); once retries are exhausted the claim is kept, like
+    a failed biography, and the chain moves on.
+    
+    Args:
+        collection_file: Collection file name (relative to colecciones/)
+        options: BiographyGenerateRequest fields other than the character
+        continue_collection: Enqueue this task again after a character,
+            until the collection runs out
+        
+    Returns:
+        Dict with the character, job and outcome
+    """
+    import uuid
+    from src.api.models.biographies import BiographyGenerateRequest, JobStatus
+    from src.api.routers.biographies import (
+        create_biography_job,
+        generate_sources_for_biography,
+        run_biography_generation
+    )
+    from src.services.collection_service import CollectionService
+    from src.services.job_store import get_job_store
+    
+    scheduler = CollectionService().get_scheduler(collection_file)
+    entry = scheduler.claim_next(worker_id=f"{self.request.hostname}:{self.request.id}")
+    
+    if entry is None:
+        # Last worker out writes the buffered completion marks
+        scheduler.flush()
+        logger.info(f"Collection {collection_file} has no characters left to claim")
+        return {
+            'collection_file': collection_file,
+            'status': 'collection_complete',
+            'task_id': self.request.id
+        }
+    
+    logger.info(f"Generating biography for '{entry.name}' from collection {collection_file}")
+    
+    def continue_chain():
+        if continue_collection:
+            generate_collection_biography.apply_async(
+                args=(collection_file, options),
+                kwargs={'continue_collection': True}
+            )
+    
+    try:
+        request = BiographyGenerateRequest(character=entry.name, **(options or {}))
+        job_id = str(uuid.uuid4())
+        source_result = generate_sources_for_biography(
+            character=request.character,
+            mode=request.mode,
+            user_sources=request.sources,
+            min_sources=request.min_sources or 40,
+            quality_threshold=request.quality_threshold or 0.8
+        )
+        create_biography_job(job_id, request, source_result)
+        run_biography_generation(job_id, request)
+    except Exception:
+        if self.request.retries < self.retry_kwargs.get('max_retries', self.max_retries):
+            # The retry claims a character again; do not strand this claim
+            scheduler.release(entry.name)
+        else:
+            logger.warning(
+                f"Biography for '{entry.name}' failed after {self.request.retries} retries; "
+                f"it will be retried when its claim expires"
+            )
+            continue_chain()
+        raise
+    
+    job = get_job_store().get_status(job_id)
+    completed = job is not None and job['status'] == JobStatus.COMPLETED
+    if completed:
+        scheduler.complete(entry.name)
+    else:
+        logger.warning(f"Biography for '{entry.name}' failed; it will be retried when its claim expires")
+    
+    continue_chain()
+    
+    return {
+        'collection_file': collection_file,
+        'character': entry.name,
+        'job_id': job_id,
+        'status': 'completed' if completed else 'failed',
+        'task_id': self.request.id
+    }
+
+
+@app.task(
+    base=GenerationTask,
+    bind=True,
+    name='src.tasks.generation_tasks.run_collection',
+    queue='content_generation',
+    priority=4
+)
+def run_collection(
+    self,
+    collection_file: str,
+    concurrency: int = 4,
+    options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Generate the biographies of a collection with N concurrent workers
+    
+    Starts up to `concurrency` generate_collection_biography chains; each
+    one claims a character, generates it and moves on to the next.
+    
+    Args:
+        collection_file: Collection file name (relative to colecciones/)
+        concurrency: Number of biographies generated at once
+        options: BiographyGenerateRequest fields other than the character
+        
+    Returns:
+        Dict with the number of started workers
+    """
+    from celery import group
+    from src.services.collection_service import CollectionService
+    
+    stats = CollectionService().get_collection_stats(collection_file)
+    workers = max(0, min(concurrency, stats['remaining'] - stats['in_progress']))
+    logger.info(f"Running collection {collection_file} with {workers} concurrent workers")
+    
+    group_id = None
+    if workers:
+        result = group([
+            generate_collection_biography.s(collection_file, options)
+            for _ in range(workers)
+        ]).apply_async()
+        group_id = result.id
+    
+    return {
+        'collection_file': collection_file,
+        'remaining': stats['remaining'],
+        'workers': workers,
+        'group_id': group_id,
+        'status': 'processing' if workers else 'collection_complete',
+        'task_id': self.request.id
+    }
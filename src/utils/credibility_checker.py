@@ -3,15 +3,11 @@ Credibility checker for source validation
 """
 import re
 from typing import Optional, Dict, Any
-from urllib.parse import urlparse
 from datetime import datetime
 from dateutil import parser as date_parser
 
-from ..config.trusted_domains import (
-    get_domain_credibility_score,
-    is_trusted_domain,
-    get_domain_category
-)
+from ..config.domain_index import classify_domain
+from .url_utils import extract_domain
 
 
 class CredibilityChecker:
@@ -99,22 +95,14 @@ class CredibilityChecker:
             Domain credibility information
         """
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc
-            
-            # Remove 'www.' prefix
-            if domain.startswith('www.'):
-                domain = domain[4:]
-            
-            score = get_domain_credibility_score(domain)
-            category = get_domain_category(domain)
-            is_trusted = is_trusted_domain(domain)
+            domain = extract_domain(url)
+            classification = classify_domain(domain)
             
             return {
                 "domain": domain,
-                "score": score,
-                "category": category,
-                "is_trusted": is_trusted
+                "score": classification.credibility_score,
+                "category": classification.category,
+                "is_trusted": classification.is_trusted
             }
             
         except Exception:
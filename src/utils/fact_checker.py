@@ -5,13 +5,63 @@ AI-powered fact extraction and consistency verification
 import logging
 import re
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Sequence, Set
+
+import numpy as np
 
 from ..services.openrouter_client import OpenRouterClient, OpenRouterException
 from ..api.models.cross_validation import KeyFact
 
 logger = logging.getLogger(__name__)
 
+# Fact extraction and comparison results are reused by retried jobs for this long
+FACT_CACHE_TTL = 7 * 24 * 3600
+
+
+# Patterns and vocabularies used to normalize facts for local comparison
+_YEAR_PATTERN = re.compile(r'\b(1[0-9]{3}|20[0-9]{2})\b')
+_PLACE_PATTERN = re.compile(
+    r'\b(?:in|at|near)\s+([A-Z][\w\-]+(?:(?:,\s*|\s+)[A-Z][\w\-]+)*)'
+)
+_WORD_PATTERN = re.compile(r"[a-z][a-z\-']+")
+
+# Capitalized words after "in/at/near" that do not name a place
+# (dates such as "born in March 1879", seasons, sentence-initial determiners)
+_NON_PLACE_WORDS = frozenset({
+    'january', 'february', 'march', 'april', 'may', 'june', 'july',
+    'august', 'september', 'october', 'november', 'december',
+    'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept',
+    'oct', 'nov', 'dec',
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday',
+    'spring', 'summer', 'autumn', 'fall', 'winter',
+    'the', 'a', 'an', 'his', 'her', 'their', 'this', 'that', 'age',
+})
+
+_EVENT_KEYWORDS = {
+    'birth': ('born', 'birth'),
+    'death': ('died', 'death', 'passed away'),
+}
+
+_ROLE_TERMS = frozenset({
+    'physicist', 'scientist', 'mathematician', 'chemist', 'biologist',
+    'philosopher', 'writer', 'author', 'poet', 'novelist', 'playwright',
+    'composer', 'musician', 'painter', 'artist', 'sculptor', 'architect',
+    'inventor', 'engineer', 'astronomer', 'economist', 'historian',
+    'politician', 'president', 'king', 'queen', 'emperor', 'general',
+    'professor', 'teacher', 'lawyer', 'physician', 'doctor', 'explorer',
+    'businessman', 'entrepreneur', 'actor', 'actress', 'director',
+})
+
+_STOP_WORDS = frozenset({
+    'the', 'and', 'was', 'were', 'with', 'from', 'that', 'this', 'for',
+    'his', 'her', 'their', 'has', 'had', 'have', 'into', 'over', 'also',
+    'which', 'who', 'whom', 'after', 'before', 'during', 'about',
+})
+
+# Slots that hold a single true value; disjoint values across sources are
+# treated as a contradiction
+EXCLUSIVE_SLOTS = ('birth_year', 'birth_place', 'death_year', 'death_place')
+
 
 class FactualConsistencyChecker:
     """Checker for factual consistency using AI"""
@@ -77,7 +127,8 @@ Example format:
             response = self.openrouter_client.generate_text(
                 prompt=prompt,
                 temperature=0.1,
-                max_tokens=1000
+                max_tokens=1000,
+                cache_ttl=FACT_CACHE_TTL
             )
             
             # Parse JSON response
@@ -88,15 +139,7 @@ Example format:
                 else:
                     data = json.loads(response)
                 
-                facts = []
-                for idx, item in enumerate(data[:max_facts]):
-                    fact = KeyFact(
-                        fact=item.get('fact', ''),
-                        source_index=0,  # Will be set by caller
-                        confidence=float(item.get('confidence', 0.8)),
-                        category=item.get('category', 'other')
-                    )
-                    facts.append(fact)
+                facts = self._parse_fact_items(data, max_facts)
                 
                 logger.debug(f"Extracted {len(facts)} facts")
                 return facts
@@ -112,6 +155,153 @@ Example format:
             logger.error(f"Unexpected error during fact extraction: {e}")
             return []
     
+    def extract_key_facts_batch(
+        self,
+        contents: Sequence[str],
+        character: str,
+        max_facts: int = 10,
+        batch_size: int = 5
+    ) -> List[List[KeyFact]]:
+        """
+        Extract key facts from several sources with one AI call per batch
+        
+        Sources whose batch response cannot be parsed are retried one by
+        one with extract_key_facts.
+        
+        Args:
+            contents: Content of each source
+            character: Character name for context
+            max_facts: Maximum number of facts per source
+            batch_size: Number of sources sent in one prompt
+            
+        Returns:
+            One list of KeyFact objects per content, in input order
+        """
+        fact_sets: List[List[KeyFact]] = [[] for _ in contents]
+        pending = [
+            idx for idx, content in enumerate(contents)
+            if content and len(content.strip()) >= 50
+        ]
+        batch_size = max(1, batch_size)
+        
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            if len(batch) == 1:
+                idx = batch[0]
+                fact_sets[idx] = self.extract_key_facts(contents[idx], character, max_facts)
+                continue
+            
+            batch_facts = self._extract_batch(
+                [contents[idx] for idx in batch], character, max_facts
+            )
+            for position, idx in enumerate(batch):
+                facts = batch_facts.get(position)
+                if facts is None:
+                    facts = self.extract_key_facts(contents[idx], character, max_facts)
+                fact_sets[idx] = facts
+        
+        return fact_sets
+    
+    def _extract_batch(
+        self,
+        contents: List[str],
+        character: str,
+        max_facts: int
+    ) -> Dict[int, List[KeyFact]]:
+        """
+        Extract facts for one batch of sources in a single structured prompt
+        
+        Args:
+            contents: Contents of the batch
+            character: Character name for context
+            max_facts: Maximum number of facts per source
+            
+        Returns:
+            Dictionary mapping batch position to facts; positions missing
+            from the response are left out
+        """
+        sources_text = "\n\n".join(
+            f"Source {number}:\n{content[:2000]}"
+            for number, content in enumerate(contents, 1)
+        )
+        prompt = f"""Extract up to {max_facts} key factual statements about {character} from each of the {len(contents)} sources below.
+
+Focus on:
+- Birth/death dates and places
+- Major achievements and events
+- Important relationships
+- Career milestones
+- Historical context
+
+{sources_text}
+
+Respond with a JSON array containing one object per source, each containing:
+- source: the source number (integer)
+- facts: array of objects with fact (string), confidence (0-1 float) and category (one of [date, event, relationship, achievement, context])
+
+Example format:
+[
+  {{"source": 1, "facts": [{{"fact": "Born in 1879 in Ulm, Germany", "confidence": 0.95, "category": "date"}}]}},
+  {{"source": 2, "facts": [{{"fact": "Developed theory of relativity", "confidence": 0.9, "category": "achievement"}}]}}
+]
+"""
+        try:
+            response = self.openrouter_client.generate_text(
+                prompt=prompt,
+                temperature=0.1,
+                max_tokens=min(1000 * len(contents), 4000),
+                cache_ttl=FACT_CACHE_TTL
+            )
+            
+            json_match = re.search(r'\[.*\]', response, re.DOTALL)
+            data = json.loads(json_match.group(0) if json_match else response)
+            
+            results: Dict[int, List[KeyFact]] = {}
+            for entry in data:
+                if not isinstance(entry, dict) or not isinstance(entry.get('facts'), list):
+                    continue
+                position = int(entry.get('source', 0)) - 1
+                if 0 <= position < len(contents):
+                    results[position] = self._parse_fact_items(entry['facts'], max_facts)
+            
+            logger.debug(f"Batch extraction returned facts for {len(results)}/{len(contents)} sources")
+            return results
+            
+        except (json.JSONDecodeError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to parse batch fact extraction response: {e}")
+            return {}
+        except OpenRouterException as e:
+            logger.error(f"OpenRouter error during batch fact extraction: {e}")
+            return {
+                position: self._fallback_fact_extraction(content, character)
+                for position, content in enumerate(contents)
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error during batch fact extraction: {e}")
+            return {}
+    
+    def _parse_fact_items(self, items: List[Dict[str, Any]], max_facts: int) -> List[KeyFact]:
+        """
+        Convert parsed JSON fact objects to KeyFact objects
+        
+        Args:
+            items: Parsed fact objects
+            max_facts: Maximum number of facts to keep
+            
+        Returns:
+            List of KeyFact objects
+        """
+        facts = []
+        for item in items[:max_facts]:
+            fact = KeyFact(
+                fact=item.get('fact', ''),
+                source_index=0,  # Will be set by caller
+                confidence=float(item.get('confidence', 0.8)),
+                category=item.get('category', 'other')
+            )
+            facts.append(fact)
+        return facts
+    
     def _fallback_fact_extraction(
         self,
         content: str,
@@ -186,7 +376,8 @@ Respond with a JSON object containing:
             response = self.openrouter_client.generate_text(
                 prompt=prompt,
                 temperature=0.1,
-                max_tokens=500
+                max_tokens=500,
+                cache_ttl=FACT_CACHE_TTL
             )
             
             json_match = re.search(r'\{.*\}', response, re.DOTALL)
@@ -232,3 +423,147 @@ Respond with a JSON object containing:
         total = len(words1.union(words2))
         
         return overlap / total if total > 0 else 0.5
+    
+    def normalize_facts(self, facts: List[KeyFact]) -> Set[str]:
+        """
+        Normalize facts into comparable "slot:value" keys
+        
+        Years and places are attached to the birth or death slot when the
+        fact is about one of them; roles and content words are kept so
+        that agreeing sources share keys.
+        
+        Args:
+            facts: Facts of one source
+            
+        Returns:
+            Set of normalized fact keys (e.g. "birth_year:1879", "role:physicist")
+        """
+        keys: Set[str] = set()
+        
+        for fact in facts:
+            text = fact.fact
+            lowered = text.lower()
+            
+            events = [
+                event for event, keywords in _EVENT_KEYWORDS.items()
+                if any(keyword in lowered for keyword in keywords)
+            ]
+            prefix = f"{events[0]}_" if len(events) == 1 else ""
+            
+            years = set(_YEAR_PATTERN.findall(text))
+            for year in years:
+                keys.add(f"{prefix}year:{year}")
+            
+            for match in _PLACE_PATTERN.findall(text):
+                for place in re.split(r',\s*|\s+', match):
+                    if place.lower() not in _NON_PLACE_WORDS:
+                        keys.add(f"{prefix}place:{place.lower()}")
+            
+            for word in _WORD_PATTERN.findall(lowered):
+                if word in _ROLE_TERMS:
+                    keys.add(f"role:{word}")
+                elif len(word) > 3 and word not in _STOP_WORDS:
+                    keys.add(f"term:{word}")
+        
+        return keys
+    
+    def compare_normalized_facts(self, keys1: Set[str], keys2: Set[str]) -> float:
+        """
+        Compare two normalized fact sets locally, without an AI call
+        
+        Shared values in exclusive slots (birth/death year and place)
+        count as agreements, disjoint values as contradictions; overall
+        key overlap adds credit for corroborated facts.
+        
+        Args:
+            keys1: Normalized facts of the first source
+            keys2: Normalized facts of the second source
+            
+        Returns:
+            Consistency score (0-1)
+        """
+        if not keys1 or not keys2:
+            return 0.5  # Neutral score if no facts to compare
+        
+        agreements = 0
+        contradictions = 0
+        for slot in EXCLUSIVE_SLOTS:
+            values1 = {key for key in keys1 if key.startswith(f"{slot}:")}
+            values2 = {key for key in keys2 if key.startswith(f"{slot}:")}
+            if values1 and values2:
+                if values1 & values2:
+                    agreements += 1
+                else:
+                    contradictions += 1
+        
+        overlap = len(keys1 & keys2) / len(keys1 | keys2)
+        
+        if agreements + contradictions == 0:
+            return 0.5 + 0.5 * overlap
+        
+        return (agreements / (agreements + contradictions)) * 0.8 + overlap * 0.2
+    
+    def consistency_matrix(self, key_sets: Sequence[Set[str]]) -> np.ndarray:
+        """
+        Vectorized compare_normalized_facts for all pairs of sources
+        
+        Builds a source-by-fact incidence matrix and derives every pairwise
+        overlap, agreement and contradiction count from matrix products.
+        
+        Args:
+            key_sets: Normalized facts of each source
+            
+        Returns:
+            Symmetric (n x n) matrix of consistency scores with ones on the
+            diagonal
+        """
+        n = len(key_sets)
+        if n == 0:
+            return np.zeros((0, 0))
+        
+        vocabulary: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, keys in enumerate(key_sets):
+            for key in keys:
+                rows.append(row)
+                cols.append(vocabulary.setdefault(key, len(vocabulary)))
+        
+        incidence = np.zeros((n, len(vocabulary)), dtype=np.float32)
+        incidence[rows, cols] = 1.0
+        
+        # Jaccard overlap of the key sets
+        shared = incidence @ incidence.T
+        sizes = incidence.sum(axis=1)
+        union = sizes[:, None] + sizes[None, :] - shared
+        overlap = np.divide(shared, union, out=np.zeros_like(shared), where=union > 0)
+        
+        # Agreements/contradictions on single-valued slots
+        agreements = np.zeros((n, n), dtype=np.float32)
+        contradictions = np.zeros((n, n), dtype=np.float32)
+        for slot in EXCLUSIVE_SLOTS:
+            slot_cols = [col for key, col in vocabulary.items() if key.startswith(f"{slot}:")]
+            if not slot_cols:
+                continue
+            slot_incidence = incidence[:, slot_cols]
+            present = slot_incidence.any(axis=1)
+            both = present[:, None] & present[None, :]
+            agree = (slot_incidence @ slot_incidence.T) > 0
+            agreements += both & agree
+            contradictions += both & ~agree
+        
+        evidence = agreements + contradictions
+        slot_score = np.divide(agreements, evidence, out=np.zeros_like(agreements), where=evidence > 0)
+        matrix = np.where(
+            evidence > 0,
+            slot_score * 0.8 + overlap * 0.2,
+            0.5 + 0.5 * overlap
+        )
+        
+        # Neutral score if either source has no facts
+        empty = sizes == 0
+        matrix[empty, :] = 0.5
+        matrix[:, empty] = 0.5
+        np.fill_diagonal(matrix, 1.0)
+        
+        return matrix.astype(float)
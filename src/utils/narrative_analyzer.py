@@ -3,14 +3,36 @@ Narrative coherence analyzer for biography content
 Analyzes text for narrative flow, consistency, and quality
 """
 import re
+from dataclasses import dataclass
 from typing import List, Dict, Tuple, Optional
 from collections import Counter
 import logging
 
-from src.utils.text_analyzer import TextAnalyzer
+from src.utils.near_duplicates import ShingleIndex, shingle_set
+from src.utils.text_analyzer import TextAnalyzer, TextOrDocument
+from src.utils.tokenized_document import tokenize
 
 logger = logging.getLogger(__name__)
 
+# Years from 1000 to 2029 (matched against whole terms)
+YEAR_RE = re.compile(r'1[0-9]{3}|20[0-2][0-9]')
+
+# Paragraph similarity (Jaccard or containment) considered redundant, and
+# words per shingle when comparing paragraphs
+REDUNDANCY_THRESHOLD = 0.7
+REDUNDANCY_SHINGLE_SIZE = 3
+
+
+@dataclass
+class ChapterProfile:
+    """Per-chapter facts the coherence checks are computed from"""
+    mentions: int  # Mentions of the subject's name variations
+    years: List[int]  # Unique years mentioned, ascending
+    vocabulary: List[str]  # Unique lowercased terms
+    term_count: int
+    has_content: bool
+    has_header: bool  # Header within the first 5 lines
+
 
 class NarrativeAnalyzer:
     """Analyzes narrative coherence and quality"""
@@ -34,7 +56,62 @@ class NarrativeAnalyzer:
         Returns:
             Dictionary with coherence metrics
         """
-        if not chapters:
+        return self.combine_coherence(
+            [self.profile_chapter(chapter, character_name) for chapter in chapters],
+            character_name
+        )
+    
+    def profile_chapter(self, chapter: TextOrDocument, character_name: str) -> ChapterProfile:
+        """
+        Extract what the coherence checks need from one chapter
+        
+        Profiles only depend on the chapter itself, so they can be cached
+        per chapter and combined later.
+        
+        Args:
+            chapter: Chapter content (or its TokenizedDocument)
+            character_name: Biography subject name
+            
+        Returns:
+            ChapterProfile
+        """
+        document = tokenize(chapter)
+        
+        # Case-insensitive whole-word search of each name variation
+        mentions = sum(document.count_phrase(pattern) for pattern in self._name_patterns(character_name))
+        
+        # Year mentions (whole terms, so only the vocabulary is scanned)
+        years = sorted(int(term) for term in document.term_vocabulary if YEAR_RE.fullmatch(term))
+        
+        # Check for proper chapter structure in the first 5 lines
+        stripped = document.text.strip()
+        has_header = any(re.match(r'^#+\s+', line) for line in stripped.split('\n')[:5])
+        
+        return ChapterProfile(
+            mentions=mentions,
+            years=years,
+            vocabulary=list(document.term_vocabulary),
+            term_count=len(document.term_ids),
+            has_content=bool(stripped),
+            has_header=has_header
+        )
+    
+    def combine_coherence(
+        self,
+        profiles: List[ChapterProfile],
+        character_name: str
+    ) -> Dict[str, any]:
+        """
+        Analyze narrative coherence from chapter profiles
+        
+        Args:
+            profiles: Profile of each chapter, in order
+            character_name: Biography subject name
+            
+        Returns:
+            Dictionary with coherence metrics (same as analyze_coherence)
+        """
+        if not profiles:
             return {
                 'score': 0.0,
                 'issues': [],
@@ -42,10 +119,10 @@ class NarrativeAnalyzer:
             }
         
         # Analyze various coherence aspects
-        character_consistency = self._check_character_consistency(chapters, character_name)
-        temporal_consistency = self._check_temporal_consistency(chapters)
-        vocabulary_coherence = self._check_vocabulary_coherence(chapters)
-        narrative_flow = self._analyze_narrative_flow(chapters)
+        character_consistency = self._check_character_consistency(profiles, character_name)
+        temporal_consistency = self._check_temporal_consistency(profiles)
+        vocabulary_coherence = self._check_vocabulary_coherence(profiles)
+        narrative_flow = self._analyze_narrative_flow(profiles)
         
         # Calculate overall coherence score (weighted average)
         overall_score = (
@@ -73,16 +150,34 @@ class NarrativeAnalyzer:
             }
         }
     
+    def _name_patterns(self, character_name: str) -> List[str]:
+        """Name variations counted as mentions of the subject"""
+        # Extract first and last name variations
+        name_parts = character_name.split()
+        name_patterns = []
+        
+        if len(name_parts) >= 2:
+            # Full name
+            name_patterns.append(character_name)
+            # Last name
+            name_patterns.append(name_parts[-1])
+            # First name
+            name_patterns.append(name_parts[0])
+        else:
+            name_patterns.append(character_name)
+        
+        return name_patterns
+    
     def _check_character_consistency(
         self, 
-        chapters: List[str],
+        profiles: List[ChapterProfile],
         character_name: str
     ) -> Dict[str, any]:
         """
         Check for consistent character representation
         
         Args:
-            chapters: List of chapter contents
+            profiles: Profile of each chapter
             character_name: Biography subject name
             
         Returns:
@@ -90,47 +185,19 @@ class NarrativeAnalyzer:
         """
         issues = []
         
-        # Extract first and last name variations
-        name_parts = character_name.split()
-        name_patterns = []
-        
-        if len(name_parts) >= 2:
-            # Full name
-            name_patterns.append(character_name)
-            # Last name
-            name_patterns.append(name_parts[-1])
-            # First name
-            name_patterns.append(name_parts[0])
-        else:
-            name_patterns.append(character_name)
-        
         # Count mentions across chapters
-        total_mentions = 0
-        chapters_with_mentions = 0
-        
-        for idx, chapter in enumerate(chapters):
-            chapter_mentions = 0
-            for pattern in name_patterns:
-                # Case-insensitive search
-                chapter_mentions += len(re.findall(
-                    r'\b' + re.escape(pattern) + r'\b',
-                    chapter,
-                    re.IGNORECASE
-                ))
-            
-            if chapter_mentions > 0:
-                chapters_with_mentions += 1
-            total_mentions += chapter_mentions
+        total_mentions = sum(profile.mentions for profile in profiles)
+        chapters_with_mentions = sum(1 for profile in profiles if profile.mentions > 0)
         
         # Calculate consistency score
-        if len(chapters) == 0:
+        if len(profiles) == 0:
             score = 0.0
         else:
             # Score based on percentage of chapters mentioning the subject
-            mention_ratio = chapters_with_mentions / len(chapters)
+            mention_ratio = chapters_with_mentions / len(profiles)
             
             # Also consider average mentions per chapter
-            avg_mentions = total_mentions / len(chapters)
+            avg_mentions = total_mentions / len(profiles)
             
             # Combine metrics (good if most chapters mention the subject)
             score = min(1.0, (mention_ratio * 0.7 + min(avg_mentions / 10, 1.0) * 0.3))
@@ -140,7 +207,7 @@ class NarrativeAnalyzer:
             issues.append({
                 'type': 'character_consistency',
                 'severity': 'warning',
-                'message': f'Subject "{character_name}" mentioned in only {chapters_with_mentions}/{len(chapters)} sections'
+                'message': f'Subject "{character_name}" mentioned in only {chapters_with_mentions}/{len(profiles)} sections'
             })
         
         return {
@@ -149,30 +216,20 @@ class NarrativeAnalyzer:
             'total_mentions': total_mentions
         }
     
-    def _check_temporal_consistency(self, chapters: List[str]) -> Dict[str, any]:
+    def _check_temporal_consistency(self, profiles: List[ChapterProfile]) -> Dict[str, any]:
         """
         Check temporal/chronological consistency
         
         Args:
-            chapters: List of chapter contents
+            profiles: Profile of each chapter
             
         Returns:
             Temporal consistency analysis
         """
         issues = []
         
-        # Extract year mentions
-        year_pattern = r'\b(1[0-9]{3}|20[0-2][0-9])\b'
-        
-        chapter_years = []
-        for chapter in chapters:
-            years = re.findall(year_pattern, chapter)
-            if years:
-                # Get unique years and convert to int
-                unique_years = sorted(set(int(y) for y in years))
-                chapter_years.append(unique_years)
-            else:
-                chapter_years.append([])
+        # Unique years of each chapter in ascending order
+        chapter_years = [profile.years for profile in profiles]
         
         # Check for chronological progression
         score = 1.0
@@ -200,35 +257,29 @@ class NarrativeAnalyzer:
             'issues': issues
         }
     
-    def _check_vocabulary_coherence(self, chapters: List[str]) -> Dict[str, any]:
+    def _check_vocabulary_coherence(self, profiles: List[ChapterProfile]) -> Dict[str, any]:
         """
         Analyze vocabulary consistency across chapters
         
         Args:
-            chapters: List of chapter contents
+            profiles: Profile of each chapter
             
         Returns:
             Vocabulary coherence metrics
         """
-        if len(chapters) < 2:
+        if len(profiles) < 2:
             return {'score': 1.0, 'issues': []}
         
-        # Combine all chapters
-        combined_text = ' '.join(chapters)
-        
-        # Calculate vocabulary richness
-        words = re.findall(r'\b\w+\b', combined_text.lower())
-        if not words:
+        # Calculate vocabulary richness of all chapters combined
+        total_words = sum(profile.term_count for profile in profiles)
+        if not total_words:
             return {'score': 0.0, 'issues': []}
         
-        unique_words = set(words)
-        vocabulary_richness = len(unique_words) / len(words)
-        
         # Analyze vocabulary distribution across chapters
-        chapter_vocabularies = []
-        for chapter in chapters:
-            chapter_words = set(re.findall(r'\b\w+\b', chapter.lower()))
-            chapter_vocabularies.append(chapter_words)
+        chapter_vocabularies = [set(profile.vocabulary) for profile in profiles]
+        
+        unique_words = set().union(*chapter_vocabularies)
+        vocabulary_richness = len(unique_words) / total_words
         
         # Calculate overlap between consecutive chapters
         overlaps = []
@@ -269,12 +320,12 @@ class NarrativeAnalyzer:
             'vocabulary_richness': vocabulary_richness
         }
     
-    def _analyze_narrative_flow(self, chapters: List[str]) -> Dict[str, any]:
+    def _analyze_narrative_flow(self, profiles: List[ChapterProfile]) -> Dict[str, any]:
         """
         Analyze narrative flow and transitions
         
         Args:
-            chapters: List of chapter contents
+            profiles: Profile of each chapter
             
         Returns:
             Narrative flow metrics
@@ -283,20 +334,12 @@ class NarrativeAnalyzer:
         score = 1.0
         
         # Check for abrupt starts/ends
-        for idx, chapter in enumerate(chapters):
-            if not chapter.strip():
+        for idx, profile in enumerate(profiles):
+            if not profile.has_content:
                 continue
             
-            lines = chapter.strip().split('\n')
-            
             # Check for proper chapter structure
-            has_header = False
-            for line in lines[:5]:  # Check first 5 lines
-                if re.match(r'^#+\s+', line):
-                    has_header = True
-                    break
-            
-            if not has_header and idx > 0:  # Allow first chapter to be different
+            if not profile.has_header and idx > 0:  # Allow first chapter to be different
                 issues.append({
                     'type': 'structure',
                     'severity': 'info',
@@ -314,11 +357,17 @@ class NarrativeAnalyzer:
     def detect_redundancies(
         self,
         chapters: List[str],
-        similarity_threshold: float = 0.7
+        similarity_threshold: float = REDUNDANCY_THRESHOLD
     ) -> List[Dict[str, any]]:
         """
         Detect redundant content across chapters
         
+        Paragraphs are compared through an inverted index of hashed word
+        shingles, so only paragraphs sharing wording are ever compared.
+        A paragraph is redundant if its Jaccard similarity with, or its
+        containment in, an earlier paragraph reaches the threshold; each
+        redundant paragraph is reported once, against its closest match.
+        
         Args:
             chapters: List of chapter contents
             similarity_threshold: Threshold for considering content redundant
@@ -327,36 +376,70 @@ class NarrativeAnalyzer:
             List of detected redundancies
         """
         redundancies = []
+        index = ShingleIndex(threshold=similarity_threshold, shingle_size=REDUNDANCY_SHINGLE_SIZE)
+        normalized_paragraphs = {}
         
-        # Split chapters into paragraphs
-        chapter_paragraphs = []
-        for idx, chapter in enumerate(chapters):
-            paragraphs = [p.strip() for p in chapter.split('\n\n') if p.strip()]
-            chapter_paragraphs.append((idx, paragraphs))
-        
-        # Simple redundancy detection based on exact or near-exact matches
-        seen_content = {}
-        
-        for chapter_idx, paragraphs in chapter_paragraphs:
-            for para_idx, paragraph in enumerate(paragraphs):
-                # Skip very short paragraphs
-                if len(paragraph.split()) < 10:
-                    continue
+        for chapter_idx, chapter in enumerate(chapters):
+            for para_idx, normalized in self._comparable_paragraphs(chapter):
+                key = (chapter_idx, para_idx)
+                normalized_paragraphs[key] = normalized
                 
-                # Normalize paragraph for comparison
-                normalized = ' '.join(paragraph.lower().split())
+                matches = index.add(key, normalized)
+                if not matches:
+                    continue
                 
-                # Check for duplicates
-                if normalized in seen_content:
-                    original_chapter, original_para = seen_content[normalized]
-                    redundancies.append({
-                        'type': 'exact_duplicate',
-                        'original_chapter': original_chapter,
-                        'duplicate_chapter': chapter_idx,
-                        'severity': 'warning',
-                        'message': f'Duplicate content found between chapters {original_chapter+1} and {chapter_idx+1}'
-                    })
+                (original_chapter, original_para), jaccard, containment = matches[0]
+                if normalized_paragraphs[(original_chapter, original_para)] == normalized:
+                    redundancy_type = 'exact_duplicate'
+                    message = (
+                        f'Duplicate content found between chapters '
+                        f'{original_chapter+1} and {chapter_idx+1}'
+                    )
                 else:
-                    seen_content[normalized] = (chapter_idx, para_idx)
+                    redundancy_type = 'near_duplicate'
+                    message = (
+                        f'Similar content ({max(jaccard, containment):.0%} overlap) found '
+                        f'between chapters {original_chapter+1} and {chapter_idx+1}'
+                    )
+                
+                redundancies.append({
+                    'type': redundancy_type,
+                    'original_chapter': original_chapter,
+                    'original_paragraph': original_para,
+                    'duplicate_chapter': chapter_idx,
+                    'duplicate_paragraph': para_idx,
+                    'similarity': round(jaccard, 3),
+                    'containment': round(containment, 3),
+                    'severity': 'warning',
+                    'message': message
+                })
         
         return redundancies
+    
+    def paragraph_shingles(self, chapter: TextOrDocument) -> List[Tuple[int, List[int]]]:
+        """
+        Shingle hashes of the paragraphs detect_redundancies compares
+        
+        Lets callers cache a chapter's paragraphs and compare them later
+        with a ShingleIndex (add_shingles / query_shingles).
+        
+        Args:
+            chapter: Chapter content (or its TokenizedDocument)
+            
+        Returns:
+            List of (paragraph index, sorted shingle hashes)
+        """
+        return [
+            (para_idx, sorted(shingle_set(normalized, REDUNDANCY_SHINGLE_SIZE)))
+            for para_idx, normalized in self._comparable_paragraphs(chapter)
+        ]
+    
+    def _comparable_paragraphs(self, chapter: TextOrDocument):
+        """Yield (paragraph index, normalized text) of paragraphs long enough to compare"""
+        for para_idx, paragraph in enumerate(tokenize(chapter).paragraphs):
+            # Skip very short paragraphs
+            if len(paragraph.split()) < 10:
+                continue
+            
+            # Normalize paragraph for comparison
+            yield para_idx, ' '.join(paragraph.lower().split())
@@ -0,0 +1,410 @@
+"""
+Near-duplicate detection with MinHash signatures and LSH
+
+Mirrors, print views and syndicated copies of an article differ in page
+chrome and a few edits but share almost all of their word shingles. A
+MinHash signature estimates the Jaccard similarity of two shingle sets, and
+a banded LSH index returns the documents sharing at least one band with a
+query, so each lookup costs a few dictionary probes instead of a comparison
+with every document seen so far. Short texts such as paragraphs use an
+exact inverted index over the same shingle hashes instead.
+"""
+import logging
+import re
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple, TypeVar
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+_WORD_RE = re.compile(r"\w+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Shingles hashed against all permutations at once (bounds temporary memory)
+_CHUNK_SIZE = 2048
+
+
+def shingle_set(text: str, size: int = 5) -> Set[int]:
+    """
+    Hash the distinct word shingles of a text
+
+    Texts shorter than one shingle yield a single shingle of all words.
+
+    Args:
+        text: Document text
+        size: Words per shingle
+
+    Returns:
+        Set of 32-bit shingle hashes (empty for texts without words)
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    windows = zip(*(words[offset:] for offset in range(size)))
+    return {zlib.crc32(shingle.encode('utf-8')) for shingle in map(' '.join, windows)}
+
+
+def shingle_hashes(text: str, size: int = 5) -> np.ndarray:
+    """
+    Hash the distinct word shingles of a text into an array
+
+    Args:
+        text: Document text
+        size: Words per shingle
+
+    Returns:
+        Array of 32-bit shingle hashes (empty for texts without words)
+    """
+    shingles = shingle_set(text, size)
+    return np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+
+
+def _area(y: np.ndarray, x: np.ndarray) -> float:
+    """Trapezoidal integral of y over x"""
+    return float(np.sum((y[1:] + y[:-1]) * np.diff(x)) / 2)
+
+
+@lru_cache(maxsize=32)
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Choose LSH bands and rows per band for a similarity threshold
+
+    Minimizes the sum of the false positive and false negative probability
+    mass of the S-curve 1 - (1 - s^rows)^bands around the threshold.
+
+    Args:
+        threshold: Jaccard similarity above which documents should collide
+        num_perm: Signature length
+
+    Returns:
+        Tuple of (bands, rows)
+    """
+    below = np.linspace(0.0, threshold, 64)
+    above = np.linspace(threshold, 1.0, 64)
+    best, best_error = (1, num_perm), float('inf')
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        false_positive = _area(1 - (1 - below ** rows) ** bands, below)
+        false_negative = _area((1 - above ** rows) ** bands, above)
+        error = false_positive + false_negative
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """MinHash signatures of word-shingle sets"""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        """
+        Initialize the hasher
+
+        Args:
+            num_perm: Number of hash permutations (signature length)
+            shingle_size: Words per shingle
+            seed: Seed of the permutation parameters; signatures are only
+                comparable between hashers with the same seed and num_perm
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        Compute the MinHash signature of a text
+
+        Args:
+            text: Document text
+
+        Returns:
+            Signature array, or None if the text has no words
+        """
+        hashes = shingle_hashes(text, self.shingle_size)
+        if hashes.size == 0:
+            return None
+
+        signature = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        for start in range(0, hashes.size, _CHUNK_SIZE):
+            chunk = hashes[start:start + _CHUNK_SIZE, np.newaxis]
+            values = ((chunk * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+            np.minimum(signature, values.min(axis=0), out=signature)
+        return signature
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        """
+        Estimate the Jaccard similarity of two signatures
+
+        Args:
+            first: Signature
+            second: Signature of the same length
+
+        Returns:
+            Estimated similarity (0-1)
+        """
+        return float(np.count_nonzero(first == second)) / len(first)
+
+
+class MinHashLSH:
+    """Banded locality-sensitive hashing index over MinHash signatures"""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128):
+        """
+        Initialize the index
+
+        Args:
+            threshold: Estimated Jaccard similarity of a match
+            num_perm: Signature length
+        """
+        self.threshold = threshold
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self._tables: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        """
+        Add a document to the index
+
+        Args:
+            key: Document key (must not be indexed yet)
+            signature: MinHash signature
+        """
+        if key in self._signatures:
+            raise ValueError(f"Key already indexed: {key!r}")
+        self._signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._tables[band][band_key].append(key)
+
+    def query(self, signature: np.ndarray) -> List[Tuple[Hashable, float]]:
+        """
+        Find indexed documents similar to a signature
+
+        Candidates sharing a band are verified against the threshold with
+        their estimated similarity.
+
+        Args:
+            signature: MinHash signature
+
+        Returns:
+            List of (key, estimated similarity), most similar first
+        """
+        candidates: Set[Hashable] = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._tables[band].get(band_key, ()))
+
+        matches = []
+        for key in candidates:
+            similarity = MinHasher.similarity(signature, self._signatures[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+
+class ShingleIndex:
+    """
+    Inverted index from shingle hash to the documents containing it
+
+    Used for short texts such as paragraphs, where exact shingle sets are
+    cheap to keep. Adding a document walks the posting lists of its
+    shingles once, which yields the exact overlap with every earlier
+    document sharing a shingle; documents sharing none are never looked at.
+    """
+
+    def __init__(self, threshold: float = 0.7, shingle_size: int = 3):
+        """
+        Initialize the index
+
+        Args:
+            threshold: Minimum Jaccard similarity or containment of a match
+            shingle_size: Words per shingle
+        """
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self._postings: Dict[int, List[Hashable]] = {}
+        self._sizes: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add(self, key: Hashable, text: str) -> List[Tuple[Hashable, float, float]]:
+        """
+        Index a document and return the earlier documents it matches
+
+        Args:
+            key: Document key (must not be indexed yet)
+            text: Document text
+
+        Returns:
+            List of (key, Jaccard similarity, containment) for indexed
+            documents whose Jaccard similarity or containment (overlap
+            relative to the smaller document) reaches the threshold, best
+            match first
+        """
+        return self.add_shingles(key, shingle_set(text, self.shingle_size))
+
+    def add_shingles(self, key: Hashable, shingles: Iterable[int]) -> List[Tuple[Hashable, float, float]]:
+        """
+        Index a document by its shingle hashes (see add)
+
+        Args:
+            key: Document key (must not be indexed yet)
+            shingles: Distinct shingle hashes of the document
+
+        Returns:
+            Matches as returned by add
+        """
+        if key in self._sizes:
+            raise ValueError(f"Key already indexed: {key!r}")
+
+        # Most shingles are new; only walk the posting lists of known ones
+        known = []
+        size = 0
+        for shingle in shingles:
+            size += 1
+            posting = self._postings.get(shingle)
+            if posting is None:
+                self._postings[shingle] = [key]
+            else:
+                known.append(posting)
+        overlaps = Counter(chain.from_iterable(known))
+        for posting in known:
+            posting.append(key)
+        self._sizes[key] = size
+        return self._matches(overlaps, size)
+
+    def query_shingles(self, shingles: Iterable[int]) -> List[Tuple[Hashable, float, float]]:
+        """
+        Find the indexed documents a document matches without indexing it
+
+        Args:
+            shingles: Distinct shingle hashes of the document
+
+        Returns:
+            Matches as returned by add
+        """
+        shingles = list(shingles)
+        # Most documents share nothing with the index; rule them out in C
+        if self._postings.keys().isdisjoint(shingles):
+            return []
+
+        known = [self._postings[shingle] for shingle in shingles if shingle in self._postings]
+        return self._matches(Counter(chain.from_iterable(known)), len(shingles))
+
+    def _matches(self, overlaps: Counter, size: int) -> List[Tuple[Hashable, float, float]]:
+        matches = []
+        for other, overlap in overlaps.items():
+            other_size = self._sizes[other]
+            jaccard = overlap / (size + other_size - overlap)
+            containment = overlap / min(size, other_size)
+            if jaccard >= self.threshold or containment >= self.threshold:
+                matches.append((other, jaccard, containment))
+        matches.sort(key=lambda match: (match[1], match[2]), reverse=True)
+        return matches
+
+
+class NearDuplicateDetector:
+    """
+    Groups documents whose texts are near-duplicates of each other
+
+    Documents are added to an LSH index one by one and joined (union-find)
+    with every indexed document above the similarity threshold.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 5):
+        """
+        Initialize the detector
+
+        Args:
+            threshold: Estimated Jaccard similarity of word shingles above
+                which two texts are near-duplicates
+            num_perm: MinHash signature length
+            shingle_size: Words per shingle
+        """
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm=num_perm, shingle_size=shingle_size)
+
+    def cluster(self, texts: Sequence[Optional[str]]) -> List[Optional[int]]:
+        """
+        Assign texts to near-duplicate clusters
+
+        Args:
+            texts: Document texts (None for documents without text)
+
+        Returns:
+            Per document, the index of the first document of its cluster,
+            or None for documents without text
+        """
+        index = MinHashLSH(threshold=self.threshold, num_perm=self.hasher.num_perm)
+        parent: Dict[int, int] = {}
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, text in enumerate(texts):
+            signature = self.hasher.signature(text) if text else None
+            if signature is None:
+                continue
+            parent[i] = i
+            for match, _ in index.query(signature):
+                root, other = find(i), find(match)
+                if root != other:
+                    parent[max(root, other)] = min(root, other)
+            index.insert(i, signature)
+
+        return [find(i) if i in parent else None for i in range(len(texts))]
+
+    def deduplicate(
+        self,
+        items: Sequence[T],
+        text_of: Callable[[T], Optional[str]],
+        score_of: Callable[[T], float]
+    ) -> Tuple[List[T], List[T]]:
+        """
+        Keep only the highest-scoring item of each near-duplicate cluster
+
+        Items without text are always kept. Ties go to the earlier item.
+
+        Args:
+            items: Items to de-duplicate
+            text_of: Text of an item (None if unknown)
+            score_of: Score deciding which cluster member is kept
+
+        Returns:
+            Tuple of (kept items in input order, removed items)
+        """
+        clusters = self.cluster([text_of(item) for item in items])
+
+        best: Dict[int, int] = {}
+        for i, root in enumerate(clusters):
+            if root is not None and (root not in best or score_of(items[i]) > score_of(items[best[root]])):
+                best[root] = i
+
+        kept, removed = [], []
+        for i, root in enumerate(clusters):
+            if root is None or best[root] == i:
+                kept.append(items[i])
+            else:
+                removed.append(items[i])
+
+        if removed:
+            logger.info(f"Dropped {len(removed)} near-duplicate items out of {len(items)}")
+        return kept, removed
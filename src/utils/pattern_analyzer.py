@@ -5,9 +5,9 @@ Analyzes successful generations to identify common patterns
 import logging
 from typing import List, Dict, Any, Set
 from collections import Counter, defaultdict
-from urllib.parse import urlparse
 
 from ..strategies.base_strategy import SourceCandidate
+from .url_utils import extract_domain
 from ..models.quality_metrics import (
     SuccessPattern,
     BiographyQualityScore
@@ -81,9 +81,7 @@ class SuccessPatternAnalyzer:
         for source in sources:
             if hasattr(source.source_item, 'url') and source.source_item.url:
                 try:
-                    domain = urlparse(source.source_item.url).netloc
-                    # Remove www. prefix
-                    domain = domain.replace('www.', '')
+                    domain = extract_domain(source.source_item.url)
                     if domain:
                         domain_counter[domain] += 1
                 except Exception as e:
@@ -2,9 +2,10 @@
 Retry Handler with Exponential Backoff
 System for handling retries with exponential backoff for API calls
 """
+import asyncio
 import time
 import logging
-from typing import Callable, Any, Optional, Type
+from typing import Awaitable, Callable, Any, Optional, Type
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -115,6 +116,57 @@ class RetryHandler:
         
         # Should never reach here
         raise RetryException(f"Unexpected retry loop termination") from last_exception
+    
+    async def execute_async(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args,
+        retry_on: tuple[Type[Exception], ...] = (Exception,),
+        **kwargs
+    ) -> Any:
+        """
+        Await a coroutine function with retry logic
+        
+        Same policy as execute(), but waits with asyncio.sleep so other
+        tasks keep running between attempts.
+        
+        Args:
+            func: Coroutine function to await
+            *args: Positional arguments for the function
+            retry_on: Tuple of exception types to retry on
+            **kwargs: Keyword arguments for the function
+            
+        Returns:
+            Result of the function
+            
+        Raises:
+            RetryException: If all retry attempts fail
+        """
+        func_name = getattr(func, '__name__', repr(func))
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await func(*args, **kwargs)
+            except retry_on as e:
+                if attempt == self.max_retries:
+                    logger.error(
+                        f"All {self.max_retries} retry attempts exhausted for {func_name}",
+                        exc_info=True
+                    )
+                    raise RetryException(
+                        f"Failed after {self.max_retries + 1} attempts: {str(e)}"
+                    ) from e
+                
+                delay = self.calculate_delay(attempt)
+                logger.warning(
+                    f"Attempt {attempt + 1}/{self.max_retries + 1} failed for {func_name}. "
+                    f"Retrying in {delay:.2f}s. Error: {str(e)}"
+                )
+                await asyncio.sleep(delay)
+            except Exception as e:
+                # Don't retry on unexpected exceptions
+                logger.error(f"Unexpected error in {func_name}: {str(e)}", exc_info=True)
+                raise
 
 
 def with_retry(
@@ -3,11 +3,14 @@ Source Triangulator
 Cross-reference and triangulate information from multiple sources
 """
 import logging
-from typing import List, Dict, Any, Set
+from typing import List, Dict, Any, Optional, Set
 from collections import defaultdict
 
 from ..strategies.base_strategy import SourceCandidate
 from ..api.models.cross_validation import KeyFact
+from ..cache.page_cache import PageCache, get_page_cache
+from .near_duplicates import NearDuplicateDetector
+from .url_utils import extract_domain, extract_registrable_domain
 
 logger = logging.getLogger(__name__)
 
@@ -15,8 +18,22 @@ logger = logging.getLogger(__name__)
 class SourceTriangulator:
     """Triangulator for cross-referencing multiple sources"""
     
-    def __init__(self):
-        """Initialize the source triangulator"""
+    def __init__(
+        self,
+        page_cache: Optional[PageCache] = None,
+        duplicate_detector: Optional[NearDuplicateDetector] = None
+    ):
+        """
+        Initialize the source triangulator
+        
+        Args:
+            page_cache: Fetched-page cache holding the text of validated
+                pages (uses the shared cache if None)
+            duplicate_detector: Near-duplicate detector for page texts
+                (creates default if None)
+        """
+        self.page_cache = page_cache or get_page_cache()
+        self.duplicate_detector = duplicate_detector or NearDuplicateDetector()
         logger.info("SourceTriangulator initialized")
     
     def triangulate_facts(
@@ -120,6 +137,10 @@ class SourceTriangulator:
         """
         Calculate information overlap between sources
         
+        Sources whose fetched pages are near-duplicates of each other count
+        as one source. Sources whose page text is not cached fall back to
+        their registrable domain, so copies on one site count once.
+        
         Args:
             sources: List of source candidates
             
@@ -133,26 +154,47 @@ class SourceTriangulator:
                 'redundant_sources': 0
             }
         
-        # Extract domains
-        domains = []
-        for source in sources:
-            if hasattr(source.source_item, 'url') and source.source_item.url:
-                domain = self._extract_domain(source.source_item.url)
-                domains.append(domain)
+        urls = [
+            source.source_item.url if hasattr(source.source_item, 'url') else None
+            for source in sources
+        ]
+        clusters = self.duplicate_detector.cluster(
+            [self.page_cache.get_text(url) if url else None for url in urls]
+        )
         
-        # Count unique domains
-        unique_domains = len(set(domains))
+        # Group by content cluster, or by domain when the text is unknown
+        groups: Dict[Any, List[int]] = defaultdict(list)
+        domains = set()
+        for index, (url, cluster) in enumerate(zip(urls, clusters)):
+            if not url:
+                continue
+            domain = extract_registrable_domain(url)
+            domains.add(domain)
+            groups[('content', cluster) if cluster is not None else ('domain', domain)].append(index)
+        
+        unique_sources = len(groups)
         total_sources = len(sources)
+        compared = sum(1 for cluster in clusters if cluster is not None)
+        near_duplicates = [
+            [urls[index] for index in members]
+            for key, members in groups.items()
+            if key[0] == 'content' and len(members) > 1
+        ]
+        duplicate_pages = sum(len(group) - 1 for group in near_duplicates)
         
         # Calculate diversity
-        diversity = unique_domains / total_sources if total_sources > 0 else 0.0
+        diversity = unique_sources / total_sources if total_sources > 0 else 0.0
         
         return {
             'overlap_score': 1.0 - diversity,
-            'unique_sources': unique_domains,
-            'redundant_sources': total_sources - unique_domains,
+            'unique_sources': unique_sources,
+            'redundant_sources': total_sources - unique_sources,
             'total_sources': total_sources,
-            'diversity_score': diversity
+            'diversity_score': diversity,
+            'unique_domains': len(domains),
+            'compared_sources': compared,
+            'content_overlap': duplicate_pages / compared if compared else 0.0,
+            'near_duplicate_groups': near_duplicates
         }
     
     def _extract_domain(self, url: str) -> str:
@@ -165,18 +207,7 @@ class SourceTriangulator:
         Returns:
             Domain name
         """
-        import re
-        
-        # Remove protocol
-        domain = re.sub(r'https?://', '', url)
-        
-        # Remove www.
-        domain = re.sub(r'^www\.', '', domain)
-        
-        # Get first part (domain)
-        domain = domain.split('/')[0]
-        
-        return domain
+        return extract_domain(url)
     
     def detect_source_diversity(
         self,
@@ -206,8 +237,7 @@ class SourceTriangulator:
             
             # Domain
             if hasattr(source.source_item, 'url') and source.source_item.url:
-                domain = self._extract_domain(source.source_item.url)
-                domains.add(domain)
+                domains.add(extract_registrable_domain(source.source_item.url))
             
             # Author
             if hasattr(source.source_item, 'author') and source.source_item.author:
@@ -1,13 +1,66 @@
 """
 Text analysis utilities for chapter validation
 Provides density analysis, repetition detection, and n-gram analysis
+
+All metrics are computed from the shared TokenizedDocument of the text, so
+a chapter is tokenized once however many metrics are asked for.
 """
 import re
-from collections import Counter
-from typing import List, Dict, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from scipy import sparse
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, strip_accents_unicode
 import numpy as np
 
+from src.utils.tokenized_document import TokenizedDocument, tokenize
+
+TextOrDocument = Union[str, TokenizedDocument]
+
+# Multiplier of the rolling n-gram hash when exact keys would overflow
+_NGRAM_HASH_BASE = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _ngram_keys(
+    word_ids: np.ndarray,
+    vocabulary_size: int,
+    ngram_sizes: Sequence[int]
+) -> Iterator[Tuple[int, Optional[np.ndarray]]]:
+    """
+    Integer keys of all n-grams of a word id sequence
+    
+    The key of each n-gram is rolled forward from the (n-1)-gram keys, so
+    all sizes come out of one pass. Keys are exact base-vocabulary numbers
+    while they fit into 63 bits and a 64-bit polynomial hash beyond that.
+    
+    Args:
+        word_ids: Word ids in text order
+        vocabulary_size: Number of distinct word ids
+        ngram_sizes: N-gram sizes to produce
+        
+    Yields:
+        Tuples of (n-gram size, keys of the n-grams starting at each word
+        position), with None as keys when the text is shorter than n
+    """
+    wanted = set(ngram_sizes)
+    base = max(vocabulary_size, 1)
+    exact = True
+    keys = word_ids.astype(np.int64)
+    results = {}
+    for ngram_size in range(1, max(wanted, default=0) + 1):
+        if ngram_size > len(word_ids):
+            break
+        if ngram_size > 1:
+            if exact and base ** ngram_size >= 1 << 63:
+                exact = False
+                keys = keys.astype(np.uint64)
+            if exact:
+                keys = keys[:-1] * base + word_ids[ngram_size - 1:]
+            else:
+                keys = keys[:-1] * _NGRAM_HASH_BASE + word_ids[ngram_size - 1:].astype(np.uint64)
+        if ngram_size in wanted:
+            results[ngram_size] = keys
+    for ngram_size in ngram_sizes:
+        yield ngram_size, results.get(ngram_size)
+
 
 class TextAnalyzer:
     """Analyzer for text quality metrics"""
@@ -23,141 +76,243 @@ class TextAnalyzer:
         self.max_features = max_features
         self.ngram_size = ngram_size
     
-    def count_words(self, text: str) -> int:
+    def count_words(self, text: TextOrDocument) -> int:
         """
         Count words in text (same logic as check_lengths.py)
         
         Args:
-            text: Text to analyze
+            text: Text to analyze (or its TokenizedDocument)
             
         Returns:
             Word count
         """
-        return len(text.split())
+        return tokenize(text).word_count
     
-    def calculate_information_density(self, text: str) -> float:
+    def calculate_information_density(self, text: TextOrDocument) -> float:
         """
         Calculate information density using TF-IDF
         Higher density = more unique, informative content
         
         Args:
-            text: Text to analyze
+            text: Text to analyze (or its TokenizedDocument)
             
         Returns:
             Density score (0-1)
         """
-        if not text or len(text.split()) < 10:
+        document = tokenize(text)
+        if not document.text or document.word_count < 10:
             return 0.0
         
         try:
-            # Create TF-IDF vectorizer
-            vectorizer = TfidfVectorizer(
-                max_features=self.max_features,
-                stop_words='english',
-                lowercase=True,
-                strip_accents='unicode'
-            )
-            
-            # Split text into sentences for better analysis
-            sentences = self._split_into_sentences(text)
-            if len(sentences) < 2:
-                sentences = [text]
-            
-            # Fit and transform
-            tfidf_matrix = vectorizer.fit_transform(sentences)
+            # TF-IDF over sentences for better analysis
+            _, tfidf_matrix = self._tfidf(document, by_sentence=True, strip_accents=True)
             
             # Calculate mean TF-IDF score across all terms
             # Higher mean = more informative content
-            scores = tfidf_matrix.toarray()
-            mean_score = np.mean(scores[scores > 0])
+            mean_score = np.mean(tfidf_matrix.data)
             
             # Normalize to 0-1 range (TF-IDF scores are typically 0-1 but can vary)
             return min(float(mean_score), 1.0)
             
-        except Exception as e:
+        except ValueError:
             # Fallback: simple uniqueness ratio
-            words = text.lower().split()
+            words = document.word_ids
             if len(words) == 0:
                 return 0.0
-            unique_ratio = len(set(words)) / len(words)
+            unique_ratio = len(np.unique(words)) / len(words)
             return unique_ratio
     
-    def detect_repetitive_content(self, text: str) -> Dict[str, float]:
+    def _tfidf(
+        self,
+        document: TokenizedDocument,
+        by_sentence: bool,
+        strip_accents: bool
+    ) -> Tuple[List[str], sparse.csr_matrix]:
         """
-        Detect repetitive content using n-grams
+        TF-IDF matrix of a document from its term ids
+        
+        Reproduces TfidfVectorizer(max_features=self.max_features,
+        stop_words='english', lowercase=True) fitted on the document's
+        sentences (or on the whole text): terms of two or more characters,
+        max_features most frequent terms, smooth idf and l2-normalized
+        rows, without tokenizing the text again.
         
         Args:
-            text: Text to analyze
+            document: Tokenized document
+            by_sentence: One row per sentence if the document has at least
+                two, otherwise one row for the whole text
+            strip_accents: Strip accents from terms
             
         Returns:
-            Dictionary with repetition metrics
+            Tuple of (feature names in alphabetical order, TF-IDF matrix)
+            
+        Raises:
+            ValueError: If no terms remain after stop word removal
         """
-        words = text.lower().split()
+        # Feature of each term id (-1 for dropped terms)
+        term_features = np.full(len(document.term_vocabulary), -1, dtype=np.int64)
+        features: Dict[str, int] = {}
+        for term_id, term in enumerate(document.term_vocabulary):
+            if strip_accents and not term.isascii():
+                term = strip_accents_unicode(term)
+            if len(term) < 2 or term in ENGLISH_STOP_WORDS:
+                continue
+            term_features[term_id] = features.setdefault(term, len(features))
+        if not features:
+            raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
         
-        if len(words) < self.ngram_size:
-            return {
-                'repetition_score': 0.0,
-                'most_repeated_ngram': '',
-                'repetition_count': 0,
-                'total_ngrams': 0
-            }
+        # Features in alphabetical order, like the vectorizer's vocabulary
+        names = sorted(features)
+        position = np.empty(len(names), dtype=np.int64)
+        position[[features[name] for name in names]] = np.arange(len(names))
+        columns = term_features[document.term_ids]
         
-        # Generate n-grams
-        ngrams = []
-        for i in range(len(words) - self.ngram_size + 1):
-            ngram = ' '.join(words[i:i + self.ngram_size])
-            ngrams.append(ngram)
+        offsets = document.sentence_term_offsets
+        if by_sentence and document.sentence_count >= 2:
+            n_rows = document.sentence_count
+            rows = np.repeat(np.arange(n_rows), np.diff(offsets))
+        else:
+            n_rows = 1
+            rows = np.zeros(len(columns), dtype=np.int64)
+        kept = columns >= 0
+        rows, columns = rows[kept], position[columns[kept]]
         
-        if not ngrams:
-            return {
-                'repetition_score': 0.0,
-                'most_repeated_ngram': '',
-                'repetition_count': 0,
-                'total_ngrams': 0
-            }
+        counts = sparse.csr_matrix(
+            (np.ones(len(columns), dtype=np.int64), (rows, columns)),
+            shape=(n_rows, len(names))
+        )
+        counts.sum_duplicates()
         
-        # Count n-gram frequencies
-        ngram_counts = Counter(ngrams)
-        total_ngrams = len(ngrams)
+        # Keep the max_features most frequent terms
+        if len(names) > self.max_features:
+            term_frequencies = np.asarray(counts.sum(axis=0)).ravel()
+            limited = np.sort((-term_frequencies).argsort()[:self.max_features])
+            counts = counts[:, limited]
+            names = [names[index] for index in limited]
         
-        # Find most repeated n-gram
-        most_common = ngram_counts.most_common(1)[0] if ngram_counts else ('', 0)
-        most_repeated_ngram, repetition_count = most_common
+        # Smooth idf, then l2-normalize each row
+        document_frequencies = np.bincount(counts.indices, minlength=len(names))
+        idf = np.log((n_rows + 1) / (document_frequencies + 1.0)) + 1
+        tfidf = counts.astype(np.float64)
+        tfidf.data *= idf[tfidf.indices]
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        tfidf.data /= np.repeat(norms, np.diff(tfidf.indptr))
+        return names, tfidf
+    
+    def detect_repetitive_content(self, text: TextOrDocument, top_k: int = 5) -> Dict[str, any]:
+        """
+        Detect repetitive content using n-grams
         
-        # Calculate repetition score (what % of n-grams are duplicates)
-        unique_ngrams = len(set(ngrams))
-        repetition_score = 1.0 - (unique_ngrams / total_ngrams) if total_ngrams > 0 else 0.0
+        Args:
+            text: Text to analyze (or its TokenizedDocument)
+            top_k: Number of most repeated n-grams to report with positions
+            
+        Returns:
+            Dictionary with repetition metrics
+        """
+        return self.detect_repetition(text, ngram_sizes=(self.ngram_size,), top_k=top_k)[self.ngram_size]
+    
+    def detect_repetition(
+        self,
+        text: TextOrDocument,
+        ngram_sizes: Sequence[int] = (3, 5),
+        top_k: int = 5
+    ) -> Dict[int, Dict[str, any]]:
+        """
+        Detect repeated n-grams for several n-gram sizes in one pass
         
-        return {
-            'repetition_score': repetition_score,
-            'most_repeated_ngram': most_repeated_ngram,
-            'repetition_count': repetition_count,
-            'total_ngrams': total_ngrams
-        }
+        Words are mapped to integer ids and every n-gram to one integer key
+        rolled forward from the (n-1)-gram keys, so n-grams are counted with
+        np.unique instead of building joined strings.
+        
+        Args:
+            text: Text to analyze (or its TokenizedDocument)
+            ngram_sizes: N-gram sizes to analyze
+            top_k: Number of most repeated n-grams to report per size
+            
+        Returns:
+            Repetition metrics per n-gram size: repetition_score,
+            most_repeated_ngram, repetition_count, total_ngrams and
+            top_repeated (n-grams seen more than once, most repeated first,
+            with their word positions)
+        """
+        document = tokenize(text)
+        words = document.word_ids
+        
+        def ngram_at(position: int, ngram_size: int) -> str:
+            ids = words[position:position + ngram_size].tolist()
+            return ' '.join(document.word_vocabulary[word_id] for word_id in ids)
+        
+        results = {}
+        for ngram_size, keys in _ngram_keys(words, len(document.word_vocabulary), ngram_sizes):
+            if keys is None or len(keys) == 0:
+                results[ngram_size] = {
+                    'repetition_score': 0.0,
+                    'most_repeated_ngram': '',
+                    'repetition_count': 0,
+                    'total_ngrams': 0,
+                    'top_repeated': []
+                }
+                continue
+            
+            # Count n-gram frequencies
+            unique_keys, counts = np.unique(keys, return_counts=True)
+            total_ngrams = len(keys)
+            unique_ngrams = len(unique_keys)
+            
+            top_repeated = []
+            if counts.max() < 2:
+                # Nothing repeats: the first n-gram is the most common one
+                most_repeated_ngram, repetition_count = ngram_at(0, ngram_size), 1
+            else:
+                # Locate only the n-grams that can make the top-k
+                k = min(max(top_k, 1), unique_ngrams)
+                threshold = max(np.partition(counts, -k)[-k], 2)
+                positions = np.flatnonzero(np.isin(keys, unique_keys[counts >= threshold]))
+                _, first, inverse, candidate_counts = np.unique(
+                    keys[positions], return_index=True, return_inverse=True, return_counts=True
+                )
+                
+                # Most repeated first; ties go to the n-gram seen first
+                ranking = np.lexsort((first, -candidate_counts)).tolist()
+                for candidate in ranking[:top_k]:
+                    top_repeated.append({
+                        'ngram': ngram_at(int(positions[first[candidate]]), ngram_size),
+                        'count': int(candidate_counts[candidate]),
+                        'positions': positions[inverse == candidate].tolist()
+                    })
+                most_common = ranking[0]
+                most_repeated_ngram = ngram_at(int(positions[first[most_common]]), ngram_size)
+                repetition_count = int(candidate_counts[most_common])
+            
+            # Calculate repetition score (what % of n-grams are duplicates)
+            results[ngram_size] = {
+                'repetition_score': 1.0 - (unique_ngrams / total_ngrams),
+                'most_repeated_ngram': most_repeated_ngram,
+                'repetition_count': repetition_count,
+                'total_ngrams': total_ngrams,
+                'top_repeated': top_repeated
+            }
+        
+        return results
     
-    def extract_keywords(self, text: str, top_n: int = 10) -> List[Tuple[str, float]]:
+    def extract_keywords(self, text: TextOrDocument, top_n: int = 10) -> List[Tuple[str, float]]:
         """
         Extract top keywords using TF-IDF
         
         Args:
-            text: Text to analyze
+            text: Text to analyze (or its TokenizedDocument)
             top_n: Number of keywords to extract
             
         Returns:
             List of (keyword, score) tuples
         """
-        if not text or len(text.split()) < 5:
+        document = tokenize(text)
+        if not document.text or document.word_count < 5:
             return []
         
         try:
-            vectorizer = TfidfVectorizer(
-                max_features=self.max_features,
-                stop_words='english',
-                lowercase=True
-            )
-            
-            tfidf_matrix = vectorizer.fit_transform([text])
-            feature_names = vectorizer.get_feature_names_out()
+            feature_names, tfidf_matrix = self._tfidf(document, by_sentence=False, strip_accents=False)
             scores = tfidf_matrix.toarray()[0]
             
             # Get top N keywords
@@ -165,23 +320,24 @@ class TextAnalyzer:
             keywords = [(feature_names[i], float(scores[i])) for i in top_indices if scores[i] > 0]
             
             return keywords
-        except Exception:
+        except ValueError:
             return []
     
-    def calculate_readability_metrics(self, text: str) -> Dict[str, float]:
+    def calculate_readability_metrics(self, text: TextOrDocument) -> Dict[str, float]:
         """
         Calculate basic readability metrics
         
         Args:
-            text: Text to analyze
+            text: Text to analyze (or its TokenizedDocument)
             
         Returns:
             Dictionary with readability metrics
         """
-        words = text.split()
-        sentences = self._split_into_sentences(text)
+        document = tokenize(text)
+        word_count = document.word_count
+        sentence_count = document.sentence_count
         
-        if not words or not sentences:
+        if not word_count or not sentence_count:
             return {
                 'avg_sentence_length': 0.0,
                 'avg_word_length': 0.0,
@@ -190,50 +346,50 @@ class TextAnalyzer:
             }
         
         # Average words per sentence
-        avg_sentence_length = len(words) / len(sentences)
+        avg_sentence_length = word_count / sentence_count
         
         # Average word length
-        total_chars = sum(len(word) for word in words)
-        avg_word_length = total_chars / len(words) if words else 0.0
+        avg_word_length = document.char_count / word_count
         
         return {
             'avg_sentence_length': avg_sentence_length,
             'avg_word_length': avg_word_length,
-            'sentence_count': len(sentences),
-            'word_count': len(words)
+            'sentence_count': sentence_count,
+            'word_count': word_count
         }
     
-    def _split_into_sentences(self, text: str) -> List[str]:
+    def _split_into_sentences(self, text: TextOrDocument) -> List[str]:
         """
         Split text into sentences
         
+        Sentences end at . ! ? followed by whitespace and a capital letter.
+        
         Args:
-            text: Text to split
+            text: Text to split (or its TokenizedDocument)
             
         Returns:
             List of sentences
         """
-        # Simple sentence splitting on common terminators
-        # Using regex to split on . ! ? followed by space and capital letter
-        sentences = re.split(r'[.!?]+\s+(?=[A-Z])', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return list(tokenize(text).sentences)
     
-    def analyze_content_balance(self, text: str) -> Dict[str, any]:
+    def analyze_content_balance(self, text: TextOrDocument) -> Dict[str, any]:
         """
         Analyze if content is balanced (not too much dialogue, description, etc.)
         
         Args:
-            text: Text to analyze
+            text: Text to analyze (or its TokenizedDocument)
             
         Returns:
             Dictionary with balance metrics
         """
+        document = tokenize(text)
+        
         # Count dialogue (text in quotes)
         dialogue_pattern = r'["\']([^"\']+)["\']'
-        dialogue_matches = re.findall(dialogue_pattern, text)
+        dialogue_matches = re.findall(dialogue_pattern, document.text)
         dialogue_words = sum(len(d.split()) for d in dialogue_matches)
         
-        total_words = self.count_words(text)
+        total_words = document.word_count
         
         if total_words == 0:
             return {
@@ -1,27 +1,132 @@
 """
 TF-IDF analyzer for content relevance scoring
 """
+import logging
+import math
+import os
 import re
-from typing import List, Optional
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+import joblib
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+
+# Smoothed IDF a two-document fit gives a term found in only one of them;
+# terms found in both get an IDF of 1
+_PAIR_IDF_UNSHARED = math.log(3 / 2) + 1
+
 
 class TfidfAnalyzer:
     """Analyzer for calculating content relevance using TF-IDF"""
     
-    def __init__(self, max_features: int = 1000, stop_words: str = 'english'):
+    def __init__(
+        self,
+        max_features: int = 1000,
+        stop_words: str = 'english',
+        corpus_model_path: Optional[str] = None
+    ):
         """
         Initialize TF-IDF analyzer
         
         Args:
             max_features: Maximum number of features for TF-IDF
             stop_words: Language for stop words filtering
+            corpus_model_path: Optional path of a vocabulary/IDF model saved
+                with save_corpus_model; loaded if the file exists
         """
         self.max_features = max_features
         self.stop_words = stop_words
         self.vectorizer = None
+        self.corpus_vectorizer: Optional[TfidfVectorizer] = None
+        
+        if corpus_model_path:
+            if os.path.exists(corpus_model_path):
+                self.load_corpus_model(corpus_model_path)
+            else:
+                logger.warning(f"TF-IDF corpus model {corpus_model_path} not found; fitting per request")
+    
+    def _create_vectorizer(self, **overrides) -> TfidfVectorizer:
+        """Create a vectorizer with the analyzer settings"""
+        settings = dict(
+            stop_words=self.stop_words,
+            max_features=self.max_features,
+            lowercase=True,
+            strip_accents='unicode'
+        )
+        settings.update(overrides)
+        return TfidfVectorizer(**settings)
+    
+    def fit_corpus(self, documents: Sequence[str]) -> TfidfVectorizer:
+        """
+        Fit vocabulary and IDF once on a reference corpus
+        
+        Subsequent batch scoring transforms texts with this model instead
+        of refitting on every call.
+        
+        Args:
+            documents: Corpus documents
+            
+        Returns:
+            Fitted vectorizer
+        """
+        vectorizer = self._create_vectorizer()
+        vectorizer.fit(documents)
+        self.corpus_vectorizer = vectorizer
+        logger.info(
+            f"Fitted TF-IDF corpus model on {len(documents)} documents "
+            f"({len(vectorizer.vocabulary_)} terms)"
+        )
+        return vectorizer
+    
+    def fit_corpus_from_directory(
+        self,
+        directory: str = 'bios',
+        pattern: str = '**/*.md'
+    ) -> TfidfVectorizer:
+        """
+        Fit the corpus model on the markdown files of a directory
+        
+        Args:
+            directory: Root directory (e.g., the bios/ folder)
+            pattern: Glob pattern of files to include
+            
+        Returns:
+            Fitted vectorizer
+        """
+        documents = [
+            path.read_text(encoding='utf-8', errors='ignore')
+            for path in sorted(Path(directory).glob(pattern))
+            if path.is_file()
+        ]
+        if not documents:
+            raise ValueError(f"No documents matching {pattern} in {directory}")
+        return self.fit_corpus(documents)
+    
+    def save_corpus_model(self, path: str):
+        """
+        Persist the fitted corpus vocabulary/IDF
+        
+        Args:
+            path: Destination file
+        """
+        if self.corpus_vectorizer is None:
+            raise ValueError("No corpus model has been fitted")
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        joblib.dump(self.corpus_vectorizer, path)
+    
+    def load_corpus_model(self, path: str):
+        """
+        Load a corpus vocabulary/IDF saved with save_corpus_model
+        
+        Args:
+            path: Model file
+        """
+        self.corpus_vectorizer = joblib.load(path)
+        logger.info(f"Loaded TF-IDF corpus model from {path}")
     
     def calculate_similarity(
         self,
@@ -45,16 +150,15 @@ class TfidfAnalyzer:
             if len(content_text) > max_content_length:
                 content_text = content_text[:max_content_length]
             
-            # Create vectorizer
-            self.vectorizer = TfidfVectorizer(
-                stop_words=self.stop_words,
-                max_features=self.max_features,
-                lowercase=True,
-                strip_accents='unicode'
-            )
-            
-            # Fit and transform both texts
-            tfidf_matrix = self.vectorizer.fit_transform([reference_text, content_text])
+            if self.corpus_vectorizer is not None:
+                # Reuse the corpus vocabulary/IDF
+                tfidf_matrix = self.corpus_vectorizer.transform([reference_text, content_text])
+            else:
+                # Create vectorizer
+                self.vectorizer = self._create_vectorizer()
+                
+                # Fit and transform both texts
+                tfidf_matrix = self.vectorizer.fit_transform([reference_text, content_text])
             
             # Calculate cosine similarity
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
@@ -65,6 +169,127 @@ class TfidfAnalyzer:
             # Return low score on error
             return 0.0
     
+    def calculate_similarities(
+        self,
+        reference_texts: Union[str, Sequence[str]],
+        content_texts: Sequence[str],
+        max_content_length: int = 5000
+    ) -> np.ndarray:
+        """
+        Calculate TF-IDF similarities for many texts in one matrix operation
+        
+        With a corpus model, all texts are transformed with it. Without one,
+        the batch is tokenized once and each score is the one
+        calculate_similarity gives for that reference/content pair (IDF
+        fitted on the pair), computed for all pairs at once; fitting IDF on
+        the whole batch instead would let unrelated contents change each
+        other's scores.
+        
+        Args:
+            reference_texts: One reference text for all contents, or one
+                reference text per content
+            content_texts: Contents to analyze
+            max_content_length: Maximum length of each content to analyze
+            
+        Returns:
+            Array of similarity scores (0-1), one per content
+        """
+        n = len(content_texts)
+        if n == 0:
+            return np.zeros(0)
+        
+        single_reference = isinstance(reference_texts, str)
+        references = [reference_texts] if single_reference else list(reference_texts)
+        if not single_reference and len(references) != n:
+            raise ValueError("reference_texts and content_texts must have the same length")
+        
+        contents = [text[:max_content_length] for text in content_texts]
+        
+        if self.corpus_vectorizer is not None:
+            matrix = self.corpus_vectorizer.transform(references + contents)
+            reference_matrix = matrix[:len(references)]
+            content_matrix = matrix[len(references):]
+            
+            # Rows are L2-normalized, so dot products are cosine similarities
+            if single_reference:
+                scores = (content_matrix @ reference_matrix.T).toarray().ravel()
+            else:
+                scores = np.asarray(content_matrix.multiply(reference_matrix).sum(axis=1)).ravel()
+            return np.clip(scores, 0.0, 1.0)
+        
+        try:
+            # Raw term counts; the pair vocabulary is never capped by the batch
+            counts = self._create_vectorizer(
+                max_features=None, use_idf=False, norm=None
+            ).fit_transform(references + contents).tocsr()
+        except ValueError:
+            # Empty vocabulary (e.g., only stop words)
+            return np.zeros(n)
+        
+        reference_counts = counts[:len(references)]
+        if single_reference:
+            reference_counts = reference_counts[np.zeros(n, dtype=int)]
+        content_counts = counts[len(references):]
+        
+        return np.clip(self._pair_similarities(reference_counts, content_counts), 0.0, 1.0)
+    
+    @staticmethod
+    def _pair_similarities(reference_counts, content_counts) -> np.ndarray:
+        """
+        Row-wise cosine similarities with IDF fitted on each row pair
+        
+        With two documents, a term in both has IDF 1 and a term in only one
+        has _PAIR_IDF_UNSHARED. Only shared terms contribute to the dot
+        product, so each pair needs the dot product of its counts and the
+        squared norms split into shared and unshared terms.
+        """
+        shared = (reference_counts > 0).multiply(content_counts > 0)
+        dot = np.asarray(reference_counts.multiply(content_counts).sum(axis=1)).ravel()
+        
+        def squared_norm(counts):
+            squares = counts.multiply(counts)
+            total = np.asarray(squares.sum(axis=1)).ravel()
+            in_shared = np.asarray(squares.multiply(shared).sum(axis=1)).ravel()
+            return _PAIR_IDF_UNSHARED ** 2 * (total - in_shared) + in_shared
+        
+        norms = np.sqrt(squared_norm(reference_counts) * squared_norm(content_counts))
+        scores = np.zeros_like(dot, dtype=float)
+        np.divide(dot, norms, out=scores, where=norms > 0)
+        return scores
+    
+    def calculate_relevance_batch(
+        self,
+        character_name: str,
+        sources: Sequence[Tuple[str, str]],
+        max_content_length: int = 5000
+    ) -> List[float]:
+        """
+        Batch version of calculate_relevance_with_mentions
+        
+        Args:
+            character_name: Name of the character/subject
+            sources: (source_title, content) pairs
+            max_content_length: Maximum content length
+            
+        Returns:
+            Relevance scores (0-1), one per source
+        """
+        if not sources:
+            return []
+        
+        references = [
+            f"{character_name} {title} biography historical" for title, _ in sources
+        ]
+        contents = [content for _, content in sources]
+        similarities = self.calculate_similarities(references, contents, max_content_length)
+        
+        pattern = re.compile(r'\b' + re.escape(character_name) + r'\b', re.IGNORECASE)
+        scores = []
+        for similarity, content in zip(similarities, contents):
+            mention_bonus = min(len(pattern.findall(content)) * 0.1, 0.3)
+            scores.append(min(float(similarity) + mention_bonus, 1.0))
+        return scores
+    
     def calculate_relevance_with_mentions(
         self,
         character_name: str,
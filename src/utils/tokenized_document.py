@@ -0,0 +1,305 @@
+"""
+Shared single-pass tokenization of chapter and book text
+
+TextAnalyzer, NarrativeAnalyzer, LengthValidationService and
+ConcatenationService all look at the words, sentences and paragraphs of
+the same texts. tokenize() splits a text into integer token ids and offset
+arrays once and memoizes the result per content hash, so every analyzer
+after the first one reuses it.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# Word runs (same as r'\b\w+\b')
+TERM_RE = re.compile(r"\w+")
+# Sentence boundaries: terminators followed by whitespace and a capital letter
+SENTENCE_BOUNDARY_RE = re.compile(r'[.!?]+\s+(?=[A-Z])')
+# Paragraph boundaries (same as text.split('\n\n'))
+PARAGRAPH_BOUNDARY_RE = re.compile(r'\n\n')
+
+# Memoized documents are bounded by count and by total characters
+MAX_CACHED_DOCUMENTS = 256
+MAX_CACHED_CHARS = 16_000_000
+
+
+def _spans(text: str, boundary: "re.Pattern") -> np.ndarray:
+    """
+    Character spans of the stripped, non-empty pieces between boundaries
+
+    Args:
+        text: Text to split
+        boundary: Pattern of the separators
+
+    Returns:
+        Array of shape (pieces, 2) with start and end offsets
+    """
+    spans = []
+    start = 0
+    for match in boundary.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text)))
+
+    stripped = []
+    for start, end in spans:
+        piece = text[start:end]
+        content = piece.strip()
+        if content:
+            offset = start + len(piece) - len(piece.lstrip())
+            stripped.append((offset, offset + len(content)))
+    return np.array(stripped, dtype=np.int64).reshape(-1, 2)
+
+
+class TokenizedDocument:
+    """
+    A text tokenized once into compact arrays
+
+    Two token streams are kept, matching the tokenizations the analyzers
+    have always used:
+    - words: whitespace-separated tokens (text.split()), lowercased ids
+    - terms: word runs (re.findall(r'\\b\\w+\\b', text.lower())), lowercased
+      ids with their character offsets
+
+    Sentences (split on terminators followed by a capital letter) and
+    paragraphs (split on blank lines) are stored as character spans plus
+    the range of terms each one covers. Streams are built on first use.
+    """
+
+    def __init__(self, text: str, content_hash: Optional[str] = None):
+        """
+        Initialize a document
+
+        Args:
+            text: Document text
+            content_hash: Hash of the text (computed if None)
+        """
+        self.text = text
+        self.content_hash = content_hash or _content_hash(text)
+
+    def __len__(self) -> int:
+        return len(self.text)
+
+    # ------------------------------------------------------------------
+    # Words
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _words(self) -> Tuple[np.ndarray, List[str], int]:
+        words = self.text.split()
+        index: Dict[str, int] = {}
+        ids = [index.setdefault(word, len(index)) for word in words]
+
+        # Lowercase the vocabulary, not the text
+        lowered: Dict[str, int] = {}
+        remap = np.array([lowered.setdefault(word.lower(), len(lowered)) for word in index], dtype=np.int32)
+        word_ids = remap[np.array(ids, dtype=np.int32)] if ids else np.empty(0, dtype=np.int32)
+        return word_ids, list(lowered), sum(map(len, words))
+
+    @property
+    def word_ids(self) -> np.ndarray:
+        """Ids of the lowercased whitespace-separated words"""
+        return self._words[0]
+
+    @property
+    def word_vocabulary(self) -> List[str]:
+        """Lowercased word of each word id"""
+        return self._words[1]
+
+    @property
+    def word_count(self) -> int:
+        """Number of whitespace-separated words"""
+        return len(self._words[0])
+
+    @property
+    def char_count(self) -> int:
+        """Total length of all words"""
+        return self._words[2]
+
+    # ------------------------------------------------------------------
+    # Terms
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _terms(self) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        index: Dict[str, int] = {}
+        ids = []
+        starts = []
+        for match in TERM_RE.finditer(self.text):
+            ids.append(index.setdefault(match.group(), len(index)))
+            starts.append(match.start())
+
+        lowered: Dict[str, int] = {}
+        remap = np.array([lowered.setdefault(term.lower(), len(lowered)) for term in index], dtype=np.int32)
+        term_ids = remap[np.array(ids, dtype=np.int32)] if ids else np.empty(0, dtype=np.int32)
+        return term_ids, np.array(starts, dtype=np.int64), list(lowered)
+
+    @property
+    def term_ids(self) -> np.ndarray:
+        """Ids of the lowercased word runs, in text order"""
+        return self._terms[0]
+
+    @property
+    def term_starts(self) -> np.ndarray:
+        """Character offset of each term"""
+        return self._terms[1]
+
+    @property
+    def term_vocabulary(self) -> List[str]:
+        """Lowercased term of each term id"""
+        return self._terms[2]
+
+    @cached_property
+    def term_counts(self) -> np.ndarray:
+        """Occurrences of each term id"""
+        return np.bincount(self.term_ids, minlength=len(self.term_vocabulary))
+
+    @cached_property
+    def term_index(self) -> Dict[str, int]:
+        """Term id of each lowercased term"""
+        return {term: term_id for term_id, term in enumerate(self.term_vocabulary)}
+
+    def terms(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """
+        Lowercased terms of a term range
+
+        Args:
+            start: First term index
+            end: End term index (exclusive, defaults to the last term)
+
+        Returns:
+            List of terms
+        """
+        vocabulary = self.term_vocabulary
+        return [vocabulary[term_id] for term_id in self.term_ids[start:end].tolist()]
+
+    def count_phrase(self, phrase: str) -> int:
+        """
+        Count case-insensitive occurrences of a phrase as whole words
+
+        The phrase matches wherever its word runs appear consecutively,
+        whatever separates them.
+
+        Args:
+            phrase: Word or phrase
+
+        Returns:
+            Number of occurrences
+        """
+        ids = [self.term_index.get(term.lower()) for term in TERM_RE.findall(phrase)]
+        if not ids or None in ids:
+            return 0
+        if len(ids) == 1:
+            return int(self.term_counts[ids[0]])
+
+        term_ids = self.term_ids
+        if len(term_ids) < len(ids):
+            return 0
+        matches = term_ids[:len(term_ids) - len(ids) + 1] == ids[0]
+        for offset, term_id in enumerate(ids[1:], start=1):
+            matches &= term_ids[offset:len(term_ids) - len(ids) + 1 + offset] == term_id
+        return int(np.count_nonzero(matches))
+
+    # ------------------------------------------------------------------
+    # Sentences and paragraphs
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def sentence_spans(self) -> np.ndarray:
+        """Character spans of the sentences"""
+        return _spans(self.text, SENTENCE_BOUNDARY_RE)
+
+    @cached_property
+    def paragraph_spans(self) -> np.ndarray:
+        """Character spans of the paragraphs"""
+        return _spans(self.text, PARAGRAPH_BOUNDARY_RE)
+
+    @cached_property
+    def sentence_term_offsets(self) -> np.ndarray:
+        """Term index where each sentence starts, plus the end of the last one"""
+        return self._term_offsets(self.sentence_spans)
+
+    @cached_property
+    def paragraph_term_offsets(self) -> np.ndarray:
+        """Term index where each paragraph starts, plus the end of the last one"""
+        return self._term_offsets(self.paragraph_spans)
+
+    def _term_offsets(self, spans: np.ndarray) -> np.ndarray:
+        # Spans partition the terms: separators never contain word characters
+        starts = np.searchsorted(self.term_starts, spans[:, 0])
+        return np.append(starts, len(self.term_ids)) if len(spans) else np.zeros(1, dtype=np.int64)
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        """Text of each sentence"""
+        return [self.text[start:end] for start, end in self.sentence_spans.tolist()]
+
+    @cached_property
+    def paragraphs(self) -> List[str]:
+        """Text of each paragraph"""
+        return [self.text[start:end] for start, end in self.paragraph_spans.tolist()]
+
+    @property
+    def sentence_count(self) -> int:
+        """Number of sentences"""
+        return len(self.sentence_spans)
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+_documents: "OrderedDict[str, TokenizedDocument]" = OrderedDict()
+_cached_chars = 0
+_lock = threading.Lock()
+
+
+def tokenize(text: Union[str, TokenizedDocument]) -> TokenizedDocument:
+    """
+    Get the tokenized document of a text
+
+    Documents are memoized per content hash in a bounded LRU, so the same
+    chapter text passed to several analyzers is tokenized once.
+
+    Args:
+        text: Text (a TokenizedDocument is returned as is)
+
+    Returns:
+        TokenizedDocument
+    """
+    global _cached_chars
+    if isinstance(text, TokenizedDocument):
+        return text
+
+    key = _content_hash(text)
+    with _lock:
+        document = _documents.get(key)
+        if document is not None:
+            _documents.move_to_end(key)
+            return document
+
+    document = TokenizedDocument(text, content_hash=key)
+    if len(text) > MAX_CACHED_CHARS:
+        return document
+
+    with _lock:
+        if key not in _documents:
+            _documents[key] = document
+            _cached_chars += len(text)
+            while len(_documents) > MAX_CACHED_DOCUMENTS or _cached_chars > MAX_CACHED_CHARS:
+                _, evicted = _documents.popitem(last=False)
+                _cached_chars -= len(evicted)
+        return _documents[key]
+
+
+def clear_tokenized_documents():
+    """Drop all memoized documents (useful for testing)"""
+    global _cached_chars
+    with _lock:
+        _documents.clear()
+        _cached_chars = 0
@@ -0,0 +1,229 @@
+"""
+Canonical URL normalization and domain extraction
+
+Every component that compares, de-duplicates or scores sources by URL or
+domain goes through this module, so they all agree on what "the same page"
+and "the same site" mean. Parsing is memoized; candidate lists repeat the
+same URLs and hosts many times.
+"""
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Query parameters that only track the visitor and never change the page
+TRACKING_PARAMS = frozenset({
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', 'ref_src',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+# Multi-label public suffixes (and shared hosting suffixes) under which the
+# registrable domain has one more label. Single-label TLDs need no entry.
+MULTI_LABEL_SUFFIXES = frozenset({
+    # United Kingdom
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'me.uk', 'net.uk', 'nhs.uk', 'police.uk', 'sch.uk',
+    # Australia / New Zealand
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au', 'asn.au', 'id.au',
+    'co.nz', 'org.nz', 'ac.nz', 'govt.nz', 'net.nz',
+    # Asia
+    'co.jp', 'ac.jp', 'go.jp', 'or.jp', 'ne.jp',
+    'com.cn', 'edu.cn', 'gov.cn', 'org.cn', 'net.cn', 'ac.cn',
+    'co.kr', 'ac.kr', 'go.kr', 'or.kr',
+    'co.in', 'ac.in', 'gov.in', 'nic.in', 'org.in', 'res.in',
+    'com.sg', 'edu.sg', 'gov.sg', 'com.hk', 'edu.hk', 'gov.hk', 'com.tw', 'edu.tw', 'gov.tw',
+    # Americas
+    'com.br', 'gov.br', 'org.br', 'edu.br', 'com.mx', 'gob.mx', 'edu.mx', 'org.mx',
+    'com.ar', 'gob.ar', 'edu.ar', 'gc.ca', 'gov.co', 'edu.co',
+    # Europe
+    'gouv.fr', 'gob.es', 'edu.es', 'org.es', 'com.es', 'co.at', 'or.at', 'ac.at', 'gv.at',
+    'com.pl', 'edu.pl', 'gov.pl', 'com.tr', 'edu.tr', 'gov.tr', 'co.il', 'ac.il', 'gov.il',
+    # Africa
+    'co.za', 'ac.za', 'gov.za', 'org.za',
+    # Shared hosting: every subdomain is a different site
+    'blogspot.com', 'wordpress.com', 'github.io', 'substack.com', 'tumblr.com',
+    'wixsite.com', 'weebly.com', 'herokuapp.com', 'netlify.app', 'pages.dev',
+})
+
+
+@dataclass(frozen=True)
+class ParsedURL:
+    """Normalized parts of a URL"""
+    scheme: str
+    host: str
+    port: Optional[int]
+    path: str
+    query: str
+
+    @property
+    def domain(self) -> str:
+        """Host without a leading 'www.'"""
+        return self.host[4:] if self.host.startswith('www.') else self.host
+
+    @property
+    def registrable_domain(self) -> str:
+        """Registrable domain (eTLD+1) of the host"""
+        return registrable_domain(self.host)
+
+    @property
+    def url(self) -> str:
+        """Normalized URL string"""
+        host = f"[{self.host}]" if ':' in self.host else self.host
+        netloc = f"{host}:{self.port}" if self.port else host
+        return urlunsplit((self.scheme, netloc, self.path, self.query, ''))
+
+
+def normalize_host(host: str) -> str:
+    """
+    Normalize a host name
+
+    Lowercases, drops the trailing dot and converts internationalized
+    names to their ASCII (punycode) form.
+
+    Args:
+        host: Host name
+
+    Returns:
+        Normalized host
+    """
+    host = host.strip().rstrip('.').lower()
+    if host and not host.isascii():
+        try:
+            host = host.encode('idna').decode('ascii')
+        except UnicodeError:
+            logger.debug(f"Could not IDNA-encode host {host!r}")
+    return host
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+@lru_cache(maxsize=16384)
+def parse_url(url: str) -> ParsedURL:
+    """
+    Parse and normalize a URL
+
+    Scheme and host are lowercased (IDN hosts converted to punycode),
+    default ports, fragments, trailing slashes and tracking parameters are
+    dropped, and the remaining query parameters are sorted. URLs without a
+    scheme are treated as http.
+
+    Args:
+        url: URL to parse
+
+    Returns:
+        ParsedURL
+    """
+    url = url.strip()
+    if '://' not in url and not url.startswith('//'):
+        url = f"http://{url}"
+    parts = urlsplit(url)
+    scheme = (parts.scheme or 'http').lower()
+
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port == DEFAULT_PORTS.get(scheme):
+        port = None
+
+    query = urlencode(sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ))
+
+    return ParsedURL(
+        scheme=scheme,
+        host=normalize_host(parts.hostname or ''),
+        port=port,
+        path=parts.path.rstrip('/') or '/',
+        query=query
+    )
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL for comparison and use as a cache key
+
+    Args:
+        url: URL to normalize
+
+    Returns:
+        Normalized URL
+    """
+    return parse_url(url).url
+
+
+def extract_domain(url: str) -> str:
+    """
+    Extract the host of a URL without a leading 'www.'
+
+    Args:
+        url: URL (a bare host is accepted)
+
+    Returns:
+        Domain, or an empty string if the URL has no host
+    """
+    return parse_url(url).domain
+
+
+@lru_cache(maxsize=16384)
+def registrable_domain(host: str) -> str:
+    """
+    Get the registrable domain (eTLD+1) of a host
+
+    "en.wikipedia.org" -> "wikipedia.org", "www.bbc.co.uk" -> "bbc.co.uk",
+    "someone.blogspot.com" -> "someone.blogspot.com". IP addresses and
+    single-label hosts are returned unchanged.
+
+    Args:
+        host: Normalized host name
+
+    Returns:
+        Registrable domain
+    """
+    labels = host.split('.')
+    if len(labels) <= 2 or labels[-1].isdigit():
+        return host
+    if '.'.join(labels[-2:]) in MULTI_LABEL_SUFFIXES:
+        return '.'.join(labels[-3:])
+    return '.'.join(labels[-2:])
+
+
+def is_subdomain_of(domain: str, parent: str) -> bool:
+    """
+    Check whether a domain equals or is a subdomain of another
+
+    Matching is label-aligned: "cs.mit.edu" is under "edu" and "mit.edu",
+    "reduce.com" is not under "edu".
+
+    Args:
+        domain: Normalized domain
+        parent: Parent domain or suffix
+
+    Returns:
+        True if domain is parent or one of its subdomains
+    """
+    return domain == parent or domain.endswith(f".{parent}")
+
+
+def extract_registrable_domain(url: str) -> str:
+    """
+    Get the registrable domain (eTLD+1) of a URL
+
+    Args:
+        url: URL (a bare host is accepted)
+
+    Returns:
+        Registrable domain, or an empty string if the URL has no host
+    """
+    return parse_url(url).registrable_domain
@@ -2,5 +2,6 @@
 WebSocket package for real-time notifications
 """
 from .manager import ConnectionManager, manager, get_websocket_client
+from .token_stream import TokenStreamForwarder
 
-__all__ = ["ConnectionManager", "manager", "get_websocket_client"]
+__all__ = ["ConnectionManager", "manager", "get_websocket_client", "TokenStreamForwarder"]
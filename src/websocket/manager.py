@@ -1,9 +1,11 @@
 """
 WebSocket Manager for real-time notifications
 """
-from typing import Dict, Set, Optional
+from typing import Deque, Dict, Set, Optional, Tuple
+import asyncio
 import logging
 import json
+from collections import deque
 from datetime import datetime, timezone
 from fastapi import WebSocket, WebSocketDisconnect
 
@@ -15,12 +17,24 @@ class ConnectionManager:
     Manages WebSocket connections for real-time updates
     """
     
-    def __init__(self):
-        """Initialize connection manager"""
+    def __init__(self, max_pending_frames: int = 8):
+        """
+        Initialize connection manager
+        
+        Args:
+            max_pending_frames: Streaming frames queued per connection
+                before intermediate frames are dropped
+        """
         # Active connections: {user_id: Set[WebSocket]}
         self.active_connections: Dict[str, Set[WebSocket]] = {}
         # Job-specific connections: {job_id: Set[WebSocket]}
         self.job_connections: Dict[str, Set[WebSocket]] = {}
+        # Streaming frames waiting to be sent and their sender tasks
+        self.max_pending_frames = max_pending_frames
+        self._stream_queues: Dict[WebSocket, Deque[Tuple[dict, bool]]] = {}
+        self._stream_senders: Dict[WebSocket, asyncio.Task] = {}
+        # Event loop serving the connections (set on first connect)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def connect(self, websocket: WebSocket, user_id: str = None, job_id: str = None):
         """
@@ -32,6 +46,7 @@ class ConnectionManager:
             job_id: Optional job identifier for job-specific updates
         """
         await websocket.accept()
+        self.loop = asyncio.get_running_loop()
         
         if user_id:
             if user_id not in self.active_connections:
@@ -49,11 +64,19 @@ class ConnectionManager:
         """
         Remove WebSocket connection
         
+        Any streaming frames still queued for the connection are dropped and
+        its sender task is cancelled.
+        
         Args:
             websocket: WebSocket connection to remove
             user_id: Optional user identifier
             job_id: Optional job identifier
         """
+        self._stream_queues.pop(websocket, None)
+        sender = self._stream_senders.pop(websocket, None)
+        if sender is not None:
+            sender.cancel()
+        
         if user_id and user_id in self.active_connections:
             self.active_connections[user_id].discard(websocket)
             if not self.active_connections[user_id]:
@@ -121,6 +144,59 @@ class ConnectionManager:
             for connection in disconnected:
                 self.job_connections[job_id].discard(connection)
     
+    def stream_to_job(self, message: dict, job_id: str, final: bool = False) -> int:
+        """
+        Queue a streaming frame for job watchers without waiting for delivery
+        
+        Must be called on the event loop thread. Each connection has its own
+        small queue drained by a sender task; when a slow connection's queue
+        is full, its oldest intermediate frame is dropped instead of holding
+        up the caller. Final frames are never dropped.
+        
+        Args:
+            message: Frame to send
+            job_id: Target job identifier
+            final: Whether this is the last frame of the stream
+            
+        Returns:
+            Number of frames dropped to make room
+        """
+        dropped = 0
+        for connection in list(self.job_connections.get(job_id, ())):
+            queue = self._stream_queues.setdefault(connection, deque())
+            
+            if len(queue) >= self.max_pending_frames:
+                for index, (_, queued_final) in enumerate(queue):
+                    if not queued_final:
+                        del queue[index]
+                        dropped += 1
+                        break
+            queue.append((message, final))
+            
+            if connection not in self._stream_senders:
+                self._stream_senders[connection] = asyncio.ensure_future(
+                    self._drain_stream_queue(connection, job_id)
+                )
+        
+        if dropped:
+            logger.debug(f"Dropped {dropped} stream frame(s) for slow connections of job {job_id}")
+        return dropped
+    
+    async def _drain_stream_queue(self, connection: WebSocket, job_id: str):
+        """Send queued streaming frames in order, removing the connection if it fails"""
+        queue = self._stream_queues.get(connection)
+        try:
+            while queue:
+                message, _ = queue.popleft()
+                await connection.send_json(message)
+        except Exception as e:
+            logger.error(f"Error streaming to job {job_id}: {e}")
+            if job_id in self.job_connections:
+                self.job_connections[job_id].discard(connection)
+        finally:
+            self._stream_senders.pop(connection, None)
+            self._stream_queues.pop(connection, None)
+    
     async def broadcast(self, message: dict):
         """
         Broadcast message to all active connections
@@ -0,0 +1,129 @@
+"""
+Coalesced token streaming from generation threads to WebSocket watchers
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from .manager import ConnectionManager
+
+logger = logging.getLogger(__name__)
+
+
+class TokenStreamForwarder:
+    """
+    Forwards generated tokens of one chapter to the watchers of a job
+
+    Tokens are coalesced into frames by size and time, and frames are
+    handed to the connection manager's event loop without waiting, so the
+    generating thread is never blocked by a slow socket.
+
+    Frame format (JSON):
+    {
+        "type": "token_stream",
+        "job_id": "123",
+        "chapter": 3,
+        "seq": 7,
+        "text": "...tokens since the previous frame...",
+        "final": false,
+        "timestamp": "2024-01-01T12:00:00Z"
+    }
+    The final frame also carries "content" with the full chapter text, so
+    clients that missed frames (gaps in seq) can resynchronize.
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        job_id: str,
+        chapter: Optional[int] = None,
+        flush_interval: float = 0.1,
+        max_chunk_chars: int = 256,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ):
+        """
+        Initialize forwarder
+
+        Args:
+            manager: Connection manager holding the job watchers
+            job_id: Job identifier
+            chapter: Chapter number the tokens belong to
+            flush_interval: Maximum seconds tokens are held before sending
+            max_chunk_chars: Buffered characters that trigger a frame
+            loop: Event loop serving the connections (defaults to the
+                manager's loop)
+        """
+        self.manager = manager
+        self.job_id = job_id
+        self.chapter = chapter
+        self.flush_interval = flush_interval
+        self.max_chunk_chars = max_chunk_chars
+        self.loop = loop or manager.loop
+
+        self.frames_sent = 0
+        self._buffer: List[str] = []
+        self._buffered_chars = 0
+        self._last_flush = time.monotonic()
+
+    def feed(self, token: str):
+        """
+        Add a generated token, sending a frame when the batch is due
+
+        Args:
+            token: Generated text chunk
+        """
+        if not token:
+            return
+        self._buffer.append(token)
+        self._buffered_chars += len(token)
+
+        if (
+            self._buffered_chars >= self.max_chunk_chars
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Send buffered tokens as one frame"""
+        if self._buffer:
+            self._send(self._build_frame(final=False))
+
+    def close(self, content: Optional[str] = None):
+        """
+        Send the remaining tokens as the final frame
+
+        Args:
+            content: Full chapter text to include for resynchronization
+        """
+        frame = self._build_frame(final=True)
+        if content is not None:
+            frame["content"] = content
+        self._send(frame, final=True)
+
+    def _build_frame(self, final: bool) -> dict:
+        frame = {
+            "type": "token_stream",
+            "job_id": self.job_id,
+            "chapter": self.chapter,
+            "seq": self.frames_sent,
+            "text": "".join(self._buffer),
+            "final": final,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+        self._buffer = []
+        self._buffered_chars = 0
+        self._last_flush = time.monotonic()
+        self.frames_sent += 1
+        return frame
+
+    def _send(self, frame: dict, final: bool = False):
+        """Schedule the frame on the event loop without waiting"""
+        if self.loop is None or self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.manager.stream_to_job, frame, self.job_id, final)
+        except RuntimeError as e:
+            # Loop shut down between the check and the call
+            logger.debug(f"Token stream for job {self.job_id} stopped: {e}")
@@ -8,7 +8,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
 
+# Keep the application database in memory (must be set before src.database loads)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
 from src.database.base import Base
+from src.cache.page_cache import reset_page_cache
+from src.cache.llm_cache import reset_llm_cache
+from src.cache.single_flight import reset_single_flight
+from src.services.rate_limiter import reset_rate_limiter
+from src.services.openrouter_client import reset_http_session
+from src.services.token_budget import reset_token_budgeter
 
 # Set test environment variables at import time (before app is loaded)
 os.environ["ENV"] = "test"
@@ -19,6 +28,10 @@ os.environ["OPENROUTER_MODEL"] = "test-model"
 os.environ["REDIS_URL"] = "redis://localhost:6379/1"
 # Set high rate limit for tests to avoid rate limiting during benchmarks
 os.environ["RATE_LIMIT_PER_MINUTE"] = "10000"
+# Keep OpenRouter rate-limit buckets in process memory (no Redis in tests)
+os.environ["RATE_LIMIT_BACKEND"] = "memory"
+# Coalesce identical calls in-process only
+os.environ["SINGLE_FLIGHT_BACKEND"] = "memory"
 
 
 @pytest.fixture(autouse=True)
@@ -27,6 +40,12 @@ def setup_test_env():
     # Variables already set at module import time
     yield
     # Cleanup after tests
+    reset_page_cache()
+    reset_llm_cache()
+    reset_single_flight()
+    reset_token_budgeter()
+    reset_rate_limiter()
+    reset_http_session()
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,109 @@
+"""
+Local stub HTTP server for network-bound tests and benchmarks
+"""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+
+# A route returns (status_code, headers, body)
+Route = Callable[[BaseHTTPRequestHandler], Tuple[int, Dict[str, str], bytes]]
+
+
+class StubHTTPServer:
+    """
+    Threaded HTTP server answering every request after a fixed delay
+
+    Usage:
+        with StubHTTPServer(delay=0.2) as server:
+            url = server.url("/page")
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        body: bytes = b"<html><title>Stub</title><body><p>Stub page</p></body></html>",
+        status_code: int = 200,
+        route: Optional[Route] = None
+    ):
+        self.delay = delay
+        self.body = body
+        self.status_code = status_code
+        self.route = route
+        self.request_count = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.port: Optional[int] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                with stub._lock:
+                    stub.request_count += 1
+                    stub._in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub._in_flight)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    if stub.route is not None:
+                        status_code, headers, body = stub.route(self)
+                    else:
+                        status_code, headers, body = (
+                            stub.status_code,
+                            {"Content-Type": "text/html; charset=utf-8"},
+                            stub.body
+                        )
+                    self.send_response(status_code)
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub._in_flight -= 1
+
+            def do_GET(self):
+                self._respond()
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.request_body = self.rfile.read(length) if length else b""
+                self._respond()
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubHTTPServer":
+        server_class = type("_Server", (ThreadingHTTPServer,), {"request_queue_size": 128})
+        self._server = server_class(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self.port}{path}"
+
+    def __enter__(self) -> "StubHTTPServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,93 @@
+"""
+Benchmarks for concatenating a 27-section biography (streaming and incremental)
+
+Usage:
+    pytest tests/performance/test_concatenation_performance.py -v
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import pytest
+
+from src.api.models.concatenation import ConcatenationConfig
+from src.services.concatenation import ConcatenationService
+from src.utils.tokenized_document import clear_tokenized_documents
+
+# Mark all tests in this module as slow
+pytestmark = pytest.mark.slow
+
+PARAGRAPHS_PER_SECTION = 26
+
+
+def _paragraph(rng, vocabulary):
+    sentences = []
+    for _ in range(5):
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(12, 25))]
+        words[0] = words[0].capitalize()
+        sentences.append(" ".join(words) + ".")
+    return " ".join(sentences)
+
+
+@pytest.fixture
+def biography():
+    """Biography directory with every default section (about 65k words)"""
+    rng = random.Random(5)
+    vocabulary = [f"term{i}" for i in range(6000)] + "the of and in to a was her his she he Ada".split() * 100
+    base_path = tempfile.mkdtemp()
+    config = ConcatenationConfig(base_path=base_path)
+    paths = ConcatenationService(config)._get_ordered_files(os.path.join(base_path, "ada"))
+    for number, path in enumerate(paths):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        paragraphs = [_paragraph(rng, vocabulary) for _ in range(PARAGRAPHS_PER_SECTION)]
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"# Capítulo {number}\n\n" + "\n\n".join(paragraphs))
+    yield config, paths
+    shutil.rmtree(base_path)
+
+
+class TestIncrementalConcatenationPerformance:
+    """Re-concatenating after one edit costs about one section, not the book"""
+
+    def test_single_chapter_edit(self, biography):
+        """Test an incremental run after one edit is several times faster than a full run"""
+        config, paths = biography
+        ConcatenationService(config).concatenate_biography("ada", incremental=True)
+
+        with open(paths[5], "a", encoding="utf-8") as f:
+            f.write("\n\nA new closing paragraph about Ada and the Analytical Engine written in 1843.")
+
+        def timed(incremental):
+            clear_tokenized_documents()
+            start = time.process_time()
+            result = ConcatenationService(config).concatenate_biography("ada", incremental=incremental)
+            return time.process_time() - start, result
+
+        incremental_time, incremental = timed(True)
+        full_time, full = timed(False)
+
+        print(f"\nFull: {full_time * 1000:.1f}ms, incremental after one edit: {incremental_time * 1000:.1f}ms")
+        assert incremental.metrics == full.metrics
+        assert incremental_time < full_time / 3
+
+
+class TestStreamingConcatenationPerformance:
+    """A full run streams the book instead of holding copies of it"""
+
+    def test_peak_memory(self, biography):
+        """Test peak memory of a full run stays well below a few copies of the book"""
+        config, _ = biography
+        clear_tokenized_documents()
+
+        tracemalloc.start()
+        result = ConcatenationService(config).concatenate_biography("ada", validate_quality=False)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        book_size = os.path.getsize(result.output_file)
+        print(f"\nBook: {book_size / 1e6:.2f}MB, peak traced memory: {peak / 1e6:.2f}MB")
+        assert result.success
+        assert peak < 4 * book_size
@@ -0,0 +1,78 @@
+"""
+Benchmark for the vectorized cross-validation consistency matrix
+Scores pairwise consistency, weighting and outliers for 250 sources
+
+Usage:
+    pytest tests/performance/test_cross_validation_performance.py -v
+    pytest tests/performance/test_cross_validation_performance.py --benchmark-only
+"""
+import random
+import time
+
+import pytest
+
+from src.api.models.cross_validation import KeyFact
+from src.services.cross_validator import CrossValidationSystem
+
+# Mark all tests in this module as slow
+pytestmark = pytest.mark.slow
+
+SOURCES = 250
+FACTS_PER_SOURCE = 10
+
+PLACES = ["Ulm", "Munich", "Bern", "Zurich", "Berlin", "Princeton", "Prague"]
+ROLES = ["physicist", "professor", "author", "inventor", "philosopher"]
+
+
+def _fact_sets(count=SOURCES, seed=42):
+    """Synthetic fact sets that mostly agree, with some conflicting sources"""
+    rng = random.Random(seed)
+    fact_sets = []
+    for index in range(count):
+        birth_year = 1879 if rng.random() > 0.05 else 1880
+        facts = [
+            f"Born in {birth_year} in Ulm, Germany",
+            "Died in 1955 in Princeton",
+        ]
+        for _ in range(FACTS_PER_SOURCE - len(facts)):
+            facts.append(
+                f"Worked as a {rng.choice(ROLES)} in {rng.choice(PLACES)} "
+                f"from {rng.randint(1900, 1950)} on topic {rng.randint(1, 40)}"
+            )
+        fact_sets.append([KeyFact(fact=text, source_index=index) for text in facts])
+    return fact_sets
+
+
+@pytest.fixture(scope="module")
+def system():
+    return CrossValidationSystem()
+
+
+class TestConsistencyMatrixPerformance:
+    """Scaling of the consistency matrix with source count"""
+
+    def test_250_sources_in_milliseconds(self, system):
+        """
+        Matrix, weighted score and outlier detection for 250 sources
+        Target: < 250ms including fact normalization
+        """
+        fact_sets = _fact_sets()
+        weights = [random.Random(index).uniform(60, 100) for index in range(SOURCES)]
+
+        start = time.perf_counter()
+        matrix = system._build_consistency_matrix(fact_sets)
+        score = system._calculate_weighted_consistency_score(matrix, weights)
+        system._detect_outlier_sources(matrix)
+        elapsed = time.perf_counter() - start
+
+        assert matrix.shape == (SOURCES, SOURCES)
+        assert 0.0 <= score <= 1.0
+        assert elapsed < 0.25, f"Consistency matrix took {elapsed * 1000:.1f}ms"
+
+    def test_consistency_matrix_benchmark(self, benchmark, system):
+        """Benchmark the consistency matrix for 250 sources"""
+        fact_sets = _fact_sets()
+
+        matrix = benchmark(system._build_consistency_matrix, fact_sets)
+
+        assert matrix.shape == (SOURCES, SOURCES)
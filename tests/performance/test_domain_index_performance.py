@@ -0,0 +1,117 @@
+"""
+Microbenchmark for domain classification over 100k URLs
+Compares the suffix-trie index with the previous linear list scans
+
+Usage:
+    pytest tests/performance/test_domain_index_performance.py -v
+    pytest tests/performance/test_domain_index_performance.py --benchmark-only
+"""
+import random
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+from src.config.domain_index import _classify, classify_domain
+from src.config.premium_domains import PremiumDomainRegistry
+from src.config.trusted_domains import (
+    ACADEMIC_DOMAINS,
+    GOVERNMENT_DOMAINS,
+    MEDIUM_CREDIBILITY_SITES,
+    TRUSTED_ACADEMIC_SITES,
+)
+
+# Mark all tests in this module as slow
+pytestmark = pytest.mark.slow
+
+URL_COUNT = 100_000
+
+KNOWN_HOSTS = [
+    "en.wikipedia.org", "www.britannica.com", "www.loc.gov", "www.nytimes.com",
+    "plato.stanford.edu", "www.archives.gov", "arxiv.org", "www.bbc.com",
+    "history.army.mil", "www.nobelprize.org", "someone.blogspot.com",
+]
+
+
+def _urls(count=URL_COUNT, seed=7):
+    """URLs over a realistic mix of hot known hosts and a long tail"""
+    rng = random.Random(seed)
+    urls = []
+    for index in range(count):
+        if rng.random() < 0.7:
+            host = rng.choice(KNOWN_HOSTS)
+        else:
+            host = f"site{rng.randint(0, 20_000)}.{rng.choice(['com', 'org', 'net', 'edu', 'co.uk'])}"
+        urls.append(f"https://{host}/wiki/page_{index}")
+    return urls
+
+
+def _linear_scan(domain):
+    """Credibility, category and premium info via the previous list scans"""
+    for suffix in ACADEMIC_DOMAINS:
+        if domain.endswith(f'.{suffix}') or domain == suffix:
+            score = 95.0
+            break
+    else:
+        for suffix in GOVERNMENT_DOMAINS:
+            if domain.endswith(f'.{suffix}') or domain == suffix:
+                score = 95.0
+                break
+        else:
+            score = 90.0 if any(site in domain for site in TRUSTED_ACADEMIC_SITES) else (
+                60.0 if any(site in domain for site in MEDIUM_CREDIBILITY_SITES) else 50.0
+            )
+    info = None
+    for registry in [
+        PremiumDomainRegistry.TIER_1_ACADEMIC, PremiumDomainRegistry.GOVERNMENT_ARCHIVES,
+        PremiumDomainRegistry.TIER_1_ENCYCLOPEDIC, PremiumDomainRegistry.TIER_1_BIOGRAPHICAL,
+        PremiumDomainRegistry.TIER_1_SCIENTIFIC, PremiumDomainRegistry.TIER_1_CULTURAL,
+        PremiumDomainRegistry.TIER_1_LITERARY, PremiumDomainRegistry.TIER_1_MILITARY,
+        PremiumDomainRegistry.TIER_1_NEWS_ARCHIVES,
+    ]:
+        for registered, entry in registry.items():
+            if domain.endswith(registered):
+                info = entry
+                break
+        if info:
+            break
+    return score, info
+
+
+class TestDomainIndexPerformance:
+    """Domain classification throughput"""
+
+    def test_100k_urls(self):
+        """
+        Classify the hosts of 100k URLs
+        The index must agree with the linear scans and not be slower;
+        the speedup is reported, not asserted (wall-clock ratios vary
+        with machine load)
+        """
+        hosts = [urlsplit(url).hostname for url in _urls()]
+        _classify.cache_clear()
+
+        start = time.perf_counter()
+        expected = [_linear_scan(host) for host in hosts]
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        classified = [classify_domain(host) for host in hosts]
+        index_time = time.perf_counter() - start
+
+        print(f"\n100k URLs: linear scans {linear_time * 1000:.0f}ms, "
+              f"index {index_time * 1000:.0f}ms ({linear_time / index_time:.1f}x)")
+        print(f"LRU: {_classify.cache_info()}")
+
+        assert [(c.credibility_score, c.premium_info) for c in classified] == expected
+        assert index_time < linear_time
+
+    def test_benchmark_classify(self, benchmark):
+        """Benchmark classification of 100k URL hosts"""
+        hosts = [urlsplit(url).hostname for url in _urls()]
+
+        def classify_all():
+            for host in hosts:
+                classify_domain(host)
+
+        benchmark(classify_all)
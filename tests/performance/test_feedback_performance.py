@@ -0,0 +1,105 @@
+"""
+Benchmarks for the quality feedback system with a long success case history
+
+Usage:
+    pytest tests/performance/test_feedback_performance.py -v
+"""
+import json
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.services.feedback_system import QualityFeedbackSystem
+from src.services.success_case_store import segment_name
+
+# Mark all tests in this module as slow
+pytestmark = pytest.mark.slow
+
+CASES = 200_000
+MONTHS = 24
+
+
+@pytest.fixture(scope="module")
+def tracking_path():
+    """Store with 200k cases over two years, written and compacted once"""
+    rng = random.Random(7)
+    base_path = tempfile.mkdtemp()
+    storage_path = Path(base_path) / "quality_tracking.json"
+    store_dir = storage_path.with_suffix("")
+    store_dir.mkdir()
+
+    now = datetime.now()
+    lines = {}
+    for i in range(CASES):
+        timestamp = now - timedelta(days=MONTHS * 30 * (1 - i / CASES), seconds=rng.random())
+        case = {
+            "character": f"Person {i}",
+            "quality_score": round(rng.uniform(70, 98), 2),
+            "source_count": rng.randint(5, 30),
+            "patterns": [
+                {
+                    "pattern_type": "domain",
+                    "pattern_value": f"site{rng.randint(0, 200)}.edu",
+                    "frequency": rng.randint(1, 4),
+                    "avg_quality_impact": round(rng.uniform(70, 98), 2),
+                    "confidence": round(rng.random(), 3),
+                }
+                for _ in range(3)
+            ],
+            "timestamp": timestamp.isoformat(),
+        }
+        lines.setdefault(segment_name(timestamp), []).append(json.dumps(case) + "\n")
+    for name, segment_lines in lines.items():
+        with open(store_dir / name, "w", encoding="utf-8") as f:
+            f.writelines(segment_lines)
+
+    QualityFeedbackSystem(storage_path=str(storage_path)).quality_tracker.store.compact()
+    yield storage_path
+    shutil.rmtree(base_path)
+
+
+class TestFeedbackPerformance:
+    """Startup and metrics cost scale with recent cases, not the whole history"""
+
+    def test_improvement_metrics_with_long_history(self, tracking_path):
+        """Test startup and metrics over 200k cases only read the recent segments"""
+        start = time.perf_counter()
+        system = QualityFeedbackSystem(storage_path=str(tracking_path))
+        startup = time.perf_counter() - start
+
+        # The first call parses the segments of the last 30 days (about 13k cases)
+        start = time.perf_counter()
+        metrics = system.get_improvement_metrics(lookback_days=30)
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        system.get_improvement_metrics(lookback_days=30)
+        warm = time.perf_counter() - start
+
+        print(f"\nStartup: {startup * 1000:.1f}ms, metrics: {cold * 1000:.1f}ms cold, "
+              f"{warm * 1000:.1f}ms warm")
+        assert metrics.total_generations == CASES
+        assert metrics.patterns_identified == 201
+        assert startup < 0.1
+        assert cold < 2.0
+        assert warm < 0.1
+
+    def test_recording_a_case_is_constant_time(self, tracking_path):
+        """Test storing a case appends one line instead of rewriting the history"""
+        system = QualityFeedbackSystem(storage_path=str(tracking_path))
+        system.quality_tracker.store.compact_interval = 0
+
+        start = time.perf_counter()
+        for i in range(100):
+            system.quality_tracker.store_success_case(
+                character=f"New {i}", sources=[], patterns=[], quality_score=90.0
+            )
+        per_case = (time.perf_counter() - start) / 100
+
+        print(f"\nStore success case: {per_case * 1000:.2f}ms")
+        assert per_case < 0.005
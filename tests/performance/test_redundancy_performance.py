@@ -0,0 +1,59 @@
+"""
+Benchmark for paragraph redundancy detection over a 25-chapter book
+
+Usage:
+    pytest tests/performance/test_redundancy_performance.py -v
+"""
+import random
+import time
+
+import pytest
+
+from src.utils.narrative_analyzer import NarrativeAnalyzer
+
+# Mark all tests in this module as slow
+pytestmark = pytest.mark.slow
+
+CHAPTERS = 25
+PARAGRAPHS_PER_CHAPTER = 40
+WORDS_PER_PARAGRAPH = 120
+
+
+def _book(seed=11):
+    """Book of random paragraphs where every 10th chapter repeats reworded paragraphs"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(8000)] + ["the", "of", "and", "in", "to", "a"] * 200
+    chapters, planted = [], 0
+    first_chapter = None
+    for chapter in range(CHAPTERS):
+        paragraphs = []
+        for _ in range(PARAGRAPHS_PER_CHAPTER):
+            paragraphs.append(" ".join(rng.choice(vocabulary) for _ in range(WORDS_PER_PARAGRAPH)))
+        if first_chapter is None:
+            first_chapter = paragraphs
+        elif chapter % 10 == 0:
+            for index in range(3):
+                words = first_chapter[index].split()
+                words[rng.randrange(len(words))] = "reworded"
+                paragraphs[index] = " ".join(words)
+                planted += 1
+        chapters.append("\n\n".join(paragraphs))
+    return chapters, planted
+
+
+class TestRedundancyPerformance:
+    """Redundancy detection must stay well under a second per book"""
+
+    def test_book_scale_detection(self):
+        """Test a 25-chapter book is analyzed in well under a second"""
+        chapters, planted = _book()
+        analyzer = NarrativeAnalyzer()
+
+        start = time.perf_counter()
+        redundancies = analyzer.detect_redundancies(chapters)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n{CHAPTERS * PARAGRAPHS_PER_CHAPTER} paragraphs analyzed in {elapsed * 1000:.1f}ms")
+        assert len(redundancies) == planted
+        assert all(r['type'] == 'near_duplicate' for r in redundancies)
+        assert elapsed < 1.0
@@ -0,0 +1,102 @@
+"""
+Throughput benchmark for concurrent source fetching
+Shows that validating a source list takes about as long as the slowest host,
+not the sum of all request latencies
+
+Usage:
+    pytest tests/performance/test_source_fetch_performance.py -v
+    pytest tests/performance/test_source_fetch_performance.py --benchmark-only
+"""
+import time
+
+import pytest
+
+from src.api.models.sources import SourceItem, SourceType
+from src.cache.page_cache import PageCache
+from src.services.async_fetcher import AsyncFetchEngine
+from src.services.source_validator import SourceValidationService
+from tests.fixtures.stub_server import StubHTTPServer
+
+# Mark all tests in this module as slow
+pytestmark = pytest.mark.slow
+
+FAST_DELAY = 0.05
+SLOW_DELAY = 0.4
+HOSTS = 10
+URLS_PER_HOST = 4
+
+
+@pytest.fixture(scope="module")
+def stub_hosts():
+    """Ten local hosts (distinct ports), one of them much slower than the rest"""
+    servers = [StubHTTPServer(delay=SLOW_DELAY).start()]
+    servers += [StubHTTPServer(delay=FAST_DELAY).start() for _ in range(HOSTS - 1)]
+    yield servers
+    for server in servers:
+        server.stop()
+
+
+def _urls(servers, per_host=URLS_PER_HOST):
+    return [server.url(f"/source/{i}") for server in servers for i in range(per_host)]
+
+
+class TestSourceFetchThroughput:
+    """Wall-clock scaling of the async fetch engine"""
+
+    def test_batch_time_tracks_slowest_host(self, stub_hosts):
+        """
+        40 sources (the default min_sources) over 10 hosts
+        Target: close to the slowest host's latency, far below the sequential sum
+        """
+        engine = AsyncFetchEngine(timeout=5, max_per_host=URLS_PER_HOST)
+        urls = _urls(stub_hosts)
+
+        start = time.perf_counter()
+        results = engine.fetch_all_sync(urls)
+        elapsed = time.perf_counter() - start
+
+        sequential = SLOW_DELAY * URLS_PER_HOST + FAST_DELAY * URLS_PER_HOST * (HOSTS - 1)
+        assert len(results) == HOSTS * URLS_PER_HOST
+        assert all(result.ok for result in results.values())
+        assert SLOW_DELAY <= elapsed < SLOW_DELAY * 2.5
+        assert elapsed < sequential / 2
+
+    def test_batch_time_independent_of_source_count(self, stub_hosts):
+        """Doubling the fast-host sources does not move the wall-clock time much"""
+        engine = AsyncFetchEngine(timeout=5, max_per_host=URLS_PER_HOST * 2)
+
+        timings = []
+        for per_host in (URLS_PER_HOST, URLS_PER_HOST * 2):
+            urls = [stub_hosts[0].url("/source/slow")] + _urls(stub_hosts[1:], per_host)
+            start = time.perf_counter()
+            engine.fetch_all_sync(urls)
+            timings.append(time.perf_counter() - start)
+
+        assert timings[1] < timings[0] + SLOW_DELAY
+
+    def test_validate_sources_benchmark(self, benchmark, stub_hosts):
+        """Benchmark full validation of 40 accessible sources"""
+        page_cache = PageCache()
+        validator = SourceValidationService(
+            timeout=5,
+            max_concurrency_per_host=URLS_PER_HOST,
+            page_cache=page_cache
+        )
+        sources = [
+            SourceItem(title="Stub source", url=url, source_type=SourceType.URL)
+            for url in _urls(stub_hosts)
+        ]
+
+        def cold_cache():
+            page_cache.clear()
+            return ("Stub", sources), {"check_accessibility": True}
+
+        result = benchmark.pedantic(
+            validator.validate_sources,
+            setup=cold_cache,
+            rounds=3,
+            iterations=1
+        )
+
+        assert result["total_sources"] == HOSTS * URLS_PER_HOST
+        assert all(r.is_accessible for r in result["results"])
@@ -0,0 +1,93 @@
+"""
+Benchmark for chapter validation and coherence analysis over a 25-chapter book
+
+Usage:
+    pytest tests/performance/test_text_analysis_performance.py -v
+"""
+import random
+import time
+from collections import Counter
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.services.length_validator import LengthValidationService
+from src.utils.narrative_analyzer import NarrativeAnalyzer
+from src.utils.text_analyzer import TextAnalyzer
+from src.utils import tokenized_document
+
+# Mark all tests in this module as slow
+pytestmark = pytest.mark.slow
+
+CHAPTERS = 25
+PARAGRAPHS_PER_CHAPTER = 26
+
+
+def _book(seed=3):
+    """Book of random sentences (about 60k words) with years sprinkled in"""
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(6000)] + "the of and in to a was her his she he that with".split() * 100
+    chapters = []
+    for chapter in range(CHAPTERS):
+        paragraphs = []
+        for _ in range(PARAGRAPHS_PER_CHAPTER):
+            sentences = []
+            for _ in range(5):
+                words = [rng.choice(vocabulary) for _ in range(rng.randint(12, 25))]
+                words[0] = words[0].capitalize()
+                if rng.random() < 0.2:
+                    words.insert(3, str(rng.randint(1800, 1900)))
+                sentences.append(" ".join(words) + ".")
+            paragraphs.append(" ".join(sentences))
+        chapters.append(f"# Chapter {chapter + 1}\n\n" + "\n\n".join(paragraphs))
+    return chapters
+
+
+class TestTextAnalysisPerformance:
+    """Every chapter is tokenized once for all validation metrics"""
+
+    def test_book_validation(self):
+        """Test a 60k-word book is validated and analyzed in well under a second"""
+        chapters = _book()
+        service = LengthValidationService()
+        analyzer = NarrativeAnalyzer()
+        tokenized_document.clear_tokenized_documents()
+
+        start = time.perf_counter()
+        results = [service.validate_chapter(chapter) for chapter in chapters]
+        analyzer.analyze_coherence(chapters, "Term1 Term2")
+        analyzer.detect_redundancies(chapters)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n{sum(r.word_count for r in results)} words validated and analyzed in {elapsed * 1000:.1f}ms")
+        # One memoized document per chapter served every analyzer
+        assert len(tokenized_document._documents) == CHAPTERS
+        assert elapsed < 1.5
+
+        # Same density as fitting the vectorizer on the chapter's sentences
+        vectorizer = TfidfVectorizer(max_features=1000, stop_words='english', lowercase=True, strip_accents='unicode')
+        scores = vectorizer.fit_transform(tokenized_document.tokenize(chapters[0]).sentences).toarray()
+        assert results[0].density_score == pytest.approx(np.mean(scores[scores > 0]))
+
+    def test_book_repetition(self):
+        """Test n-gram repetition of the whole book matches string n-gram counting"""
+        book = "\n\n".join(_book())
+        # Plant a repeated passage
+        book += " " + book[:400]
+        words = book.lower().split()
+        analyzer = TextAnalyzer()
+        document = tokenized_document.tokenize(book)
+        document.word_ids
+
+        start = time.perf_counter()
+        results = analyzer.detect_repetition(document, ngram_sizes=(3, 5, 8))
+        elapsed = time.perf_counter() - start
+
+        print(f"\n{len(words)} words, 3 n-gram sizes counted in {elapsed * 1000:.1f}ms")
+        for ngram_size, result in results.items():
+            ngrams = Counter(' '.join(words[i:i + ngram_size]) for i in range(len(words) - ngram_size + 1))
+            assert result['total_ngrams'] == sum(ngrams.values())
+            assert result['repetition_score'] == pytest.approx(1.0 - len(ngrams) / sum(ngrams.values()))
+            assert (result['most_repeated_ngram'], result['repetition_count']) == ngrams.most_common(1)[0]
+        assert elapsed < 0.1
@@ -0,0 +1,276 @@
+"""
+Tests for concurrent chapter generation with incremental persistence
+"""
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.models.biographies import BiographyGenerateRequest, JobStatus
+from src.api.routers import biographies
+from src.database.base import Base
+from src.models import Chapter, GenerationJob
+from src.services.chapter_generator import ChapterGenerator, ChapterStore
+from src.services.job_store import JobStore
+from src.services.openrouter_client import Completion, OpenRouterException
+
+
+class FakeClient:
+    """OpenRouter client stand-in that takes a fixed time per chapter"""
+
+    def __init__(self, delay=0.0, fail_on=None, label=""):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.label = label
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.config = SimpleNamespace(model="fake-model", max_tokens=8192)
+        self._lock = threading.Lock()
+
+    def generate_completion(self, prompt, **kwargs):
+        with self._lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            number = int(prompt.split()[2])
+            if number == self.fail_on:
+                raise OpenRouterException("Text generation failed")
+            time.sleep(self.delay)
+            return Completion(content=f"# Chapter {number}\n\n{self.label}Text of chapter {number}.")
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory on a shared in-memory database"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def job_store(session_factory):
+    """Job store holding job-1 for Ada Lovelace"""
+    store = JobStore(session_factory=session_factory)
+    store.create_job("job-1", character="Ada Lovelace", total_chapters=8)
+    return store
+
+
+def _stored_numbers(session_factory, job_id):
+    db = session_factory()
+    try:
+        job = db.query(GenerationJob).filter_by(public_id=job_id).one()
+        return sorted(chapter.number for chapter in db.query(Chapter).filter_by(biography_id=job.biography_id))
+    finally:
+        db.close()
+
+
+class TestChapterGenerator:
+    """Test ChapterGenerator and ChapterStore"""
+
+    def test_chapters_generated_concurrently_and_persisted(self, tmp_path, session_factory, job_store):
+        """Test chapters run in parallel and each is written to disk and database"""
+        client = FakeClient(delay=0.2)
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path), session_factory=session_factory)
+        generator = ChapterGenerator(client, store, max_concurrency=4)
+
+        start = time.perf_counter()
+        chapters = generator.generate("Ada Lovelace", total_chapters=8, words_per_chapter=500)
+        elapsed = time.perf_counter() - start
+
+        assert [c["chapter"] for c in chapters] == list(range(1, 9))
+        assert client.max_in_flight == 4
+        assert elapsed < 8 * 0.2 / 2
+        chapter_file = tmp_path / "ada_lovelace" / "jobs" / "job-1" / "chapters" / "capitulo-08.md"
+        assert chapter_file.read_text().startswith("# Chapter 8")
+        assert _stored_numbers(session_factory, "job-1") == list(range(1, 9))
+
+    def test_existing_chapters_are_skipped(self, tmp_path, session_factory, job_store):
+        """Test a restarted job only generates missing chapters"""
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path), session_factory=session_factory)
+        store.save(1, "Stored chapter one")
+        (tmp_path / "ada_lovelace" / "jobs" / "job-1" / "chapters" / "capitulo-01.md").unlink()
+        store.save(2, "Stored chapter two")
+
+        client = FakeClient()
+        chapters = ChapterGenerator(client, store).generate(
+            "Ada Lovelace", total_chapters=4, words_per_chapter=500
+        )
+
+        assert len(client.prompts) == 2
+        assert chapters[0]["content"] == "Stored chapter one"
+        assert chapters[1]["content"] == "Stored chapter two"
+
+    def test_finished_chapters_survive_failure(self, tmp_path, session_factory, job_store):
+        """Test a failing chapter does not lose chapters already finished"""
+        client = FakeClient(fail_on=3)
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path), session_factory=session_factory)
+        completed = []
+
+        with pytest.raises(OpenRouterException):
+            ChapterGenerator(client, store, max_concurrency=1).generate(
+                "Ada Lovelace",
+                total_chapters=5,
+                words_per_chapter=500,
+                on_chapter=lambda chapter, count: completed.append(chapter["chapter"])
+            )
+
+        assert {1, 2} <= set(completed)
+        assert set(store.existing_chapters()) == set(completed)
+        assert 3 not in completed
+
+        retry_client = FakeClient()
+        chapters = ChapterGenerator(retry_client, store).generate(
+            "Ada Lovelace", total_chapters=5, words_per_chapter=500
+        )
+        assert len(retry_client.prompts) == 5 - len(completed)
+        assert [c["chapter"] for c in chapters] == [1, 2, 3, 4, 5]
+
+    def test_running_chapters_are_saved_after_a_failure(self, tmp_path, session_factory, job_store):
+        """Test chapters still running when another fails are persisted, not discarded"""
+        client = FakeClient(delay=0.2, fail_on=1)
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path), session_factory=session_factory)
+        completed = []
+
+        with pytest.raises(OpenRouterException):
+            ChapterGenerator(client, store, max_concurrency=3).generate(
+                "Ada Lovelace",
+                total_chapters=8,
+                words_per_chapter=500,
+                on_chapter=lambda chapter, count: completed.append(chapter["chapter"])
+            )
+
+        assert {2, 3} <= set(completed)
+        # Every chapter that was requested, apart from the failed one, is stored
+        assert len(completed) == len(client.prompts) - 1
+        assert _stored_numbers(session_factory, "job-1") == sorted(completed)
+        assert len(client.prompts) < 8
+
+    def test_run_biography_generation_updates_job(self, tmp_path, session_factory):
+        """Test the background task reports progress and stores chapters"""
+        job_id = "job-chapters"
+        request = BiographyGenerateRequest(character="Ada Lovelace", chapters=3, total_words=3000)
+        job_store = JobStore(session_factory=session_factory)
+        job_store.create_job(job_id, character="Ada Lovelace", total_chapters=3)
+
+        with patch.object(biographies, "OpenRouterClient", return_value=FakeClient()), \
+             patch.object(biographies, "get_job_store", return_value=job_store):
+            biographies.run_biography_generation(job_id, request, bios_dir=str(tmp_path))
+
+        job = job_store.get_status(job_id)
+        assert job["status"] == JobStatus.COMPLETED
+        assert job["progress"]["chapters_completed"] == 3
+        assert [c["chapter"] for c in job_store.get_chapters(job_id)] == [1, 2, 3]
+        assert len(list((tmp_path / "ada_lovelace" / "jobs" / job_id / "chapters").glob("*.md"))) == 3
+
+    def test_new_job_for_same_character_generates_fresh_chapters(self, tmp_path, session_factory):
+        """Test chapters of an earlier job are not reused by a new job"""
+        job_store = JobStore(session_factory=session_factory)
+        runs = [("job-first", 3, FakeClient(label="First. ")), ("job-second", 2, FakeClient(label="Second. "))]
+
+        for job_id, chapters, client in runs:
+            job_store.create_job(job_id, character="Ada Lovelace", total_chapters=chapters)
+            request = BiographyGenerateRequest(character="Ada Lovelace", chapters=chapters, total_words=3000)
+            with patch.object(biographies, "OpenRouterClient", return_value=client), \
+                 patch.object(biographies, "get_job_store", return_value=job_store):
+                biographies.run_biography_generation(job_id, request, bios_dir=str(tmp_path))
+
+        assert len(runs[1][2].prompts) == 2
+        second = job_store.get_chapters("job-second")
+        assert [c["chapter"] for c in second] == [1, 2]
+        assert all("Second." in c["content"] for c in second)
+        assert all("First." in c["content"] for c in job_store.get_chapters("job-first"))
+
+
+class BudgetClient:
+    """OpenRouter client stand-in reporting usage and truncation"""
+
+    def __init__(self, replies):
+        self.config = SimpleNamespace(model="fake-model", max_tokens=8192)
+        self.replies = list(replies)
+        self.calls = []
+
+    def generate_completion(self, prompt, **kwargs):
+        self.calls.append({"prompt": prompt, **kwargs})
+        return self.replies.pop(0)
+
+
+def _words(count, word="word"):
+    return " ".join([word] * count)
+
+
+class TestChapterBudgeting:
+    """Test adaptive max_tokens and continuation of truncated chapters"""
+
+    def test_truncated_chapter_is_continued(self, tmp_path):
+        """Test a chapter cut off at max_tokens is continued, not regenerated"""
+        usage = {"prompt_tokens": 60, "completion_tokens": 400}
+        client = BudgetClient([
+            Completion(content=_words(300, "early") + " ", usage=usage, finish_reason="length"),
+            Completion(content=_words(200, "later"), usage=usage, finish_reason="stop"),
+        ])
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path))
+
+        chapters = ChapterGenerator(client, store).generate("Ada Lovelace", total_chapters=1, words_per_chapter=500)
+
+        assert len(client.calls) == 2
+        continuation = client.calls[1]["prompt"]
+        assert continuation.startswith("Continue chapter 1 of 1 about Ada Lovelace")
+        assert "early early" in continuation
+        assert "approximately 200 more words" in continuation
+        assert chapters[0]["word_count"] == 500
+
+    def test_continuation_is_joined_as_received(self, tmp_path):
+        """Test a chapter cut off mid-word is not split by the continuation"""
+        client = BudgetClient([
+            Completion(content="Ada was a mathemat", usage={}, finish_reason="length"),
+            Completion(content="ician and writer.", usage={}, finish_reason="stop"),
+        ])
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path))
+
+        chapters = ChapterGenerator(client, store).generate("Ada Lovelace", total_chapters=1, words_per_chapter=500)
+
+        assert chapters[0]["content"] == "Ada was a mathematician and writer."
+
+    def test_continuations_are_bounded(self, tmp_path):
+        """Test a model that keeps hitting the limit gets a bounded number of continuations"""
+        client = BudgetClient([
+            Completion(content=_words(50), usage={}, finish_reason="length") for _ in range(3)
+        ])
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path))
+
+        ChapterGenerator(client, store, max_continuations=2).generate(
+            "Ada Lovelace", total_chapters=1, words_per_chapter=500
+        )
+
+        assert len(client.calls) == 3
+
+    def test_max_tokens_follows_learned_ratio(self, tmp_path):
+        """Test max_tokens adapts to the words per token the model reports"""
+        # The model writes 0.5 words per token, not the 0.75 prior
+        usage = {"prompt_tokens": 60, "completion_tokens": 1000}
+        client = BudgetClient([
+            Completion(content=_words(500), usage=usage, finish_reason="stop") for _ in range(2)
+        ])
+        store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path))
+
+        ChapterGenerator(client, store, max_concurrency=1).generate(
+            "Ada Lovelace", total_chapters=2, words_per_chapter=500
+        )
+
+        first, second = (call["max_tokens"] for call in client.calls)
+        assert first == pytest.approx(500 / 0.75 * 1.15, abs=2)
+        assert second == pytest.approx(500 / 0.5 * 1.15, abs=2)
@@ -5,7 +5,9 @@ import pytest
 import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
+from src.services.collection_scheduler import CollectionScheduler, reset_collection_schedulers
 from src.services.collection_service import CollectionService
 
 
@@ -175,3 +177,97 @@ Dwight D. Eisenhower
         assert line_idx == 2
         assert line_number == ""
         assert character_name == "Winston Churchill"
+
+
+class TestCollectionScheduler:
+    """Tests for concurrent claiming and batched completion marks"""
+    
+    @pytest.fixture(autouse=True)
+    def fresh_schedulers(self):
+        """Do not share scheduler instances between tests"""
+        reset_collection_schedulers()
+        yield
+        reset_collection_schedulers()
+    
+    @pytest.fixture
+    def collection_path(self, tmp_path):
+        """Create a collection file with 3 completed and 20 open characters"""
+        lines = [f"{i}. Character {i} ✅" for i in range(1, 4)]
+        lines += [f"{i}. Character {i}" for i in range(4, 24)]
+        path = tmp_path / "collection.md"
+        path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        return str(path)
+    
+    def test_concurrent_claims_are_unique(self, collection_path):
+        """Test workers with their own schedulers never claim the same character"""
+        import threading
+        claimed = []
+        
+        def worker(worker_id):
+            scheduler = CollectionScheduler(collection_path)
+            while True:
+                entry = scheduler.claim_next(worker_id)
+                if entry is None:
+                    return
+                claimed.append(entry.name)
+        
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert sorted(claimed) == sorted(f"Character {i}" for i in range(4, 24))
+        assert CollectionScheduler(collection_path).stats()['in_progress'] == 20
+    
+    def test_completion_marks_are_batched(self, collection_path):
+        """Test marks are shared immediately but written to the file per batch"""
+        scheduler = CollectionScheduler(collection_path, batch_size=3)
+        other_worker = CollectionScheduler(collection_path)
+        with open(collection_path, encoding='utf-8') as f:
+            original = f.read()
+        
+        assert scheduler.complete("Character 4") is True
+        assert scheduler.complete("character 5") is True
+        assert scheduler.complete("Character 5") is False
+        with open(collection_path, encoding='utf-8') as f:
+            assert f.read() == original
+        assert other_worker.stats()['completed'] == 5
+        assert other_worker.first_uncompleted().name == "Character 6"
+        
+        assert other_worker.complete("Character 9") is True
+        assert scheduler.complete("Character 6") is True
+        with open(collection_path, encoding='utf-8') as f:
+            content = f.read()
+        for i in (4, 5, 6, 9):
+            assert f"{i}. Character {i} ✅\n" in content
+        assert "7. Character 7\n" in content
+    
+    def test_stats_do_not_rescan_unchanged_file(self, collection_path):
+        """Test the file is parsed once until it changes on disk"""
+        scheduler = CollectionScheduler(collection_path)
+        with patch.object(CollectionScheduler, '_parse', autospec=True,
+                          side_effect=CollectionScheduler._parse) as parse:
+            for _ in range(5):
+                assert scheduler.stats()['completed'] == 3
+            
+            with open(collection_path, 'a', encoding='utf-8') as f:
+                f.write("24. Character 24 ✅\n")
+            assert scheduler.stats()['completed'] == 4
+        
+        assert parse.call_count == 2
+    
+    def test_expired_claims_are_handed_out_again(self, collection_path):
+        """Test a claim held by a dead worker expires"""
+        scheduler = CollectionScheduler(collection_path, claim_ttl=0)
+        
+        first = scheduler.claim_next("crashed-worker")
+        assert scheduler.claim_next("other-worker").name == first.name
+    
+    def test_service_skips_claimed_characters(self, collection_path):
+        """Test find_first_uncompleted does not return characters being generated"""
+        service = CollectionService(collections_base_path=os.path.dirname(collection_path))
+        service.get_scheduler("collection.md").claim_next("worker")
+        
+        assert service.find_first_uncompleted("collection.md")[2] == "Character 5"
+        assert service.get_collection_stats("collection.md")['in_progress'] == 1
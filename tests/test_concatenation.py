@@ -5,14 +5,18 @@ import pytest
 import os
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from src.services.concatenation import ConcatenationService
+from src.services.concatenation_manifest import content_hash
+from src.services.concatenation_writer import BookWriter
 from src.api.models.concatenation import (
     ConcatenationConfig,
     ConcatenationResult,
     TransitionError
 )
 from src.utils.narrative_analyzer import NarrativeAnalyzer
+from src.utils.tokenized_document import tokenize
 from src.utils.transition_generator import TransitionGenerator
 
 
@@ -102,6 +106,48 @@ class TestNarrativeAnalyzer:
         # Should detect the duplicate paragraph
         assert len(redundancies) > 0
         assert redundancies[0]['type'] == 'exact_duplicate'
+    
+    def test_detect_reworded_redundancies(self):
+        """Test paragraphs repeated with small rewording are detected"""
+        analyzer = NarrativeAnalyzer()
+        
+        original = (
+            "Ada Lovelace published her notes on the Analytical Engine in 1843, "
+            "describing an algorithm to compute Bernoulli numbers with the machine "
+            "and arguing that it could manipulate symbols as well as numbers."
+        )
+        reworded = (
+            "In 1843 Ada Lovelace published her notes on the Analytical Engine, "
+            "describing an algorithm to compute Bernoulli numbers with the machine "
+            "and arguing that it could process symbols as well as numbers."
+        )
+        chapters = [
+            f"Chapter one.\n\n{original}",
+            "Chapter two.\n\nHer childhood was shaped by her mother's insistence on mathematics and logic, "
+            "a deliberate counterweight to the poetic temperament of her father.",
+            f"Chapter three.\n\n{reworded}",
+        ]
+        
+        redundancies = analyzer.detect_redundancies(chapters)
+        
+        assert len(redundancies) == 1
+        assert redundancies[0]['type'] == 'near_duplicate'
+        assert redundancies[0]['original_chapter'] == 0
+        assert redundancies[0]['duplicate_chapter'] == 2
+        assert 0.5 < redundancies[0]['similarity'] < 1.0
+    
+    def test_redundancy_threshold_is_honored(self):
+        """Test similarity_threshold decides which reworded paragraphs count"""
+        analyzer = NarrativeAnalyzer()
+        
+        words = [f"word{i}" for i in range(40)]
+        reworded = list(words)
+        for i in range(0, 40, 8):
+            reworded[i] = f"other{i}"
+        chapters = [" ".join(words), " ".join(reworded)]
+        
+        assert len(analyzer.detect_redundancies(chapters, similarity_threshold=0.4)) == 1
+        assert analyzer.detect_redundancies(chapters, similarity_threshold=0.9) == []
 
 
 class TestTransitionGenerator:
@@ -407,6 +453,162 @@ class TestConcatenationService:
         assert result.success is True
 
 
+class TestIncrementalConcatenation:
+    """Test incremental re-concatenation against full runs"""
+    
+    REPEATED = "Ada Lovelace translated the memoir on the Analytical Engine and added her famous notes in 1843."
+    
+    def setup_method(self):
+        """Setup a biography with a repeated paragraph"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConcatenationConfig(
+            base_path=self.temp_dir,
+            file_order=["prologo.md", "capitulo-01.md", "capitulo-02.md", "capitulo-03.md", "epilogo.md"]
+        )
+        character_dir = os.path.join(self.temp_dir, "ada")
+        self.paths = ConcatenationService(self.config)._get_ordered_files(character_dir)
+        os.makedirs(os.path.dirname(self.paths[0]))
+        os.makedirs(os.path.dirname(self.paths[1]))
+        
+        contents = [
+            "## Prólogo\n\nAda Lovelace was born in London in 1815 as the only legitimate child of Lord Byron.",
+            f"# Capítulo 1\n\nHer mother Anne Isabella Milbanke insisted on mathematics lessons from an early age.\n\n{self.REPEATED}",
+            "# Capítulo 2\n\nIn 1833 Ada met Charles Babbage at a party and saw his Difference Engine demonstrated.",
+            f"# Capítulo 3\n\n{self.REPEATED}\n\nShe died in 1852 at the age of thirty-six years old in London.",
+            "## Epílogo\n\nThe Ada programming language was named after her by the United States Department of Defense.",
+        ]
+        for path, content in zip(self.paths, contents):
+            self._write(path, content)
+    
+    def teardown_method(self):
+        """Cleanup test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def _write(self, path, content):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
+    def _run(self, incremental):
+        result = ConcatenationService(self.config).concatenate_biography("ada", incremental=incremental)
+        with open(result.output_file, 'r', encoding='utf-8', newline='') as f:
+            output = f.read()
+        return result, output
+    
+    def _assert_same(self, incremental, full):
+        (result, output), (expected, expected_output) = incremental, full
+        assert output == expected_output
+        assert result.metrics == expected.metrics
+        assert result.redundancies_removed == expected.redundancies_removed
+        assert result.transition_errors == expected.transition_errors
+        assert result.coherence_issues == expected.coherence_issues
+        assert result.coherence_score == expected.coherence_score
+    
+    def test_first_run_matches_full_run(self):
+        """Test an incremental run without a manifest equals a full run"""
+        incremental = self._run(incremental=True)
+        
+        assert os.path.exists(incremental[0].output_file + ".manifest.json")
+        assert incremental[0].redundancies_removed == 1
+        assert incremental[1].startswith("# Prólogo")
+        self._assert_same(incremental, self._run(incremental=False))
+    
+    def test_only_changed_chapter_is_reanalyzed(self):
+        """Test a single edit re-reads one file and still equals a full run"""
+        self._run(incremental=True)
+        
+        self._write(self.paths[2], f"# Capítulo 2\n\n{self.REPEATED}\n\nIn 1833 Ada met Charles Babbage.")
+        with patch.object(NarrativeAnalyzer, 'profile_chapter', autospec=True,
+                          side_effect=NarrativeAnalyzer.profile_chapter) as profile:
+            incremental = self._run(incremental=True)
+        
+        assert profile.call_count == 1
+        assert incremental[0].redundancies_removed == 2
+        self._assert_same(incremental, self._run(incremental=False))
+    
+    def test_removed_chapter_and_edited_output(self):
+        """Test removed files drop out and a hand-edited output forces a rebuild"""
+        result, _ = self._run(incremental=True)
+        
+        os.remove(self.paths[3])
+        self._assert_same(self._run(incremental=True), self._run(incremental=False))
+        
+        with open(result.output_file, 'a', encoding='utf-8') as f:
+            f.write("\n\nHand edit")
+        self._write(self.paths[4], "## Epílogo\n\nShorter.")
+        self._assert_same(self._run(incremental=True), self._run(incremental=False))
+
+
+class TestStreamingConcatenation:
+    """Test the streaming book writer"""
+    
+    PIECES = [
+        "## Capítulo 1\n\nAda Lovelace wrote",
+        " the first published algorithm.\n\n## Capí",
+        "tulo 2\n\nCharles Babbage and Ada corresponded",
+        "\n\n",
+        "### Notes\n\nThe end",
+    ]
+    
+    def setup_method(self):
+        """Setup test environment"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_file = os.path.join(self.temp_dir, "output", "book.md")
+    
+    def teardown_method(self):
+        """Cleanup test environment"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_statistics_match_full_text(self):
+        """Test lines split across writes are normalized and measured whole"""
+        normalize = TransitionGenerator().normalize_section_headers
+        writer = BookWriter(self.output_file, normalize=normalize)
+        for piece in self.PIECES:
+            writer.write(piece)
+        assert writer.close() is True
+        
+        expected = normalize("".join(self.PIECES))
+        document = tokenize(expected)
+        with open(self.output_file, 'r', encoding='utf-8', newline='') as f:
+            assert f.read() == expected
+        assert writer.word_count == document.word_count
+        assert writer.term_count == len(document.term_ids)
+        assert writer.vocabulary == set(document.term_vocabulary)
+        assert writer.headers == [(1, "Capítulo 1"), (1, "Capítulo 2"), (3, "Notes")]
+        assert writer.content_hash == content_hash(expected)
+    
+    def test_failure_leaves_no_partial_output(self):
+        """Test an interrupted book is discarded"""
+        with pytest.raises(RuntimeError):
+            with BookWriter(self.output_file) as writer:
+                writer.write(self.PIECES[0] + "\n")
+                raise RuntimeError("generation failed")
+        
+        assert os.listdir(os.path.dirname(self.output_file)) == []
+    
+    def test_biography_matches_in_memory_concatenation(self):
+        """Test the streamed biography equals joining and normalizing in memory"""
+        config = ConcatenationConfig(base_path=self.temp_dir)
+        service = ConcatenationService(config)
+        paths = service._get_ordered_files(os.path.join(self.temp_dir, "ada"))
+        for number, path in enumerate(paths[:6]):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(f"## Capítulo {number}\n\nAda Lovelace in {1830 + number}.\n\n### Notes")
+        
+        result = service.concatenate_biography("ada")
+        
+        expected = service.transition_generator.normalize_section_headers(
+            service._concatenate_content(service._load_chapters(paths))
+        )
+        with open(result.output_file, 'r', encoding='utf-8', newline='') as f:
+            assert f.read() == expected
+        assert result.metrics.total_words == service.text_analyzer.count_words(expected)
+        assert result.metrics.files_processed == 6
+        assert result.index_generated is True
+
+
 class TestConcatenationConfig:
     """Test concatenation configuration"""
     
@@ -4,7 +4,7 @@ Integration tests for the orchestration engine
 """
 import pytest
 from datetime import datetime
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from src.engine.bookgen_engine import BookGenEngine, JobStatus
@@ -13,6 +13,7 @@ from src.engine.error_handler import ErrorHandler, ErrorSeverity, ErrorType, Rec
 from src.engine.workflow_manager import WorkflowManager, WorkflowPhase
 from src.database.base import Base
 from src.models.generation_job import GenerationJob
+from src.models.job_event import JobEvent
 from src.models.biography import Biography
 
 
@@ -436,19 +437,83 @@ class TestIntegration:
         # Add a log
         engine._add_log(job_id, "INFO", "Test log message", {"key": "value"})
         
-        # Refresh the session to get updated data
-        test_db.expire_all()
-        
         # Retrieve and verify
-        job = test_db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
-        assert len(job.logs) >= 1
+        logs = engine.get_status(job_id).logs
+        assert len(logs) >= 1
         
         # Find the test log
-        test_log = next((log for log in job.logs if log['message'] == 'Test log message'), None)
+        test_log = next((log for log in logs if log['message'] == 'Test log message'), None)
         assert test_log is not None
         assert test_log['level'] == 'INFO'
         assert test_log['metadata']['key'] == 'value'
-
+        
+        # Entries are appended to job_events, not rewritten into the job row
+        job = test_db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        assert not job.logs
+        assert test_db.query(JobEvent).filter(JobEvent.job_id == job_id).count() == len(logs)
+    
+    def test_logs_are_buffered(self, test_db):
+        """Test log entries are written in batches"""
+        engine = BookGenEngine(db_session=test_db)
+        job_id = engine.generate_biography("winston_churchill")
+        
+        for i in range(10):
+            engine._add_log(job_id, "INFO", f"Message {i}")
+        
+        assert engine._events.pending_count == 10
+        assert test_db.query(JobEvent).filter(JobEvent.job_id == job_id).count() == 1
+        
+        engine._events.flush()
+        assert test_db.query(JobEvent).filter(JobEvent.job_id == job_id).count() == 11
+    
+    def test_log_tail_pagination(self, test_db):
+        """Test status returns the newest entries with a cursor to older ones"""
+        engine = BookGenEngine(db_session=test_db)
+        job_id = engine.generate_biography("winston_churchill")
+        for i in range(25):
+            engine._add_log(job_id, "INFO", f"Message {i}")
+        
+        status = engine.get_status(job_id, log_limit=10)
+        assert [log['message'] for log in status.logs] == [f"Message {i}" for i in range(15, 25)]
+        
+        older = engine.get_status(job_id, log_limit=10, log_before=status.next_log_cursor)
+        assert [log['message'] for log in older.logs] == [f"Message {i}" for i in range(5, 15)]
+        
+        oldest = engine.get_status(job_id, log_limit=10, log_before=older.next_log_cursor)
+        assert len(oldest.logs) == 6
+        assert oldest.next_log_cursor is None
+    
+    def test_phase_update_is_one_transaction(self, test_db):
+        """Test a phase update and its log entry share a single commit"""
+        engine = BookGenEngine(db_session=test_db)
+        job_id = engine.generate_biography("winston_churchill")
+        
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(test_db.get_bind(), "before_cursor_execute", listener)
+        commits = []
+        event.listen(test_db, "after_commit", lambda session: commits.append(session))
+        try:
+            engine._phase_validate_sources({'job_id': job_id})
+        finally:
+            event.remove(test_db.get_bind(), "before_cursor_execute", listener)
+        
+        assert len(commits) == 1
+        assert not any(statement.lstrip().upper().startswith("SELECT") for statement in statements)
+        
+        job = test_db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+        assert job.current_phase == "sources_validating"
+        assert engine.get_status(job_id).logs[-1]['message'] == "Validating biographical sources"
+    
+    def test_initialize_missing_job(self, test_db):
+        """Test initializing a nonexistent job raises and writes no events"""
+        engine = BookGenEngine(db_session=test_db)
+        
+        with pytest.raises(ValueError):
+            engine._phase_initialize({'job_id': 999})
+        
+        assert engine._events.pending_count == 0
+        assert test_db.query(JobEvent).count() == 0
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
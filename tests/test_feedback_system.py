@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
 from src.services.feedback_system import QualityFeedbackSystem, QualityTracker
+from src.services.success_case_store import SuccessCaseStore, segment_name
 from src.utils.pattern_analyzer import SuccessPatternAnalyzer
 from src.models.quality_metrics import (
     BiographyQualityScore,
@@ -249,7 +250,7 @@ class TestQualityTracker:
                 patterns=[],
                 timestamp=datetime.now() - timedelta(days=40)
             )
-            tracker.success_cases.append(old_case)
+            tracker.add_case(old_case)
             
             # Add a recent case
             recent_case = SuccessCase(
@@ -259,7 +260,7 @@ class TestQualityTracker:
                 patterns=[],
                 timestamp=datetime.now()
             )
-            tracker.success_cases.append(recent_case)
+            tracker.add_case(recent_case)
             
             # Get recent cases (last 30 days)
             recent = tracker.get_recent_cases(days=30)
@@ -267,6 +268,100 @@ class TestQualityTracker:
             assert recent[0].character == "Recent Person"
 
 
+class TestSuccessCaseStore:
+    """Test the append-only, time-partitioned success case store"""
+    
+    @staticmethod
+    def _case(name, days_ago, score, patterns=()):
+        return SuccessCase(
+            character=name,
+            quality_score=score,
+            source_count=3,
+            patterns=[
+                SuccessPattern(
+                    pattern_type="domain",
+                    pattern_value=value,
+                    frequency=2,
+                    avg_quality_impact=score,
+                    confidence=0.8
+                )
+                for value in patterns
+            ],
+            timestamp=datetime.now() - timedelta(days=days_ago)
+        )
+    
+    def test_range_queries_across_segments(self, tmp_path):
+        """Cases are partitioned by month and returned in time order"""
+        store = SuccessCaseStore(str(tmp_path / "store"))
+        for i, days_ago in enumerate([100, 3, 70, 1, 40, 5]):
+            store.append(self._case(f"P{i}", days_ago, 80.0))
+        
+        assert len(list((tmp_path / "store").glob("cases-*.jsonl"))) >= 3
+        all_cases = store.range()
+        assert [c.character for c in all_cases] == ["P0", "P2", "P4", "P5", "P1", "P3"]
+        
+        recent = store.range(start=datetime.now() - timedelta(days=10))
+        assert [c.character for c in recent] == ["P5", "P1", "P3"]
+        
+        window = store.range(
+            start=datetime.now() - timedelta(days=80),
+            end=datetime.now() - timedelta(days=4)
+        )
+        assert [c.character for c in window] == ["P2", "P4", "P5"]
+    
+    def test_summary_matches_aggregate_patterns(self, tmp_path):
+        """Segment summaries give the same totals as visiting every case"""
+        store = SuccessCaseStore(str(tmp_path / "store"))
+        cases = [
+            self._case("A", 90, 92.0, ["a.edu", "b.org"]),
+            self._case("B", 45, 80.0, ["a.edu"]),
+            self._case("C", 2, 88.0, ["b.org", "c.gov"]),
+        ]
+        for case in cases:
+            store.append(case)
+        assert store.compact() >= 2
+        
+        # A fresh store answers from index.json without parsing closed segments
+        reopened = SuccessCaseStore(str(tmp_path / "store"))
+        summary = reopened.summary()
+        assert summary.count == 3
+        assert summary.score_sum == pytest.approx(260.0)
+        assert summary.success_count == 2
+        assert all(name >= segment_name(datetime.now()) for name in reopened._segments)
+        
+        expected = SuccessPatternAnalyzer().aggregate_patterns([c.patterns for c in cases])
+        actual = summary.aggregated_patterns()
+        assert [(p.pattern_value, p.frequency, p.metadata) for p in actual] == \
+            [(p.pattern_value, p.frequency, p.metadata) for p in expected]
+        assert [p.avg_quality_impact for p in actual] == \
+            pytest.approx([p.avg_quality_impact for p in expected])
+    
+    def test_picks_up_appends_from_other_writers(self, tmp_path):
+        """Caches are invalidated when another process appends to a segment"""
+        store = SuccessCaseStore(str(tmp_path / "store"))
+        other = SuccessCaseStore(str(tmp_path / "store"))
+        store.append(self._case("Mine", 1, 90.0))
+        assert store.summary().count == 1
+        
+        other.append(self._case("Theirs", 0, 70.0))
+        assert [c.character for c in store.range()] == ["Mine", "Theirs"]
+        assert store.summary().count == 2
+    
+    def test_migrates_legacy_json_file(self, tmp_path):
+        """Cases of the old single-file format are moved into the store"""
+        storage_path = tmp_path / "tracking.json"
+        case = self._case("Legacy", 60, 87.0, ["a.edu"])
+        with open(storage_path, 'w') as f:
+            json.dump({'cases': [case.model_dump(mode='json')]}, f)
+        
+        tracker = QualityTracker(storage_path=str(storage_path))
+        assert not storage_path.exists()
+        assert [c.character for c in tracker.get_all_cases()] == ["Legacy"]
+        
+        reopened = QualityTracker(storage_path=str(storage_path))
+        assert reopened.get_summary().count == 1
+
+
 class TestQualityFeedbackSystem:
     """Test QualityFeedbackSystem"""
     
@@ -363,7 +458,7 @@ class TestQualityFeedbackSystem:
                     patterns=[],
                     timestamp=datetime.now() - timedelta(days=i)
                 )
-                system.quality_tracker.success_cases.append(case)
+                system.quality_tracker.add_case(case)
             
             metrics = system.get_improvement_metrics()
             assert metrics.total_generations == 5
@@ -396,7 +491,7 @@ class TestQualityFeedbackSystem:
                 patterns=[],
                 timestamp=datetime.now()
             )
-            system.quality_tracker.success_cases.append(case)
+            system.quality_tracker.add_case(case)
             
             dashboard = system.export_dashboard_data()
             assert isinstance(dashboard, dict)
@@ -443,7 +538,7 @@ class TestAcceptanceCriteria:
                     patterns=[],
                     timestamp=datetime.now() - timedelta(days=45)
                 )
-                feedback_system.quality_tracker.success_cases.append(case)
+                feedback_system.quality_tracker.add_case(case)
             
             # Then add recent generations with improving quality
             # Create high-quality sources for Einstein
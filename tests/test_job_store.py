@@ -0,0 +1,178 @@
+"""
+Tests for the persistent biography job store
+"""
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.models.biographies import JobStatus
+from src.models import Chapter
+from src.repositories.chapter_repository import ChapterRepository
+from src.repositories.generation_job_repository import GenerationJobRepository
+from src.services.chapter_generator import ChapterStore
+from src.services.job_store import JobStore
+
+
+@pytest.fixture
+def engine():
+    """Shared in-memory database, standing in for the server database"""
+    return create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+
+
+@pytest.fixture
+def statements(engine):
+    """SQL statements executed on the engine"""
+    executed = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: executed.append(statement)
+    )
+    return executed
+
+
+def _store(engine, **kwargs):
+    return JobStore(session_factory=sessionmaker(bind=engine), **kwargs)
+
+
+def _add_chapters(store, job_id, contents):
+    """Write chapter rows under the biography of a job"""
+    db = store.session_factory()
+    try:
+        job = GenerationJobRepository(db).get_by_public_id(job_id)
+        for number, content in enumerate(contents, start=1):
+            ChapterRepository(db).create(Chapter(
+                biography_id=job.biography_id,
+                number=number,
+                content=content,
+                word_count=len(content.split())
+            ))
+    finally:
+        db.close()
+
+
+class TestJobStore:
+    """Test JobStore persistence and status cache"""
+
+    def test_create_and_get_status(self, engine):
+        """Test a created job is pending and has no download URL"""
+        store = _store(engine)
+        created = store.create_job("job-1", character="Ada Lovelace", total_chapters=5)
+
+        status = store.get_status("job-1")
+        assert status["status"] == JobStatus.PENDING
+        assert status["character"] == "Ada Lovelace"
+        assert status["created_at"] == created["created_at"]
+        assert status["download_url"] is None
+        assert store.get_status("missing") is None
+
+    def test_status_of_own_jobs_served_from_cache(self, engine, statements):
+        """Test status polling does not query the database"""
+        store = _store(engine)
+        store.create_job("job-1", character="Ada Lovelace", total_chapters=5)
+        store.mark_started("job-1")
+        store.update_progress("job-1", 2, 5)
+
+        statements.clear()
+        for _ in range(100):
+            status = store.get_status("job-1")
+
+        assert statements == []
+        assert status["status"] == JobStatus.IN_PROGRESS
+        assert status["progress"]["chapters_completed"] == 2
+
+    def test_status_never_loads_chapter_bodies(self, engine, statements, tmp_path):
+        """Test an uncached status read is a narrow generation_jobs query"""
+        store = _store(engine)
+        store.create_job("job-1", character="Ada Lovelace", total_chapters=2)
+        ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path), session_factory=store.session_factory).save(1, "x" * 10_000)
+
+        other_worker = _store(engine, create_tables=False)
+        statements.clear()
+        other_worker.get_status("job-1")
+
+        assert len(statements) == 1
+        assert "chapters" not in statements[0]
+        assert "logs" not in statements[0]
+
+    def test_jobs_survive_restart(self, engine, tmp_path):
+        """Test a new store instance sees jobs and chapters stored by another"""
+        store = _store(engine)
+        store.create_job("job-1", character="Ada Lovelace", total_chapters=2)
+        chapter_store = ChapterStore("Ada Lovelace", "job-1", base_dir=str(tmp_path), session_factory=store.session_factory)
+        chapter_store.save(1, "Chapter one")
+        chapter_store.save(2, "Chapter two")
+        store.mark_completed("job-1", 2, 2)
+
+        restarted = _store(engine)
+        status = restarted.get_status("job-1")
+        assert status["status"] == JobStatus.COMPLETED
+        assert status["download_url"] == "/api/v1/biographies/job-1/download"
+        assert status["completed_at"].tzinfo is not None
+        assert [c["content"] for c in restarted.get_chapters("job-1")] == ["Chapter one", "Chapter two"]
+
+    def test_chapters_are_scoped_to_their_job(self, engine):
+        """Test a second job for a character does not report the first job's chapters"""
+        store = _store(engine)
+        store.create_job("job-1", character="Ada Lovelace", total_chapters=3)
+        _add_chapters(store, "job-1", ["First one", "First two", "First three"])
+        store.create_job("job-2", character="Ada Lovelace", total_chapters=3)
+
+        assert store.get_chapters("job-2") == []
+
+        _add_chapters(store, "job-2", ["Second one"])
+        assert [c["content"] for c in store.get_chapters("job-1")] == ["First one", "First two", "First three"]
+        assert [c["content"] for c in store.get_chapters("job-2")] == ["Second one"]
+
+    def test_other_worker_sees_progress_after_refresh_interval(self, engine):
+        """Test active jobs of another worker are re-read once the entry expires"""
+        worker_a = _store(engine)
+        worker_b = _store(engine, refresh_interval=0.05)
+        worker_a.create_job("job-1", character="Ada Lovelace", total_chapters=4)
+        worker_a.mark_started("job-1")
+
+        assert worker_b.get_status("job-1")["progress"] is None
+        worker_a.update_progress("job-1", 1, 4)
+        assert worker_b.get_status("job-1")["progress"] is None
+
+        time.sleep(0.1)
+        assert worker_b.get_status("job-1")["progress"]["chapters_completed"] == 1
+
+    def test_cache_is_bounded(self, engine):
+        """Test the least recently used snapshots are evicted"""
+        store = _store(engine, cache_size=3)
+        for i in range(10):
+            store.create_job(f"job-{i}", character="Ada Lovelace", total_chapters=1)
+
+        assert list(store._cache) == ["job-7", "job-8", "job-9"]
+        assert store.get_status("job-0")["job_id"] == "job-0"
+
+    def test_failed_write_still_updates_cache(self, engine):
+        """Test a database outage does not hide progress on this worker"""
+        store = _store(engine)
+        store.create_job("job-1", character="Ada Lovelace", total_chapters=4)
+
+        with patch.object(store, "session_factory", side_effect=OperationalError("update", {}, Exception("down"))):
+            store.mark_failed("job-1", "boom")
+
+        status = store.get_status("job-1")
+        assert status["status"] == JobStatus.FAILED
+        assert status["error"] == "boom"
+
+    def test_count_by_status(self, engine):
+        """Test job counts use API status names"""
+        store = _store(engine)
+        for i in range(3):
+            store.create_job(f"job-{i}", character="Ada Lovelace", total_chapters=1)
+        store.mark_started("job-0")
+        store.mark_completed("job-1", 1, 1)
+
+        assert store.count_by_status() == {"pending": 1, "in_progress": 1, "completed": 1}
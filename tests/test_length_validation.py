@@ -138,6 +138,24 @@ class TestTextAnalyzer:
         
         assert result['repetition_score'] < 0.5
     
+    def test_detect_repetition_top_spans(self):
+        """Test repeated n-grams are reported with their word positions"""
+        analyzer = TextAnalyzer()
+        text = "The quick brown fox jumps. A quick brown fox sleeps, the quick brown fox jumps."
+        
+        results = analyzer.detect_repetition(text, ngram_sizes=(3, 4, 20), top_k=2)
+        
+        assert results[3]['most_repeated_ngram'] == 'quick brown fox'
+        assert results[3]['top_repeated'] == [
+            {'ngram': 'quick brown fox', 'count': 3, 'positions': [1, 6, 11]},
+            {'ngram': 'the quick brown', 'count': 2, 'positions': [0, 10]},
+        ]
+        assert results[4]['top_repeated'][0] == {'ngram': 'the quick brown fox', 'count': 2, 'positions': [0, 10]}
+        assert results[20]['total_ngrams'] == 0
+        assert analyzer.detect_repetitive_content(text)['top_repeated'] == [
+            {'ngram': 'the quick brown fox jumps.', 'count': 2, 'positions': [0, 10]}
+        ]
+    
     def test_extract_keywords(self):
         """Test keyword extraction"""
         analyzer = TextAnalyzer()
@@ -175,6 +193,39 @@ class TestTextAnalyzer:
         assert 'narrative_ratio' in result
         assert 'is_balanced' in result
         assert 0 <= result['dialogue_ratio'] <= 1
+    
+    def test_tfidf_matches_vectorizer(self):
+        """Test density and keywords match sklearn's TfidfVectorizer"""
+        import numpy as np
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        
+        text = (
+            "Marie Curie studied in Paris. Her café was near the Sorbonne! "
+            "She discovered polonium and radium with Pierre. Café society ignored her. "
+            "Radium changed physics, and Curie won two Nobel prizes."
+        )
+        # Few max_features so the most frequent terms have to be selected
+        analyzer = TextAnalyzer(max_features=8)
+        
+        vectorizer = TfidfVectorizer(max_features=8, stop_words='english', lowercase=True, strip_accents='unicode')
+        scores = vectorizer.fit_transform(analyzer._split_into_sentences(text)).toarray()
+        assert analyzer.calculate_information_density(text) == pytest.approx(np.mean(scores[scores > 0]))
+        
+        vectorizer = TfidfVectorizer(max_features=8, stop_words='english', lowercase=True)
+        scores = vectorizer.fit_transform([text]).toarray()[0]
+        names = vectorizer.get_feature_names_out()
+        expected = [(names[i], scores[i]) for i in np.argsort(scores)[-5:][::-1] if scores[i] > 0]
+        keywords = analyzer.extract_keywords(text, top_n=5)
+        assert [k for k, _ in keywords] == [k for k, _ in expected]
+        assert [s for _, s in keywords] == pytest.approx([s for _, s in expected])
+    
+    def test_stop_words_only(self):
+        """Test texts without content terms fall back gracefully"""
+        analyzer = TextAnalyzer()
+        text = "it is what it is and it was what it was to be"
+        
+        assert analyzer.extract_keywords(text) == []
+        assert analyzer.calculate_information_density(text) == pytest.approx(7 / 13)
 
 
 class TestLengthValidationService:
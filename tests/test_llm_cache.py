@@ -0,0 +1,210 @@
+"""
+Tests for the LLM response cache and its use by OpenRouterClient
+"""
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.cache.llm_cache import CachedResponse, LLMResponseCache, response_key
+from src.config.openrouter_config import OpenRouterConfig
+from src.services.openrouter_client import OpenRouterClient
+from src.services.rate_limiter import DistributedRateLimiter
+from src.services.source_generator import AutomaticSourceGenerator
+from src.utils.fact_checker import FactualConsistencyChecker
+
+
+PAYLOAD = {
+    "model": "test-model",
+    "messages": [{"role": "user", "content": "Analyze Ada Lovelace"}],
+    "temperature": 0.1,
+    "max_tokens": 1000,
+    "top_p": 1.0,
+}
+
+
+class FakeBackend:
+    """Dictionary-backed stand-in for RedisCache"""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=3600):
+        self.data[key] = value
+        self.ttls[key] = ttl
+        return True
+
+
+def _completion(content="Ada Lovelace was a mathematician."):
+    response = Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.json.return_value = {
+        "choices": [{"message": {"content": content}}],
+        "usage": {"prompt_tokens": 40, "completion_tokens": 10, "total_tokens": 50}
+    }
+    return response
+
+
+class TestResponseKey:
+    """Test cache keys cover exactly the request fields that matter"""
+
+    def test_key_ignores_field_order_and_stream(self):
+        """Test equivalent payloads share a key"""
+        reordered = dict(reversed(list(PAYLOAD.items())))
+        assert response_key(reordered) == response_key({**PAYLOAD, "stream": False})
+
+    @pytest.mark.parametrize("field,value", [
+        ("model", "other-model"),
+        ("temperature", 0.7),
+        ("max_tokens", 500),
+        ("top_p", 0.9),
+        ("messages", [{"role": "user", "content": "Analyze Alan Turing"}]),
+    ])
+    def test_key_changes_with_each_field(self, field, value):
+        """Test model, messages and sampling parameters are part of the key"""
+        assert response_key({**PAYLOAD, field: value}) != response_key(PAYLOAD)
+
+
+class TestLLMResponseCache:
+    """Test cache tiers, expiry and eviction"""
+
+    def test_roundtrip_is_compressed(self):
+        """Test responses are stored compressed and returned intact"""
+        cache = LLMResponseCache()
+        content = "The Analytical Engine. " * 200
+
+        cache.set(PAYLOAD, content, {"total_tokens": 50}, ttl=60)
+        cached = cache.get(PAYLOAD)
+
+        assert cached.content == content
+        assert cached.usage == {"total_tokens": 50}
+        assert len(cached.compressed) < len(content) / 10
+        assert cache.get_stats()["hits"] == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Test the per-entry TTL applies to the memory tier"""
+        cache = LLMResponseCache()
+        cache.set(PAYLOAD, "answer", ttl=60)
+
+        with patch("src.cache.llm_cache.time.time", return_value=time.time() + 61):
+            assert cache.get(PAYLOAD) is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_backend_is_shared_between_instances(self):
+        """Test a second worker finds the response in the backend tier"""
+        backend = FakeBackend()
+        LLMResponseCache(backend=backend).set(PAYLOAD, "answer", ttl=3600)
+
+        other_worker = LLMResponseCache(backend=backend)
+
+        assert other_worker.get(PAYLOAD).content == "answer"
+        assert list(backend.ttls.values()) == [3600]
+        assert isinstance(next(iter(backend.data.values()))["compressed"], str)
+
+    def test_memory_tier_is_size_bounded(self):
+        """Test least recently used responses are evicted first"""
+        entry_size = CachedResponse.from_content("x").size
+        cache = LLMResponseCache(max_memory_bytes=entry_size * 2)
+        payloads = [{**PAYLOAD, "max_tokens": n} for n in range(3)]
+
+        cache.set(payloads[0], "x")
+        cache.set(payloads[1], "x")
+        cache.get(payloads[0])
+        cache.set(payloads[2], "x")
+
+        assert cache.get(payloads[0]) is not None
+        assert cache.get(payloads[1]) is None
+
+
+class TestOpenRouterClientCaching:
+    """Test opt-in caching in OpenRouterClient"""
+
+    @pytest.fixture
+    def client(self):
+        config = OpenRouterConfig(api_key="test-key", model="test-model")
+        return OpenRouterClient(
+            config,
+            rate_limiter=DistributedRateLimiter(),
+            response_cache=LLMResponseCache()
+        )
+
+    @patch("requests.Session.post")
+    def test_cached_calls_skip_the_api_and_stats(self, mock_post, client):
+        """Test a repeated call is served from the cache and not counted"""
+        mock_post.return_value = _completion()
+
+        first = client.generate_text("Analyze Ada", temperature=0.1, cache_ttl=60)
+        second = client.generate_text("Analyze Ada", temperature=0.1, cache_ttl=60)
+
+        assert first == second
+        assert mock_post.call_count == 1
+        stats = client.get_usage_stats()
+        assert stats["requests"] == 1
+        assert stats["total_tokens"] == 50
+        assert stats["cached_responses"] == 1
+
+    @patch("requests.Session.post")
+    def test_caching_is_opt_in(self, mock_post, client):
+        """Test calls without cache_ttl always reach the API"""
+        mock_post.return_value = _completion()
+
+        client.generate_text("Write chapter 1", temperature=0.8)
+        client.generate_text("Write chapter 1", temperature=0.8)
+
+        assert mock_post.call_count == 2
+        assert client.response_cache.get_stats()["total_requests"] == 0
+
+    @patch("requests.Session.post")
+    def test_sampling_parameters_separate_entries(self, mock_post, client):
+        """Test a different temperature is a different completion"""
+        mock_post.return_value = _completion()
+
+        client.generate_text("Analyze Ada", temperature=0.1, cache_ttl=60)
+        client.generate_text("Analyze Ada", temperature=0.5, cache_ttl=60)
+
+        assert mock_post.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_empty_responses_are_not_cached(self, mock_post, client):
+        """Test an empty completion is requested again next time"""
+        mock_post.return_value = _completion(content="")
+
+        client.generate_text("Analyze Ada", cache_ttl=60)
+        client.generate_text("Analyze Ada", cache_ttl=60)
+
+        assert mock_post.call_count == 2
+
+
+class TestRetriedAnalysis:
+    """Test retried jobs reuse completed analysis steps"""
+
+    @patch("requests.Session.post")
+    def test_rerun_analysis_costs_no_requests(self, mock_post):
+        """Test character analysis and fact extraction hit the cache on a retry"""
+        analysis = (
+            '{"historical_period": "19th century", "nationality": "British", '
+            '"professional_field": "Mathematics", "key_events": [], '
+            '"related_entities": [], "search_terms": ["Ada Lovelace"]}'
+        )
+        facts = '[{"fact": "Born in 1815 in London", "confidence": 0.9, "category": "date"}]'
+        mock_post.side_effect = [_completion(analysis), _completion(facts)]
+        content = "Ada Lovelace was born in 1815 in London and worked with Babbage. " * 3
+
+        for _ in range(2):
+            # A retried job builds fresh services on the shared cache
+            client = OpenRouterClient(rate_limiter=DistributedRateLimiter())
+            generator = AutomaticSourceGenerator(openrouter_client=client, source_validator=Mock())
+            checker = FactualConsistencyChecker(openrouter_client=client)
+
+            result = generator._analyze_character_with_ai("Ada Lovelace")
+            key_facts = checker.extract_key_facts(content, "Ada Lovelace")
+
+        assert mock_post.call_count == 2
+        assert result.professional_field == "Mathematics"
+        assert key_facts[0].fact == "Born in 1815 in London"
+        assert client.get_usage_stats()["cached_responses"] == 2
@@ -0,0 +1,162 @@
+"""
+Tests for MinHash/LSH near-duplicate detection of fetched sources
+"""
+import random
+from unittest.mock import Mock
+
+import pytest
+
+from src.api.models.sources import SourceItem, SourceType
+from src.api.models.source_generation import AutomaticSourceGenerationRequest
+from src.cache.page_cache import PageCache
+from src.services.hybrid_generator import HybridSourceGenerator
+from src.services.source_generator import AutomaticSourceGenerator
+from src.strategies.base_strategy import SourceCandidate
+from src.utils.near_duplicates import MinHasher, MinHashLSH, NearDuplicateDetector, ShingleIndex
+from src.utils.source_triangulator import SourceTriangulator
+
+
+def _article(seed, words=600):
+    """Pseudo-random article text"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+
+ARTICLE = _article(1)
+# Same article with site chrome and a couple of edits
+MIRROR = "Home About Contact " + ARTICLE.replace(ARTICLE.split()[100], "changed", 1) + " Copyright 2024"
+PRINT_VIEW = "Print this page " + ARTICLE
+OTHER = _article(2)
+
+
+def _page(url, text):
+    return url, f"<html><body><p>{text}</p></body></html>".encode("utf-8")
+
+
+@pytest.fixture
+def page_cache():
+    """Page cache holding an article, its copies and an unrelated page"""
+    cache = PageCache()
+    for url, body in [
+        _page("https://original.org/ada", ARTICLE),
+        _page("https://mirror.net/ada", MIRROR),
+        _page("https://original.org/ada/print", PRINT_VIEW),
+        _page("https://other.com/ada", OTHER),
+    ]:
+        cache.store(url, 200, {"content-type": "text/html"}, body)
+    return cache
+
+
+class TestMinHash:
+    """Test signatures and the LSH index"""
+
+    def test_similarity_estimate(self):
+        """Test copies estimate high and unrelated texts low similarity"""
+        hasher = MinHasher()
+
+        assert hasher.similarity(hasher.signature(ARTICLE), hasher.signature(MIRROR)) > 0.8
+        assert hasher.similarity(hasher.signature(ARTICLE), hasher.signature(OTHER)) < 0.1
+        assert hasher.signature("") is None
+
+    def test_query_only_verifies_colliding_candidates(self):
+        """Test a lookup does not compare against every indexed document"""
+        hasher = MinHasher()
+        index = MinHashLSH(threshold=0.8)
+        for i in range(200):
+            index.insert(i, hasher.signature(_article(100 + i, words=200)))
+        index.insert("original", hasher.signature(ARTICLE))
+
+        matches = index.query(hasher.signature(MIRROR))
+        assert [key for key, _ in matches] == ["original"]
+
+    def test_cluster(self):
+        """Test copies share a cluster and texts without words have none"""
+        clusters = NearDuplicateDetector().cluster([ARTICLE, OTHER, MIRROR, None, PRINT_VIEW])
+
+        assert clusters == [0, 1, 0, None, 0]
+
+    def test_deduplicate_keeps_highest_score(self):
+        """Test the best-scored copy survives in input order"""
+        items = [("mirror", MIRROR, 60.0), ("other", OTHER, 50.0), ("original", ARTICLE, 95.0), ("book", None, 10.0)]
+
+        kept, removed = NearDuplicateDetector().deduplicate(
+            items, text_of=lambda item: item[1], score_of=lambda item: item[2]
+        )
+
+        assert [item[0] for item in kept] == ["other", "original", "book"]
+        assert [item[0] for item in removed] == ["mirror"]
+
+
+class TestShingleIndex:
+    """Test the inverted shingle index used for paragraphs"""
+
+    def test_matches_report_jaccard_and_containment(self):
+        """Test a paragraph contained in a longer one matches by containment"""
+        index = ShingleIndex(threshold=0.7)
+        paragraph = " ".join(ARTICLE.split()[:60])
+
+        assert index.add("long", " ".join(ARTICLE.split()[:120])) == []
+        (key, jaccard, containment), = index.add("short", paragraph)
+        assert key == "long"
+        assert jaccard == pytest.approx(0.5, abs=0.02)
+        assert containment == 1.0
+        assert index.add("other", OTHER) == []
+
+
+class TestSourceDeduplication:
+    """Test generators and triangulator use page content, not just URLs"""
+
+    def test_automatic_generator_keeps_most_credible_copy(self, page_cache):
+        """Test validated near-duplicates collapse to the most credible one"""
+        results = [
+            Mock(is_valid=True, relevance_score=0.9, credibility_score=score,
+                 source=SourceItem(title=url, url=url, source_type=SourceType.URL))
+            for url, score in [
+                ("https://mirror.net/ada", 60.0),
+                ("https://original.org/ada", 95.0),
+                ("https://other.com/ada", 85.0),
+                ("https://original.org/ada/print", 95.0),
+            ]
+        ]
+        validator = Mock()
+        validator.validate_sources.return_value = {
+            'results': results, 'total_sources': 4, 'valid_sources': 4
+        }
+        generator = AutomaticSourceGenerator(
+            openrouter_client=Mock(), source_validator=validator, page_cache=page_cache
+        )
+        request = AutomaticSourceGenerationRequest(character_name="Ada Lovelace", min_credibility=50.0)
+
+        result = generator._validate_and_filter_sources([r.source for r in results], "Ada Lovelace", request)
+
+        assert [s.url for s in result['sources']] == ["https://original.org/ada", "https://other.com/ada"]
+        assert result['validation_summary']['near_duplicates_removed'] == 2
+
+    def test_hybrid_drops_copies_of_user_sources(self, page_cache):
+        """Test auto sources duplicating a user source's page are removed"""
+        generator = HybridSourceGenerator(
+            automatic_generator=Mock(), source_validator=Mock(), page_cache=page_cache
+        )
+        user = [SourceItem(title="Mirror", url="https://mirror.net/ada", source_type=SourceType.URL)]
+        auto = [
+            SourceItem(title="Original", url="https://original.org/ada", source_type=SourceType.URL),
+            SourceItem(title="Other", url="https://other.com/ada", source_type=SourceType.URL),
+        ]
+
+        assert [s.title for s in generator._remove_duplicates(auto, user)] == ["Other"]
+
+    def test_triangulator_reports_content_overlap(self, page_cache):
+        """Test overlap counts near-duplicate pages on different domains"""
+        candidates = [
+            SourceCandidate(source_item=SourceItem(title=url, url=url, source_type=SourceType.URL))
+            for url in ["https://original.org/ada", "https://mirror.net/ada", "https://other.com/ada"]
+        ]
+
+        overlap = SourceTriangulator(page_cache=page_cache).calculate_source_overlap(candidates)
+
+        assert overlap['unique_domains'] == 3
+        assert overlap['unique_sources'] == 2
+        assert overlap['redundant_sources'] == 1
+        assert overlap['near_duplicate_groups'] == [["https://original.org/ada", "https://mirror.net/ada"]]
+        assert overlap['content_overlap'] == pytest.approx(1 / 3)
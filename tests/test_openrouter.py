@@ -4,10 +4,14 @@ Unit tests for the OpenRouter client with mocking
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+import asyncio
 import json
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime
 
+from aiohttp import web
+
 from src.config.openrouter_config import OpenRouterConfig
 from src.services.openrouter_client import (
     OpenRouterClient,
@@ -15,6 +19,8 @@ from src.services.openrouter_client import (
     RateLimitException,
     APIException
 )
+from src.services.async_openrouter_client import AsyncOpenRouterClient
+from src.services.rate_limiter import DistributedRateLimiter
 from src.utils.retry_handler import RetryHandler, RetryException
 
 
@@ -93,6 +99,23 @@ class TestRetryHandler:
         
         assert mock_func.call_count == 3  # Initial + 2 retries
     
+    @pytest.mark.asyncio
+    async def test_retry_async_success_after_failures(self):
+        """Test coroutine retries with the same policy as execute()"""
+        handler = RetryHandler(max_retries=3, base_delay=0.01)
+        calls = []
+        
+        async def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ValueError("fail")
+            return "success"
+        
+        result = await handler.execute_async(flaky, retry_on=(ValueError,))
+        
+        assert result == "success"
+        assert len(calls) == 3
+    
     def test_retry_delay_calculation(self):
         """Test exponential backoff delay calculation"""
         handler = RetryHandler(base_delay=1.0, exponential_base=2.0, jitter=False)
@@ -147,7 +170,7 @@ class TestOpenRouterClient:
         assert client._stats['requests'] == 0
         assert client._stats['successful_requests'] == 0
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_generate_text_success(self, mock_post, client):
         """Test successful text generation"""
         mock_response = Mock()
@@ -172,7 +195,7 @@ class TestOpenRouterClient:
         assert client._stats['total_tokens'] == 100
         mock_post.assert_called_once()
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_generate_text_with_system_prompt(self, mock_post, client):
         """Test text generation with system prompt"""
         mock_response = Mock()
@@ -199,7 +222,7 @@ class TestOpenRouterClient:
         assert payload['messages'][0]['role'] == 'system'
         assert payload['messages'][1]['role'] == 'user'
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_generate_text_rate_limit(self, mock_post, client):
         """Test rate limit handling"""
         mock_response = Mock()
@@ -212,7 +235,7 @@ class TestOpenRouterClient:
         
         assert client._stats['failed_requests'] > 0
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_generate_text_timeout(self, mock_post, client):
         """Test timeout handling"""
         from requests.exceptions import Timeout
@@ -221,7 +244,7 @@ class TestOpenRouterClient:
         with pytest.raises(OpenRouterException):
             client.generate_text("Test prompt")
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_rate_limiting_delay(self, mock_post, client):
         """Test that rate limiting introduces delay between requests"""
         mock_response = Mock()
@@ -243,7 +266,7 @@ class TestOpenRouterClient:
         # Should take at least the minimum interval
         assert elapsed >= 0.1
     
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_custom_parameters(self, mock_post, client):
         """Test custom generation parameters"""
         mock_response = Mock()
@@ -269,6 +292,221 @@ class TestOpenRouterClient:
         assert payload['top_p'] == 0.95
 
 
+@asynccontextmanager
+async def stub_openrouter(delay: float = 0.0, status: int = 200):
+    """Local OpenRouter stand-in; yields its base URL and the client sockets seen"""
+    peers = set()
+    
+    async def completions(request):
+        body = await request.json()
+        peers.add(request.transport.get_extra_info('peername'))
+        await asyncio.sleep(delay)
+        if status != 200:
+            return web.json_response({'error': 'stub error'}, status=status)
+        
+        prompt = body['messages'][-1]['content']
+        if body.get('stream'):
+            response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+            await response.prepare(request)
+            for word in prompt.split():
+                chunk = {'choices': [{'delta': {'content': word.upper()}}]}
+                await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            final = {
+                'choices': [{'delta': {}, 'finish_reason': 'length' if body.get('max_tokens') == 2 else 'stop'}],
+                'usage': {'total_tokens': 7, 'prompt_tokens': 5, 'completion_tokens': 2}
+            }
+            await response.write(f"data: {json.dumps(final)}\n\n".encode())
+            await response.write(b"data: [DONE]\n\n")
+            return response
+        
+        return web.json_response({
+            'choices': [{'message': {'content': prompt.upper()}}],
+            'usage': {'total_tokens': 15, 'prompt_tokens': 5, 'completion_tokens': 10}
+        })
+    
+    app = web.Application()
+    app.router.add_post('/api/v1/chat/completions', completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{port}/api/v1", peers
+    finally:
+        await runner.cleanup()
+
+
+class TestAsyncOpenRouterClient:
+    """Tests for the asynchronous client against a local stub server"""
+    
+    @staticmethod
+    def _client(base_url: str) -> AsyncOpenRouterClient:
+        config = OpenRouterConfig(api_key='test-key', base_url=base_url, model='test-model')
+        client = AsyncOpenRouterClient(config=config, rate_limiter=DistributedRateLimiter())
+        client.retry_handler = RetryHandler(max_retries=1, base_delay=0.01)
+        return client
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_overlap(self):
+        """Test N concurrent completions finish in about the time of one"""
+        delay, n = 0.3, 20
+        async with stub_openrouter(delay=delay) as (base_url, _):
+            async with self._client(base_url) as client:
+                start = time.perf_counter()
+                results = await asyncio.gather(
+                    *(client.generate_text(f"prompt {i}") for i in range(n))
+                )
+                elapsed = time.perf_counter() - start
+                stats = client.get_usage_stats()
+        
+        assert results == [f"PROMPT {i}" for i in range(n)]
+        # Sequential requests would take n * delay = 6s
+        assert elapsed < 3 * delay
+        assert stats['successful_requests'] == n
+        assert stats['total_tokens'] == 15 * n
+    
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self):
+        """Test sequential requests share one keep-alive connection"""
+        async with stub_openrouter() as (base_url, peers):
+            async with self._client(base_url) as client:
+                for i in range(5):
+                    await client.generate_text(f"prompt {i}", system_prompt="Be brief")
+        
+        assert len(peers) == 1
+    
+    @pytest.mark.asyncio
+    async def test_streaming(self):
+        """Test streamed chunks are yielded as they arrive"""
+        async with stub_openrouter() as (base_url, _):
+            async with self._client(base_url) as client:
+                chunks = [chunk async for chunk in client.generate_text_streaming("hola mundo")]
+                stats = client.get_usage_stats()
+        
+        assert chunks == ["HOLA", "MUNDO"]
+        assert stats['successful_requests'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_error(self):
+        """Test 429 responses are retried and then raised"""
+        async with stub_openrouter(status=429) as (base_url, _):
+            async with self._client(base_url) as client:
+                with pytest.raises(OpenRouterException, match="Rate limit exceeded"):
+                    await client.generate_text("prompt")
+                stats = client.get_usage_stats()
+        
+        assert stats['failed_requests'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_min_request_interval_spaces_starts(self):
+        """Test the free-tier interval spaces request starts without serializing them"""
+        async with stub_openrouter(delay=0.2) as (base_url, _):
+            async with self._client(base_url) as client:
+                client._min_request_interval = 0.05
+                start = time.perf_counter()
+                await asyncio.gather(*(client.generate_text(f"p{i}") for i in range(4)))
+                elapsed = time.perf_counter() - start
+        
+        # Three intervals plus one response delay, not 4 * (interval + delay)
+        assert 0.15 <= elapsed < 0.6
+
+
+class TestStreamingCompletion:
+    """Test the synchronous client reports how a stream finished"""
+    
+    @pytest.mark.asyncio
+    async def test_finish_reason_and_usage_of_final_chunk(self):
+        """Test on_complete receives the joined text, finish reason and usage"""
+        async with stub_openrouter() as (base_url, _):
+            config = OpenRouterConfig(api_key='test-key', base_url=base_url, model='test-model')
+            client = OpenRouterClient(config=config, rate_limiter=DistributedRateLimiter())
+            completions = []
+            
+            def run(max_tokens):
+                return list(client.generate_text_streaming(
+                    "hola mundo", max_tokens=max_tokens, on_complete=completions.append
+                ))
+            
+            chunks = await asyncio.to_thread(run, 2)
+            await asyncio.to_thread(run, 100)
+        
+        assert chunks == ["HOLA", "MUNDO"]
+        assert [c.content for c in completions] == ["HOLAMUNDO", "HOLAMUNDO"]
+        assert [c.truncated for c in completions] == [True, False]
+        assert completions[0].usage['completion_tokens'] == 2
+        assert client.get_usage_stats()['total_tokens'] == 14
+
+
+class TestPooledConnections:
+    """Tests for connection reuse in the synchronous client and a non-blocking async budget"""
+    
+    @pytest.mark.asyncio
+    async def test_sync_clients_share_keep_alive_connections(self):
+        """Test separate OpenRouterClient instances reuse one pooled connection"""
+        async with stub_openrouter() as (base_url, peers):
+            config = OpenRouterConfig(api_key='test-key', base_url=base_url, model='test-model')
+            
+            def run():
+                results = []
+                for i in range(4):
+                    client = OpenRouterClient(config=config, rate_limiter=DistributedRateLimiter())
+                    results.append(client.generate_text(f"prompt {i}"))
+                results.append("".join(client.generate_text_streaming("hola mundo")))
+                return results
+            
+            results = await asyncio.to_thread(run)
+        
+        assert results == ["PROMPT 0", "PROMPT 1", "PROMPT 2", "PROMPT 3", "HOLAMUNDO"]
+        assert len(peers) == 1
+    
+    @pytest.mark.asyncio
+    async def test_async_budget_reservation_does_not_block_loop(self):
+        """Test slow (Redis) reservations of concurrent requests overlap"""
+        def slow_reserve(payload):
+            time.sleep(0.2)
+            return 10, 0.0
+        
+        async with stub_openrouter() as (base_url, _):
+            async with TestAsyncOpenRouterClient._client(base_url) as client:
+                client._reserve = slow_reserve
+                start = time.perf_counter()
+                await asyncio.gather(*(client.generate_text(f"p{i}") for i in range(3)))
+                elapsed = time.perf_counter() - start
+        
+        # Reservations run on the event loop would take 3 * 0.2s
+        assert elapsed < 0.5
+    
+    @pytest.mark.asyncio
+    async def test_async_redis_updates_and_cache_do_not_block_loop(self):
+        """Test slow (Redis) budget updates and response cache calls of concurrent requests overlap"""
+        class SlowCache:
+            def get(self, payload):
+                time.sleep(0.1)
+                return None
+            
+            def set(self, payload, content, usage=None, ttl=None):
+                time.sleep(0.1)
+        
+        def slow(*args):
+            time.sleep(0.1)
+        
+        async with stub_openrouter() as (base_url, _):
+            async with TestAsyncOpenRouterClient._client(base_url) as client:
+                client.response_cache = SlowCache()
+                client._observe_response = slow
+                client._observe_usage = slow
+                start = time.perf_counter()
+                results = await asyncio.gather(
+                    *(client.generate_text(f"p{i}", cache_ttl=60) for i in range(4))
+                )
+                elapsed = time.perf_counter() - start
+        
+        assert results == ["P0", "P1", "P2", "P3"]
+        # Four 0.1s Redis calls per request, run on the event loop, would take 1.6s
+        assert elapsed < 1.0
+
+
 class TestIntegration:
     """Integration tests (would need actual API key to run)"""
     
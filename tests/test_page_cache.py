@@ -0,0 +1,284 @@
+"""
+Tests for the fetched-page cache shared by validator, content analyzer
+and cross-validator
+"""
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.api.models.sources import SourceItem, SourceType
+from src.cache.page_cache import (
+    PageCache,
+    CachedPage,
+    DiskPageStore,
+    normalize_url,
+)
+from src.monitoring.prometheus_metrics import get_metrics_collector
+from src.services.content_analyzer import ContentAnalyzer
+from src.services.cross_validator import CrossValidationSystem
+from src.services.source_validator import SourceValidationService
+from src.strategies.base_strategy import SourceCandidate
+from tests.fixtures.stub_server import StubHTTPServer
+
+
+HTML = (
+    b"<html><head><title>Ada Lovelace</title></head><body>"
+    b"<nav>Menu</nav><p>Ada Lovelace was a mathematician born in 1815.</p>"
+    b"</body></html>"
+)
+
+
+class FakeBackend:
+    """Dictionary-backed stand-in for RedisCache"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ttl=3600):
+        self.data[key] = value
+        return True
+
+
+class TestNormalizeUrl:
+    """Test URL normalization for cache keys"""
+
+    def test_equivalent_urls_share_key(self):
+        """Test case, default port, fragment and trailing slash are ignored"""
+        assert normalize_url("HTTPS://Example.COM:443/wiki/Ada/#life") == \
+            normalize_url("https://example.com/wiki/Ada")
+
+    def test_query_order_is_ignored(self):
+        """Test query parameters are sorted"""
+        assert normalize_url("http://example.com/p?b=2&a=1") == \
+            normalize_url("http://example.com/p?a=1&b=2")
+
+    def test_non_default_port_is_kept(self):
+        """Test non-default ports distinguish hosts"""
+        assert normalize_url("http://example.com:8080/") != normalize_url("http://example.com/")
+
+
+class TestPageCache:
+    """Test PageCache tiers, freshness and text extraction"""
+
+    def test_store_and_get_roundtrip(self):
+        """Test pages are stored compressed and returned intact"""
+        cache = PageCache()
+        cache.store("https://example.com/ada", 200, {"Content-Type": "text/html"}, HTML)
+
+        page = cache.get("https://example.com/ada/")
+
+        assert page is not None
+        assert page.content == HTML
+        assert page.headers["content-type"] == "text/html"
+        assert cache.get_stats()["hits"] == 1
+
+    def test_error_responses_are_not_cached(self):
+        """Test 4xx/5xx responses are not stored"""
+        cache = PageCache()
+        cache.store("https://example.com/missing", 404, {}, b"not found")
+
+        assert cache.get("https://example.com/missing") is None
+
+    def test_stale_pages_need_revalidation(self):
+        """Test pages older than max_age are only available through lookup"""
+        cache = PageCache(max_age=60)
+        page = cache.store("https://example.com/ada", 200, {"ETag": '"v1"'}, HTML)
+        page.fetched_at = time.time() - 120
+
+        assert cache.get("https://example.com/ada") is None
+        assert cache.conditional_headers("https://example.com/ada") == {"If-None-Match": '"v1"'}
+
+        refreshed = cache.store("https://example.com/ada", 304, {}, b"")
+
+        assert refreshed.content == HTML
+        assert cache.get("https://example.com/ada") is not None
+
+    def test_not_modified_without_cached_page_is_not_stored(self):
+        """Test a 304 for an evicted page stores nothing"""
+        cache = PageCache()
+
+        assert cache.store("https://example.com/ada", 304, {}, b"") is None
+        assert cache.lookup("https://example.com/ada") is None
+
+    def test_memory_tier_is_size_bounded(self):
+        """Test least recently used pages are evicted past the byte budget"""
+        cache = PageCache(max_memory_bytes=2000)
+        for i in range(20):
+            cache.store(f"https://example.com/{i}", 200, {}, bytes(range(256)) * 4)
+
+        stats = cache.get_stats()
+        assert stats["memory_bytes"] <= 2000
+        assert cache.get("https://example.com/0") is None
+        assert cache.get("https://example.com/19") is not None
+
+    def test_clean_text_is_extracted_once_per_body(self):
+        """Test identical bodies at different URLs are parsed once"""
+        cache = PageCache()
+        with patch("src.cache.page_cache.extract_clean_text", return_value="clean") as extract:
+            first = cache.extract_text(HTML)
+            second = cache.extract_text(HTML)
+
+        assert first == second == "clean"
+        assert extract.call_count == 1
+
+    def test_backend_tier_survives_new_instance(self):
+        """Test pages and text are read back from the second tier"""
+        backend = FakeBackend()
+        PageCache(backend=backend).store("https://example.com/ada", 200, {}, HTML)
+        PageCache(backend=backend).extract_text(HTML)
+
+        cache = PageCache(backend=backend)
+        assert cache.get("https://example.com/ada").content == HTML
+        with patch("src.cache.page_cache.extract_clean_text") as extract:
+            assert "mathematician" in cache.extract_text(HTML)
+        extract.assert_not_called()
+
+    def test_disk_store(self, tmp_path):
+        """Test disk tier persists serialized pages"""
+        store = DiskPageStore(str(tmp_path))
+        page = CachedPage(url="https://example.com/ada", status_code=200, compressed=b"x")
+        store.set("page:key", page.to_dict(), ttl=60)
+
+        assert CachedPage.from_dict(store.get("page:key")).compressed == b"x"
+        assert store.get("page:other") is None
+
+    def test_hits_and_misses_feed_metrics(self):
+        """Test hit/miss counters are exported through MetricsCollector"""
+        collector = get_metrics_collector()
+        labels_hit = {"kind": "page", "result": "hit"}
+        labels_miss = {"kind": "page", "result": "miss"}
+        hits_before = collector.get_counter("bookgen_page_cache_requests_total", labels_hit)
+        misses_before = collector.get_counter("bookgen_page_cache_requests_total", labels_miss)
+
+        cache = PageCache()
+        cache.get("https://example.com/ada")
+        cache.store("https://example.com/ada", 200, {}, HTML)
+        cache.get("https://example.com/ada")
+
+        assert collector.get_counter("bookgen_page_cache_requests_total", labels_hit) == hits_before + 1
+        assert collector.get_counter("bookgen_page_cache_requests_total", labels_miss) == misses_before + 1
+
+
+class TestSharedPageCache:
+    """Test that a job fetches and parses each URL once"""
+
+    def test_validator_reuses_cached_pages(self):
+        """Test a second validation run does not refetch"""
+        cache = PageCache()
+        with StubHTTPServer(body=HTML) as server:
+            validator = SourceValidationService(timeout=5, page_cache=cache)
+            sources = [SourceItem(title="Ada Lovelace", url=server.url("/ada"), source_type=SourceType.URL)]
+
+            first = validator.validate_sources("Ada Lovelace", sources)
+            second = validator.validate_sources("Ada Lovelace", sources)
+
+        assert server.request_count == 1
+        assert first["results"][0].relevance_score == second["results"][0].relevance_score
+
+    def test_validator_revalidates_with_etag(self):
+        """Test stale pages are revalidated with If-None-Match"""
+        def route(handler):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"Content-Type": "text/html", "ETag": '"v1"'}, HTML
+
+        cache = PageCache(max_age=0)
+        with StubHTTPServer(route=route) as server:
+            validator = SourceValidationService(timeout=5, page_cache=cache)
+            sources = [SourceItem(title="Ada Lovelace", url=server.url("/ada"), source_type=SourceType.URL)]
+
+            validator.validate_sources("Ada Lovelace", sources)
+            time.sleep(0.01)
+            result = validator.validate_sources("Ada Lovelace", sources)
+
+        assert server.request_count == 2
+        assert result["results"][0].is_accessible is True
+        assert result["results"][0].metadata["content_length"] > 0
+
+    @pytest.mark.parametrize("batch", [True, False])
+    def test_validator_refetches_page_evicted_before_304(self, batch):
+        """Test a 304 for a page evicted meanwhile is followed by a full fetch"""
+        cache = PageCache(max_age=0)
+
+        def route(handler):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                cache.clear()
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"Content-Type": "text/html", "ETag": '"v1"'}, HTML
+
+        with StubHTTPServer(route=route) as server:
+            validator = SourceValidationService(timeout=5, page_cache=cache)
+            url = server.url("/ada")
+            cache.store(url, 200, {"ETag": '"v1"'}, HTML)
+            time.sleep(0.01)
+
+            if batch:
+                source = SourceItem(title="Ada Lovelace", url=url, source_type=SourceType.URL)
+                result = validator.validate_sources("Ada Lovelace", [source])["results"][0]
+                assert result.is_accessible is True
+                assert result.metadata["content_length"] > 0
+            else:
+                result = validator._fetch(url)
+                assert result.ok
+                assert result.status_code == 200
+                assert result.content == HTML
+
+        assert server.request_count == 2
+        assert cache.lookup(url).content == HTML
+
+    def test_content_analyzer_refetches_page_evicted_before_304(self):
+        """Test the content analyzer does not analyze an empty 304 body"""
+        cache = PageCache(max_age=0)
+
+        def route(handler):
+            if handler.headers.get("If-None-Match") == '"v1"':
+                cache.clear()
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"Content-Type": "text/html", "ETag": '"v1"'}, HTML
+
+        with StubHTTPServer(route=route) as server:
+            url = server.url("/ada")
+            cache.store(url, 200, {"ETag": '"v1"'}, HTML)
+            time.sleep(0.01)
+
+            analyzer = ContentAnalyzer(openrouter_client=Mock(), page_cache=cache)
+            content = analyzer._fetch_and_clean_content(url, max_length=5000)
+
+        assert server.request_count == 2
+        assert "mathematician" in content
+
+    @patch('requests.get')
+    def test_content_analyzer_uses_validator_fetch(self, mock_get):
+        """Test the content analyzer does not refetch a validated page"""
+        cache = PageCache()
+        with StubHTTPServer(body=HTML) as server:
+            validator = SourceValidationService(timeout=5, page_cache=cache)
+            url = server.url("/ada")
+            validator.validate_sources(
+                "Ada Lovelace",
+                [SourceItem(title="Ada Lovelace", url=url, source_type=SourceType.URL)]
+            )
+
+        analyzer = ContentAnalyzer(openrouter_client=Mock(), page_cache=cache)
+        content = analyzer._fetch_and_clean_content(url, max_length=5000)
+
+        mock_get.assert_not_called()
+        assert "mathematician" in content
+        assert "Menu" not in content
+
+    def test_cross_validator_reads_cached_text(self):
+        """Test the cross-validator uses fetched text instead of the title"""
+        cache = PageCache()
+        cache.store("https://example.com/ada", 200, {}, HTML)
+        system = CrossValidationSystem(openrouter_client=Mock(), page_cache=cache)
+        source = SourceCandidate(
+            source_item=SourceItem(
+                title="Ada", url="https://example.com/ada", source_type=SourceType.URL
+            )
+        )
+
+        assert "mathematician born in 1815" in system._get_source_content(source)
@@ -0,0 +1,211 @@
+"""
+Tests for the cluster-wide OpenRouter rate limiter
+"""
+import time
+from email.utils import formatdate
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+import redis
+
+from src.config.openrouter_config import OpenRouterConfig
+from src.services.openrouter_client import OpenRouterClient
+from src.services.rate_limiter import (
+    DistributedRateLimiter,
+    RateLimitBudget,
+    estimate_request_tokens,
+    parse_retry_after
+)
+
+KEY = "test-key"
+
+
+def _limiter(**kwargs) -> DistributedRateLimiter:
+    return DistributedRateLimiter(**kwargs)
+
+
+class TestTokenBuckets:
+    """Test reservations against request and token budgets"""
+
+    def test_waiters_are_queued_in_arrival_order(self):
+        """Test each reservation queues behind the previous ones"""
+        limiter = _limiter(key_budget=RateLimitBudget(requests_per_minute=60), burst_seconds=2)
+
+        waits = [limiter.acquire(KEY, "model-a").wait for _ in range(5)]
+
+        assert waits[:2] == [0.0, 0.0]
+        assert waits[2:] == pytest.approx([1.0, 2.0, 3.0], abs=0.05)
+
+    def test_key_budget_is_shared_by_models(self):
+        """Test the API key budget applies across models, model budgets per model"""
+        limiter = _limiter(
+            key_budget=RateLimitBudget(requests_per_minute=120),
+            model_budgets={"slow": RateLimitBudget(requests_per_minute=6)},
+            burst_seconds=1
+        )
+
+        assert limiter.acquire(KEY, "slow").wait == 0.0
+        # The model budget (one request per 10s) is exhausted, the key budget is not
+        assert limiter.acquire(KEY, "slow").wait == pytest.approx(10.0, abs=0.05)
+        assert limiter.acquire(KEY, "fast").wait == pytest.approx(0.5, abs=0.05)
+        # Another key has its own buckets
+        assert limiter.acquire("other-key", "slow").wait == 0.0
+
+    def test_free_models_default_to_free_tier_budget(self):
+        """Test ':free' models get OpenRouter's free-tier request budget"""
+        limiter = _limiter()
+        assert limiter.budget_for("qwen/qwen2.5-vl-72b-instruct:free").requests_per_minute == 20
+        assert limiter.budget_for("openai/gpt-4o").requests_per_minute is None
+
+    def test_token_budget_and_usage_refund(self):
+        """Test tokens are reserved up front and unused ones are returned"""
+        limiter = _limiter(key_budget=RateLimitBudget(tokens_per_minute=60000), burst_seconds=10)
+
+        # Capacity is 10k tokens, refilled at 1k per second
+        assert limiter.acquire(KEY, "m", tokens=8000).wait == 0.0
+        assert limiter.acquire(KEY, "m", tokens=4000).wait == pytest.approx(2.0, abs=0.05)
+
+        # Both requests used only 1000 tokens: 10000 are returned
+        limiter.record_usage(KEY, "m", 8000, 1000)
+        limiter.record_usage(KEY, "m", 4000, 1000)
+        assert limiter.acquire(KEY, "m", tokens=4000).wait == 0.0
+
+    def test_waits_beyond_max_wait_are_refused(self):
+        """Test refused reservations do not consume budget"""
+        limiter = _limiter(key_budget=RateLimitBudget(requests_per_minute=6), burst_seconds=1, max_wait=5)
+
+        assert limiter.acquire(KEY, "m").granted
+        refused = limiter.acquire(KEY, "m")
+        assert not refused.granted
+        assert refused.wait == pytest.approx(10.0, abs=0.05)
+        assert limiter.acquire(KEY, "m").wait == pytest.approx(refused.wait, abs=0.05)
+
+    def test_estimate_request_tokens(self):
+        """Test the estimate covers the prompt and the completion limit"""
+        messages = [{"role": "system", "content": "x" * 400}, {"role": "user", "content": "y" * 400}]
+        assert estimate_request_tokens(messages, 1000) == 1200
+
+
+class TestProviderFeedback:
+    """Test adaptation to Retry-After and X-RateLimit-* headers"""
+
+    def test_retry_after_pauses_the_model(self):
+        """Test a 429 with Retry-After pauses that model only"""
+        limiter = _limiter()
+
+        pause = limiter.update_from_headers(KEY, "m", 429, {"Retry-After": "7"})
+
+        assert pause == 7.0
+        assert limiter.acquire(KEY, "m").wait == pytest.approx(7.0, abs=0.05)
+        assert limiter.acquire(KEY, "other").wait == 0.0
+
+    def test_exhausted_remaining_pauses_until_reset(self):
+        """Test X-RateLimit-Remaining 0 pauses until X-RateLimit-Reset (ms epoch)"""
+        limiter = _limiter()
+        reset_ms = str(int((time.time() + 4) * 1000))
+
+        limiter.update_from_headers(KEY, "m", 200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset_ms})
+
+        assert limiter.acquire(KEY, "m").wait == pytest.approx(4.0, abs=0.1)
+
+    def test_remaining_caps_the_bucket(self):
+        """Test the provider's remaining count caps the model's request bucket"""
+        limiter = _limiter(
+            model_budgets={"m": RateLimitBudget(requests_per_minute=600)},
+            burst_seconds=1
+        )
+
+        limiter.update_from_headers(KEY, "m", 200, {"X-RateLimit-Remaining": "1"})
+
+        assert limiter.acquire(KEY, "m").wait == 0.0
+        assert limiter.acquire(KEY, "m").wait == pytest.approx(0.1, abs=0.02)
+
+    def test_parse_retry_after(self):
+        """Test Retry-After in seconds and as an HTTP date"""
+        now = time.time()
+        assert parse_retry_after("12", now) == 12.0
+        assert parse_retry_after(formatdate(now + 30, usegmt=True), now) == pytest.approx(30, abs=1)
+        assert parse_retry_after("soon", now) is None
+        assert parse_retry_after(None, now) is None
+
+
+class TestRedisBackend:
+    """Test the Redis scripts are called with the bucket layout"""
+
+    def test_acquire_runs_the_lua_script(self):
+        """Test one script call reserves every bucket atomically"""
+        client = MagicMock()
+        script = Mock(return_value=[1, "0.25"])
+        client.register_script.return_value = script
+        limiter = _limiter(
+            redis_client=client,
+            key_budget=RateLimitBudget(requests_per_minute=60, tokens_per_minute=6000)
+        )
+
+        reservation = limiter.acquire(KEY, "m", tokens=100)
+
+        assert reservation.granted
+        assert reservation.wait == 0.25
+        keys = script.call_args.kwargs["keys"]
+        args = script.call_args.kwargs["args"]
+        assert keys[0].endswith(":pause")
+        assert [key.rsplit(":", 1)[1] for key in keys[1:]] == ["rpm", "tpm"]
+        # max_wait, then capacity, rate and cost per bucket
+        assert args[0] == limiter.max_wait
+        assert args[1:4] == [10.0, 1.0, 1.0]
+        assert args[4:7] == [1000.0, 100.0, 100.0]
+
+    def test_falls_back_to_local_buckets_without_redis(self):
+        """Test Redis errors switch to process-local buckets for a while"""
+        client = MagicMock()
+        client.register_script.return_value = Mock(side_effect=redis.ConnectionError("down"))
+        limiter = _limiter(redis_client=client, key_budget=RateLimitBudget(requests_per_minute=60))
+
+        assert limiter.acquire(KEY, "m").granted
+        assert limiter.acquire(KEY, "m").granted
+        assert client.register_script.return_value.call_count == 1
+
+
+class TestClientIntegration:
+    """Test OpenRouter clients share one budget"""
+
+    @staticmethod
+    def _response(status_code=200, headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.json.return_value = {
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {"total_tokens": 10}
+        }
+        return response
+
+    @patch("requests.Session.post")
+    def test_clients_share_the_budget(self, mock_post):
+        """Test two clients (e.g. two workers) draw from the same buckets"""
+        mock_post.return_value = self._response()
+        config = OpenRouterConfig(api_key=KEY, model="m")
+        limiter = _limiter(key_budget=RateLimitBudget(requests_per_minute=600), burst_seconds=0.1)
+        workers = [OpenRouterClient(config, rate_limiter=limiter) for _ in range(2)]
+
+        start = time.perf_counter()
+        for worker in workers * 2:
+            worker.generate_text("prompt")
+        elapsed = time.perf_counter() - start
+
+        # One request per 0.1s across both clients
+        assert elapsed >= 0.25
+
+    @patch("requests.Session.post")
+    def test_rate_limit_headers_reach_the_limiter(self, mock_post):
+        """Test a 429 response pauses the model for every client"""
+        mock_post.return_value = self._response(429, {"Retry-After": "30"})
+        config = OpenRouterConfig(api_key=KEY, model="m")
+        limiter = _limiter(max_wait=5)
+        client = OpenRouterClient(config, rate_limiter=limiter)
+        client.retry_handler.max_retries = 0
+
+        with pytest.raises(Exception):
+            client.generate_text("prompt")
+
+        assert not limiter.acquire(KEY, "m").granted
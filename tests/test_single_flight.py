@@ -0,0 +1,309 @@
+"""
+Tests for request coalescing (single-flight) of LLM calls, strategy
+searches and page fetches
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+import redis
+
+from src.api.models.source_generation import CharacterAnalysis
+from src.api.models.sources import SourceItem, SourceType
+from src.cache.page_cache import PageCache
+from src.cache.single_flight import CallCancelled, SingleFlight
+from src.config.openrouter_config import OpenRouterConfig
+from src.services.openrouter_client import OpenRouterClient
+from src.services.rate_limiter import DistributedRateLimiter
+from src.services.source_generator import AutomaticSourceGenerator
+from src.services.source_validator import SourceValidationService
+from src.strategies.source_strategy import SourceStrategy, StrategyCancelled
+
+
+class FakeRedis:
+    """Dictionary-backed stand-in for the redis.Redis calls SingleFlight uses"""
+
+    def __init__(self):
+        self.data = {}
+        self._lock = threading.Lock()
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        with self._lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def register_script(self, source):
+        def release(keys, args):
+            with self._lock:
+                if self.data.get(keys[0]) == args[0]:
+                    del self.data[keys[0]]
+                    return 1
+                return 0
+        return release
+
+
+def _concurrently(calls, workers=None):
+    """Run callables at the same time and return their results in order"""
+    with ThreadPoolExecutor(max_workers=workers or len(calls)) as executor:
+        futures = [executor.submit(call) for call in calls]
+        return [future.result() for future in futures]
+
+
+def _slow(result, delay=0.2, counter=None):
+    def fn():
+        if counter is not None:
+            counter.append(1)
+        time.sleep(delay)
+        return result
+    return fn
+
+
+class TestSingleFlight:
+    """Test in-process and cross-process coalescing"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test eight concurrent identical calls run the function once"""
+        flight = SingleFlight()
+        executions = []
+
+        results = _concurrently([
+            lambda: flight.do("key", _slow({"text": "answer"}, counter=executions))
+            for _ in range(8)
+        ])
+
+        assert len(executions) == 1
+        assert results == [{"text": "answer"}] * 8
+        assert flight.get_stats() == {'executed': 1, 'shared': 7, 'remote': 0}
+
+    def test_followers_get_independent_copies(self):
+        """Test a caller modifying its result does not affect the others"""
+        flight = SingleFlight()
+
+        results = _concurrently([lambda: flight.do("key", _slow(["a"])) for _ in range(3)])
+        results[0].append("b")
+
+        assert results[1] == ["a"] and results[2] == ["a"]
+        assert results[1] is not results[2]
+
+    def test_errors_are_shared(self):
+        """Test followers receive the leader's exception"""
+        flight = SingleFlight()
+
+        def failing():
+            time.sleep(0.2)
+            raise ValueError("upstream failed")
+
+        def call():
+            try:
+                flight.do("key", failing)
+            except ValueError as e:
+                return str(e)
+
+        assert _concurrently([call, call, call]) == ["upstream failed"] * 3
+        assert flight.get_stats()['executed'] == 1
+
+    def test_leader_cancellation_is_not_shared(self):
+        """Test followers run the call themselves when the leader cancels it"""
+        flight = SingleFlight()
+        executions = []
+
+        def cancelled():
+            executions.append(1)
+            time.sleep(0.2)
+            raise CallCancelled()
+
+        def lead():
+            with pytest.raises(CallCancelled):
+                flight.do("key", cancelled)
+
+        def follow():
+            time.sleep(0.05)
+            return flight.do("key", _slow("answer", delay=0.05, counter=executions))
+
+        assert _concurrently([lead, follow, follow])[1:] == ["answer", "answer"]
+        assert len(executions) == 2
+
+    def test_sequential_and_distinct_calls_are_not_coalesced(self):
+        """Test only calls in flight at the same time with the same key are joined"""
+        flight = SingleFlight()
+        executions = []
+
+        _concurrently([lambda: flight.do("a", _slow(1, counter=executions)),
+                       lambda: flight.do("b", _slow(2, counter=executions))])
+        flight.do("a", _slow(1, delay=0, counter=executions))
+
+        assert len(executions) == 3
+
+    def test_processes_share_through_redis(self):
+        """Test a second process waits for the leader's result key"""
+        client = FakeRedis()
+        workers = [SingleFlight(redis_client=client, poll_interval=0.01) for _ in range(2)]
+        executions = []
+
+        results = _concurrently([
+            lambda flight=flight: flight.do(
+                "key", _slow({"n": 1}, counter=executions), encode=dict, decode=dict
+            )
+            for flight in workers
+        ])
+
+        assert len(executions) == 1
+        assert results == [{"n": 1}, {"n": 1}]
+        assert sum(flight.get_stats()['remote'] for flight in workers) == 1
+        # The lock is released, the result stays readable for a short while
+        assert [key.rsplit(":", 1)[1] for key in client.data] == ["result"]
+
+    def test_follower_takes_over_after_leader_failure(self):
+        """Test other processes run the call themselves when the leader fails"""
+        client = FakeRedis()
+        leader, follower = (SingleFlight(redis_client=client, poll_interval=0.01) for _ in range(2))
+
+        def failing():
+            time.sleep(0.1)
+            raise RuntimeError("boom")
+
+        def lead():
+            with pytest.raises(RuntimeError):
+                leader.do("key", failing, encode=str, decode=str)
+
+        def follow():
+            time.sleep(0.02)
+            return follower.do("key", lambda: "recovered", encode=str, decode=str)
+
+        assert _concurrently([lead, follow])[1] == "recovered"
+
+    def test_redis_errors_fall_back_to_in_process(self):
+        """Test an unreachable Redis does not fail the call"""
+        client = Mock()
+        client.set.side_effect = redis.ConnectionError("down")
+        flight = SingleFlight(redis_client=client)
+
+        assert flight.do("key", lambda: "ok", encode=str, decode=str) == "ok"
+        assert flight.do("key", lambda: "ok", encode=str, decode=str) == "ok"
+        assert client.set.call_count == 1
+
+
+class TestCoalescedCallers:
+    """Test identical work from concurrent requests collapses to one upstream call"""
+
+    @patch("requests.Session.post")
+    def test_identical_generations_share_one_request(self, mock_post):
+        """Test concurrent identical prompts send one request"""
+        response = Mock(status_code=200, headers={})
+        response.json.return_value = {
+            "choices": [{"message": {"content": "Ada Lovelace analysis"}}],
+            "usage": {"total_tokens": 50}
+        }
+        mock_post.side_effect = lambda **kwargs: (time.sleep(0.2), response)[1]
+        flight = SingleFlight()
+        clients = [
+            OpenRouterClient(
+                OpenRouterConfig(api_key="test-key", model="test-model"),
+                rate_limiter=DistributedRateLimiter(),
+                single_flight=flight
+            )
+            for _ in range(4)
+        ]
+
+        results = _concurrently([
+            lambda client=client: client.generate_text("Analyze Ada", temperature=0.3)
+            for client in clients
+        ])
+
+        assert results == ["Ada Lovelace analysis"] * 4
+        assert mock_post.call_count == 1
+        assert sum(client.get_usage_stats()["requests"] for client in clients) == 1
+        assert sum(client.get_usage_stats()["coalesced_responses"] for client in clients) == 3
+
+    def test_identical_strategy_searches_share_one_search(self):
+        """Test two requests for the same character search once per strategy"""
+
+        class SlowStrategy(SourceStrategy):
+            calls = 0
+
+            def search(self, character_name, character_analysis):
+                SlowStrategy.calls += 1
+                time.sleep(0.2)
+                return [SourceItem(
+                    source_type=SourceType.URL,
+                    title=f"{character_name} biography",
+                    url="https://example.com/ada"
+                )]
+
+        flight = SingleFlight()
+        analysis = CharacterAnalysis(character_name="Ada Lovelace", search_terms=["Ada Lovelace"])
+        generators = [
+            AutomaticSourceGenerator(openrouter_client=Mock(), source_validator=Mock(), single_flight=flight)
+            for _ in range(2)
+        ]
+
+        results = _concurrently([
+            lambda generator=generator: generator._run_strategy(SlowStrategy(), "Ada Lovelace", analysis)
+            for generator in generators
+        ])
+
+        assert SlowStrategy.calls == 1
+        assert [sources[0].url for sources, _, _ in results] == ["https://example.com/ada"] * 2
+        assert results[0][0][0] is not results[1][0][0]
+
+    def test_cancelled_search_does_not_fail_joined_requests(self):
+        """Test one request stopping early does not cancel the search for another"""
+
+        class PagingStrategy(SourceStrategy):
+            calls = 0
+
+            def search(self, character_name, character_analysis):
+                PagingStrategy.calls += 1
+                for _ in range(4):
+                    self.check_cancelled()
+                    time.sleep(0.05)
+                return [SourceItem(
+                    source_type=SourceType.URL,
+                    title=f"{character_name} biography",
+                    url="https://example.com/ada"
+                )]
+
+        flight = SingleFlight()
+        analysis = CharacterAnalysis(character_name="Ada Lovelace", search_terms=["Ada Lovelace"])
+        generators = [
+            AutomaticSourceGenerator(openrouter_client=Mock(), source_validator=Mock(), single_flight=flight)
+            for _ in range(2)
+        ]
+        cancel_event = threading.Event()
+
+        def cancelled_request():
+            threading.Timer(0.08, cancel_event.set).start()
+            return generators[0]._run_strategy(PagingStrategy(), "Ada Lovelace", analysis, cancel_event)
+
+        def joined_request():
+            time.sleep(0.02)
+            return generators[1]._run_strategy(PagingStrategy(), "Ada Lovelace", analysis)
+
+        (_, _, cancelled_error), (sources, _, error) = _concurrently([cancelled_request, joined_request])
+
+        assert isinstance(cancelled_error, StrategyCancelled)
+        assert error is None
+        assert [source.url for source in sources] == ["https://example.com/ada"]
+        assert PagingStrategy.calls == 2
+
+    def test_concurrent_fetches_of_a_page_share_one_download(self):
+        """Test equivalent URLs fetched at once are downloaded once"""
+        validator = SourceValidationService(page_cache=PageCache(), single_flight=SingleFlight())
+        response = Mock(status_code=200, text="<p>Ada</p>", content=b"<p>Ada</p>", headers={})
+        validator.session.get = Mock(side_effect=lambda *args, **kwargs: (time.sleep(0.2), response)[1])
+
+        results = _concurrently([
+            lambda: validator._fetch("https://example.com/ada"),
+            lambda: validator._fetch("https://EXAMPLE.com/ada/"),
+        ])
+
+        assert validator.session.get.call_count == 1
+        assert [result.url for result in results] == ["https://example.com/ada", "https://EXAMPLE.com/ada/"]
+        assert all(result.content == b"<p>Ada</p>" for result in results)
@@ -4,6 +4,8 @@ Tests for automatic source generator service
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 import json
+import threading
+import time
 
 from src.services.source_generator import AutomaticSourceGenerator
 from src.api.models.sources import SourceItem, SourceType
@@ -11,6 +13,7 @@ from src.api.models.source_generation import (
     AutomaticSourceGenerationRequest,
     CharacterAnalysis
 )
+from src.strategies.source_strategy import SourceStrategy
 from src.strategies.wikipedia_strategy import WikipediaStrategy
 
 
@@ -157,6 +160,45 @@ class TestWikipediaStrategy:
         assert not strategy._is_quality_external_link("https://random-blog.com/post")
 
 
+class _SleepyStrategy(SourceStrategy):
+    """Strategy stub that waits before returning fixed URLs"""
+    
+    def __init__(self, name, delay=0.0, urls=(), error=None):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.urls = list(urls)
+        self.error = error
+    
+    def search(self, character_name, character_analysis):
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [SourceItem(title=f"{self.name} {i}", url=url) for i, url in enumerate(self.urls)]
+
+
+class _PagingStrategy(SourceStrategy):
+    """Strategy stub that issues slow requests, checking for cancellation between them"""
+    
+    def __init__(self, name, pages=20, delay=0.05):
+        super().__init__()
+        self.name = name
+        self.pages = pages
+        self.delay = delay
+        self.requests = 0
+        self.finished = threading.Event()
+    
+    def search(self, character_name, character_analysis):
+        try:
+            for page in range(self.pages):
+                self.check_cancelled()
+                self.requests += 1
+                time.sleep(self.delay)
+            return [SourceItem(title=self.name, url=f"https://{self.name.lower()}.com/1")]
+        finally:
+            self.finished.set()
+
+
 class TestAutomaticSourceGenerator:
     """Test AutomaticSourceGenerator service"""
     
@@ -299,6 +341,143 @@ class TestAutomaticSourceGenerator:
         assert 'validation_summary' in result
         assert len(result['strategies_used']) >= 1
 
+    
+    def test_strategies_run_concurrently(self):
+        """Test strategies fan out instead of running one after another"""
+        generator = AutomaticSourceGenerator(openrouter_client=Mock(), source_validator=Mock())
+        generator.search_strategies = [
+            _SleepyStrategy(f"Strategy{i}", delay=0.2, urls=[f"https://site{i}.com/a"])
+            for i in range(5)
+        ]
+        
+        start = time.perf_counter()
+        sources, report = generator._generate_sources_from_strategies(
+            "Albert Einstein",
+            generator._create_fallback_analysis("Albert Einstein")
+        )
+        elapsed = time.perf_counter() - start
+        
+        assert len(sources) == 5
+        assert elapsed < 0.6
+        assert all(entry['status'] == 'completed' for entry in report['strategies'].values())
+        assert all(entry['latency_seconds'] >= 0.2 for entry in report['strategies'].values())
+    
+    def test_strategy_results_are_deduplicated(self):
+        """Test URLs found by several strategies are kept once"""
+        generator = AutomaticSourceGenerator(openrouter_client=Mock(), source_validator=Mock())
+        generator.search_strategies = [
+            _SleepyStrategy("A", urls=["https://a.com/1", "https://shared.com/x"]),
+            _SleepyStrategy("B", urls=["https://shared.com/x", "https://b.com/2"]),
+        ]
+        
+        sources, _ = generator._generate_sources_from_strategies(
+            "Test", generator._create_fallback_analysis("Test")
+        )
+        
+        assert sorted(s.url for s in sources) == [
+            "https://a.com/1", "https://b.com/2", "https://shared.com/x"
+        ]
+    
+    def test_strategy_deadline_and_failures(self):
+        """Test slow strategies time out and failing ones are reported"""
+        generator = AutomaticSourceGenerator(
+            openrouter_client=Mock(),
+            source_validator=Mock(),
+            strategy_timeout=0.3
+        )
+        generator.search_strategies = [
+            _SleepyStrategy("Fast", urls=["https://fast.com/1"]),
+            _SleepyStrategy("Slow", delay=2.0, urls=["https://slow.com/1"]),
+            _SleepyStrategy("Broken", error=RuntimeError("boom")),
+        ]
+        
+        start = time.perf_counter()
+        sources, report = generator._generate_sources_from_strategies(
+            "Test", generator._create_fallback_analysis("Test")
+        )
+        
+        assert time.perf_counter() - start < 1.0
+        assert [s.url for s in sources] == ["https://fast.com/1"]
+        assert report['strategies']['Fast']['status'] == 'completed'
+        assert report['strategies']['Slow']['status'] == 'timeout'
+        assert report['strategies']['Broken']['status'] == 'failed'
+    
+    def test_early_termination_on_enough_high_quality_sources(self):
+        """Test remaining strategies are cancelled once min_sources is reached"""
+        generator = AutomaticSourceGenerator(openrouter_client=Mock(), source_validator=Mock())
+        generator.search_strategies = [
+            _SleepyStrategy("Trusted", urls=[f"https://www.harvard.edu/{i}" for i in range(10)]),
+            _SleepyStrategy("Slow", delay=2.0, urls=["https://slow.com/1"]),
+        ]
+        
+        start = time.perf_counter()
+        sources, report = generator._generate_sources_from_strategies(
+            "Test",
+            generator._create_fallback_analysis("Test"),
+            min_sources=10
+        )
+        
+        assert time.perf_counter() - start < 1.0
+        assert len(sources) == 10
+        assert report['early_terminated'] is True
+        assert report['strategies']['Slow']['status'] == 'cancelled'
+    
+    def test_cancelled_strategies_stop_issuing_requests(self):
+        """Test strategies cancelled by early termination or the deadline stop between requests"""
+        generator = AutomaticSourceGenerator(
+            openrouter_client=Mock(),
+            source_validator=Mock(),
+            strategy_timeout=0.3
+        )
+        cancelled = _PagingStrategy("Cancelled")
+        generator.search_strategies = [
+            _SleepyStrategy("Trusted", delay=0.1, urls=[f"https://www.harvard.edu/{i}" for i in range(10)]),
+            cancelled,
+        ]
+        _, report = generator._generate_sources_from_strategies(
+            "Test", generator._create_fallback_analysis("Test"), min_sources=10
+        )
+        
+        assert report['strategies']['Cancelled']['status'] == 'cancelled'
+        assert cancelled.finished.wait(1.0)
+        assert cancelled.requests < cancelled.pages
+        
+        timed_out = _PagingStrategy("TimedOut")
+        generator.search_strategies = [timed_out]
+        _, report = generator._generate_sources_from_strategies(
+            "Test", generator._create_fallback_analysis("Test")
+        )
+        
+        assert report['strategies']['TimedOut']['status'] == 'timeout'
+        assert timed_out.finished.wait(1.0)
+        assert timed_out.requests < timed_out.pages
+    
+    def test_strategies_with_the_same_name_are_reported_separately(self):
+        """Test the report keeps an entry per strategy even when names repeat"""
+        generator = AutomaticSourceGenerator(
+            openrouter_client=Mock(),
+            source_validator=Mock(),
+            strategy_timeout=0.3
+        )
+        class _BrokenStrategy(_SleepyStrategy):
+            pass
+        
+        generator.search_strategies = [
+            _SleepyStrategy("Archive", urls=["https://a.com/1"]),
+            _PagingStrategy("Archive"),
+            _BrokenStrategy("Archive", error=RuntimeError("boom")),
+        ]
+        
+        _, report = generator._generate_sources_from_strategies(
+            "Test", generator._create_fallback_analysis("Test")
+        )
+        
+        assert {key: entry['status'] for key, entry in report['strategies'].items()} == {
+            'Archive': 'completed',
+            'Archive#2': 'timeout',
+            'Archive#3': 'failed',
+        }
+
 
 class TestSourceGeneratorEndpoint:
     """Test the API endpoint (integration test)"""
@@ -79,6 +79,12 @@ class TestPremiumDomainRegistry:
         """Test premium domain check returns False"""
         assert PremiumDomainRegistry.is_premium_domain('random-site.com') is False
     
+    def test_registered_domains_match_whole_labels(self):
+        """Test subdomains match but look-alike domains do not"""
+        assert PremiumDomainRegistry.get_authority_score('www.harvard.edu') == 98
+        assert PremiumDomainRegistry.get_domain_info('notharvard.edu') is None
+        assert PremiumDomainRegistry.get_category('fun.org') == "other"
+    
     def test_get_all_domains_by_category_academic(self):
         """Test getting all domains in academic category"""
         domains = PremiumDomainRegistry.get_all_domains_by_category('academic')
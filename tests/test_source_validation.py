@@ -1,8 +1,12 @@
 """
 Tests for advanced source validation service
 """
+import numpy as np
 import pytest
+from unittest.mock import patch
+from sklearn.feature_extraction.text import TfidfVectorizer
 from src.services.source_validator import SourceValidationService
+from src.services.async_fetcher import AsyncFetchEngine, FetchResult
 from src.api.models.sources import SourceItem, SourceType
 from src.utils.tfidf_analyzer import TfidfAnalyzer
 from src.utils.credibility_checker import CredibilityChecker
@@ -11,6 +15,8 @@ from src.config.trusted_domains import (
     is_trusted_domain,
     get_domain_category
 )
+from src.config.domain_index import classify_domain
+from tests.fixtures.stub_server import StubHTTPServer
 
 
 class TestTrustedDomains:
@@ -47,6 +53,31 @@ class TestTrustedDomains:
         assert get_domain_category("gov.uk") == "government"
         assert get_domain_category("nytimes.com") == "news"
         assert get_domain_category("archive.org") == "archive"
+    
+    def test_suffix_matches_are_label_aligned(self):
+        """Test suffixes only match whole labels"""
+        assert get_domain_credibility_score("reduce.com") == 50.0
+        assert get_domain_category("reduce.com") == "other"
+        assert get_domain_credibility_score("notwikipedia.org") == 50.0
+        assert get_domain_credibility_score("en.wikipedia.org") >= 85.0
+        assert get_domain_credibility_score("www.cs.stanford.edu") == 95.0
+    
+    def test_domain_normalization(self):
+        """Test case, port and trailing dot are ignored"""
+        assert get_domain_credibility_score("MIT.EDU:443") == get_domain_credibility_score("mit.edu")
+        assert get_domain_category("nytimes.com.") == "news"
+    
+    def test_classify_domain_combines_lists(self):
+        """Test one lookup answers credibility and premium status"""
+        classification = classify_domain("www.loc.gov")
+        assert classification.credibility_score == 95.0
+        assert classification.category == "government"
+        assert classification.is_premium
+        assert classification.premium_category == "government"
+        assert classification.authority == 98.0
+        
+        assert not classify_domain("blogspot.com").is_trusted
+        assert classify_domain("someone.blogspot.co.uk").credibility_score == 30.0
 
 
 class TestTfidfAnalyzer:
@@ -88,6 +119,129 @@ class TestTfidfAnalyzer:
         
         score = analyzer.simple_relevance_score(content, character_name)
         assert score > 0.0
+    
+    def test_calculate_similarities_batch_ordering(self):
+        """Test batch scores keep relevant content above unrelated content"""
+        analyzer = TfidfAnalyzer()
+        reference = "Albert Einstein physics relativity theory"
+        contents = [
+            "Albert Einstein was a theoretical physicist who developed the theory of relativity",
+            "Cooking recipes for delicious pasta dishes",
+        ]
+        
+        scores = analyzer.calculate_similarities(reference, contents)
+        
+        assert len(scores) == 2
+        assert scores[0] > 0.3
+        assert scores[1] < 0.3
+        assert all(0.0 <= score <= 1.0 for score in scores)
+    
+    def test_calculate_similarities_is_one_fit(self):
+        """Test scoring 100 sources fits the vectorizer once"""
+        analyzer = TfidfAnalyzer()
+        contents = [f"Winston Churchill speech number {i} in parliament" for i in range(100)]
+        
+        with patch(
+            "src.utils.tfidf_analyzer.TfidfVectorizer.fit_transform",
+            autospec=True,
+            side_effect=TfidfVectorizer.fit_transform
+        ) as fit_transform:
+            scores = analyzer.calculate_similarities("Winston Churchill parliament", contents)
+        
+        assert fit_transform.call_count == 1
+        assert len(scores) == 100
+    
+    def test_calculate_similarities_pairwise_references(self):
+        """Test one reference per content is compared row by row"""
+        analyzer = TfidfAnalyzer()
+        scores = analyzer.calculate_similarities(
+            ["Einstein relativity", "pasta recipes"],
+            ["Einstein developed relativity", "Einstein developed relativity"]
+        )
+        
+        assert scores[0] > scores[1]
+        
+        with pytest.raises(ValueError):
+            analyzer.calculate_similarities(["only one"], ["a", "b"])
+    
+    def test_calculate_relevance_batch_mentions_bonus(self):
+        """Test batch relevance adds the character mention bonus"""
+        analyzer = TfidfAnalyzer()
+        scores = analyzer.calculate_relevance_batch("Winston Churchill", [
+            ("Winston Churchill Biography",
+             "Winston Churchill was a British statesman. Winston Churchill served as Prime Minister."),
+            ("Gardening", "Tomatoes need sunlight and regular watering."),
+        ])
+        
+        assert scores[0] > 0.5
+        assert scores[1] < scores[0]
+        assert analyzer.calculate_relevance_batch("Anyone", []) == []
+    
+    def test_corpus_model_roundtrip(self, tmp_path):
+        """Test a corpus model fitted on bios/ can be saved and reused"""
+        analyzer = TfidfAnalyzer(stop_words=None)
+        analyzer.fit_corpus_from_directory("bios")
+        model_path = str(tmp_path / "tfidf.joblib")
+        analyzer.save_corpus_model(model_path)
+        
+        loaded = TfidfAnalyzer(corpus_model_path=model_path)
+        assert loaded.corpus_vectorizer is not None
+        
+        text = "Churchill fue primer ministro del Reino Unido durante la guerra"
+        with patch("src.utils.tfidf_analyzer.TfidfVectorizer.fit_transform") as fit_transform:
+            batch = loaded.calculate_similarities("Churchill primer ministro", [text])
+            single = loaded.calculate_similarity("Churchill primer ministro", text)
+        
+        fit_transform.assert_not_called()
+        assert batch[0] == pytest.approx(single)
+        assert batch[0] > 0.0
+    
+    def test_batch_scores_match_single_pair_scores(self):
+        """Test batch relevance ranks sources exactly like one-by-one scoring"""
+        analyzer = TfidfAnalyzer()
+        sources = [
+            ("Albert Einstein biography",
+             "Albert Einstein was a German-born theoretical physicist. His biography covers his life "
+             "in Ulm, Munich, Zurich and Berlin, his Nobel Prize and his historical influence."),
+            ("Theory of relativity",
+             "The theory of relativity comprises special and general relativity, proposed by "
+             "Albert Einstein. Relativity transformed theoretical physics and astronomy."),
+            ("Pasta recipes",
+             "Pasta is a traditional Italian food. This historical recipe for pasta with tomato "
+             "sauce needs flour, eggs and fresh basil."),
+            ("Princeton",
+             "Princeton University is a private research university in New Jersey. Einstein "
+             "worked at the Institute for Advanced Study in Princeton."),
+        ]
+        references = [f"Albert Einstein {title} biography historical" for title, _ in sources]
+        
+        batch = analyzer.calculate_similarities(references, [content for _, content in sources])
+        single = [
+            analyzer.calculate_similarity(reference, content)
+            for reference, (_, content) in zip(references, sources)
+        ]
+        
+        assert batch == pytest.approx(single)
+        assert list(np.argsort(batch)) == list(np.argsort(single))
+        # An unrelated page does not climb because of the other contents
+        assert batch[2] == min(batch)
+    
+    def test_validator_uses_configured_corpus_model(self, tmp_path, monkeypatch):
+        """Test SourceValidationService loads the model at TFIDF_CORPUS_MODEL_PATH"""
+        analyzer = TfidfAnalyzer()
+        analyzer.fit_corpus(["Einstein developed relativity", "Curie studied radioactivity"])
+        model_path = str(tmp_path / "tfidf.joblib")
+        analyzer.save_corpus_model(model_path)
+        monkeypatch.setenv("TFIDF_CORPUS_MODEL_PATH", model_path)
+        
+        validator = SourceValidationService()
+        
+        assert validator.tfidf_analyzer.corpus_vectorizer is not None
+    
+    def test_fit_corpus_from_empty_directory(self, tmp_path):
+        """Test fitting on a directory without documents fails clearly"""
+        with pytest.raises(ValueError):
+            TfidfAnalyzer().fit_corpus_from_directory(str(tmp_path))
 
 
 class TestCredibilityChecker:
@@ -490,3 +644,114 @@ class TestSourceValidationIntegration:
         # Should have rejected_sources field
         assert "rejected_sources" in result
         assert result["rejected_sources"] >= 0
+
+
+class TestAsyncFetchEngine:
+    """Test concurrent fetching against a local stub server"""
+    
+    def test_fetch_all_deduplicates_urls(self):
+        """Test that repeated URLs are fetched once"""
+        with StubHTTPServer() as server:
+            engine = AsyncFetchEngine(timeout=5)
+            urls = [server.url("/a"), server.url("/b"), server.url("/a")]
+            
+            results = engine.fetch_all_sync(urls)
+        
+        assert set(results) == {server.url("/a"), server.url("/b")}
+        assert server.request_count == 2
+        assert all(result.ok for result in results.values())
+        assert "Stub page" in results[server.url("/a")].text
+    
+    def test_per_host_concurrency_is_bounded(self):
+        """Test that no more than max_per_host requests hit one host at once"""
+        with StubHTTPServer(delay=0.05) as server:
+            engine = AsyncFetchEngine(timeout=5, max_per_host=3)
+            engine.fetch_all_sync(server.url(f"/page/{i}") for i in range(12))
+        
+        assert server.request_count == 12
+        assert 1 < server.max_in_flight <= 3
+    
+    def test_fetch_result_stores_body_once(self):
+        """Test serialized results keep only the compressed body and rebuild the text"""
+        result = FetchResult(
+            url="https://example.com/ada",
+            status_code=200,
+            text="Ada Lovelace é mathematician",
+            content="Ada Lovelace é mathematician".encode("latin-1"),
+            headers={"content-type": "text/html; charset=latin-1"}
+        )
+        
+        data = result.to_dict()
+        restored = FetchResult.from_dict(data)
+        
+        assert "text" not in data
+        assert restored == result
+    
+    def test_timeout_is_reported(self):
+        """Test that slow hosts produce a timed out result"""
+        with StubHTTPServer(delay=1.0) as server:
+            engine = AsyncFetchEngine(timeout=0.2)
+            result = engine.fetch_all_sync([server.url("/slow")])[server.url("/slow")]
+        
+        assert result.timed_out
+        assert not result.ok
+    
+    def test_connection_error_is_reported(self):
+        """Test that unreachable hosts produce an error result"""
+        server = StubHTTPServer().start()
+        url = server.url("/gone")
+        server.stop()
+        
+        result = AsyncFetchEngine(timeout=2).fetch_all_sync([url])[url]
+        
+        assert result.error is not None
+        assert result.status_code is None
+    
+    @pytest.mark.asyncio
+    async def test_fetch_all_sync_inside_running_loop(self):
+        """Test that the blocking wrapper works from async code"""
+        with StubHTTPServer() as server:
+            results = AsyncFetchEngine(timeout=5).fetch_all_sync([server.url("/")])
+        
+        assert results[server.url("/")].ok
+    
+    def test_validate_sources_with_accessibility(self):
+        """Test accessible and broken URLs are validated in one batch"""
+        body = (
+            b"<html><title>Albert Einstein</title><body>"
+            b"<p>Albert Einstein was a theoretical physicist. "
+            b"Einstein developed the theory of relativity.</p></body></html>"
+        )
+        
+        def route(handler):
+            if handler.path == "/missing":
+                return 404, {}, b"not here"
+            return 200, {"Content-Type": "text/html"}, body
+        
+        with StubHTTPServer(route=route) as server:
+            validator = SourceValidationService(min_relevance=0.1, min_credibility=10.0, timeout=5)
+            sources = [
+                SourceItem(title="Albert Einstein", url=server.url("/einstein"), source_type=SourceType.URL),
+                SourceItem(title="Missing", url=server.url("/missing"), source_type=SourceType.URL),
+            ]
+            
+            result = validator.validate_sources("Albert Einstein", sources, check_accessibility=True)
+        
+        found, missing = result["results"]
+        assert found.is_accessible is True
+        assert found.relevance_score is not None and found.relevance_score > 0
+        assert found.metadata["content_type"] == "text/html"
+        assert missing.is_accessible is False
+        assert any("404" in issue for issue in missing.issues)
+    
+    @pytest.mark.asyncio
+    async def test_validate_sources_async(self):
+        """Test async validation entry point"""
+        with StubHTTPServer() as server:
+            validator = SourceValidationService(timeout=5)
+            sources = [SourceItem(title="Stub", url=server.url("/"), source_type=SourceType.URL)]
+            
+            result = await validator.validate_sources_async("Stub", sources)
+        
+        assert result["total_sources"] == 1
+        assert result["results"][0].is_accessible is True
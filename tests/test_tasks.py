@@ -6,7 +6,9 @@ from src.tasks.generation_tasks import (
     GenerationTask,
     generate_chapter,
     generate_introduction,
-    generate_conclusion
+    generate_conclusion,
+    generate_collection_biography,
+    run_collection
 )
 from src.tasks.validation_tasks import (
     ValidationTask,
@@ -191,3 +193,75 @@ class TestBaseTaskClasses:
         """Verify MonitoringTask base class is configured"""
         assert MonitoringTask.autoretry_for == (Exception,)
         assert MonitoringTask.retry_backoff is True
+
+
+class TestCollectionTasks:
+    """Test collection workers claim, generate and mark characters"""
+    
+    def test_collection_worker_marks_completed_character(self, tmp_path):
+        """Verify a worker generates the claimed character and buffers its mark"""
+        from unittest.mock import patch
+        from src.api.models.biographies import JobStatus
+        from src.services.collection_scheduler import reset_collection_schedulers
+        
+        collection = tmp_path / "collection.md"
+        collection.write_text("1. Ada Lovelace ✅\n2. Alan Turing\n3. Grace Hopper\n", encoding='utf-8')
+        reset_collection_schedulers()
+        
+        with patch('src.api.routers.biographies.generate_sources_for_biography',
+                   return_value={'sources': [], 'source_count': 0}), \
+                patch('src.api.routers.biographies.create_biography_job') as create_job, \
+                patch('src.api.routers.biographies.run_biography_generation') as run, \
+                patch('src.services.job_store.get_job_store') as job_store:
+            job_store.return_value.get_status.return_value = {'status': JobStatus.COMPLETED}
+            result = generate_collection_biography.run(str(collection), {'chapters': 5}, continue_collection=False)
+            finished = generate_collection_biography.run(str(collection), continue_collection=False)
+        
+        assert result['character'] == "Alan Turing"
+        assert result['status'] == 'completed'
+        assert run.call_args_list[0][0][1].chapters == 5
+        assert create_job.call_count == 2
+        assert finished['character'] == "Grace Hopper"
+        assert collection.read_text(encoding='utf-8') == "1. Ada Lovelace ✅\n2. Alan Turing\n3. Grace Hopper\n"
+        
+        assert generate_collection_biography.run(str(collection), continue_collection=False)['status'] == 'collection_complete'
+        assert collection.read_text(encoding='utf-8') == "1. Ada Lovelace ✅\n2. Alan Turing ✅\n3. Grace Hopper ✅\n"
+        reset_collection_schedulers()
+    
+    def test_failed_source_generation_releases_claim(self, tmp_path):
+        """Verify an exception releases the claim for the retry, and keeps it once retries run out"""
+        from unittest.mock import patch
+        from src.services.collection_scheduler import CollectionScheduler, reset_collection_schedulers
+        
+        collection = tmp_path / "collection.md"
+        collection.write_text("1. Ada Lovelace\n2. Alan Turing\n", encoding='utf-8')
+        reset_collection_schedulers()
+        
+        with patch('src.api.routers.biographies.generate_sources_for_biography',
+                   side_effect=ValueError("no sources")), \
+                patch.object(generate_collection_biography, 'apply_async') as enqueue:
+            with pytest.raises(ValueError):
+                generate_collection_biography.run(str(collection), continue_collection=True)
+            
+            assert CollectionScheduler(str(collection)).stats()['in_progress'] == 0
+            enqueue.assert_not_called()
+            
+            # Last attempt: the claim expires on its own and the chain moves on
+            generate_collection_biography.push_request(retries=3)
+            try:
+                with pytest.raises(ValueError):
+                    generate_collection_biography.run(str(collection), continue_collection=True)
+            finally:
+                generate_collection_biography.pop_request()
+        
+        assert CollectionScheduler(str(collection)).stats()['in_progress'] == 1
+        enqueue.assert_called_once()
+        reset_collection_schedulers()
+    
+    def test_collection_tasks_registered(self):
+        """Verify collection tasks are registered on the generation queue"""
+        from src.worker import app
+        
+        assert 'src.tasks.generation_tasks.generate_collection_biography' in app.tasks
+        assert 'src.tasks.generation_tasks.run_collection' in app.tasks
+        assert run_collection.queue == 'content_generation'
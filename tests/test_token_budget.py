@@ -0,0 +1,91 @@
+"""
+Tests for token budgeting of long-form generation
+"""
+import math
+
+import pytest
+
+from src.monitoring.prometheus_metrics import get_metrics_collector
+from src.services.token_budget import (
+    DEFAULT_WORDS_PER_TOKEN,
+    MIN_COMPLETION_TOKENS,
+    TokenBudgeter
+)
+
+MESSAGES = [
+    {"role": "system", "content": "You are an expert biographer."},
+    {"role": "user", "content": "Write chapter 1 of 10 about Ada Lovelace. " * 4},
+]
+
+
+def _prose(words):
+    return " ".join(["word"] * words)
+
+
+class TestTokenBudgeter:
+    """Test planning, learning and accuracy tracking"""
+
+    def test_plan_uses_prior_until_usage_is_reported(self):
+        """Test an unseen model is planned with the default ratio plus headroom"""
+        budget = TokenBudgeter(headroom=0.1).plan("model", MESSAGES, 1500)
+
+        assert budget.expected_tokens == 2000
+        assert budget.max_tokens == 2200
+        assert budget.prompt_tokens > 0
+
+    def test_plan_respects_limits(self):
+        """Test max_tokens stays within the configured maximum and context window"""
+        budgeter = TokenBudgeter(context_window=4000)
+
+        assert budgeter.plan("model", MESSAGES, 10000, max_tokens_limit=8192).max_tokens <= 4000 - 50
+        assert TokenBudgeter().plan("model", MESSAGES, 10000, max_tokens_limit=3000).max_tokens == 3000
+        assert TokenBudgeter().plan("model", MESSAGES, 10).max_tokens == MIN_COMPLETION_TOKENS
+
+    def test_ratios_are_learned_per_model(self):
+        """Test reported usage moves the model's ratios, not other models'"""
+        budgeter = TokenBudgeter()
+        budget = budgeter.plan("verbose", MESSAGES, 1000)
+        chars = budget.prompt_chars
+
+        budgeter.observe("verbose", budget, _prose(1000), {"prompt_tokens": chars // 3 + 8, "completion_tokens": 2000})
+
+        stats = budgeter.get_stats()["verbose"]
+        assert stats["words_per_token"] == pytest.approx(0.5)
+        assert stats["chars_per_token"] == pytest.approx(3.0, abs=0.05)
+        assert budgeter.plan("verbose", MESSAGES, 1000).expected_tokens == 2000
+        assert budgeter.plan("other", MESSAGES, 1000).expected_tokens == math.ceil(1000 / DEFAULT_WORDS_PER_TOKEN)
+
+    def test_estimate_error_shrinks_as_ratio_is_learned(self):
+        """Test accuracy is tracked per model and exported as a metric"""
+        budgeter = TokenBudgeter()
+        collector = get_metrics_collector()
+        labels = {"model": "learner", "kind": "completion"}
+        before = collector.get_histogram_stats("bookgen_token_estimate_error_ratio", labels)["count"]
+
+        errors = []
+        for _ in range(5):
+            budget = budgeter.plan("learner", MESSAGES, 1000)
+            budgeter.observe("learner", budget, _prose(1000), {"prompt_tokens": 40, "completion_tokens": 1600})
+            errors.append(budgeter.get_stats()["learner"]["completion_estimate_error"])
+
+        assert errors[0] > 0.1
+        assert errors[-1] < errors[0]
+        assert collector.get_histogram_stats("bookgen_token_estimate_error_ratio", labels)["count"] == before + 5
+        assert collector.get_gauge("bookgen_words_per_token", {"model": "learner"}) == pytest.approx(0.625)
+
+    def test_missing_usage_is_ignored(self):
+        """Test responses without usage (e.g. cached) do not change the ratios"""
+        budgeter = TokenBudgeter()
+        budget = budgeter.plan("model", MESSAGES, 1000)
+
+        budgeter.observe("model", budget, _prose(1000), {})
+
+        assert budgeter.get_stats() == {
+            "model": {
+                "words_per_token": DEFAULT_WORDS_PER_TOKEN,
+                "chars_per_token": 4.0,
+                "samples": 0,
+                "prompt_estimate_error": None,
+                "completion_estimate_error": None,
+            }
+        }
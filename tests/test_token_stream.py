@@ -0,0 +1,217 @@
+"""
+Tests for token streaming to WebSocket watchers
+"""
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.services.chapter_generator import ChapterGenerator, ChapterStore
+from src.services.openrouter_client import Completion
+from src.services.token_budget import TokenBudgeter
+from src.websocket.manager import ConnectionManager
+from src.websocket.token_stream import TokenStreamForwarder
+
+
+class RecordingSocket:
+    """WebSocket stand-in recording frames, optionally slow to send"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.frames = []
+
+    async def send_json(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(message)
+
+
+@pytest.fixture
+def loop():
+    """Event loop running in a background thread, like the server loop"""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def _drain(loop, manager, timeout=5.0):
+    """Wait until all streaming sends have finished"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pending = asyncio.run_coroutine_threadsafe(
+            asyncio.sleep(0, result=len(manager._stream_senders)), loop
+        ).result()
+        if not pending:
+            return
+        time.sleep(0.02)
+
+
+class TestTokenStreamForwarder:
+    """Test coalescing and backpressure of token frames"""
+
+    def test_tokens_are_coalesced_into_frames(self, loop):
+        """Test many small tokens become few frames with the same text"""
+        manager = ConnectionManager(max_pending_frames=100)
+        socket = RecordingSocket()
+        manager.job_connections["job1"] = {socket}
+
+        forwarder = TokenStreamForwarder(
+            manager, "job1", chapter=1, flush_interval=60, max_chunk_chars=50, loop=loop
+        )
+        tokens = [f"tok{i} " for i in range(200)]
+        for token in tokens:
+            forwarder.feed(token)
+        forwarder.close("".join(tokens))
+        _drain(loop, manager)
+
+        text = "".join(frame["text"] for frame in socket.frames)
+        assert text == "".join(tokens)
+        assert len(socket.frames) <= len("".join(tokens)) // 50 + 1
+        assert [frame["seq"] for frame in socket.frames] == list(range(len(socket.frames)))
+        assert socket.frames[-1]["final"] is True
+        assert socket.frames[-1]["content"] == "".join(tokens)
+
+    def test_time_based_flush(self, loop):
+        """Test tokens are not held longer than the flush interval"""
+        manager = ConnectionManager()
+        socket = RecordingSocket()
+        manager.job_connections["job1"] = {socket}
+
+        forwarder = TokenStreamForwarder(
+            manager, "job1", flush_interval=0.05, max_chunk_chars=10_000, loop=loop
+        )
+        forwarder.feed("first ")
+        time.sleep(0.1)
+        forwarder.feed("second ")
+        _drain(loop, manager)
+
+        assert len(socket.frames) == 1
+        assert socket.frames[0]["text"] == "first second "
+
+    def test_slow_socket_drops_frames_without_stalling(self, loop):
+        """Test a slow watcher skips frames while a fast one receives all of them"""
+        manager = ConnectionManager()
+        fast, slow = RecordingSocket(), RecordingSocket(delay=0.2)
+        manager.job_connections["job1"] = {fast, slow}
+
+        forwarder = TokenStreamForwarder(
+            manager, "job1", flush_interval=0, max_chunk_chars=1, loop=loop
+        )
+        start = time.perf_counter()
+        for i in range(20):
+            forwarder.feed(f"t{i}")
+            time.sleep(0.005)
+        forwarder.close("full text")
+        feed_time = time.perf_counter() - start
+        _drain(loop, manager)
+
+        assert feed_time < 0.2 * 5
+        assert len(fast.frames) == 21
+        assert 2 <= len(slow.frames) < 21
+        assert slow.frames[-1]["final"] is True
+        assert slow.frames[-1]["content"] == "full text"
+
+    def test_disconnect_stops_queued_frames(self, loop):
+        """Test frames still queued for a closed socket are not sent"""
+        manager = ConnectionManager()
+        socket = RecordingSocket(delay=0.2)
+        manager.job_connections["job1"] = {socket}
+
+        async def stream_then_disconnect():
+            for i in range(5):
+                manager.stream_to_job({"text": f"t{i}"}, "job1")
+            await asyncio.sleep(0.3)
+            manager.disconnect(socket, job_id="job1")
+
+        asyncio.run_coroutine_threadsafe(stream_then_disconnect(), loop).result()
+        time.sleep(0.8)
+
+        assert len(socket.frames) == 1
+        assert not manager._stream_senders
+
+    def test_no_loop_is_a_no_op(self):
+        """Test forwarding without a running server loop does nothing"""
+        forwarder = TokenStreamForwarder(ConnectionManager(), "job1")
+        forwarder.feed("token")
+        forwarder.close("token")
+
+        assert forwarder.frames_sent == 1
+
+
+class TestChapterStreaming:
+    """Test chapter generation with token streaming"""
+
+    def test_streamed_chapter_is_forwarded_and_stored(self, tmp_path, loop):
+        """Test streamed tokens reach watchers and the joined text is persisted"""
+        class StreamingClient:
+            config = SimpleNamespace(model="fake-model", max_tokens=8192)
+
+            def generate_text_streaming(self, prompt, **kwargs):
+                yield from ["Chapter ", "text ", "streamed."]
+
+            def generate_text(self, prompt, **kwargs):
+                raise AssertionError("streaming expected")
+
+        manager = ConnectionManager()
+        socket = RecordingSocket()
+        manager.job_connections["job1"] = {socket}
+        store = ChapterStore("Ada Lovelace", "job1", base_dir=str(tmp_path))
+
+        generator = ChapterGenerator(
+            StreamingClient(),
+            store,
+            stream_factory=lambda number: TokenStreamForwarder(manager, "job1", chapter=number, loop=loop)
+        )
+        chapters = generator.generate("Ada Lovelace", total_chapters=1, words_per_chapter=500)
+        _drain(loop, manager)
+
+        assert chapters[0]["content"] == "Chapter text streamed."
+        assert "".join(frame["text"] for frame in socket.frames) == "Chapter text streamed."
+        assert socket.frames[-1]["chapter"] == 1
+
+    def test_truncated_streamed_chapter_is_continued(self, tmp_path, loop):
+        """Test a streamed chapter cut off at max_tokens is continued and its usage observed"""
+        class TruncatingClient:
+            config = SimpleNamespace(model="fake-model", max_tokens=8192)
+
+            def __init__(self):
+                self.calls = []
+
+            def generate_text_streaming(self, prompt, on_complete=None, **kwargs):
+                self.calls.append({"prompt": prompt, **kwargs})
+                first = len(self.calls) == 1
+                tokens = ["Ada was a ", "mathemat"] if first else ["ician."]
+                yield from tokens
+                on_complete(Completion(
+                    content="".join(tokens),
+                    usage={"prompt_tokens": 60, "completion_tokens": 400},
+                    finish_reason="length" if first else "stop"
+                ))
+
+        manager = ConnectionManager()
+        socket = RecordingSocket()
+        manager.job_connections["job1"] = {socket}
+        store = ChapterStore("Ada Lovelace", "job1", base_dir=str(tmp_path))
+        client = TruncatingClient()
+        budgeter = TokenBudgeter()
+
+        generator = ChapterGenerator(
+            client,
+            store,
+            budgeter=budgeter,
+            stream_factory=lambda number: TokenStreamForwarder(manager, "job1", chapter=number, loop=loop)
+        )
+        chapters = generator.generate("Ada Lovelace", total_chapters=1, words_per_chapter=500)
+        _drain(loop, manager)
+
+        assert len(client.calls) == 2
+        assert client.calls[1]["prompt"].startswith("Continue chapter 1 of 1 about Ada Lovelace")
+        assert chapters[0]["content"] == "Ada was a mathematician."
+        assert socket.frames[-1]["content"] == "Ada was a mathematician."
+        assert budgeter.get_stats()["fake-model"]["samples"] == 2
@@ -0,0 +1,80 @@
+"""
+Tests for the shared tokenized document
+"""
+import re
+
+import numpy as np
+
+from src.utils.tokenized_document import TokenizedDocument, clear_tokenized_documents, tokenize
+
+
+TEXT = (
+    "# Chapter 1\n\n"
+    "Ada Lovelace was born in 1815. She worked with Charles Babbage!\n\n"
+    "  Lovelace wrote the first program.   Ada, Lovelace's notes survive.  \n\n\n"
+)
+
+
+class TestTokenizedDocument:
+    """Test token streams, spans and memoization"""
+
+    def setup_method(self):
+        clear_tokenized_documents()
+
+    def test_words_match_whitespace_split(self):
+        """Test word ids follow text.split() with lowercased vocabulary"""
+        document = TokenizedDocument(TEXT)
+        words = [document.word_vocabulary[i] for i in document.word_ids]
+
+        assert words == TEXT.lower().split()
+        assert document.word_count == len(TEXT.split())
+        assert document.char_count == sum(len(word) for word in TEXT.split())
+
+    def test_sentences_and_paragraphs(self):
+        """Test spans match the regex and blank-line splits"""
+        document = TokenizedDocument(TEXT)
+
+        assert document.paragraphs == [p.strip() for p in TEXT.split('\n\n') if p.strip()]
+        assert document.sentences == [
+            "# Chapter 1\n\nAda Lovelace was born in 1815",
+            "She worked with Charles Babbage",
+            "Lovelace wrote the first program",
+            "Ada, Lovelace's notes survive.",
+        ]
+
+    def test_term_offsets_partition_terms(self):
+        """Test each paragraph's term range holds exactly its terms"""
+        document = TokenizedDocument(TEXT)
+        offsets = document.paragraph_term_offsets
+
+        for index, paragraph in enumerate(document.paragraphs):
+            terms = document.terms(offsets[index], offsets[index + 1])
+            assert terms == re.findall(r"\w+", paragraph.lower())
+        assert offsets[-1] == len(document.term_ids)
+
+    def test_count_phrase(self):
+        """Test case-insensitive whole-word phrase counts"""
+        document = TokenizedDocument(TEXT)
+
+        assert document.count_phrase("Lovelace") == 3
+        assert document.count_phrase("ada lovelace") == 2
+        assert document.count_phrase("Babbage") == 1
+        assert document.count_phrase("Love") == 0
+        assert document.count_phrase("Grace Hopper") == 0
+
+    def test_tokenize_is_memoized_per_content(self):
+        """Test the same text is tokenized once and documents pass through"""
+        document = tokenize(TEXT)
+
+        assert tokenize(str(TEXT)) is document
+        assert tokenize(document) is document
+        assert tokenize(TEXT + " ") is not document
+
+    def test_empty_text(self):
+        """Test empty texts have no tokens or spans"""
+        document = tokenize("")
+
+        assert document.word_count == 0
+        assert len(document.term_ids) == 0
+        assert document.sentences == []
+        assert np.array_equal(document.paragraph_term_offsets, [0])
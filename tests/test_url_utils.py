@@ -0,0 +1,104 @@
+"""
+Tests for shared URL normalization and domain extraction
+"""
+from unittest.mock import Mock
+
+from src.cache.page_cache import PageCache
+from src.services.hybrid_generator import HybridSourceGenerator
+from src.utils.source_triangulator import SourceTriangulator
+from src.utils.url_utils import (
+    extract_domain,
+    extract_registrable_domain,
+    is_subdomain_of,
+    normalize_url,
+    parse_url,
+)
+from src.api.models.sources import SourceItem, SourceType
+from src.strategies.base_strategy import SourceCandidate
+
+
+class TestNormalizeURL:
+    """Test canonical URL form"""
+
+    def test_tracking_parameters_are_dropped(self):
+        """Test utm_* and click identifiers do not make pages distinct"""
+        assert normalize_url("https://example.com/a?utm_source=x&id=3&fbclid=abc") == \
+            normalize_url("https://example.com/a?id=3")
+
+    def test_idn_host_is_punycoded(self):
+        """Test internationalized hosts compare equal to their ASCII form"""
+        assert parse_url("https://Bücher.example/").host == "xn--bcher-kva.example"
+
+    def test_url_without_scheme(self):
+        """Test bare hosts are parsed as http URLs"""
+        assert parse_url("example.com/path").host == "example.com"
+        assert extract_domain("www.example.com") == "example.com"
+
+    def test_ipv6_host_round_trips(self):
+        """Test IPv6 hosts keep their brackets in the URL"""
+        assert normalize_url("http://[::1]:8080/x") == "http://[::1]:8080/x"
+
+    def test_parsing_is_memoized(self):
+        """Test repeated URLs are served from the parse cache"""
+        parse_url.cache_clear()
+        for _ in range(100):
+            parse_url("https://en.wikipedia.org/wiki/Ada_Lovelace")
+
+        assert parse_url.cache_info().hits == 99
+
+
+class TestDomains:
+    """Test domain and registrable domain extraction"""
+
+    def test_extract_domain_strips_www_and_port(self):
+        """Test domains are lowercased without www. and port"""
+        assert extract_domain("https://WWW.Example.com:8443/x") == "example.com"
+        assert extract_domain("https://sub.example.com") == "sub.example.com"
+        assert extract_domain("not a url") == "not a url"
+        assert extract_domain("") == ""
+
+    def test_registrable_domain(self):
+        """Test eTLD+1 handling of multi-label and hosting suffixes"""
+        assert extract_registrable_domain("https://en.wikipedia.org/wiki/X") == "wikipedia.org"
+        assert extract_registrable_domain("https://www.bbc.co.uk/news") == "bbc.co.uk"
+        assert extract_registrable_domain("https://someone.blogspot.com/") == "someone.blogspot.com"
+        assert extract_registrable_domain("http://192.168.0.1/") == "192.168.0.1"
+
+    def test_is_subdomain_of_is_label_aligned(self):
+        """Test suffix matches start at a label boundary"""
+        assert is_subdomain_of("cs.mit.edu", "edu")
+        assert is_subdomain_of("loc.gov", "loc.gov")
+        assert not is_subdomain_of("reduce.com", "edu")
+        assert not is_subdomain_of("notloc.gov.example", "loc.gov")
+
+
+class TestConsumers:
+    """Test components agree on what the same page and site are"""
+
+    def test_hybrid_duplicates_use_canonical_urls(self):
+        """Test tracking parameters and case do not hide duplicates"""
+        generator = HybridSourceGenerator(
+            automatic_generator=Mock(), source_validator=Mock(), page_cache=PageCache()
+        )
+        user = [SourceItem(title="A", source_type=SourceType.URL, url="https://example.com/a")]
+        auto = [
+            SourceItem(title="B", source_type=SourceType.URL, url="https://EXAMPLE.com/a/?utm_source=feed"),
+            SourceItem(title="C", source_type=SourceType.URL, url="https://example.com/c"),
+        ]
+
+        assert [s.title for s in generator._remove_duplicates(auto, user)] == ["C"]
+
+    def test_triangulator_counts_language_editions_as_one_site(self):
+        """Test source overlap uses registrable domains"""
+        candidates = [
+            SourceCandidate(source_item=SourceItem(
+                title=f"Ada {lang}",
+                source_type=SourceType.URL,
+                url=f"https://{lang}.wikipedia.org/wiki/Ada_Lovelace"
+            ))
+            for lang in ("en", "de", "fr")
+        ]
+
+        overlap = SourceTriangulator(page_cache=PageCache()).calculate_source_overlap(candidates)
+        assert overlap['unique_sources'] == 1
+        assert overlap['redundant_sources'] == 2